@@ -0,0 +1,293 @@
+#!/usr/bin/env python
+"""Microbenchmark every detector on the fixture frames, against a baseline.
+
+Usage:
+    uv run python benchmarks/bench_detectors.py [--repeats N] [--engines E ...]
+        [--from-video] [--baseline FILE] [--save] [--threshold FRACTION]
+
+Runs ``detect_game_phase``, ``detect_game_time``, ``detect_team_kills``,
+``detect_player_kda`` and ``detect_result`` over the committed frames in
+``tests/fixtures/frames`` (the phase over all of them, the HUD fields
+over the in-game ones, the result over the post-game ones), once per OCR
+engine, and ``extract_frame`` on the sample video at the fixtures'
+timestamps.  With ``--from-video`` the detectors read the frames decoded
+from the sample video instead of the PNGs.
+
+Every case is measured cold -- the first call after dropping the OCR
+reader or glyph bank, so it includes loading it -- and warm over
+*repeats* passes: throughput (calls per second), p50 / p95 / p99 latency
+and the process's peak RSS so far.  The EasyOCR reader is created with
+``gpu=False``, so the numbers are CPU-only.  Cases that need EasyOCR
+(the ``recognize`` / ``readtext`` engines and ``detect_result``) are
+skipped if its models can't be loaded, ``extract_frame`` if the sample
+video isn't checked out (Git LFS).
+
+Results are compared with the JSON baseline (default
+``benchmarks/baselines/detectors.json``, if it exists): a case whose p50
+or p95 latency grew by more than ``--threshold`` (default 25%) is a
+regression and the script exits with status 1.  ``--save`` writes this
+run as the new baseline.  Baselines are only comparable on the machine
+they were recorded on.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import resource
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "tests"))
+
+from support import FRAME_DEFS, IN_GAME_FRAMES, load_frame
+
+from wr_analyzer import glyphs, ocr
+from wr_analyzer.game_state import detect_game_phase
+from wr_analyzer.kda import detect_player_kda, detect_team_kills
+from wr_analyzer.profiling import Profile
+from wr_analyzer.result import detect_result
+from wr_analyzer.timer import detect_game_time
+from wr_analyzer.video import extract_frame
+
+DEFAULT_VIDEO = REPO_ROOT / "tests" / "fixtures" / "JjoDryfoCGs.mp4"
+DEFAULT_BASELINE = REPO_ROOT / "benchmarks" / "baselines" / "detectors.json"
+
+# Fixture frames of each detector.
+ALL_FRAMES = [name for name, _ in FRAME_DEFS]
+POSTGAME_FRAMES = [name for name in ALL_FRAMES if name.startswith("postgame_")]
+
+# Latency statistics a regression is judged on.
+_COMPARED = ("p50_ms", "p95_ms")
+
+
+class _OcrUnavailable(Exception):
+    """Raised in place of loading the EasyOCR reader when it can't be."""
+
+
+def _video_available(video: Path) -> bool:
+    return video.exists() and video.stat().st_size >= 1_000_000
+
+
+def _frames(names: list[str], video: Path | None) -> list:
+    """Return the frames *names*, from the fixture PNGs or decoded from *video*."""
+    if video is None:
+        return [load_frame(name) for name in names]
+    timestamps = dict(FRAME_DEFS)
+    return [extract_frame(video, timestamps[name]) for name in names]
+
+
+def _reset(engine: str) -> None:
+    """Drop the engine's lazily loaded state, so the next call is cold."""
+    if engine == "glyph":
+        glyphs._default_bank = None
+    else:
+        ocr._easyocr_reader = None
+
+
+def _load(engine: str) -> None:
+    """Load the engine's state: the glyph bank, or a CPU-only reader."""
+    if engine == "glyph":
+        glyphs._get_default_bank()
+    elif ocr._easyocr_reader is None:
+        ocr._easyocr_reader = ocr.easyocr.Reader(["en"], gpu=False, verbose=False)
+
+
+def _cases(engines: list[str]) -> dict[str, tuple[str | None, Callable, list[str]]]:
+    """Return ``{case: (engine, detector(frame), frame names)}``."""
+    cases = {}
+    for engine in engines:
+        for name, detect, frames in (
+            ("detect_game_phase", detect_game_phase, ALL_FRAMES),
+            ("detect_game_time", detect_game_time, IN_GAME_FRAMES),
+            ("detect_team_kills", detect_team_kills, IN_GAME_FRAMES),
+            ("detect_player_kda", detect_player_kda, IN_GAME_FRAMES),
+        ):
+            cases[f"{name}[{engine}]"] = (
+                engine,
+                lambda frame, detect=detect, engine=engine: detect(
+                    frame, engine=engine
+                ),
+                frames,
+            )
+    # The result banner is always read with full text detection.
+    cases["detect_result"] = ("readtext", detect_result, POSTGAME_FRAMES)
+    return cases
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS.
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def _measure(
+    call: Callable, inputs: list, repeats: int, load: Callable[[], None]
+) -> dict:
+    """Time *call* over *inputs*: once cold, then *repeats* warm passes.
+
+    The cold call is timed together with *load*, which loads what the
+    call needs.
+    """
+    t0 = time.perf_counter()
+    load()
+    call(inputs[0])
+    cold_ms = 1000 * (time.perf_counter() - t0)
+    for item in inputs[1:]:
+        call(item)  # warm-up
+
+    profile = Profile()
+    for _ in range(repeats):
+        for item in inputs:
+            start = time.perf_counter()
+            call(item)
+            profile.record("call", start, time.perf_counter())
+    stats = profile.stages()["call"]
+    return {
+        "calls": stats.count,
+        "throughput_per_sec": stats.count / stats.total_sec,
+        "p50_ms": stats.p50_ms,
+        "p95_ms": stats.p95_ms,
+        "p99_ms": stats.p99_ms,
+        "cold_ms": cold_ms,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def run(
+    engines: list[str], repeats: int, video: Path, from_video: bool
+) -> dict[str, dict]:
+    """Run every case; return ``{case: measurements or {"skipped": reason}}``."""
+    ocr_unavailable = None
+    try:
+        _load("readtext")
+    except Exception as exc:  # no models offline
+        ocr_unavailable = f"EasyOCR unavailable: {exc}"
+
+        def unavailable():
+            raise _OcrUnavailable(ocr_unavailable)
+
+        # Fail fast in cases that reach the OCR only for some frames
+        # (the phase cascade), instead of retrying the download.
+        ocr._get_easyocr_reader = unavailable
+    have_video = _video_available(video)
+    if from_video and not have_video:
+        sys.exit(f"Video not found: {video}\nRun `git lfs pull` first.")
+
+    results: dict[str, dict] = {}
+    for case, (engine, detect, names) in _cases(engines).items():
+        if engine != "glyph" and ocr_unavailable:
+            results[case] = {"skipped": ocr_unavailable}
+            continue
+        frames = _frames(names, video if from_video else None)
+        _reset(engine)
+        try:
+            results[case] = _measure(
+                detect, frames, repeats, lambda engine=engine: _load(engine)
+            )
+        except _OcrUnavailable as exc:
+            results[case] = {"skipped": str(exc)}
+
+    if have_video:
+        timestamps = [ts for _, ts in FRAME_DEFS]
+        results["extract_frame"] = _measure(
+            lambda ts: extract_frame(video, ts), timestamps, repeats, lambda: None
+        )
+    else:
+        results["extract_frame"] = {"skipped": f"video not found: {video}"}
+    return results
+
+
+def regressions(
+    results: dict[str, dict], baseline: dict[str, dict], threshold: float
+) -> list[str]:
+    """Return a line for each latency that grew more than *threshold* over *baseline*."""
+    found = []
+    for case, now in results.items():
+        before = baseline.get(case)
+        if before is None or "skipped" in now or "skipped" in before:
+            continue
+        for key in _COMPARED:
+            if now[key] > before[key] * (1 + threshold):
+                found.append(
+                    f"{case}: {key} {before[key]:.2f} -> {now[key]:.2f} "
+                    f"(+{now[key] / before[key] - 1:.0%})"
+                )
+    return found
+
+
+def _report(results: dict[str, dict]) -> None:
+    print(
+        f"  {'case':<30} {'calls/s':>8} {'p50 ms':>8} {'p95 ms':>8} "
+        f"{'p99 ms':>8} {'cold ms':>9} {'RSS MB':>7}"
+    )
+    for case, r in results.items():
+        if "skipped" in r:
+            print(f"  {case:<30} skipped ({r['skipped']})")
+            continue
+        print(
+            f"  {case:<30} {r['throughput_per_sec']:8.1f} {r['p50_ms']:8.2f} "
+            f"{r['p95_ms']:8.2f} {r['p99_ms']:8.2f} {r['cold_ms']:9.1f} "
+            f"{r['peak_rss_mb']:7.0f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument(
+        "--engines",
+        nargs="+",
+        choices=ocr.OCR_ENGINES,
+        default=["glyph", "recognize"],
+        help="OCR engines of the HUD detectors (default: glyph recognize)",
+    )
+    parser.add_argument("--video", type=Path, default=DEFAULT_VIDEO)
+    parser.add_argument(
+        "--from-video",
+        action="store_true",
+        help="Decode the detectors' frames from the video instead of the PNGs",
+    )
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument(
+        "--save", action="store_true", help="Write this run as the baseline"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Latency growth counted as a regression (default: 0.25)",
+    )
+    args = parser.parse_args()
+
+    print(f"CPU-only, {args.repeats} warm passes per case")
+    results = run(args.engines, args.repeats, args.video, args.from_video)
+    _report(results)
+
+    if args.save:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        record = {"machine": platform.platform(), "cases": results}
+        args.baseline.write_text(json.dumps(record, indent=2) + "\n")
+        print(f"Baseline written to {args.baseline}")
+        return
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --save to record one")
+        return
+    baseline = json.loads(args.baseline.read_text())
+    if baseline.get("machine") != platform.platform():
+        print(f"  (baseline recorded on {baseline.get('machine')})")
+    found = regressions(results, baseline["cases"], args.threshold)
+    if found:
+        print(f"Regressions over {args.threshold:.0%}:")
+        for line in found:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"No regressions over {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
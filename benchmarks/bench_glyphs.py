@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+"""Compare the glyph template engine with EasyOCR on the HUD fields.
+
+Usage:
+    uv run python benchmarks/bench_glyphs.py [REPEATS]
+
+Reads the timer, kill score and KDA of every labelled fixture frame
+(the ground-truth table in plan.md) with each OCR engine and prints the
+mean time per frame and how many fields match the ground truth.
+
+The bundled glyph templates were harvested from these same frames, so
+the glyph engine is also scored leave-one-frame-out: each frame is read
+with templates rebuilt from the other frames only, which is closer to
+how it does on unseen video.  The EasyOCR row needs its models
+(downloaded on first use) and is skipped if they can't be loaded.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "tests"))
+
+from build_glyphs import labelled_crops
+from support import HUD_GROUND_TRUTH, load_frame
+
+from wr_analyzer import glyphs
+from wr_analyzer.kda import (
+    PlayerKDA,
+    TeamKills,
+    _KDA_RE,
+    _KILLS_RE,
+    detect_player_kda,
+    detect_team_kills,
+)
+from wr_analyzer.ocr import _get_easyocr_reader
+from wr_analyzer.ocr_plan import OcrPlan
+from wr_analyzer.timer import detect_game_time, parse_game_time
+
+
+def _expected(name: str) -> tuple:
+    timer, kills, kda = HUD_GROUND_TRUTH[name]
+    k = _KILLS_RE.search(kills)
+    d = _KDA_RE.search(kda)
+    return (
+        parse_game_time(timer),
+        TeamKills(int(k.group(1)), int(k.group(2))),
+        PlayerKDA(*(int(g) for g in d.groups())),
+    )
+
+
+def _read(name: str, engine: str) -> tuple:
+    frame = load_frame(name)
+    plan = OcrPlan(frame, engine=engine)
+    timer = detect_game_time(frame, plan=plan)
+    return (
+        parse_game_time(timer) if timer else None,
+        detect_team_kills(frame, plan=plan),
+        detect_player_kda(frame, plan=plan),
+    )
+
+
+def _score(readings: dict[str, tuple]) -> int:
+    return sum(
+        got == want
+        for name, fields in readings.items()
+        for got, want in zip(fields, _expected(name))
+    )
+
+
+def _run(engine: str, repeats: int) -> tuple[float, dict[str, tuple]]:
+    """Return (mean seconds/frame, readings by frame)."""
+    readings = {}
+    t0 = time.perf_counter()
+    for _ in range(repeats):
+        readings = {name: _read(name, engine) for name in HUD_GROUND_TRUTH}
+    return (time.perf_counter() - t0) / (repeats * len(HUD_GROUND_TRUTH)), readings
+
+
+def main() -> None:
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    fields = 3 * len(HUD_GROUND_TRUTH)
+    print(f"{len(HUD_GROUND_TRUTH)} labelled frames x {repeats} repeats")
+
+    engines = ["glyph"]
+    try:
+        _get_easyocr_reader()
+        engines.append("recognize")
+    except Exception as exc:  # no models offline
+        print(f"  (EasyOCR unavailable, skipping it: {exc})")
+
+    for engine in engines:
+        _run(engine, 1)  # warm-up
+        seconds, readings = _run(engine, repeats)
+        print(
+            f"  {engine:<10} {1000 * seconds:8.1f} ms/frame"
+            f"  {_score(readings):3d}/{fields} fields correct"
+        )
+
+    # Leave-one-frame-out: templates from every other labelled frame.
+    readings = {}
+    try:
+        for name in HUD_GROUND_TRUTH:
+            others = [n for n in HUD_GROUND_TRUTH if n != name]
+            glyphs._default_bank, _ = glyphs.GlyphBank.from_samples(
+                labelled_crops(others)
+            )
+            readings[name] = _read(name, "glyph")
+    finally:
+        glyphs._default_bank = None
+    print(
+        f"  glyph, leave-one-frame-out  {_score(readings):3d}/{fields} fields correct"
+    )
+
+
+if __name__ == "__main__":
+    main()
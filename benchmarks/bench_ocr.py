@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+"""Compare per-crop and batched HUD OCR on the fixture frames.
+
+Usage:
+    uv run python benchmarks/bench_ocr.py [REPEATS]
+
+Runs the timer, kill-score and KDA detectors on every in-game fixture
+frame three ways: with each crop recognised by its own recognizer call
+(the old behaviour), through a batched per-frame
+:class:`~wr_analyzer.ocr_plan.OcrPlan`, and with the primary crops of
+all frames batched together first (what ``--ocr-batch`` does).  Prints
+the mean time and recognizer calls per frame for each, and whether they
+produced the same readings.
+
+Needs the EasyOCR models (downloaded on first use).
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "tests"))
+
+from support import IN_GAME_FRAMES, load_frame
+
+from wr_analyzer.kda import detect_player_kda, detect_team_kills
+from wr_analyzer.ocr import _get_easyocr_reader
+from wr_analyzer.ocr_plan import OcrPlan, recognize_plans
+from wr_analyzer.timer import detect_game_time
+
+
+def _run(
+    batched: bool, repeats: int, cross_frame: bool = False
+) -> tuple[float, float, list]:
+    """Return (mean seconds/frame, mean calls/frame, readings)."""
+    elapsed = 0.0
+    calls = 0
+    readings = []
+    for _ in range(repeats):
+        readings = []
+        plans = {}
+        if cross_frame:
+            t0 = time.perf_counter()
+            plans = {name: OcrPlan(load_frame(name)) for name in IN_GAME_FRAMES}
+            recognize_plans(list(plans.values()))
+            elapsed += time.perf_counter() - t0
+            calls += 1
+        for name in IN_GAME_FRAMES:
+            frame = load_frame(name)
+            t0 = time.perf_counter()
+            plan = plans.get(name) or OcrPlan(frame, batched=batched)
+            readings.append(
+                (
+                    detect_game_time(frame, plan=plan),
+                    detect_team_kills(frame, plan=plan),
+                    detect_player_kda(frame, plan=plan),
+                )
+            )
+            elapsed += time.perf_counter() - t0
+            calls += plan.calls
+    n = repeats * len(IN_GAME_FRAMES)
+    return elapsed / n, calls / n, readings
+
+
+def main() -> None:
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    _get_easyocr_reader()
+    print(f"{len(IN_GAME_FRAMES)} fixture frames x {repeats} repeats")
+
+    # Warm-up pass so no mode pays for first-call allocation.
+    _run(True, 1)
+
+    single_s, single_calls, single_out = _run(False, repeats)
+    batch_s, batch_calls, batch_out = _run(True, repeats)
+    cross_s, cross_calls, cross_out = _run(True, repeats, cross_frame=True)
+    rows = [
+        ("per-crop", single_s, single_calls),
+        ("per-frame", batch_s, batch_calls),
+        ("cross-frame", cross_s, cross_calls),
+    ]
+    for label, seconds, calls in rows:
+        print(
+            f"  {label:<12} {1000 * seconds:8.1f} ms/frame  {calls:4.1f} calls"
+            f"  {single_s / seconds:5.2f}x"
+        )
+    same = sum(a == b == c for a, b, c in zip(single_out, batch_out, cross_out))
+    print(f"  identical readings on {same}/{len(single_out)} frames")
+
+
+if __name__ == "__main__":
+    main()
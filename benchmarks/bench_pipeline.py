@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+"""Compare sequential and pipelined ``analyze_video`` wall-clock time.
+
+Usage:
+    uv run python benchmarks/bench_pipeline.py [VIDEO] [INTERVAL] [ENGINE]
+
+Analyses the video twice, once with decode, preprocessing and OCR run
+one after another and once with ``pipeline=True`` (decode and CLAHE on
+background threads feeding the OCR through bounded queues), and prints
+the wall-clock time of each and whether their frame data match.  The
+overlap needs a spare core: on a single core the threads only take
+turns.
+
+The default video is tests/fixtures/JjoDryfoCGs.mp4 (Git LFS).  Needs
+the EasyOCR models (downloaded on first use).
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+from wr_analyzer.analyze import analyze_video
+from wr_analyzer.ocr import _get_easyocr_reader
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_VIDEO = REPO_ROOT / "tests" / "fixtures" / "JjoDryfoCGs.mp4"
+
+
+def main() -> None:
+    video = Path(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_VIDEO
+    interval = float(sys.argv[2]) if len(sys.argv) > 2 else 30.0
+    engine = sys.argv[3] if len(sys.argv) > 3 else "recognize"
+    if not video.exists() or video.stat().st_size < 1_000_000:
+        sys.exit(f"Video not found: {video}\nRun `git lfs pull` first.")
+
+    _get_easyocr_reader()  # keep model loading out of the timings
+    results = {}
+    for pipeline in (False, True):
+        t0 = time.monotonic()
+        results[pipeline] = analyze_video(
+            video, interval_sec=interval, ocr_engine=engine, pipeline=pipeline
+        )
+        elapsed = time.monotonic() - t0
+        frames = len(results[pipeline].frame_data)
+        label = "pipelined" if pipeline else "sequential"
+        print(
+            f"  {label:<11} {elapsed:7.2f}s  "
+            f"({1000 * elapsed / max(frames, 1):.1f} ms/frame, {frames} frames)"
+        )
+    same = results[False].frame_data == results[True].frame_data
+    print(f"  identical frame data: {same}")
+
+
+if __name__ == "__main__":
+    main()
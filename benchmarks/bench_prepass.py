@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+"""Compare a uniform ``analyze_video`` run with a ``prepass=True`` one.
+
+Usage:
+    uv run python benchmarks/bench_prepass.py [VIDEO] [INTERVAL]
+
+Analyses the video twice, once sampling the whole range and once only
+the candidate game spans the thumbnail pre-pass finds, and prints the
+wall-clock time of each (pre-pass included), the measured speedup, the
+estimate :attr:`PrepassStats.speedup` reports without the uniform run,
+and whether both runs find the same games.
+
+The default video is tests/fixtures/JjoDryfoCGs.mp4 (Git LFS).  Needs
+the EasyOCR models (downloaded on first use).
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+from wr_analyzer.analyze import analyze_video
+from wr_analyzer.ocr import _get_easyocr_reader
+from wr_analyzer.video_index import ensure_index
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_VIDEO = REPO_ROOT / "tests" / "fixtures" / "JjoDryfoCGs.mp4"
+
+
+def main() -> None:
+    video = Path(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_VIDEO
+    interval = float(sys.argv[2]) if len(sys.argv) > 2 else 30.0
+    if not video.exists() or video.stat().st_size < 1_000_000:
+        sys.exit(f"Video not found: {video}\nRun `git lfs pull` first.")
+
+    _get_easyocr_reader()  # keep model loading out of the timings
+    ensure_index(video)  # and the one-off index build
+    results, times = {}, {}
+    for prepass in (False, True):
+        t0 = time.monotonic()
+        results[prepass] = analyze_video(video, interval_sec=interval, prepass=prepass)
+        times[prepass] = time.monotonic() - t0
+        frames = len(results[prepass].frame_data)
+        label = "pre-pass" if prepass else "uniform"
+        print(f"  {label:<9} {times[prepass]:7.2f}s  ({frames} frames)")
+
+    stats = results[True].prepass
+    print(
+        f"  pre-pass: {stats.thumbnails} thumbnails in {stats.seconds:.2f}s "
+        f"(keyframes only: {stats.keyframes_only}), "
+        f"skipped {stats.skipped_fraction:.0%} of the video"
+    )
+    estimate = stats.speedup
+    print(
+        f"  speedup: {times[False] / times[True]:.2f}x measured, "
+        + (f"{estimate:.2f}x estimated" if estimate is not None else "no estimate")
+    )
+
+    def games(result):
+        return [(g.start_sec, g.end_sec, g.result) for g in result.games]
+
+    print(f"  same games: {games(results[False]) == games(results[True])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+"""Compare the OCR preprocessing variants on the fixture frames.
+
+Usage:
+    uv run python benchmarks/bench_preprocess.py [REPEATS]
+
+Preprocesses every HUD crop the detectors may read (both tiers of
+:data:`~wr_analyzer.ocr_plan.HUD_TIERS`, the scoreboard as its two rows)
+of the labelled fixture frames with each variant in
+:data:`~wr_analyzer.preprocess.VARIANTS`, and with the original
+implementation (a new CLAHE object and split / merge per crop) for
+reference.  Prints the mean preprocessing time per frame and, with the
+``recognize`` engine, the mean time of the whole timer / kills / KDA
+read and how many fields match the ground truth (the table in plan.md).
+
+The accuracy columns need the EasyOCR models (downloaded on first use)
+and are skipped if they can't be loaded.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+import cv2
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "tests"))
+
+from support import HUD_GROUND_TRUTH, load_frame
+
+from wr_analyzer.kda import (
+    PlayerKDA,
+    TeamKills,
+    _KDA_RE,
+    _KILLS_RE,
+    detect_player_kda,
+    detect_team_kills,
+)
+from wr_analyzer.ocr import _get_easyocr_reader
+from wr_analyzer.ocr_plan import _ROWS, HUD_TIERS, OcrPlan
+from wr_analyzer.preprocess import VARIANTS, preprocess
+from wr_analyzer.timer import detect_game_time, parse_game_time
+
+
+def _legacy(image, scale):
+    """The original preprocess_clahe()."""
+    clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(2, 2))
+    b, g, r = cv2.split(image)
+    enhanced = cv2.merge([clahe.apply(b), clahe.apply(g), clahe.apply(r)])
+    if scale > 1:
+        enhanced = cv2.resize(
+            enhanced, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC
+        )
+    return enhanced
+
+
+def _crops() -> list[tuple]:
+    """Return ``(crop, scale)`` of every HUD crop of the labelled frames."""
+    return [
+        (part.crop(load_frame(name)), scale)
+        for name in HUD_GROUND_TRUTH
+        for tier in HUD_TIERS
+        for region, scale in tier
+        for part in _ROWS.get(region, (region,))
+    ]
+
+
+def _preprocess_time(fn, crops: list[tuple], repeats: int) -> float:
+    """Return the best mean seconds per frame over *repeats*."""
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        for crop, scale in crops:
+            fn(crop, scale)
+        best = min(best, time.perf_counter() - t0)
+    return best / len(HUD_GROUND_TRUTH)
+
+
+def _expected(name: str) -> tuple:
+    timer, kills, kda = HUD_GROUND_TRUTH[name]
+    k = _KILLS_RE.search(kills)
+    d = _KDA_RE.search(kda)
+    return (
+        parse_game_time(timer),
+        TeamKills(int(k.group(1)), int(k.group(2))),
+        PlayerKDA(*(int(g) for g in d.groups())),
+    )
+
+
+def _accuracy(variant: str) -> tuple[float, int]:
+    """Return (mean seconds/frame, fields correct) of the full HUD read."""
+    correct = 0
+    t0 = time.perf_counter()
+    for name in HUD_GROUND_TRUTH:
+        frame = load_frame(name)
+        plan = OcrPlan(frame, variant=variant)
+        timer = detect_game_time(frame, plan=plan)
+        got = (
+            parse_game_time(timer) if timer else None,
+            detect_team_kills(frame, plan=plan),
+            detect_player_kda(frame, plan=plan),
+        )
+        correct += sum(a == b for a, b in zip(got, _expected(name)))
+    return (time.perf_counter() - t0) / len(HUD_GROUND_TRUTH), correct
+
+
+def main() -> None:
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    crops = _crops()
+    fields = 3 * len(HUD_GROUND_TRUTH)
+    print(
+        f"{len(HUD_GROUND_TRUTH)} labelled frames, {len(crops)} crops, "
+        f"best of {repeats}"
+    )
+    try:
+        _get_easyocr_reader()
+        ocr = True
+    except Exception as exc:  # no models offline
+        print(f"  (EasyOCR unavailable, skipping accuracy: {exc})")
+        ocr = False
+
+    legacy = _preprocess_time(_legacy, crops, repeats)
+    print(f"  {'original':<16} {1000 * legacy:7.2f} ms/frame preprocessing")
+    for name, variant in VARIANTS.items():
+        seconds = _preprocess_time(
+            lambda crop, scale: preprocess(crop, scale, variant), crops, repeats
+        )
+        line = (
+            f"  {name:<16} {1000 * seconds:7.2f} ms/frame preprocessing"
+            f"  {legacy / seconds:5.2f}x"
+        )
+        if ocr:
+            _accuracy(name)  # warm-up
+            read_sec, correct = _accuracy(name)
+            line += f"  {1000 * read_sec:7.1f} ms/frame read  {correct:2d}/{fields}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
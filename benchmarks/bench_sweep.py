@@ -0,0 +1,355 @@
+#!/usr/bin/env python
+"""Sweep analysis settings; report accuracy against cost and its Pareto front.
+
+Usage:
+    uv run python benchmarks/bench_sweep.py [--intervals SEC ...]
+        [--engines E ...] [--variants V ...] [--upscales N ...]
+        [--fallback on off] [--start SEC] [--end SEC] [--csv FILE]
+        [--video FILE | --fixtures]
+
+Runs every combination of OCR engine, preprocessing variant (see
+:data:`wr_analyzer.preprocess.VARIANTS`), upscale factor (``own`` is
+each crop's own scale, 3-5x) and fallback crops on / off, end to end on
+the sample video: :func:`~wr_analyzer.analyze.analyze_frame` on the
+frames a uniform pass at each sampling interval decodes.  The frames
+are decoded once per interval and every configuration reads the same
+ones; the decode time is shared out among them.
+
+Each row reports:
+
+* ``sec_per_frame`` -- mean decode + analysis time of a sampled frame,
+  and ``sec_per_video_min`` what that costs per minute of video;
+* ``field_accuracy`` -- the share of the labelled fields read right on
+  the ground-truth frames (the table in plan.md: timer, kills and KDA of
+  in_game_02..11, and the result of the two post-game frames), decoded
+  from the video at their timestamps;
+* ``games`` / ``final_kills_ok`` / ``result_ok`` -- whether the uniform
+  pass finds the video's one game, with its final score (38 VS 34) and
+  result (victory).
+
+Rows are sorted by cost; ``*`` marks the Pareto front of
+``sec_per_frame`` against ``field_accuracy``, i.e. the settings no
+other setting beats on both.  ``--csv`` also writes the rows to a file.
+
+The glyph engine reads the raw crops, so the variant and upscale don't
+apply to it, nor the upscale to the ``*_model`` variants; those
+combinations are run once.  Everything runs offline once the EasyOCR
+models are downloaded.  Without them only the glyph engine is swept,
+and the result banners (always read by EasyOCR) read as empty.  With
+``--fixtures`` only the accuracy part runs, on the committed fixture
+frames, timing the analysis of those instead.  The default video is
+tests/fixtures/JjoDryfoCGs.mp4 (Git LFS).
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "tests"))
+
+from support import FRAME_DEFS, HUD_GROUND_TRUTH, load_frame
+
+from wr_analyzer import ocr, ocr_plan
+from wr_analyzer.analyze import (
+    FrameData,
+    _sanitize_kills,
+    _segment_games,
+    analyze_frame,
+)
+from wr_analyzer.kda import _KDA_RE, _KILLS_RE, PlayerKDA, TeamKills
+from wr_analyzer.ocr import OCR_ENGINES, OcrResult
+from wr_analyzer.ocr_plan import OcrPlan, confidence_threshold
+from wr_analyzer.preprocess import VARIANTS, resolve_variant
+from wr_analyzer.timer import parse_game_time
+from wr_analyzer.video import open_video
+from wr_analyzer.video_index import ensure_index
+
+DEFAULT_VIDEO = REPO_ROOT / "tests" / "fixtures" / "JjoDryfoCGs.mp4"
+
+# Video-level ground truth (plan.md): one game, won 38 VS 34.
+FINAL_KILLS = TeamKills(38, 34)
+RESULT = "victory"
+RESULT_FRAMES = ("postgame_victory_banner", "postgame_victory_scoreboard")
+
+
+@dataclass(frozen=True)
+class Config:
+    """One point of the grid; ``None`` is the plan's own setting."""
+
+    engine: str
+    variant: str | None
+    upscale: int | None
+    fallback: bool
+
+    def plan(self, frame) -> OcrPlan:
+        return OcrPlan(
+            frame,
+            engine=self.engine,
+            variant=self.variant,
+            upscale=self.upscale,
+            fallback=self.fallback,
+        )
+
+    def row(self) -> dict:
+        return {
+            "engine": self.engine,
+            "variant": self.variant or "-",
+            "upscale": self.upscale or ("own" if self.engine != "glyph" else "-"),
+            "fallback": "on" if self.fallback else "off",
+        }
+
+
+def grid(
+    engines: list[str],
+    variants: list[str],
+    upscales: list[int | None],
+    fallbacks: list[bool],
+) -> list[Config]:
+    """Return the distinct configurations of the grid, in order."""
+    configs: dict[Config, None] = {}
+    for engine in engines:
+        for variant in variants:
+            for upscale in upscales:
+                for fallback in fallbacks:
+                    if engine == "glyph":
+                        variant_, upscale_ = None, None
+                    else:
+                        variant_, upscale_ = variant, upscale
+                        if resolve_variant(variant).resize == "model":
+                            upscale_ = None
+                    configs[Config(engine, variant_, upscale_, fallback)] = None
+    return list(configs)
+
+
+def _expected(name: str) -> tuple:
+    timer, kills, kda = HUD_GROUND_TRUTH[name]
+    k = _KILLS_RE.search(kills)
+    d = _KDA_RE.search(kda)
+    return (
+        parse_game_time(timer),
+        TeamKills(int(k.group(1)), int(k.group(2))),
+        PlayerKDA(*(int(g) for g in d.groups())),
+    )
+
+
+def field_score(config: Config, frames: dict) -> tuple[int, int, float]:
+    """Return ``(correct, total, seconds)`` of *config* on the labelled *frames*."""
+    correct = total = 0
+    seconds = 0.0
+    for name, frame in frames.items():
+        t0 = time.perf_counter()
+        fd = analyze_frame(frame, 0.0, plan=config.plan(frame))
+        seconds += time.perf_counter() - t0
+        if name in HUD_GROUND_TRUTH:
+            got = (
+                parse_game_time(fd.game_time) if fd.game_time else None,
+                fd.team_kills,
+                fd.player_kda,
+            )
+            correct += sum(g == w for g, w in zip(got, _expected(name)))
+            total += 3
+        else:
+            correct += fd.result == RESULT
+            total += 1
+    return correct, total, seconds
+
+
+def _labelled_frames(source) -> dict:
+    """Return the ground-truth frames, decoded by *source* (or the PNGs)."""
+    names = [*HUD_GROUND_TRUTH, *RESULT_FRAMES]
+    if source is None:
+        return {name: load_frame(name) for name in names}
+    timestamps = dict(FRAME_DEFS)
+    return {name: source.read(timestamps[name]).copy() for name in names}
+
+
+def uniform_pass(
+    source, configs: list[Config], interval: float, start: float, end: float
+) -> dict[Config, tuple[list[FrameData], float]]:
+    """Analyse a uniform pass with every config; return frames and seconds each."""
+    frames: dict[Config, list[FrameData]] = {c: [] for c in configs}
+    seconds = dict.fromkeys(configs, 0.0)
+    decode = 0.0
+    samples = source.frames(interval, start, end)
+    while True:
+        t0 = time.perf_counter()
+        item = next(samples, None)
+        decode += time.perf_counter() - t0
+        if item is None:
+            break
+        ts, frame = item
+        frame = frame.copy()
+        for config in configs:
+            t0 = time.perf_counter()
+            fd = analyze_frame(frame, ts, plan=config.plan(frame))
+            seconds[config] += time.perf_counter() - t0
+            frames[config].append(fd)
+    # Each config would have decoded the frames itself.
+    return {c: (frames[c], seconds[c] + decode) for c in configs}
+
+
+def video_checks(config: Config, frames: list[FrameData], interval: float) -> dict:
+    """Return the video-level outcome of *config*'s uniform pass *frames*."""
+    frames = _sanitize_kills(frames, confidence_threshold(config.engine))
+    games = _segment_games(frames, min_gap_sec=max(30.0, interval * 5))
+    game = games[-1] if games else None
+    return {
+        "games": len(games),
+        "final_kills_ok": game is not None and game.final_team_kills == FINAL_KILLS,
+        "result_ok": game is not None and game.result == RESULT,
+    }
+
+
+def pareto(rows: list[dict]) -> None:
+    """Mark each row on the front of sec_per_frame vs field_accuracy."""
+    for row in rows:
+        row["pareto"] = not any(
+            other["sec_per_frame"] <= row["sec_per_frame"]
+            and other["field_accuracy"] >= row["field_accuracy"]
+            and (
+                other["sec_per_frame"] < row["sec_per_frame"]
+                or other["field_accuracy"] > row["field_accuracy"]
+            )
+            for other in rows
+        )
+
+
+def _offline_readtext() -> None:
+    """Read every ``readtext`` crop as empty, for runs without EasyOCR."""
+    ocr_result = ocr_plan.ocr_result
+
+    def result(image, *, engine="recognize", allowlist=None):
+        if engine == "readtext":
+            return OcrResult("")
+        return ocr_result(image, engine=engine, allowlist=allowlist)
+
+    ocr_plan.ocr_result = result
+
+
+def _print(rows: list[dict]) -> None:
+    columns = [c for c in rows[0] if c != "pareto"]
+    widths = {c: max(len(c), *(len(_fmt(r[c])) for r in rows)) for c in columns}
+    print("   " + "  ".join(c.rjust(widths[c]) for c in columns))
+    for r in rows:
+        mark = " * " if r["pareto"] else "   "
+        print(mark + "  ".join(_fmt(r[c]).rjust(widths[c]) for c in columns))
+
+
+def _fmt(value) -> str:
+    if isinstance(value, float):
+        return f"{value:.3f}"
+    return str(value)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--video", type=Path, default=DEFAULT_VIDEO)
+    parser.add_argument(
+        "--fixtures",
+        action="store_true",
+        help="Only score the committed fixture frames (no video needed)",
+    )
+    parser.add_argument(
+        "--intervals", type=float, nargs="+", default=[15.0, 30.0, 60.0]
+    )
+    parser.add_argument(
+        "--engines", nargs="+", choices=OCR_ENGINES, default=["glyph", "recognize"]
+    )
+    parser.add_argument(
+        "--variants", nargs="+", choices=list(VARIANTS), default=list(VARIANTS)
+    )
+    parser.add_argument(
+        "--upscales",
+        nargs="+",
+        default=["own", "2", "3"],
+        help="Upscale factors; 'own' is each crop's own (default: own 2 3)",
+    )
+    parser.add_argument(
+        "--fallback", nargs="+", choices=["on", "off"], default=["on", "off"]
+    )
+    parser.add_argument("--start", type=float, default=0.0)
+    parser.add_argument("--end", type=float, default=None)
+    parser.add_argument("--csv", type=Path, default=None, help="Also write the rows")
+    args = parser.parse_args()
+
+    engines = args.engines
+    try:
+        ocr._get_easyocr_reader()
+    except Exception as exc:  # no models offline
+        print(f"(EasyOCR unavailable, sweeping the glyph engine only: {exc})")
+        engines = [e for e in engines if e == "glyph"]
+        _offline_readtext()
+    if not engines:
+        sys.exit("Nothing to sweep.")
+    configs = grid(
+        engines,
+        args.variants,
+        [None if u == "own" else int(u) for u in args.upscales],
+        [f == "on" for f in args.fallback],
+    )
+
+    rows = []
+    if args.fixtures:
+        labelled = _labelled_frames(None)
+        print(f"{len(configs)} configurations on {len(labelled)} fixture frames")
+        for config in configs:
+            correct, total, seconds = field_score(config, labelled)
+            rows.append(
+                {
+                    **config.row(),
+                    "sec_per_frame": seconds / len(labelled),
+                    "field_accuracy": correct / total,
+                }
+            )
+    else:
+        if not args.video.exists() or args.video.stat().st_size < 1_000_000:
+            sys.exit(
+                f"Video not found: {args.video}\nRun `git lfs pull` first, "
+                "or use --fixtures."
+            )
+        index = ensure_index(args.video)
+        with open_video(args.video, "opencv", index=index) as source:
+            labelled = _labelled_frames(source)
+            end = args.end if args.end is not None else source.info.duration
+        scores = {c: field_score(c, labelled) for c in configs}
+        print(
+            f"{len(configs)} configurations x {len(args.intervals)} intervals "
+            f"over {end - args.start:.0f}s of {args.video.name}"
+        )
+        for interval in args.intervals:
+            with open_video(args.video, "opencv", index=index) as source:
+                passes = uniform_pass(source, configs, interval, args.start, end)
+            for config, (frames, seconds) in passes.items():
+                correct, total, _ = scores[config]
+                per_frame = seconds / max(1, len(frames))
+                rows.append(
+                    {
+                        "interval": interval,
+                        **config.row(),
+                        "frames": len(frames),
+                        "sec_per_frame": per_frame,
+                        "sec_per_video_min": per_frame * 60 / interval,
+                        "field_accuracy": correct / total,
+                        **video_checks(config, frames, interval),
+                    }
+                )
+
+    pareto(rows)
+    rows.sort(key=lambda r: (r["sec_per_frame"], -r["field_accuracy"]))
+    _print(rows)
+    if args.csv is not None:
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"Rows written to {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+"""Compare per-frame decode cost across the decoder backends.
+
+Usage:
+    uv run python benchmarks/bench_video.py [VIDEO] [INTERVAL]
+
+Reads the same sample timestamps both ways and prints the mean and total
+time per frame.  ``extract_frame`` reopens the container for every
+sample (the old ``analyze_video`` behaviour); ``VideoSource`` keeps a
+single handle open and grab-skips short gaps; with a keyframe index it
+decodes forward from the right keyframe.  ``FfmpegSource`` streams
+the sampled frames through one ffmpeg pipe, either full-frame or
+cropped to the top-right HUD strip at decode time (skipped when ffmpeg
+is not installed).
+
+The default video is tests/fixtures/JjoDryfoCGs.mp4 (Git LFS).
+"""
+
+from __future__ import annotations
+
+import shutil
+import sys
+import time
+from pathlib import Path
+
+from wr_analyzer.regions import SCOREBOARD
+from wr_analyzer.video import DecodeFilter, FfmpegSource, VideoSource, extract_frame
+from wr_analyzer.video_index import build_index
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_VIDEO = REPO_ROOT / "tests" / "fixtures" / "JjoDryfoCGs.mp4"
+
+
+def _report(label: str, elapsed: list[float]) -> None:
+    total = sum(elapsed)
+    mean_ms = 1000 * total / len(elapsed)
+    print(f"  {label:<18} {mean_ms:8.1f} ms/frame  ({total:.2f}s total)")
+
+
+def _stream(source: FfmpegSource, interval: float, end: float) -> list[float]:
+    elapsed = []
+    t0 = time.monotonic()
+    for _ in source.frames(interval, 0.0, end):
+        elapsed.append(time.monotonic() - t0)
+        t0 = time.monotonic()
+    return elapsed
+
+
+def main() -> None:
+    video = Path(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_VIDEO
+    interval = float(sys.argv[2]) if len(sys.argv) > 2 else 15.0
+    if not video.exists() or video.stat().st_size < 1_000_000:
+        sys.exit(f"Video not found: {video}\nRun `git lfs pull` first.")
+
+    with VideoSource(video) as source:
+        duration = source.info.duration
+    timestamps = [i * interval for i in range(int(duration / interval))]
+    print(f"{video.name}: {len(timestamps)} frames every {interval}s")
+
+    elapsed = []
+    for ts in timestamps:
+        t0 = time.monotonic()
+        extract_frame(video, ts)
+        elapsed.append(time.monotonic() - t0)
+    _report("extract_frame", elapsed)
+
+    elapsed = []
+    with VideoSource(video) as source:
+        for ts in timestamps:
+            t0 = time.monotonic()
+            source.read(ts)
+            elapsed.append(time.monotonic() - t0)
+    _report("VideoSource", elapsed)
+
+    t0 = time.monotonic()
+    index = build_index(video)
+    print(f"  (index built in {time.monotonic() - t0:.2f}s)")
+    elapsed = []
+    with VideoSource(video, index=index) as source:
+        for ts in timestamps:
+            t0 = time.monotonic()
+            source.read(ts)
+            elapsed.append(time.monotonic() - t0)
+    _report("VideoSource+index", elapsed)
+
+    if shutil.which("ffmpeg") is None:
+        print("  (ffmpeg not installed; skipping FfmpegSource)")
+        return
+
+    end = timestamps[-1] + interval / 2
+    with FfmpegSource(video) as source:
+        _report("FfmpegSource", _stream(source, interval, end))
+    hud = DecodeFilter(crop=SCOREBOARD)
+    with FfmpegSource(video, decode_filter=hud) as source:
+        _report("FfmpegSource+crop", _stream(source, interval, end))
+
+
+if __name__ == "__main__":
+    main()
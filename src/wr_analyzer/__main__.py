@@ -2,6 +2,8 @@
 
 The *video* argument may be a local file path **or** a YouTube URL / video ID.
 When a URL is given the video is downloaded (and cached) before analysis.
+With ``--live`` it is a recording that is still growing, or ``-`` for a
+stream on stdin, and frames and game events are printed as JSON Lines.
 """
 
 from __future__ import annotations
@@ -13,6 +15,11 @@ from pathlib import Path
 
 from wr_analyzer.analyze import analyze_video
 from wr_analyzer.download import download_video, extract_video_id
+from wr_analyzer.journal import journal_path
+from wr_analyzer.live import analyze_live, event_record, open_live
+from wr_analyzer.ocr import OCR_ENGINES
+from wr_analyzer.profiling import Profile
+from wr_analyzer.video import DECODERS
 
 
 def main(argv: list[str] | None = None) -> None:
@@ -22,7 +29,8 @@ def main(argv: list[str] | None = None) -> None:
     )
     parser.add_argument(
         "video",
-        help="Path to a local video file, YouTube URL, or YouTube video ID",
+        help="Path to a local video file, YouTube URL, or YouTube video ID "
+        "(with --live: a growing recording, or - for stdin)",
     )
     parser.add_argument(
         "--interval",
@@ -59,9 +67,184 @@ def main(argv: list[str] | None = None) -> None:
         default=720,
         help="Download resolution in pixels (default: 720)",
     )
+    parser.add_argument(
+        "--decoder",
+        choices=DECODERS,
+        default="opencv",
+        help="Video decoder backend (default: opencv)",
+    )
+    parser.add_argument(
+        "--decode-width",
+        type=int,
+        default=None,
+        metavar="W",
+        help="Scale frames down to W pixels wide inside the decoder, "
+        "keeping the aspect ratio (requires --decoder ffmpeg)",
+    )
+    parser.add_argument(
+        "--ocr-engine",
+        choices=OCR_ENGINES,
+        default="recognize",
+        help="OCR engine for HUD fields: recognition only, full "
+        "detection + recognition, or HUD-font template matching "
+        "(default: recognize)",
+    )
+    parser.add_argument(
+        "--ocr-batch",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Recognise the HUD crops of N sampled frames in one batch (default: 1)",
+    )
+    parser.add_argument(
+        "--ocr-max-wait",
+        type=float,
+        default=2.0,
+        metavar="SEC",
+        help="Run a partial OCR batch after its oldest frame waited SEC "
+        "seconds (default: 2)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Analyse N contiguous time ranges in parallel worker processes, "
+        "each with its own decoder and OCR model (default: 1)",
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Decode and preprocess frames on background threads, overlapping with OCR",
+    )
+    parser.add_argument(
+        "--refine",
+        type=float,
+        default=None,
+        metavar="SEC",
+        help="Adaptive sampling: after the --interval pass, bisect around game "
+        "boundaries until each is pinned down to SEC seconds",
+    )
+    parser.add_argument(
+        "--prepass",
+        action="store_true",
+        help="Scan keyframe thumbnails first and analyse only the spans that "
+        "look like games, with their result screens",
+    )
+    parser.add_argument(
+        "--clock-verify",
+        type=float,
+        default=None,
+        metavar="SEC",
+        help="Predict the game clock from earlier timer readings and OCR the "
+        "timer only to verify it, at least every SEC seconds of video",
+    )
+    parser.add_argument(
+        "--hud-reuse",
+        type=float,
+        default=None,
+        metavar="SEC",
+        help="Carry the kills / KDA forward without OCR while their HUD crops "
+        "look unchanged, re-reading them at least every SEC seconds of video",
+    )
+    parser.add_argument(
+        "--results-cache",
+        default=None,
+        metavar="FILE",
+        help="Cache per-frame detector results across runs in this SQLite file, "
+        "so re-runs skip the OCR (default: no cache)",
+    )
+    parser.add_argument(
+        "--results-cache-mb",
+        type=float,
+        default=256,
+        metavar="MB",
+        help="Size cap of the results cache; least recently used entries "
+        "beyond it are evicted (default: 256)",
+    )
+    parser.add_argument(
+        "--journal",
+        default=None,
+        metavar="FILE",
+        help="Append each analysed frame to FILE as the run goes, so it can "
+        "be resumed (default with --resume: <video>.journal.jsonl next to the video)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted run from its journal instead of starting over",
+    )
+    parser.add_argument(
+        "--live",
+        action="store_true",
+        help="Follow a recording that is still being written, or a stream on "
+        "stdin, sampling every --interval seconds of wall-clock time and "
+        "printing frames and game events as JSON Lines",
+    )
+    parser.add_argument(
+        "--live-format",
+        default=None,
+        metavar="FMT",
+        help="ffmpeg input format of the live stream, e.g. mpegts or h264 "
+        "(default: probed)",
+    )
+    parser.add_argument(
+        "--live-timeout",
+        type=float,
+        default=30.0,
+        metavar="SEC",
+        help="Stop following a growing recording once it hasn't grown for "
+        "SEC seconds (default: 30)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Time each analysis stage and report its count, total and "
+        "p50/p95/p99 latency, with the OCR reads per HUD region",
+    )
+    parser.add_argument(
+        "--trace",
+        default=None,
+        metavar="FILE",
+        help="Write a Chrome trace-event file of every timed stage to FILE "
+        "(open in chrome://tracing or ui.perfetto.dev)",
+    )
 
     args = parser.parse_args(argv)
 
+    if args.decode_width is not None and args.decoder != "ffmpeg":
+        parser.error("--decode-width requires --decoder ffmpeg")
+    if args.refine is not None and args.decoder == "ffmpeg":
+        parser.error("--refine requires --decoder opencv")
+
+    if args.live:
+        unsupported = [
+            flag
+            for flag, used in (
+                ("--decoder", args.decoder != "opencv"),
+                ("--ocr-batch", args.ocr_batch > 1),
+                (
+                    "--ocr-max-wait",
+                    args.ocr_max_wait != parser.get_default("ocr_max_wait"),
+                ),
+                ("--workers", args.workers > 1),
+                ("--pipeline", args.pipeline),
+                ("--refine", args.refine is not None),
+                ("--prepass", args.prepass),
+                ("--decode-width", args.decode_width is not None),
+                ("--results-cache", args.results_cache is not None),
+                ("--journal", args.journal is not None),
+                ("--resume", args.resume),
+                ("--profile", args.profile),
+                ("--trace", args.trace is not None),
+            )
+            if used
+        ]
+        if unsupported:
+            parser.error(f"{', '.join(unsupported)} can't be used with --live")
+        _run_live(args)
+        return
+
     # Resolve video source: local path or YouTube download.
     video_path = Path(args.video)
     if not video_path.exists():
@@ -75,6 +258,10 @@ def main(argv: list[str] | None = None) -> None:
             on_progress=lambda msg: print(msg, file=sys.stderr),
         )
 
+    journal = args.journal
+    if journal is None and args.resume:
+        journal = journal_path(video_path)
+
     print(
         f"Analysing {video_path} (sampling every {args.interval}s) ...", file=sys.stderr
     )
@@ -93,17 +280,60 @@ def main(argv: list[str] | None = None) -> None:
         start_sec=args.start,
         end_sec=args.end,
         on_progress=_progress,
+        decoder=args.decoder,
+        decode_width=args.decode_width,
+        ocr_engine=args.ocr_engine,
+        ocr_batch_frames=args.ocr_batch,
+        ocr_max_wait_sec=args.ocr_max_wait,
+        workers=args.workers,
+        pipeline=args.pipeline,
+        refine_sec=args.refine,
+        clock_verify_sec=args.clock_verify,
+        hud_reuse_sec=args.hud_reuse,
+        results_cache=args.results_cache,
+        results_cache_max_bytes=int(args.results_cache_mb * 1024 * 1024),
+        journal=journal,
+        resume=args.resume,
+        prepass=args.prepass,
+        profile=args.profile,
+        trace=args.trace is not None,
     )
     print(file=sys.stderr)  # newline after progress
+    if args.trace is not None:
+        result.profile.write_trace(args.trace)
+        print(f"Trace written to {args.trace}", file=sys.stderr)
 
     if args.output_json:
-        print(json.dumps(result.summary(), indent=2))
+        summary = result.summary()
+        if args.profile:
+            summary["profile"] = result.profile.summary()
+        print(json.dumps(summary, indent=2))
         return
 
     # --- human-readable report ---
     info_line = f"Video:    {result.source}  ({result.duration_sec / 60:.1f} min)"
     print(info_line)
     print(f"Sampled:  {len(result.frame_data)} frames")
+    sampling = result.sampling
+    if sampling is not None:
+        print(
+            f"Refined:  {sampling.sparse} sparse + {sampling.refined} refined "
+            f"in {sampling.rounds} rounds (uniform every {args.refine}s: "
+            f"{sampling.uniform} frames)"
+        )
+    prepass = result.prepass
+    if prepass is not None:
+        speedup = prepass.speedup
+        print(
+            f"Pre-pass: {prepass.thumbnails} thumbnails in {prepass.seconds:.1f}s, "
+            f"skipped {prepass.skipped_fraction:.0%} of the video "
+            f"({prepass.frames} of {prepass.uniform} frames"
+            + (f", ~{speedup:.1f}x faster)" if speedup is not None else ")")
+        )
+    ocr = result.ocr_stats
+    print(f"OCR:      {ocr.calls} calls for {ocr.requests} reads ({ocr.saved} saved)")
+    if args.profile:
+        _print_profile(result.profile)
 
     # Phase breakdown
     from collections import Counter
@@ -123,25 +353,38 @@ def main(argv: list[str] | None = None) -> None:
     )
 
     # Timer readings
-    timer_readings = [(f.timestamp_sec, f.game_time) for f in in_game if f.game_time]
+    timer_readings = [f for f in in_game if f.game_time]
     if timer_readings:
         print(f"\nGame clock ({len(timer_readings)} readings):")
-        for ts, gt in timer_readings:
-            print(f"  video {ts:>7.0f}s  →  {gt}")
+        for f in timer_readings:
+            note = (
+                f"  ({f.clock_status})" if f.clock_status not in (None, "read") else ""
+            )
+            print(f"  video {f.timestamp_sec:>7.0f}s  →  {f.game_time}{note}")
 
     # Kill scores
-    kill_readings = [(f.timestamp_sec, f.team_kills) for f in in_game if f.team_kills]
+    kill_readings = [f for f in in_game if f.team_kills]
     if kill_readings:
         print(f"\nTeam kills ({len(kill_readings)} readings):")
-        for ts, tk in kill_readings:
-            print(f"  video {ts:>7.0f}s  →  Blue {tk.blue:>2d}  vs  Red {tk.red:>2d}")
+        for f in kill_readings:
+            tk = f.team_kills
+            note = "  (carried)" if "team_kills" in f.carried else ""
+            print(
+                f"  video {f.timestamp_sec:>7.0f}s  →  "
+                f"Blue {tk.blue:>2d}  vs  Red {tk.red:>2d}{note}"
+            )
 
     # KDA
-    kda_readings = [(f.timestamp_sec, f.player_kda) for f in in_game if f.player_kda]
+    kda_readings = [f for f in in_game if f.player_kda]
     if kda_readings:
         print(f"\nPlayer KDA ({len(kda_readings)} readings):")
-        for ts, kda in kda_readings:
-            print(f"  video {ts:>7.0f}s  →  {kda.kills}/{kda.deaths}/{kda.assists}")
+        for f in kda_readings:
+            kda = f.player_kda
+            note = "  (carried)" if "player_kda" in f.carried else ""
+            print(
+                f"  video {f.timestamp_sec:>7.0f}s  →  "
+                f"{kda.kills}/{kda.deaths}/{kda.assists}{note}"
+            )
 
     # Game segments
     if result.games:
@@ -166,5 +409,55 @@ def main(argv: list[str] | None = None) -> None:
         print("\nNo game segments detected (frames too sparse or short).")
 
 
+def _print_profile(profile: Profile) -> None:
+    """Print the stage latency table and OCR reads per region."""
+    print(
+        f"\n  {'Stage':<12s} {'count':>5s} {'total s':>10s} "
+        f"{'p50 ms':>8s} {'p95 ms':>8s} {'p99 ms':>8s}"
+    )
+    for stage, s in profile.stages().items():
+        print(
+            f"  {stage:<12s} {s.count:>5d} {s.total_sec:>10.2f} "
+            f"{s.p50_ms:>8.1f} {s.p95_ms:>8.1f} {s.p99_ms:>8.1f}"
+        )
+    if profile.ocr_calls:
+        reads = ", ".join(f"{r}: {n}" for r, n in profile.ocr_calls.most_common())
+        print(f"OCR reads:  {reads}")
+    print()
+
+
+def _run_live(args: argparse.Namespace) -> None:
+    """Analyse a live input, printing one JSON object per line."""
+    print(
+        f"Following {args.video} (sampling every {args.interval}s) ...",
+        file=sys.stderr,
+    )
+    with open_live(
+        args.video,
+        input_format=args.live_format,
+        idle_timeout_sec=args.live_timeout,
+    ) as source:
+        stream = analyze_live(
+            source,
+            args.interval,
+            start_sec=args.start,
+            end_sec=args.end,
+            ocr_engine=args.ocr_engine,
+            clock_verify_sec=args.clock_verify,
+            hud_reuse_sec=args.hud_reuse,
+        )
+        for item, latency in stream:
+            print(json.dumps(event_record(item, latency)), flush=True)
+    summary = {
+        "event": "end",
+        "frames": stream.frames,
+        "dropped": stream.dropped,
+        "latency_mean_sec": round(stream.latency_mean_sec, 3),
+        "latency_max_sec": round(stream.latency_max_sec, 3),
+        "ocr_calls": stream.ocr_stats.calls,
+    }
+    print(json.dumps(summary), flush=True)
+
+
 if __name__ == "__main__":
     main()
@@ -6,26 +6,82 @@ timer / kill-score / KDA data for each detected game.
 
 from __future__ import annotations
 
+import multiprocessing
+import os
+import queue
 import time
-from collections.abc import Callable
-from dataclasses import dataclass, field
+from collections import deque
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field, replace
 from datetime import datetime
 from pathlib import Path
 
 import numpy as np
 
-from wr_analyzer.game_state import detect_game_phase
+from wr_analyzer.clock import GameClock
+from wr_analyzer.frame_cache import (
+    DEFAULT_MAX_BYTES,
+    CachedFrame,
+    FrameCache,
+    video_fingerprint,
+)
+from wr_analyzer.game_state import classify_game_phase, classify_pixels
+from wr_analyzer.hud_memo import HudMemo
+from wr_analyzer.journal import Journal
 from wr_analyzer.ocr import _get_easyocr_reader
+from wr_analyzer.ocr_plan import (
+    HUD_TIERS,
+    KDA_CROPS,
+    KILLS_CROPS,
+    TIMER_CROPS,
+    OcrPlan,
+    OcrStats,
+    confidence_threshold,
+)
+from wr_analyzer.ocr_scheduler import OcrScheduler
+from wr_analyzer.pipeline import pipelined
+from wr_analyzer.prepass import PrepassStats, find_spans
+from wr_analyzer.profiling import Profile, span, timed
 from wr_analyzer.kda import (
-    MAX_TEAM_KILLS,
     PlayerKDA,
     TeamKills,
-    detect_player_kda,
-    detect_team_kills,
+    read_player_kda,
+    read_team_kills,
+)
+from wr_analyzer.regions import KILLS, PLAYER_KDA, Region
+from wr_analyzer.result import read_result
+from wr_analyzer.sampling import (
+    SamplingStats,
+    refinement_times,
+    sample_times,
+    uniform_frame_count,
 )
-from wr_analyzer.result import detect_result
-from wr_analyzer.timer import detect_game_time
-from wr_analyzer.video import extract_frame, probe
+from wr_analyzer.segmentation import (
+    GameEnded,
+    GameEvent,
+    GameSegment,
+    GameSegmenter,
+    KillFilter,
+)
+from wr_analyzer.timer import format_game_time, parse_game_time, read_game_time
+from wr_analyzer.video import DecodeFilter, FfmpegSource, open_video
+from wr_analyzer.video_index import ensure_index
+
+# Timer crops a predicting clock leaves out of the batch; the scoreboard
+# fallback is shared with the kills and KDA and stays.
+_CLOCK_CROPS = TIMER_CROPS[:-1]
+
+# Primary crop of each region a HudMemo may carry forward.
+_MEMO_CROPS = {KILLS: KILLS_CROPS[0], PLAYER_KDA: KDA_CROPS[0]}
+
+# Crops an in-game frame leaves out of the batch when the results cache
+# already holds the field.
+_CACHED_CROPS = {
+    "game_time": _CLOCK_CROPS,
+    "team_kills": KILLS_CROPS[:1],
+    "player_kda": KDA_CROPS[:1],
+}
 
 
 @dataclass
@@ -38,52 +94,26 @@ class FrameData:
     team_kills: TeamKills | None = None
     player_kda: PlayerKDA | None = None
     result: str | None = None  # "victory" or "defeat" for post_game frames
-
-
-@dataclass
-class GameSegment:
-    """A contiguous stretch of in-game frames plus trailing post-game data."""
-
-    start_sec: float
-    end_sec: float
-    frames: list[FrameData] = field(default_factory=list)
-    post_game_frames: list[FrameData] = field(default_factory=list)
-
-    @property
-    def result(self) -> str | None:
-        """Return ``"victory"`` or ``"defeat"`` from the first post-game frame."""
-        for f in self.post_game_frames:
-            if f.result is not None:
-                return f.result
-        return None
-
-    @property
-    def first_game_time(self) -> str | None:
-        for f in self.frames:
-            if f.game_time is not None:
-                return f.game_time
-        return None
-
-    @property
-    def last_game_time(self) -> str | None:
-        for f in reversed(self.frames):
-            if f.game_time is not None:
-                return f.game_time
-        return None
-
-    @property
-    def final_team_kills(self) -> TeamKills | None:
-        for f in reversed(self.frames):
-            if f.team_kills is not None:
-                return f.team_kills
-        return None
-
-    @property
-    def final_player_kda(self) -> PlayerKDA | None:
-        for f in reversed(self.frames):
-            if f.player_kda is not None:
-                return f.player_kda
-        return None
+    # Presentation timestamp of the frame actually decoded for
+    # timestamp_sec (the requested time); None if the decoder can't tell.
+    pts_sec: float | None = None
+    # How sure the phase classifier was (0-1) and which cascade stage
+    # decided (see wr_analyzer.game_state.PHASE_STAGES).
+    phase_confidence: float | None = None
+    phase_stage: str | None = None
+    # With a clock model: whether game_time was OCR'd ("read"), predicted
+    # ("predicted"), or OCR'd but disagrees with the model ("conflict").
+    clock_status: str | None = None
+    # HUD fields ("team_kills", "player_kda") carried forward from an
+    # earlier frame whose crop looked the same, rather than OCR'd.
+    carried: tuple[str, ...] = ()
+    # OCR confidence (0-1) of each field's reading (see
+    # wr_analyzer.ocr.OcrResult); None if the field is missing or
+    # predicted.  A carried field keeps the confidence it was read with.
+    game_time_confidence: float | None = None
+    team_kills_confidence: float | None = None
+    player_kda_confidence: float | None = None
+    result_confidence: float | None = None
 
 
 @dataclass
@@ -95,31 +125,18 @@ class AnalysisResult:
     duration_sec: float
     games: list[GameSegment] = field(default_factory=list)
     frame_data: list[FrameData] = field(default_factory=list)
+    # OCR requests vs. engine calls over the whole run.
+    ocr_stats: OcrStats = field(default_factory=OcrStats)
+    # Sparse vs. refined frame counts; None for a uniform run.
+    sampling: SamplingStats | None = None
+    # Thumbnail pre-pass cost and savings; None without one.
+    prepass: PrepassStats | None = None
+    # Per-stage timings; None unless profiled.
+    profile: Profile | None = None
 
     def summary(self) -> dict:
         """Return a human-readable summary dict."""
-        games_out = []
-        for i, g in enumerate(self.games, 1):
-            entry: dict = {
-                "game": i,
-                "video_start_sec": g.start_sec,
-                "video_end_sec": g.end_sec,
-                "result": g.result,
-                "first_game_time": g.first_game_time,
-                "last_game_time": g.last_game_time,
-            }
-            tk = g.final_team_kills
-            if tk:
-                entry["final_kills"] = {"blue": tk.blue, "red": tk.red}
-            kda = g.final_player_kda
-            if kda:
-                entry["final_kda"] = {
-                    "kills": kda.kills,
-                    "deaths": kda.deaths,
-                    "assists": kda.assists,
-                }
-            games_out.append(entry)
-
+        games_out = [{"game": i, **g.summary()} for i, g in enumerate(self.games, 1)]
         return {
             "source": self.source,
             "analysis_date": self.analysis_date.isoformat(),
@@ -129,51 +146,59 @@ class AnalysisResult:
         }
 
 
-def _sanitize_kills(frames: list[FrameData]) -> list[FrameData]:
+class AnalysisStream:
+    """Frames and game events of an analysis, as they are produced.
+
+    Iterating yields each :class:`FrameData` in timestamp order (kill
+    readings filtered by :class:`~wr_analyzer.segmentation.KillFilter`),
+    each followed by the :class:`~wr_analyzer.segmentation.GameStarted`,
+    :class:`~wr_analyzer.segmentation.GameEnded` and
+    :class:`~wr_analyzer.segmentation.GameResult` events it settles.
+    Returned by :func:`analyze_video_iter`; can be iterated once.
+
+    Attributes
+    ----------
+    source : str
+        The video path.
+    duration_sec : float | None
+        Video duration, known once iteration has started.
+    ocr_stats : OcrStats
+        OCR requests vs. engine calls so far (complete once exhausted).
+    sampling : SamplingStats | None
+        Sparse vs. refined frame counts of a ``refine_sec`` run, set
+        once refinement is done; ``None`` for a uniform run.
+    prepass : PrepassStats | None
+        Cost and savings of the thumbnail pre-pass of a ``prepass`` run,
+        set once it is done and complete once the stream is exhausted;
+        ``None`` without one.
+    profile : Profile | None
+        Per-stage timings of a ``profile`` or ``trace`` run (complete
+        once exhausted); ``None`` otherwise.
+    """
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self.duration_sec: float | None = None
+        self.ocr_stats = OcrStats()
+        self.sampling: SamplingStats | None = None
+        self.prepass: PrepassStats | None = None
+        self.profile: Profile | None = None
+        self._items: Iterator[FrameData | GameEvent] = iter(())
+
+    def __iter__(self) -> Iterator[FrameData | GameEvent]:
+        return self._items
+
+
+def _sanitize_kills(
+    frames: list[FrameData], confidence_threshold: float = 0.0
+) -> list[FrameData]:
     """Filter out team-kill readings that violate monotonicity.
 
-    Kill totals can only increase during a game.  Readings where either
-    team's count decreases compared to the previous valid reading are
-    OCR errors and are replaced with ``None`` (frame is kept, kill data
-    is cleared).
+    Batch form of :class:`~wr_analyzer.segmentation.KillFilter`: frames
+    are kept, implausible kill readings are replaced with ``None``.
     """
-    last_blue = -1
-    last_red = -1
-    out: list[FrameData] = []
-    for f in frames:
-        if f.team_kills is None:
-            out.append(f)
-            continue
-        b, r = f.team_kills.blue, f.team_kills.red
-        if b > MAX_TEAM_KILLS or r > MAX_TEAM_KILLS:
-            # Implausible value — clear kill data
-            out.append(
-                FrameData(
-                    timestamp_sec=f.timestamp_sec,
-                    phase=f.phase,
-                    game_time=f.game_time,
-                    team_kills=None,
-                    player_kda=f.player_kda,
-                    result=f.result,
-                )
-            )
-            continue
-        if b >= last_blue and r >= last_red:
-            last_blue, last_red = b, r
-            out.append(f)
-        else:
-            # Drop the kill reading but keep the frame
-            out.append(
-                FrameData(
-                    timestamp_sec=f.timestamp_sec,
-                    phase=f.phase,
-                    game_time=f.game_time,
-                    team_kills=None,
-                    player_kda=f.player_kda,
-                    result=f.result,
-                )
-            )
-    return out
+    keep = KillFilter(confidence_threshold)
+    return [keep(f) for f in frames]
 
 
 def _segment_games(
@@ -183,63 +208,120 @@ def _segment_games(
 ) -> list[GameSegment]:
     """Group consecutive in-game frames into game segments.
 
-    A new segment starts when the gap between consecutive in-game frames
-    exceeds *min_gap_sec*.  Segments shorter than *min_duration_sec* are
-    discarded (likely false positives).
-
-    Post-game frames that immediately follow a segment (within
-    *min_gap_sec*) are attached to it so that win/loss results
-    can be extracted.
+    Batch form of :class:`~wr_analyzer.segmentation.GameSegmenter`: a
+    new segment starts when the gap between consecutive in-game frames
+    exceeds *min_gap_sec*, segments shorter than *min_duration_sec* are
+    discarded, and post-game frames within *min_gap_sec* after a
+    segment are attached to it.
     """
-    in_game = [f for f in frames if f.phase == "in_game"]
-    if not in_game:
-        return []
+    segmenter = GameSegmenter(min_gap_sec, min_duration_sec)
+    events = [e for f in frames for e in segmenter.push(f)] + segmenter.finish()
+    return [e.segment for e in events if isinstance(e, GameEnded)]
 
-    segments: list[GameSegment] = []
-    current = GameSegment(
-        start_sec=in_game[0].timestamp_sec, end_sec=in_game[0].timestamp_sec
-    )
-    current.frames.append(in_game[0])
-
-    for f in in_game[1:]:
-        if f.timestamp_sec - current.end_sec > min_gap_sec:
-            segments.append(current)
-            current = GameSegment(start_sec=f.timestamp_sec, end_sec=f.timestamp_sec)
-        current.end_sec = f.timestamp_sec
-        current.frames.append(f)
-
-    segments.append(current)
-
-    kept = [s for s in segments if (s.end_sec - s.start_sec) >= min_duration_sec]
-
-    # Attach post-game frames that follow each segment.
-    post_game = [f for f in frames if f.phase == "post_game"]
-    for seg in kept:
-        for f in post_game:
-            if (
-                f.timestamp_sec > seg.end_sec
-                and f.timestamp_sec <= seg.end_sec + min_gap_sec
-            ):
-                seg.post_game_frames.append(f)
 
-    return kept
+def analyze_frame(
+    frame: np.ndarray,
+    timestamp_sec: float,
+    pts_sec: float | None = None,
+    *,
+    ocr_engine: str = "recognize",
+    plan: OcrPlan | None = None,
+    clock: GameClock | None = None,
+    memo: HudMemo | None = None,
+    cached: CachedFrame | None = None,
+) -> FrameData:
+    """Analyse a single frame and return extracted data.
+
+    *pts_sec* is the decoded frame's true presentation timestamp, if
+    known; it is recorded on the result unchanged.  *ocr_engine* selects
+    the OCR engine for the HUD fields (see
+    :data:`wr_analyzer.ocr.OCR_ENGINES`).
+
+    All detectors share one :class:`~wr_analyzer.ocr_plan.OcrPlan`, the
+    frame's analysis context, so no crop is OCR'd twice and the timer,
+    kills and KDA crops are recognised in a single batch (plus one more
+    for the fallback crops, if any field needs them).
+    Pass *plan* to supply one that is already (partly) read, e.g. by
+    :class:`~wr_analyzer.ocr_scheduler.OcrScheduler`; *ocr_engine* is
+    then taken from the plan.
+
+    With a *clock* model (see :mod:`wr_analyzer.clock`) the timer is
+    only OCR'd when the model asks for a reading, and predicted
+    otherwise.  With a *memo* (see :mod:`wr_analyzer.hud_memo`) the
+    kills and KDA are carried forward while their crops look unchanged.
+    Either way, frames are then expected in timestamp order.
+
+    With *cached*, this frame's entry in a results cache (see
+    :mod:`wr_analyzer.frame_cache`), detectors whose result is cached
+    are not run, and the results of those that are run are stored.
+    """
+    if plan is None:
+        plan = OcrPlan(frame, engine=ocr_engine)
+
+    def detect(name: str, detector: Callable):
+        def compute():
+            return detector(frame, plan=plan)
 
+        return compute() if cached is None else cached.get_or_compute(name, compute)
 
-def analyze_frame(frame: np.ndarray, timestamp_sec: float) -> FrameData:
-    """Analyse a single frame and return extracted data."""
-    phase = detect_game_phase(frame)
+    with span(plan.profile, "phase"):
+        decision = detect("phase", classify_game_phase)
+    phase = decision.phase
 
     game_time = None
     team_kills = None
     player_kda = None
     result = None
+    # OCR confidences of the above.
+    game_time_conf = None
+    kills_conf = None
+    kda_conf = None
+    result_conf = None
+    clock_status = None
+    carried: tuple[str, ...] = ()
 
     if phase == "in_game":
-        game_time = detect_game_time(frame)
-        team_kills = detect_team_kills(frame)
-        player_kda = detect_player_kda(frame)
+        if clock is None:
+            game_time, game_time_conf = detect("game_time", read_game_time)
+        else:
+            game_time, game_time_conf, clock_status = _clock_game_time(
+                timestamp_sec,
+                clock,
+                lambda: detect("game_time", read_game_time),
+                # The cascade's timer check already OCR'd it, or the
+                # cache holds the reading.
+                free=decision.stage == "timer_ocr"
+                or (cached is not None and cached.has("game_time")),
+            )
+        team_kills, kills_conf, kills_carried = _carry_or_read(
+            memo,
+            KILLS,
+            plan,
+            timestamp_sec,
+            lambda: detect("team_kills", read_team_kills),
+        )
+        player_kda, kda_conf, kda_carried = _carry_or_read(
+            memo,
+            PLAYER_KDA,
+            plan,
+            timestamp_sec,
+            lambda: detect("player_kda", read_player_kda),
+        )
+        carried = tuple(
+            name
+            for name, hit in (
+                ("team_kills", kills_carried),
+                ("player_kda", kda_carried),
+            )
+            if hit
+        )
     elif phase == "post_game":
-        result = detect_result(frame)
+        result, result_conf = detect("result", read_result)
+    if phase != "in_game":
+        if clock is not None:
+            clock.interrupt()
+        if memo is not None:
+            memo.interrupt()
 
     return FrameData(
         timestamp_sec=timestamp_sec,
@@ -248,20 +330,623 @@ def analyze_frame(frame: np.ndarray, timestamp_sec: float) -> FrameData:
         team_kills=team_kills,
         player_kda=player_kda,
         result=result,
+        pts_sec=pts_sec,
+        phase_confidence=decision.confidence,
+        phase_stage=decision.stage,
+        clock_status=clock_status,
+        carried=carried,
+        game_time_confidence=game_time_conf,
+        team_kills_confidence=kills_conf,
+        player_kda_confidence=kda_conf,
+        result_confidence=result_conf,
     )
 
 
-def analyze_video(
+def _carry_or_read(
+    memo: HudMemo | None,
+    region: Region,
+    plan: OcrPlan,
+    video_sec: float,
+    read: Callable[[], tuple[object, float | None]],
+) -> tuple:
+    """Return *region*'s reading, its confidence and whether it was carried.
+
+    Without a reading carried forward by *memo*, calls *read* and stores
+    a successful ``(value, confidence)`` result in *memo*.
+    """
+    if memo is not None:
+        reading = memo.carry(region, plan, video_sec)
+        if reading is not None:
+            return *reading, True
+    value, confidence = read()
+    if memo is not None and value is not None:
+        memo.store(region, plan, video_sec, (value, confidence))
+    return value, confidence, False
+
+
+def _clock_game_time(
+    video_sec: float,
+    clock: GameClock,
+    read: Callable[[], tuple[str | None, float | None]],
+    *,
+    free: bool,
+) -> tuple[str | None, float | None, str | None]:
+    """Read or predict an in-game frame's clock.
+
+    The timer is *read* if *clock* asks for a reading or it is *free*
+    (already read); an unreadable timer falls back to the prediction.
+    Returns the time, its OCR confidence (``None`` if predicted) and its
+    status.
+    """
+    if free or clock.needs_reading(video_sec):
+        game_time, confidence = read()
+        if game_time is not None:
+            status = clock.observe(video_sec, parse_game_time(game_time))
+            return game_time, confidence, status
+    secs = clock.skip(video_sec)
+    if secs is None:
+        return None, None, None
+    return format_game_time(secs), None, "predicted"
+
+
+def _cached_crops(entry: CachedFrame) -> list[tuple[Region, int]]:
+    """Return the HUD crops a frame's cached results make unnecessary."""
+    if not entry.has("phase"):
+        return []
+    if entry.get("phase").phase != "in_game":
+        return [crop for tier in HUD_TIERS for crop in tier]
+    return [
+        crop
+        for name, crops in _CACHED_CROPS.items()
+        if entry.has(name)
+        for crop in crops
+    ]
+
+
+def _needs_hud_ocr(plan: OcrPlan) -> bool:
+    """Return ``False`` if pixel checks already settled a non-game phase."""
+    decision = classify_pixels(plan)
+    return decision is None or decision.phase == "in_game"
+
+
+def _iter_range(
+    source,
+    interval_sec: float,
+    start_sec: float,
+    stop: float,
+    *,
+    ocr_engine: str,
+    ocr_batch_frames: int,
+    ocr_max_wait_sec: float | None,
+    pipeline: bool,
+    clock_verify_sec: float | None,
+    hud_reuse_sec: float | None,
+    ocr_stats: OcrStats,
+    times: Sequence[float] | None = None,
+    cache: FrameCache | None = None,
+    replay: Sequence[FrameData] = (),
+    hold_conflicts: bool = True,
+    profile: Profile | None = None,
+) -> Iterator[tuple[FrameData, float]]:
+    """Analyse the frames *source* samples in ``[start_sec, stop)``.
+
+    Yields ``(frame_data, elapsed_sec)`` in timestamp order as frames
+    are analysed, and adds their OCR work to *ocr_stats*.  With
+    *pipeline*, decoding and preprocessing run on threads of their own
+    ahead of the OCR (see :func:`_pipelined_frames`).  Pass *times* to
+    analyse exactly those timestamps instead (see :func:`_sample`).
+    With *clock_verify_sec*, a :class:`~wr_analyzer.clock.GameClock`
+    predicts the timer between readings at most that far apart, and
+    frames it predicts leave the timer out of their OCR batch; a
+    conflicting reading is held back until the next reading settles
+    it, unless *hold_conflicts* is false (it is then yielded as a
+    conflict right away, and not revised).  Likewise, with
+    *hud_reuse_sec* a :class:`~wr_analyzer.hud_memo.HudMemo` carries
+    unchanged kills / KDA for up to that long.  With a results *cache*, each frame's cached
+    fields are left out of its OCR batch and newly measured ones are
+    stored (see :mod:`wr_analyzer.frame_cache`).  With a *profile*, the
+    decoding and each frame's stages are timed into it (see
+    :mod:`wr_analyzer.profiling`).
+
+    *replay* are the range's first frames, analysed by an interrupted
+    run (see :mod:`wr_analyzer.journal`); they are not yielded again.
+    Sampling continues after them, with the clock model and HUD memo in
+    the state they would be in.
+    """
+    clock = GameClock(clock_verify_sec) if clock_verify_sec is not None else None
+    memo = HudMemo(hud_reuse_sec) if hud_reuse_sec is not None else None
+    cached: dict[float, CachedFrame] = {}
+    if replay:
+        _restore_state(source, replay, clock, memo, ocr_engine)
+        if times is None:
+            # Sample timestamps accumulate from start_sec, so this is
+            # exactly the timestamp the interrupted run would have read.
+            start_sec = replay[-1].timestamp_sec + interval_sec
+        else:
+            times = [ts for ts in times if ts > replay[-1].timestamp_sec]
+
+    def handle(frame, ts, pts, *, plan):
+        with span(profile, "frame"):
+            fd = analyze_frame(
+                frame,
+                ts,
+                pts,
+                plan=plan,
+                clock=clock,
+                memo=memo,
+                cached=cached.pop(ts, None),
+            )
+        ocr_stats.add(plan.stats)
+        return fd
+
+    def submit(ts, pts, plan) -> list[FrameData]:
+        if cache is not None:
+            entry = cached[ts] = cache.frame(pts if pts is not None else ts)
+            plan.skip(_cached_crops(entry))
+        if clock is not None and not clock.needs_reading(ts):
+            plan.skip(_CLOCK_CROPS)
+        if memo is not None:
+            plan.skip(
+                crop
+                for region, crop in _MEMO_CROPS.items()
+                if memo.carry(region, plan, ts) is not None
+            )
+        return scheduler.submit(plan.frame, ts, pts, plan=plan)
+
+    scheduler = OcrScheduler(
+        handle,
+        batch_frames=ocr_batch_frames,
+        max_wait_sec=ocr_max_wait_sec,
+        engine=ocr_engine,
+        prefetch=_needs_hud_ocr,
+    )
+    held: list[tuple[FrameData, float]] = []
+
+    def release(results: list[FrameData], *, final: bool = False):
+        nonlocal t0
+        if results:
+            # A batch finishes all its frames at once; spread its time.
+            elapsed = (time.monotonic() - t0) / len(results)
+            held.extend((fd, elapsed) for fd in results)
+            t0 = time.monotonic()
+        if (
+            hold_conflicts
+            and clock is not None
+            and clock.pending is not None
+            and not final
+        ):
+            return
+        revised = set(clock.revised) if clock is not None else set()
+        for fd, elapsed in held:
+            if fd.timestamp_sec in revised:
+                # A conflict the next reading confirmed: the clock jumped.
+                fd = replace(fd, clock_status="read")
+            yield fd, elapsed
+        held.clear()
+
+    t0 = time.monotonic()
+    if pipeline:
+        for ts, pts, plan in _pipelined_frames(
+            source, interval_sec, start_sec, stop, ocr_engine, times, profile
+        ):
+            yield from release(submit(ts, pts, plan))
+    else:
+        frames = _sample(source, interval_sec, start_sec, stop, times)
+        for ts, frame in timed(profile, "decode", frames):
+            plan = OcrPlan(frame.copy(), engine=ocr_engine, profile=profile)
+            yield from release(submit(ts, source.pts, plan))
+    yield from release(scheduler.flush(), final=True)
+    if cache is not None:
+        cache.flush()
+    # Cross-frame batches aren't counted by the frames' own plans.
+    ocr_stats.calls += scheduler.batches
+
+
+def _analyze_range(
+    source,
+    interval_sec: float,
+    start_sec: float,
+    stop: float,
+    *,
+    on_frame: Callable[[FrameData, int, float], None],
+    **options,
+) -> tuple[list[FrameData], OcrStats]:
+    """Analyse ``[start_sec, stop)`` with :func:`_iter_range` into a list.
+
+    *on_frame* is called as ``on_frame(frame_data, frames_done,
+    elapsed_sec)`` after each frame.
+    """
+    frames: list[FrameData] = []
+    ocr_stats = OcrStats()
+    for fd, elapsed in _iter_range(
+        source, interval_sec, start_sec, stop, ocr_stats=ocr_stats, **options
+    ):
+        frames.append(fd)
+        on_frame(fd, len(frames), elapsed)
+    return frames, ocr_stats
+
+
+def _restore_state(
+    source,
+    replay: Sequence[FrameData],
+    clock: GameClock | None,
+    memo: HudMemo | None,
+    ocr_engine: str,
+) -> None:
+    """Bring *clock* and *memo* to their state after the *replay* frames.
+
+    The clock is fed the same readings, predictions and interruptions
+    again.  The memo is given each region's last stored reading,
+    re-decoding the frame it came from for the crop's signature.
+    """
+    last_read: dict[Region, tuple[float, tuple]] = {}
+    for fd in replay:
+        if fd.phase != "in_game":
+            if clock is not None:
+                clock.interrupt()
+            last_read.clear()
+            continue
+        if clock is not None:
+            if fd.clock_status in ("read", "conflict"):
+                clock.observe(fd.timestamp_sec, parse_game_time(fd.game_time))
+            else:
+                clock.skip(fd.timestamp_sec)
+        for region, name in ((KILLS, "team_kills"), (PLAYER_KDA, "player_kda")):
+            value = getattr(fd, name)
+            if value is not None and name not in fd.carried:
+                confidence = getattr(fd, f"{name}_confidence")
+                last_read[region] = (fd.timestamp_sec, (value, confidence))
+    if memo is None:
+        return
+    # At most one read per memo region, so the ffmpeg backend's process
+    # per read() is affordable here.
+    for region, (ts, reading) in last_read.items():
+        plan = OcrPlan(source.read(ts).copy(), engine=ocr_engine)
+        memo.store(region, plan, ts, reading)
+
+
+def _frame_record(fd: FrameData) -> dict:
+    """Return *fd* as a JSON-able dict (see :func:`_frame_from_record`)."""
+    return asdict(fd)
+
+
+def _frame_from_record(record: dict) -> FrameData:
+    """Rebuild the :class:`FrameData` that :func:`_frame_record` returned."""
+    kills, kda = record["team_kills"], record["player_kda"]
+    return FrameData(
+        **{
+            **record,
+            "team_kills": TeamKills(**kills) if kills is not None else None,
+            "player_kda": PlayerKDA(**kda) if kda is not None else None,
+            "carried": tuple(record["carried"]),
+        }
+    )
+
+
+def _sample(
+    source,
+    interval_sec: float,
+    start_sec: float,
+    stop: float,
+    times: Sequence[float] | None = None,
+) -> Iterator[tuple[float, np.ndarray]]:
+    """Yield ``(timestamp, frame)`` every *interval_sec*, or at *times*.
+
+    *times* must be sorted; like :meth:`~wr_analyzer.video.VideoSource.frames`,
+    sampling stops at the first timestamp the decoder can't deliver.
+    The ffmpeg backend streams them run by run
+    (:meth:`~wr_analyzer.video.FfmpegSource.frames_at`) rather than
+    spawning a process per timestamp.
+    """
+    if times is None:
+        yield from source.frames(interval_sec, start_sec, stop)
+        return
+    if isinstance(source, FfmpegSource):
+        yield from source.frames_at(times)
+        return
+    for ts in times:
+        try:
+            frame = source.read(ts)
+        except RuntimeError:
+            break
+        yield ts, frame
+
+
+def _pipelined_frames(
+    source,
+    interval_sec: float,
+    start_sec: float,
+    stop: float,
+    ocr_engine: str,
+    times: Sequence[float] | None = None,
+    profile: Profile | None = None,
+) -> Iterator[tuple[float, float | None, OcrPlan]]:
+    """Decode and preprocess sampled frames on background threads.
+
+    Yields ``(timestamp, pts, plan)`` in timestamp order.  The decoder
+    thread copies each frame out of the decoder's buffer; the
+    preprocessing thread builds its :class:`OcrPlan`, runs the pixel
+    phase checks and, for frames that will need HUD OCR, the CLAHE
+    enhancement of their primary crops.  The caller's thread is left
+    with the recognizer and the parsing.
+    """
+
+    def decode():
+        frames = _sample(source, interval_sec, start_sec, stop, times)
+        for ts, frame in timed(profile, "decode", frames):
+            yield ts, source.pts, frame.copy()
+
+    def prepare(item):
+        ts, pts, frame = item
+        plan = OcrPlan(frame, engine=ocr_engine, profile=profile)
+        if _needs_hud_ocr(plan):
+            plan.preprocess()
+        return ts, pts, plan
+
+    return pipelined(decode(), prepare)
+
+
+def _refine(
+    source,
+    frames: list[FrameData],
+    resolution_sec: float,
+    options: dict,
+    on_frame: Callable[[FrameData, int, int, float], None],
+    replay: Sequence[FrameData] = (),
+) -> tuple[list[FrameData], OcrStats, SamplingStats]:
+    """Bisect around the phase transitions of the sorted *frames*.
+
+    Each round analyses the midpoints of every transition still wider
+    than *resolution_sec* (see :func:`wr_analyzer.sampling.refinement_times`)
+    in one timestamp-ordered pass over *source*, so they share OCR
+    batches, and merges them in.  *on_frame* is called as
+    ``on_frame(frame_data, refined_done, refined_planned, elapsed_sec)``.
+    *replay* are refined frames an interrupted run already analysed;
+    they are merged in first, so only the midpoints still missing are
+    analysed.
+
+    Refined frames always read the timer and HUD: the clock model and
+    the HUD memo need frames in order, and refined frames sit at the
+    boundaries where both would re-read anyway.
+    """
+    options = {**options, "clock_verify_sec": None, "hud_reuse_sec": None}
+    ocr_stats = OcrStats()
+    stats = SamplingStats(sparse=len(frames), refined=len(replay))
+    frames = sorted([*frames, *replay], key=lambda f: f.timestamp_sec)
+    planned = len(replay)
+    while times := refinement_times(frames, resolution_sec):
+        done = stats.refined
+        planned += len(times)
+        new, round_stats = _analyze_range(
+            source,
+            0.0,
+            times[0],
+            times[-1],
+            times=times,
+            on_frame=lambda fd, i, elapsed: on_frame(fd, done + i, planned, elapsed),
+            **options,
+        )
+        ocr_stats.add(round_stats)
+        stats.refined += len(new)
+        stats.rounds += 1
+        frames = sorted(frames + new, key=lambda f: f.timestamp_sec)
+        if len(new) < len(times):
+            # The decoder ran out before the last midpoints; asking for
+            # them again would never finish.
+            break
+    return frames, ocr_stats, stats
+
+
+def _shard_ranges(
+    start_sec: float, stop: float, interval_sec: float, shards: int
+) -> list[tuple[float, float]]:
+    """Split ``[start_sec, stop)`` into up to *shards* contiguous ranges.
+
+    Every boundary is one of the sample timestamps (see
+    :func:`~wr_analyzer.sampling.sample_times`), so sampling each range
+    from its start yields bit-identical timestamps to one sequential
+    pass.
+    """
+    return _split_times(sample_times(start_sec, stop, interval_sec), stop, shards)
+
+
+def _split_times(
+    times: Sequence[float], stop: float, shards: int
+) -> list[tuple[float, float]]:
+    """Split the sorted *times* into up to *shards* ranges ending at *stop*.
+
+    Each range starts at one of *times* and holds about as many of them.
+    """
+    shards = min(shards, len(times))
+    if shards == 0:
+        return []
+    bounds = [times[len(times) * i // shards] for i in range(shards)] + [stop]
+    return list(zip(bounds, bounds[1:]))
+
+
+def _init_worker(threads: int) -> None:
+    """Pool initializer: size torch's thread pool and load EasyOCR once."""
+    import torch
+
+    torch.set_num_threads(threads)
+    _get_easyocr_reader()
+
+
+def _analyze_shard(
+    path: Path,
+    decoder: str,
+    decode_filter: DecodeFilter | None,
+    index,
+    shard: int,
+    start_sec: float,
+    stop: float,
+    interval_sec: float,
+    options: dict,
+    replay: list[FrameData],
+    progress,
+    times: list[float] | None = None,
+) -> tuple[OcrStats, Profile | None]:
+    """Worker: analyse one time range with its own decoder.
+
+    Sends ``(shard, frame_data, elapsed_sec)`` over *progress* for each
+    frame, then ``(shard, None, 0.0)`` once the range is done.  With
+    *times*, analyses exactly those timestamps of the range.  Returns
+    the range's OCR stats and the profile it was timed into, if any.
+    """
+    ocr_stats = OcrStats()
+    with open_video(path, decoder, index=index, decode_filter=decode_filter) as source:
+        for fd, elapsed in _iter_range(
+            source,
+            interval_sec,
+            start_sec,
+            stop,
+            ocr_stats=ocr_stats,
+            times=times,
+            replay=replay,
+            **options,
+        ):
+            progress.put((shard, fd, elapsed))
+    progress.put((shard, None, 0.0))
+    return ocr_stats, options.get("profile")
+
+
+def _iter_parallel(
+    path: Path,
+    decoder: str,
+    decode_filter: DecodeFilter | None,
+    index,
+    shards: list[tuple[float, float]],
+    interval_sec: float,
+    options: dict,
+    workers: int,
+    on_progress: Callable[[FrameData, int, float], None],
+    ocr_stats: OcrStats,
+    replay: Sequence[FrameData] = (),
+    times: Sequence[float] | None = None,
+) -> Iterator[FrameData]:
+    """Analyse *shards* in a process pool; yield their frames in order.
+
+    Workers send each finished frame over a queue, so *on_progress*
+    (called as ``on_progress(frame_data, frames_done, elapsed_sec)``)
+    sees one running count across all of them.  Frames of a shard are
+    held back until the shards before it are done.  *replay* are frames
+    an interrupted run already analysed; each shard continues after its
+    own.  With *times*, each shard analyses those in its range instead
+    of sampling it uniformly.  The workers' OCR work is added to
+    *ocr_stats* at the end, and their timings to the profile in
+    *options*, if any.
+    """
+    profile = options.get("profile")
+    if profile is not None:
+        # Each worker times into a copy of its own, merged at the end.
+        options = {**options, "profile": profile.fork()}
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    # spawn, not fork: the parent may already hold torch / decoder state.
+    ctx = multiprocessing.get_context("spawn")
+    with (
+        ctx.Manager() as manager,
+        ProcessPoolExecutor(
+            workers, mp_context=ctx, initializer=_init_worker, initargs=(threads,)
+        ) as pool,
+    ):
+        progress = manager.Queue()
+        replays = [
+            [f for f in replay if start <= f.timestamp_sec < stop]
+            for start, stop in shards
+        ]
+        futures = [
+            pool.submit(
+                _analyze_shard,
+                path,
+                decoder,
+                decode_filter,
+                index,
+                shard,
+                start,
+                stop,
+                interval_sec,
+                options,
+                replays[shard],
+                progress,
+                (
+                    [ts for ts in times if start <= ts < stop]
+                    if times is not None
+                    else None
+                ),
+            )
+            for shard, (start, stop) in enumerate(shards)
+        ]
+        try:
+            # Replayed frames come first in their shard.
+            buffers = [deque(frames) for frames in replays]
+            finished = [False] * len(shards)
+            current = 0
+            done = len(replay)
+            while current < len(shards):
+                while buffers[current]:
+                    yield buffers[current].popleft()
+                if finished[current]:
+                    current += 1
+                    continue
+                try:
+                    shard, fd, elapsed = progress.get(timeout=0.1)
+                except queue.Empty:
+                    for future in futures:
+                        if future.done():
+                            future.result()  # re-raise a worker's error
+                    continue
+                if fd is None:
+                    finished[shard] = True
+                    continue
+                done += 1
+                on_progress(fd, done, elapsed)
+                buffers[shard].append(fd)
+            for future in futures:
+                shard_stats, shard_profile = future.result()
+                ocr_stats.add(shard_stats)
+                if profile is not None:
+                    profile.add(shard_profile)
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def analyze_video_iter(
     path: str | Path,
     interval_sec: float = 10.0,
     start_sec: float = 0.0,
     end_sec: float | None = None,
     on_progress: Callable[[int, int, float], None] | None = None,
-) -> AnalysisResult:
-    """Analyse a Wild Rift gameplay video.
+    decoder: str = "opencv",
+    decode_width: int | None = None,
+    ocr_engine: str = "recognize",
+    ocr_batch_frames: int = 1,
+    ocr_max_wait_sec: float | None = 2.0,
+    workers: int = 1,
+    pipeline: bool = False,
+    refine_sec: float | None = None,
+    clock_verify_sec: float | None = None,
+    hud_reuse_sec: float | None = None,
+    results_cache: str | Path | None = None,
+    results_cache_max_bytes: int = DEFAULT_MAX_BYTES,
+    journal: str | Path | None = None,
+    resume: bool = False,
+    prepass: bool = False,
+    profile: bool = False,
+    trace: bool = False,
+) -> AnalysisStream:
+    """Analyse a Wild Rift gameplay video, streaming the results.
 
-    Samples one frame every *interval_sec* seconds, detects game
-    boundaries, and extracts HUD data for each game.
+    Samples one frame every *interval_sec* seconds and returns an
+    :class:`AnalysisStream` that yields each frame's :class:`FrameData`
+    as soon as it is analysed, followed by the game events it settles
+    (see :mod:`wr_analyzer.segmentation`).  Nothing is kept beyond the
+    frames of the game in progress, so memory stays flat however long
+    the video is, except with *refine_sec*, which needs the whole
+    sparse pass before it can refine, and with *workers*, whose later
+    shards are held until the earlier ones are done.  Nothing is opened
+    until the stream is iterated; invalid arguments raise
+    :class:`ValueError` right away.
 
     Parameters
     ----------
@@ -273,42 +958,333 @@ def analyze_video(
         Where to begin sampling.
     end_sec : float | None
         Where to stop (defaults to video duration).
+    decoder : str
+        Decoder backend, ``"opencv"`` or ``"ffmpeg"`` (see
+        :func:`wr_analyzer.video.open_video`).
+    decode_width : int | None
+        Have the ffmpeg decoder scale frames down to this width (keeping
+        the aspect ratio) before they leave ffmpeg, e.g. to analyse a 4K
+        VOD at 1280 wide.  Regions are relative, so the detectors work
+        at any size; OCR accuracy is only measured at 720p.
+    ocr_engine : str
+        OCR engine for the HUD fields, ``"recognize"`` (recognition only)
+        or ``"readtext"`` (full detection + recognition).
+    ocr_batch_frames : int
+        Number of sampled frames whose HUD crops are recognised together
+        in one batch (see :mod:`wr_analyzer.ocr_scheduler`).  ``1``
+        analyses each frame as soon as it is decoded.
+    ocr_max_wait_sec : float | None
+        Run a partial batch once its oldest frame has waited this long.
+    workers : int
+        Number of worker processes.  Above ``1`` the sampled range is
+        split into that many contiguous shards, each analysed by its own
+        process with its own decoder and EasyOCR reader; the result is
+        the same as a sequential run.
+    pipeline : bool
+        Decode and preprocess on background threads, connected to the
+        OCR by bounded queues (see :mod:`wr_analyzer.pipeline`), so they
+        overlap with inference.  The result is unchanged.
+    refine_sec : float | None
+        Adaptive sampling: after the pass at *interval_sec*, bisect
+        around every game boundary (see :mod:`wr_analyzer.sampling`)
+        until it is pinned down to *refine_sec* seconds.  The frame
+        counts are reported on :attr:`AnalysisResult.sampling`.  Needs
+        the OpenCV decoder, which seeks to the scattered timestamps.
+    clock_verify_sec : float | None
+        Model the game clock (see :mod:`wr_analyzer.clock`): once a few
+        timer readings agree, predict it and OCR the timer only to
+        verify it at least this often, and after non-game frames or
+        conflicting readings.  Readings that disagree with the model are
+        flagged on :attr:`FrameData.clock_status` and ignored by the
+        game summaries.  With *workers*, each shard models its own.
+    hud_reuse_sec : float | None
+        Carry the kills / KDA of an in-game frame forward without OCR
+        while their HUD crops look unchanged since the last successful
+        read (see :mod:`wr_analyzer.hud_memo`), for at most this long.
+        Carried fields are listed on :attr:`FrameData.carried`.
+    results_cache : str | Path | None
+        SQLite file caching each frame's detector results across runs
+        (see :mod:`wr_analyzer.frame_cache`), keyed by the video's
+        content, the frame's PTS and each detector's version.  Frames
+        are still decoded, but cached fields skip their OCR.
+    results_cache_max_bytes : int
+        Size cap of *results_cache*; least recently used entries beyond
+        it are evicted.
+    journal : str | Path | None
+        Append every analysed frame to this file as the run goes (see
+        :mod:`wr_analyzer.journal`), so an interrupted run can be
+        resumed.
+    resume : bool
+        Replay the frames in *journal* from an interrupted run with the
+        same settings and analyse only the rest.  The result is the same
+        as that of an uninterrupted run.
+    prepass : bool
+        First scan the range as keyframe thumbnails (see
+        :mod:`wr_analyzer.prepass`) and analyse only the sampled frames
+        inside the candidate game spans it finds, plus their post-game
+        windows.  Its cost and savings are reported on
+        :attr:`AnalysisResult.prepass`.
+    profile : bool
+        Time each stage of the analysis -- decoding, phase detection,
+        preprocessing, recognition, parsing -- and count the OCR reads
+        per HUD region (see :mod:`wr_analyzer.profiling`), reported on
+        :attr:`AnalysisResult.profile`.
+    trace : bool
+        As *profile*, also keeping every timed span for
+        :meth:`~wr_analyzer.profiling.Profile.write_trace`.
+
+    The OpenCV backend seeks through a keyframe / PTS index that is
+    built on first use and cached next to the video (see
+    :mod:`wr_analyzer.video_index`).
     """
     path = Path(path)
-    info = probe(path)
-    stop = end_sec if end_sec is not None else info.duration
+    if workers < 1:
+        raise ValueError(f"workers must be >= 1, got {workers}")
+    if refine_sec is not None and refine_sec <= 0:
+        raise ValueError(f"refine_sec must be > 0, got {refine_sec}")
+    if clock_verify_sec is not None and clock_verify_sec <= 0:
+        raise ValueError(f"clock_verify_sec must be > 0, got {clock_verify_sec}")
+    if hud_reuse_sec is not None and hud_reuse_sec <= 0:
+        raise ValueError(f"hud_reuse_sec must be > 0, got {hud_reuse_sec}")
+    if resume and journal is None:
+        raise ValueError("resume requires a journal")
+    if refine_sec is not None and decoder == "ffmpeg":
+        # Refinement reads scattered midpoints: one ffmpeg process each.
+        raise ValueError("refine_sec requires the opencv decoder")
+    decode_filter = None
+    if decode_width is not None:
+        if decoder != "ffmpeg":
+            raise ValueError("decode_width requires the ffmpeg decoder")
+        if decode_width < 2:
+            raise ValueError(f"decode_width must be >= 2, got {decode_width}")
+        decode_filter = DecodeFilter(scale=(decode_width, -1))
+    stream = AnalysisStream(str(path))
+    if profile or trace:
+        stream.profile = Profile(trace=trace)
 
-    # Eagerly load EasyOCR model so first-frame timing is representative.
-    _get_easyocr_reader()
+    def run() -> Iterator[FrameData | GameEvent]:
+        # The pre-pass decodes keyframes through the index whatever the
+        # decoder of the full analysis.
+        index = ensure_index(path) if decoder == "opencv" or prepass else None
+        options = dict(
+            ocr_engine=ocr_engine,
+            ocr_batch_frames=ocr_batch_frames,
+            ocr_max_wait_sec=ocr_max_wait_sec,
+            pipeline=pipeline,
+            clock_verify_sec=clock_verify_sec,
+            hud_reuse_sec=hud_reuse_sec,
+            cache=None,
+            profile=stream.profile,
+        )
+        fingerprint = None
+        if results_cache is not None or journal is not None:
+            fingerprint = video_fingerprint(path)
+        if results_cache is not None:
+            options["cache"] = FrameCache(
+                results_cache,
+                fingerprint,
+                # Frames decoded at another size are read differently.
+                engine=(
+                    ocr_engine
+                    if decode_width is None
+                    else f"{ocr_engine}@{decode_width}"
+                ),
+                max_bytes=results_cache_max_bytes,
+            )
+        run_journal = None
+        replayed: dict[str, list[FrameData]] = {}
+        if journal is not None:
+            settings = dict(
+                video=fingerprint,
+                interval_sec=interval_sec,
+                start_sec=start_sec,
+                end_sec=end_sec,
+                decoder=decoder,
+                ocr_engine=ocr_engine,
+                workers=workers,
+                refine_sec=refine_sec,
+                clock_verify_sec=clock_verify_sec,
+                hud_reuse_sec=hud_reuse_sec,
+            )
+            # Only when set, so journals from before the options resume.
+            if prepass:
+                settings["prepass"] = True
+            if decode_width is not None:
+                settings["decode_width"] = decode_width
+            run_journal = Journal(journal, settings, resume=resume)
+            replayed = {
+                stage: [_frame_from_record(r) for r in records]
+                for stage, records in run_journal.replayed.items()
+            }
+        try:
+            with open_video(
+                path, decoder, index=index, decode_filter=decode_filter
+            ) as source:
+                stream.duration_sec = source.info.duration
+                stop = end_sec if end_sec is not None else source.info.duration
+                yield from stream_frames(
+                    source,
+                    index,
+                    stop,
+                    options,
+                    replayed,
+                    record=run_journal.append if run_journal is not None else None,
+                )
+        finally:
+            if options["cache"] is not None:
+                options["cache"].close()
+            if run_journal is not None:
+                run_journal.close()
+
+    def stream_frames(
+        source,
+        index,
+        stop: float,
+        options: dict,
+        replayed: dict[str, list[FrameData]],
+        record: Callable[[str, dict], None] | None,
+    ) -> Iterator[FrameData | GameEvent]:
+        total = int((stop - start_sec) / interval_sec) + 1
+        sample_replay = replayed.get("sample", [])
+        # Scale gap threshold: OCR misses many frames at low resolution, so
+        # allow gaps up to 5x the sampling interval before splitting segments.
+        # Refinement only adds frames, so the sparse interval still bounds
+        # the gaps left inside a game.
+        min_gap = max(30.0, interval_sec * 5)
+        times = None
+        if prepass:
+            with span(stream.profile, "prepass"):
+                spans, stream.prepass = find_spans(
+                    path,
+                    start_sec,
+                    stop,
+                    index=index,
+                    # Sample a frame before each game, and its result
+                    # screens within the segmenter's reach after it.
+                    lead_sec=interval_sec,
+                    tail_sec=min_gap,
+                )
+            uniform = sample_times(start_sec, stop, interval_sec)
+            times = [ts for ts in uniform if any(ts in span for span in spans)]
+            total = stream.prepass.frames = len(times)
+            stream.prepass.uniform = len(uniform)
+
+        def report(fd: FrameData, done: int, elapsed: float) -> None:
+            if record is not None:
+                record("sample", _frame_record(fd))
+            if on_progress is not None:
+                on_progress(done, total, elapsed)
 
-    total = int((stop - start_sec) / interval_sec) + 1
+        def sequential() -> Iterator[FrameData]:
+            # Eagerly load EasyOCR model so first-frame timing is representative.
+            if times is None or times:
+                _get_easyocr_reader()
+            yield from sample_replay
+            done = len(sample_replay)
+            for fd, elapsed in _iter_range(
+                source,
+                interval_sec,
+                start_sec,
+                stop,
+                ocr_stats=stream.ocr_stats,
+                times=times,
+                replay=sample_replay,
+                **options,
+            ):
+                done += 1
+                report(fd, done, elapsed)
+                yield fd
+
+        if workers > 1:
+            frames = _iter_parallel(
+                path,
+                decoder,
+                decode_filter,
+                index,
+                (
+                    _split_times(times, stop, workers)
+                    if times is not None
+                    else _shard_ranges(start_sec, stop, interval_sec, workers)
+                ),
+                interval_sec,
+                options,
+                workers,
+                on_progress=report,
+                ocr_stats=stream.ocr_stats,
+                replay=sample_replay,
+                times=times,
+            )
+        else:
+            frames = sequential()
 
-    all_frames: list[FrameData] = []
-    ts = start_sec
-    idx = 0
-    while ts < stop:
         t0 = time.monotonic()
-        frame = extract_frame(path, ts)
-        fd = analyze_frame(frame, ts)
-        elapsed = time.monotonic() - t0
-        all_frames.append(fd)
-        idx += 1
-        if on_progress is not None:
-            on_progress(idx, total, elapsed)
-        ts += interval_sec
-
-    # Filter out implausible kill readings before segmenting.
-    all_frames = _sanitize_kills(all_frames)
-
-    # Scale gap threshold: OCR misses many frames at low resolution, so
-    # allow gaps up to 5x the sampling interval before splitting segments.
-    gap = max(30.0, interval_sec * 5)
-    games = _segment_games(all_frames, min_gap_sec=gap)
+        if refine_sec is not None:
+            sparse = list(frames)
+
+            def report_refined(fd, done: int, planned: int, elapsed: float) -> None:
+                if record is not None:
+                    record("refine", _frame_record(fd))
+                if on_progress is not None:
+                    on_progress(len(sparse) + done, len(sparse) + planned, elapsed)
+
+            frames, refine_stats, stream.sampling = _refine(
+                source,
+                sparse,
+                refine_sec,
+                options,
+                on_frame=report_refined,
+                replay=replayed.get("refine", ()),
+            )
+            stream.ocr_stats.add(refine_stats)
+            stream.sampling.uniform = uniform_frame_count(start_sec, stop, refine_sec)
+
+        keep = KillFilter(confidence_threshold(ocr_engine))
+        segmenter = GameSegmenter(min_gap_sec=min_gap)
+        for fd in frames:
+            # Filter out implausible kill readings before segmenting.
+            fd = keep(fd)
+            yield fd
+            yield from segmenter.push(fd)
+        if stream.prepass is not None:
+            stream.prepass.analysis_sec = time.monotonic() - t0
+        yield from segmenter.finish()
 
+    stream._items = run()
+    return stream
+
+
+def analyze_video(
+    path: str | Path,
+    interval_sec: float = 10.0,
+    start_sec: float = 0.0,
+    end_sec: float | None = None,
+    on_progress: Callable[[int, int, float], None] | None = None,
+    **options,
+) -> AnalysisResult:
+    """Analyse a Wild Rift gameplay video.
+
+    Samples one frame every *interval_sec* seconds, detects game
+    boundaries, and extracts HUD data for each game.  Takes the same
+    arguments as :func:`analyze_video_iter` and collects its stream.
+    """
+    stream = analyze_video_iter(
+        path, interval_sec, start_sec, end_sec, on_progress, **options
+    )
+    frames: list[FrameData] = []
+    games: list[GameSegment] = []
+    for item in stream:
+        if isinstance(item, FrameData):
+            frames.append(item)
+        elif isinstance(item, GameEnded):
+            games.append(item.segment)
     return AnalysisResult(
-        source=str(path),
+        source=stream.source,
         analysis_date=datetime.now(),
-        duration_sec=info.duration,
+        duration_sec=stream.duration_sec,
         games=games,
-        frame_data=all_frames,
+        frame_data=frames,
+        ocr_stats=stream.ocr_stats,
+        sampling=stream.sampling,
+        prepass=stream.prepass,
+        profile=stream.profile,
     )
@@ -0,0 +1,135 @@
+"""Online model of the game clock against video time.
+
+While a game runs, its clock advances one second per second of video,
+so once a few timer readings agree, every other in-game frame's clock
+can be predicted as ``video_sec + offset``.  Pauses and new games shift
+the offset; a :class:`GameClock` fits one offset per stretch between
+such discontinuities (a piecewise-linear fit with slope 1) from the
+median of its recent readings, so a single misread can't drag it.
+
+The analysis asks :meth:`GameClock.needs_reading` before OCR'ing the
+timer: only until the current piece is established, every *verify_sec*
+of video, after a non-game frame (a possible pause or new game) and
+after a conflicting reading.  Otherwise the timer is predicted.
+
+A reading more than *tolerance_sec* off the prediction is a conflict
+(a misread digit, say).  It is held as the candidate start of a
+new piece: if the next reading agrees with it, the clock really jumped
+and the candidate is accepted after all (its video time is added to
+:attr:`GameClock.revised`); otherwise it stays flagged as a misread.
+"""
+
+from __future__ import annotations
+
+from statistics import median
+
+# Readings of the current piece its offset is the median of.
+_WINDOW = 5
+
+
+class GameClock:
+    """Predict the game clock from earlier timer readings.
+
+    Parameters
+    ----------
+    verify_sec : float
+        Longest stretch of video to predict without reading the timer.
+    tolerance_sec : float
+        Largest disagreement between a reading and the model that still
+        counts as agreeing.  The timer shows whole seconds and the
+        sampled frame may be a frame off, so keep this above ~1.5.
+    min_readings : int
+        Agreeing readings needed before the model predicts anything.
+
+    Attributes
+    ----------
+    revised : list[float]
+        Video times of readings first reported as ``"conflict"`` and
+        then confirmed by the next reading (the clock jumped there).
+    """
+
+    def __init__(
+        self,
+        verify_sec: float = 60.0,
+        *,
+        tolerance_sec: float = 2.0,
+        min_readings: int = 2,
+    ) -> None:
+        if verify_sec <= 0:
+            raise ValueError(f"verify_sec must be > 0, got {verify_sec}")
+        self.verify_sec = verify_sec
+        self.tolerance_sec = tolerance_sec
+        self.min_readings = min_readings
+        self.revised: list[float] = []
+        self._offsets: list[float] = []  # current piece, newest last
+        self._last_read = 0.0
+        self._last_seen = 0.0
+        self._interrupted = False
+        self._candidate: tuple[float, float] | None = None  # (video_sec, offset)
+
+    @property
+    def offset(self) -> float | None:
+        """Game time minus video time on the current piece, if established."""
+        if len(self._offsets) < self.min_readings:
+            return None
+        return median(self._offsets[-_WINDOW:])
+
+    @property
+    def pending(self) -> float | None:
+        """Video time of a conflicting reading the next one will settle."""
+        return self._candidate[0] if self._candidate is not None else None
+
+    def predict(self, video_sec: float) -> int | None:
+        """Return the predicted game clock in seconds at *video_sec*."""
+        offset = self.offset
+        if offset is None:
+            return None
+        return max(0, round(video_sec + offset))
+
+    def needs_reading(self, video_sec: float) -> bool:
+        """Return ``True`` if the timer at *video_sec* should be OCR'd."""
+        return (
+            self.offset is None
+            or self._candidate is not None
+            or self._interrupted
+            or video_sec < self._last_seen
+            or video_sec - self._last_read >= self.verify_sec
+        )
+
+    def interrupt(self) -> None:
+        """Note a frame outside play; the next in-game frame is verified."""
+        self._interrupted = True
+
+    def skip(self, video_sec: float) -> int | None:
+        """Note an in-game frame whose timer is predicted; return the prediction."""
+        self._last_seen = video_sec
+        return self.predict(video_sec)
+
+    def observe(self, video_sec: float, game_sec: int) -> str:
+        """Feed a timer reading; return ``"read"`` or ``"conflict"``."""
+        self._last_seen = video_sec
+        self._interrupted = False
+        offset = game_sec - video_sec
+        current = median(self._offsets[-_WINDOW:]) if self._offsets else None
+
+        if current is None or abs(offset - current) <= self.tolerance_sec:
+            self._accept(video_sec, offset)
+            self._candidate = None
+            return "read"
+
+        candidate = self._candidate
+        if candidate is not None and abs(offset - candidate[1]) <= self.tolerance_sec:
+            # Two readings agree on a new offset: a pause or a new game.
+            self._offsets = [candidate[1]]
+            self._accept(video_sec, offset)
+            self.revised.append(candidate[0])
+            self._candidate = None
+            return "read"
+
+        self._candidate = (video_sec, offset)
+        return "conflict"
+
+    def _accept(self, video_sec: float, offset: float) -> None:
+        self._offsets.append(offset)
+        del self._offsets[:-_WINDOW]
+        self._last_read = video_sec
@@ -0,0 +1,280 @@
+"""Persistent SQLite cache of per-frame detector results.
+
+Re-running the analyzer on the same VOD with a different interval or
+range would otherwise OCR every frame again.  A :class:`FrameCache`
+stores each detector's output per frame, keyed by
+
+* the video's content fingerprint (:func:`video_fingerprint`), so a
+  renamed or re-downloaded copy still hits;
+* the frame's presentation timestamp, in milliseconds;
+* the detector's name and OCR engine (e.g. ``"team_kills:glyph"``);
+* the detector's version (``PHASE_VERSION``, ``GAME_TIME_VERSION``, ...
+  next to each detector), so bumping one detector's version only
+  invalidates that detector's entries.
+
+Only measured values are stored: clock predictions and carried HUD
+readings are not detector output.
+
+The database runs in WAL mode with a busy timeout, so several analyzer
+processes (e.g. ``--workers``) can read and write it at once; writes are
+buffered and committed in small batches.  Its size is capped: once the
+live data exceeds *max_bytes*, the least recently used rows are evicted.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import sqlite3
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from wr_analyzer.game_state import PHASE_VERSION, PhaseDecision
+from wr_analyzer.kda import (
+    PLAYER_KDA_VERSION,
+    TEAM_KILLS_VERSION,
+    PlayerKDA,
+    TeamKills,
+)
+from wr_analyzer.result import RESULT_VERSION
+from wr_analyzer.timer import GAME_TIME_VERSION
+
+
+def _optional(cls):
+    """Decoder building *cls* from a stored field list, passing ``None`` through."""
+    return lambda value: None if value is None else cls(*value)
+
+
+def _fields(value) -> list | None:
+    return None if value is None else list(vars(value).values())
+
+
+def _same(value):
+    return value
+
+
+def _reading(encode: Callable, decode: Callable) -> tuple[Callable, Callable]:
+    """Codecs of a ``(value, confidence)`` reading, given *value*'s."""
+    return (
+        lambda reading: [encode(reading[0]), reading[1]],
+        lambda stored: (decode(stored[0]), stored[1]),
+    )
+
+
+# name -> (version, encode to JSON-able, decode from JSON-able)
+DETECTORS: dict[str, tuple[int, Callable, Callable]] = {
+    "phase": (PHASE_VERSION, _fields, _optional(PhaseDecision)),
+    "game_time": (GAME_TIME_VERSION, *_reading(_same, _same)),
+    "team_kills": (TEAM_KILLS_VERSION, *_reading(_fields, _optional(TeamKills))),
+    "player_kda": (PLAYER_KDA_VERSION, *_reading(_fields, _optional(PlayerKDA))),
+    "result": (RESULT_VERSION, *_reading(_same, _same)),
+}
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Evict down to this fraction of max_bytes, so eviction isn't run on
+# every flush once the cache is full.
+_EVICT_TO = 0.9
+
+# Buffered rows that trigger a commit.
+_FLUSH_ROWS = 64
+
+# Fingerprint: this many evenly spaced chunks of this size, plus the size.
+_FINGERPRINT_CHUNKS = 16
+_FINGERPRINT_CHUNK_BYTES = 64 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    video TEXT NOT NULL,
+    pts_ms INTEGER NOT NULL,
+    detector TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    value TEXT NOT NULL,
+    used REAL NOT NULL,
+    PRIMARY KEY (video, pts_ms, detector, version)
+);
+CREATE INDEX IF NOT EXISTS results_used ON results (used);
+"""
+
+
+def video_fingerprint(path: Path | str) -> str:
+    """Return a content fingerprint of the video at *path*.
+
+    Hashes the file size and a fixed number of evenly spaced chunks, so
+    it takes milliseconds even for multi-gigabyte files while still
+    telling different recordings apart.
+    """
+    path = Path(path)
+    size = path.stat().st_size
+    digest = hashlib.blake2b(str(size).encode(), digest_size=16)
+    with open(path, "rb") as f:
+        step = max(size - _FINGERPRINT_CHUNK_BYTES, 0) / (_FINGERPRINT_CHUNKS - 1)
+        for i in range(_FINGERPRINT_CHUNKS):
+            f.seek(int(i * step))
+            digest.update(f.read(_FINGERPRINT_CHUNK_BYTES))
+    return digest.hexdigest()
+
+
+class CachedFrame:
+    """One frame's cached detector results; records what it computes.
+
+    Obtained from :meth:`FrameCache.frame`.
+    """
+
+    def __init__(self, cache: FrameCache, pts_ms: int, values: dict) -> None:
+        self._cache = cache
+        self._pts_ms = pts_ms
+        self._values = values
+
+    def has(self, name: str) -> bool:
+        """Return ``True`` if detector *name*'s result is cached."""
+        return name in self._values
+
+    def get(self, name: str):
+        """Return detector *name*'s cached result (``KeyError`` if absent)."""
+        return self._values[name]
+
+    def get_or_compute(self, name: str, compute: Callable[[], object]):
+        """Return the cached result of *name*, or compute and store it."""
+        if name in self._values:
+            return self._values[name]
+        value = self._values[name] = compute()
+        self._cache._put(self._pts_ms, name, value)
+        return value
+
+
+class FrameCache:
+    """SQLite-backed store of per-frame detector results for one video.
+
+    Parameters
+    ----------
+    path : Path | str
+        Database file; created if missing.
+    video : str
+        The video's :func:`video_fingerprint`.
+    engine : str
+        OCR engine of the run; part of every detector's key.
+    max_bytes : int
+        Size cap on the live data; least recently used rows beyond it
+        are evicted.
+
+    The connection is opened on first use and not pickled, so a cache
+    can be handed to worker processes, each of which opens its own.
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        video: str,
+        *,
+        engine: str = "recognize",
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.path = Path(path)
+        self.video = video
+        self.engine = engine
+        self.max_bytes = max_bytes
+        self._conn: sqlite3.Connection | None = None
+        self._pending: list[tuple] = []
+        self._touched: set[int] = set()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state.update(_conn=None, _pending=[], _touched=set())
+        return state
+
+    def __enter__(self) -> FrameCache:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _key(self, name: str) -> str:
+        return f"{name}:{self.engine}"
+
+    def frame(self, pts_sec: float) -> CachedFrame:
+        """Return the cached results of the frame presented at *pts_sec*."""
+        pts_ms = round(pts_sec * 1000)
+        rows = self._connect().execute(
+            "SELECT detector, version, value FROM results"
+            " WHERE video = ? AND pts_ms = ?",
+            (self.video, pts_ms),
+        )
+        found = {(detector, version): value for detector, version, value in rows}
+        values = {}
+        for name, (version, _, decode) in DETECTORS.items():
+            value = found.get((self._key(name), version))
+            if value is not None:
+                values[name] = decode(json.loads(value))
+        if values:
+            self._touched.add(pts_ms)
+        return CachedFrame(self, pts_ms, values)
+
+    def _put(self, pts_ms: int, name: str, value) -> None:
+        version, encode, _ = DETECTORS[name]
+        self._pending.append(
+            (self.video, pts_ms, self._key(name), version, json.dumps(encode(value)))
+        )
+        if len(self._pending) >= _FLUSH_ROWS:
+            self.flush()
+
+    def flush(self) -> None:
+        """Commit buffered results and access times; evict if over the cap."""
+        if not self._pending and not self._touched:
+            return
+        conn = self._connect()
+        now = time.time()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                [row + (now,) for row in self._pending],
+            )
+            conn.executemany(
+                "UPDATE results SET used = ? WHERE video = ? AND pts_ms = ?",
+                [(now, self.video, pts_ms) for pts_ms in self._touched],
+            )
+        self._pending.clear()
+        self._touched.clear()
+        self._evict(conn)
+
+    def size_bytes(self) -> int:
+        """Return the size of the live (non-free) pages of the database."""
+        conn = self._connect()
+        (page_size,) = conn.execute("PRAGMA page_size").fetchone()
+        (pages,) = conn.execute("PRAGMA page_count").fetchone()
+        (free,) = conn.execute("PRAGMA freelist_count").fetchone()
+        return (pages - free) * page_size
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        size = self.size_bytes()
+        if size <= self.max_bytes:
+            return
+        (rows,) = conn.execute("SELECT COUNT(*) FROM results").fetchone()
+        excess = 1 - self.max_bytes * _EVICT_TO / size
+        with conn:
+            conn.execute(
+                "DELETE FROM results WHERE rowid IN"
+                " (SELECT rowid FROM results ORDER BY used LIMIT ?)",
+                (math.ceil(rows * excess),),
+            )
+
+    def close(self) -> None:
+        """Flush and close the connection (reopened on next use)."""
+        if self._conn is None:
+            return
+        self.flush()
+        self._conn.close()
+        self._conn = None
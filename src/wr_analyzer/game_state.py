@@ -10,21 +10,49 @@ heuristics in each frame:
 * **post_game** — the frame is significantly brighter than a normal
   in-game frame, *or* contains a VICTORY/DEFEAT banner.
 * **unknown** — none of the above matched.
+
+The checks run as a cheap-first cascade (see :func:`classify_game_phase`):
+
+1. ``"pixels"`` — a few grayscale statistics settle the clear cases in
+   about a millisecond: dark loading / champ-select screens, bright
+   stat screens, and frames with a strong kill-score overlay.
+2. ``"timer_ocr"`` — only if the pixels were ambiguous, OCR the clock.
+3. ``"result_ocr"`` — then look for a VICTORY/DEFEAT banner.
+4. ``"fallback"`` — finally the weak HUD-presence heuristic.
+
+The pixel stage is vectorized: :func:`batch_phase_features` computes the
+statistics of a whole stack of frames at once and
+:func:`batch_classify_pixels` labels them, so dense sampling pays the
+Python overhead once per batch.  The per-frame functions are the same
+code on a batch of one.
 """
 
 from __future__ import annotations
 
+from collections.abc import Iterable
+from dataclasses import dataclass
+
 import cv2
 import numpy as np
 
+from wr_analyzer.ocr_plan import TIMER_CROPS, OcrPlan
 from wr_analyzer.regions import KILLS, SCOREBOARD
 from wr_analyzer.result import detect_result
 from wr_analyzer.timer import detect_game_time
 
+# Version of classify_game_phase()'s output.  Bump it whenever a change
+# may alter the decision for the same frame -- including changes to the
+# timer and result detectors it consults -- so cached results are
+# recomputed (see wr_analyzer.frame_cache).
+PHASE_VERSION = 2
+
 # Brightness thresholds (mean grayscale of entire frame).
 _LOADING_BRIGHTNESS_MAX = 40
 _POSTGAME_BRIGHTNESS_MIN = 120
 
+# A scoreboard region darker than this (with a dark frame) means no HUD.
+_LOADING_SCOREBOARD_MAX = 30
+
 # The in-game kills region ("# VS #") has bright white/blue/red text
 # on a dark overlay.  During gameplay the brightest pixel typically
 # exceeds this value; during champ-select or menus it does not.
@@ -35,55 +63,298 @@ _HUD_BRIGHT_PIXEL_MIN = 100
 # non-HUD content.
 _HUD_BRIGHT_FRACTION_MIN = 0.02  # 2%
 
+# Brightest kills-region pixel needed to call in_game without OCR.  The
+# kill score is near-white during play (165+ on the fixtures); the
+# post-game scoreboard's dimmer header reaches ~115.
+_HUD_STRONG_PIXEL_MIN = 150
 
-def _has_hud(frame: np.ndarray) -> bool:
-    """Return ``True`` if the kills HUD region looks like an active game overlay."""
-    kills_gray = cv2.cvtColor(KILLS.crop(frame), cv2.COLOR_BGR2GRAY)
+# Width of the grayscale thumbnails thumbnail_phases() is calibrated on.
+THUMB_WIDTH = 320
 
-    if int(kills_gray.max()) < _HUD_BRIGHT_PIXEL_MIN:
-        return False
+# Brightest kills-region pixel of a thumbnail showing the in-game HUD.
+# Downscaling averages the thin kill-score digits into their dark
+# overlay: at THUMB_WIDTH they peak at 93+ on the fixtures, against ~60
+# for the VICTORY banner and ~15 for champion select.
+_THUMB_HUD_PIXEL_MIN = 85
 
-    bright_count = int(np.sum(kills_gray > 80))
-    bright_frac = bright_count / kills_gray.size
-    return bright_frac >= _HUD_BRIGHT_FRACTION_MIN
+# Confidence of the last-resort heuristic, which OCR could not confirm.
+_FALLBACK_CONFIDENCE = 0.4
 
+# Cascade stages, cheapest first.
+PHASE_STAGES = ("pixels", "timer_ocr", "result_ocr", "fallback")
 
-def detect_game_phase(frame: np.ndarray) -> str:
-    """Return the game phase for *frame*.
+# One record of batch_phase_features() per frame; see PhaseFeatures.
+PHASE_FEATURE_DTYPE = np.dtype(
+    [
+        ("brightness", np.float64),
+        ("scoreboard_mean", np.float64),
+        ("hud_max", np.uint8),
+        ("hud_fraction", np.float64),
+    ]
+)
 
-    Returns one of ``"loading"``, ``"in_game"``, ``"post_game"``, or
-    ``"unknown"``.
+# Frames stacked at a time when batch_phase_features() is given an iterable.
+_FEATURE_CHUNK = 64
+
+
+@dataclass(frozen=True)
+class PhaseFeatures:
+    """Cheap grayscale statistics of a frame used by the cascade.
+
+    One :data:`PHASE_FEATURE_DTYPE` record of :func:`batch_phase_features`
+    as Python values.
     """
-    # If the game timer is readable, we are definitely in-game.
-    if detect_game_time(frame) is not None:
-        return "in_game"
 
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-    mean_brightness = float(gray.mean())
+    brightness: float  # mean of the whole frame
+    scoreboard_mean: float  # mean of the SCOREBOARD region
+    hud_max: int  # brightest pixel of the KILLS region
+    hud_fraction: float  # fraction of KILLS pixels > 80
+
+
+@dataclass(frozen=True)
+class PhaseDecision:
+    """A phase label, how sure the cascade is, and which stage decided.
+
+    *confidence* is in ``[0, 1]``: pixel decisions score 0.5–1.0 by how
+    far the features clear their thresholds, OCR decisions 1.0, the
+    fallback heuristic a fixed 0.4, and ``"unknown"`` 0.
+    """
+
+    phase: str
+    confidence: float
+    stage: str
+
 
-    # The scoreboard region should be populated during gameplay.
-    # A very dark scoreboard region combined with a dark frame indicates
-    # loading / champ-select.
-    sb_crop = cv2.cvtColor(SCOREBOARD.crop(frame), cv2.COLOR_BGR2GRAY)
-    sb_mean = float(sb_crop.mean())
+def batch_phase_features(frames: np.ndarray | Iterable[np.ndarray]) -> np.ndarray:
+    """Compute the cascade's pixel statistics for many frames at once.
 
-    if mean_brightness < _LOADING_BRIGHTNESS_MAX and sb_mean < 30:
-        return "loading"
+    *frames* is a stacked ``(n, h, w, 3)`` BGR or ``(n, h, w)`` grayscale
+    array, or an iterable of same-sized frames, stacked
+    ``_FEATURE_CHUNK`` at a time so memory stays flat.
 
-    # End-of-game stat screens tend to be bright (white/light backgrounds).
-    if mean_brightness > _POSTGAME_BRIGHTNESS_MIN:
-        return "post_game"
+    Returns an ``(n,)`` array of :data:`PHASE_FEATURE_DTYPE` records.
+    """
+    if isinstance(frames, np.ndarray):
+        return _stack_features(frames)
+    parts = [_no_features()]
+    chunk: list[np.ndarray] = []
+    for frame in frames:
+        chunk.append(frame)
+        if len(chunk) == _FEATURE_CHUNK:
+            parts.append(_stack_features(np.stack(chunk)))
+            chunk.clear()
+    if chunk:
+        parts.append(_stack_features(np.stack(chunk)))
+    return np.concatenate(parts)
+
+
+def _no_features() -> np.ndarray:
+    return np.empty(0, dtype=PHASE_FEATURE_DTYPE)
+
+
+def _stack_features(stack: np.ndarray) -> np.ndarray:
+    """Compute the feature records of one stacked batch."""
+    if len(stack) == 0:
+        return _no_features()
+    if stack.ndim == 4:
+        n, h, w, _ = stack.shape
+        # One conversion over the frames laid end to end, bit-identical
+        # to converting them one by one.
+        rows = np.ascontiguousarray(stack).reshape(n * h, w, 3)
+        gray = cv2.cvtColor(rows, cv2.COLOR_BGR2GRAY).reshape(n, h, w)
+    else:
+        gray = stack
+    n, h, w = gray.shape
+    sb = SCOREBOARD.to_pixels(w, h)
+    k = KILLS.to_pixels(w, h)
+    kills = gray[:, k.y : k.y + k.h, k.x : k.x + k.w]
+
+    features = np.empty(n, dtype=PHASE_FEATURE_DTYPE)
+    features["brightness"] = _means(gray)
+    features["scoreboard_mean"] = _means(
+        gray[:, sb.y : sb.y + sb.h, sb.x : sb.x + sb.w]
+    )
+    features["hud_max"] = kills.max(axis=(1, 2))
+    features["hud_fraction"] = np.count_nonzero(kills > 80, axis=(1, 2)) / (k.w * k.h)
+    return features
+
+
+def _means(images: np.ndarray) -> np.ndarray:
+    """Return the mean of each image of a uint8 stack.
+
+    Summing into integers is several times faster than a float mean and
+    exact, so the result is the same.
+    """
+    flat = images.reshape(len(images), -1)
+    # A uint32 sum holds up to 2**32 // 255 pixels of 255.
+    dtype = np.uint32 if flat.shape[1] <= 2**32 // 255 else np.uint64
+    return flat.sum(axis=1, dtype=dtype) / flat.shape[1]
+
+
+def _has_hud(features: np.ndarray) -> np.ndarray:
+    """Return where the kills HUD region looks like an active game overlay."""
+    return (features["hud_max"] >= _HUD_BRIGHT_PIXEL_MIN) & (
+        features["hud_fraction"] >= _HUD_BRIGHT_FRACTION_MIN
+    )
+
+
+def _clearance(*margins: np.ndarray | float) -> np.ndarray:
+    """Map the smallest threshold margin (0 = at the threshold) to 0.5–1.0."""
+    return 0.5 + 0.5 * np.clip(np.minimum.reduce(np.broadcast_arrays(*margins)), 0, 1)
+
+
+def batch_classify_pixels(features: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Run the cascade's first stage on :func:`batch_phase_features` records.
+
+    Returns ``(phases, confidences)``, two ``(n,)`` arrays.  Frames the
+    pixels don't settle -- the ones :func:`classify_game_phase` goes on
+    to OCR -- are ``"unknown"`` with confidence 0.
+    """
+    brightness = features["brightness"]
+    scoreboard_mean = features["scoreboard_mean"]
+    hud_max = features["hud_max"].astype(np.float64)
+    hud_fraction = features["hud_fraction"]
+
+    phases = np.full(len(features), "unknown", dtype=object)
+    confidences = np.zeros(len(features))
+
+    # Assigned in reverse cascade order, so the earlier checks win.
+    in_game = (
+        (hud_max >= _HUD_STRONG_PIXEL_MIN)
+        & (hud_fraction >= _HUD_BRIGHT_FRACTION_MIN)
+        & (brightness <= _POSTGAME_BRIGHTNESS_MIN)
+    )
+    phases[in_game] = "in_game"
+    confidences[in_game] = _clearance(
+        (hud_max[in_game] - _HUD_STRONG_PIXEL_MIN) / 50,
+        (hud_fraction[in_game] - _HUD_BRIGHT_FRACTION_MIN) / _HUD_BRIGHT_FRACTION_MIN,
+    )
+
+    post_game = (brightness > _POSTGAME_BRIGHTNESS_MIN) & ~_has_hud(features)
+    phases[post_game] = "post_game"
+    confidences[post_game] = _clearance(
+        (brightness[post_game] - _POSTGAME_BRIGHTNESS_MIN) / 60
+    )
+
+    loading = (brightness < _LOADING_BRIGHTNESS_MAX) & (
+        scoreboard_mean < _LOADING_SCOREBOARD_MAX
+    )
+    phases[loading] = "loading"
+    confidences[loading] = _clearance(
+        1 - brightness[loading] / _LOADING_BRIGHTNESS_MAX,
+        1 - scoreboard_mean[loading] / _LOADING_SCOREBOARD_MAX,
+    )
+    return phases, confidences
+
+
+def _plan_features(plan: OcrPlan) -> np.ndarray:
+    """Return the one-record feature array of the frame of *plan*."""
+    return batch_phase_features(plan.gray()[np.newaxis])
+
+
+def phase_features(plan: OcrPlan) -> PhaseFeatures:
+    """Compute the cascade's pixel statistics from the frame's context."""
+    (record,) = _plan_features(plan)
+    return PhaseFeatures(
+        brightness=float(record["brightness"]),
+        scoreboard_mean=float(record["scoreboard_mean"]),
+        hud_max=int(record["hud_max"]),
+        hud_fraction=float(record["hud_fraction"]),
+    )
+
+
+def _pixel_decision(features: np.ndarray) -> PhaseDecision | None:
+    phases, confidences = batch_classify_pixels(features)
+    if phases[0] == "unknown":
+        return None
+    return PhaseDecision(phases[0], float(confidences[0]), "pixels")
+
+
+def classify_pixels(plan: OcrPlan) -> PhaseDecision | None:
+    """Run the cascade's first stage: decide from pixel statistics alone.
+
+    Returns ``None`` when the frame is ambiguous and needs OCR.
+    """
+    return _pixel_decision(_plan_features(plan))
+
+
+def thumbnail_phases(thumbs: np.ndarray) -> np.ndarray:
+    """Classify a stack of grayscale thumbnails from pixel statistics alone.
+
+    *thumbs* is an ``(n, h, w)`` uint8 array of frames :data:`THUMB_WIDTH`
+    pixels wide.  Their :func:`batch_phase_features` are labelled
+    ``"loading"`` for dark frames with a dark scoreboard, ``"in_game"``
+    where the kills region shows the HUD, ``"post_game"`` for bright
+    frames without it, and ``"unknown"`` otherwise (there is no OCR to
+    settle those).
+
+    Returns an ``(n,)`` array of phase names.
+    """
+    features = batch_phase_features(thumbs)
+    brightness = features["brightness"]
+    hud = features["hud_max"] >= _THUMB_HUD_PIXEL_MIN
+
+    phases = np.full(len(thumbs), "unknown", dtype=object)
+    phases[(brightness > _POSTGAME_BRIGHTNESS_MIN) & ~hud] = "post_game"
+    phases[(brightness <= _POSTGAME_BRIGHTNESS_MIN) & hud] = "in_game"
+    phases[
+        (brightness < _LOADING_BRIGHTNESS_MAX)
+        & (features["scoreboard_mean"] < _LOADING_SCOREBOARD_MAX)
+    ] = "loading"
+    return phases
+
+
+def classify_game_phase(
+    frame: np.ndarray, *, engine: str = "recognize", plan: OcrPlan | None = None
+) -> PhaseDecision:
+    """Classify *frame* with the cheap-first cascade.
+
+    OCR only runs when the pixel statistics are ambiguous.  *engine*
+    selects the OCR engine for the timer check; pass the frame's *plan*
+    to share its crops and OCR results with the extractors.
+    """
+    if plan is None:
+        plan = OcrPlan(frame, TIMER_CROPS, engine=engine)
+
+    features = _plan_features(plan)
+    decision = _pixel_decision(features)
+    if decision is not None:
+        return decision
+    brightness = float(features["brightness"][0])
+
+    # If the game timer is readable, we are definitely in-game.
+    if detect_game_time(frame, plan=plan) is not None:
+        return PhaseDecision("in_game", 1.0, "timer_ocr")
+
+    # End-of-game stat screens tend to be bright (white/light backgrounds);
+    # with a HUD-like kills region that needed the timer ruled out first.
+    if brightness > _POSTGAME_BRIGHTNESS_MIN:
+        confidence = float(_clearance((brightness - _POSTGAME_BRIGHTNESS_MIN) / 60))
+        return PhaseDecision("post_game", confidence, "timer_ocr")
 
     # The VICTORY/DEFEAT banner appears on post-game screens that aren't
     # necessarily bright overall (e.g. the scoreboard or animated banner).
-    # Only run this OCR check when simpler heuristics haven't matched.
-    if detect_result(frame) is not None:
-        return "post_game"
+    if detect_result(frame, plan=plan) is not None:
+        return PhaseDecision("post_game", 1.0, "result_ocr")
 
     # Fallback: if the kills HUD region contains bright pixels typical of
     # the in-game overlay, classify as in_game even when OCR couldn't
     # read the exact timer text.
-    if _has_hud(frame):
-        return "in_game"
+    if _has_hud(features)[0]:
+        return PhaseDecision("in_game", _FALLBACK_CONFIDENCE, "fallback")
+
+    return PhaseDecision("unknown", 0.0, "fallback")
+
+
+def detect_game_phase(
+    frame: np.ndarray, *, engine: str = "recognize", plan: OcrPlan | None = None
+) -> str:
+    """Return the game phase for *frame*.
 
-    return "unknown"
+    See :func:`classify_game_phase` for the cascade and the meaning of
+    *engine* and *plan*.
+
+    Returns one of ``"loading"``, ``"in_game"``, ``"post_game"``, or
+    ``"unknown"``.
+    """
+    return classify_game_phase(frame, engine=engine, plan=plan).phase
@@ -0,0 +1,389 @@
+"""Template-matching OCR for the fixed HUD font.
+
+The game clock, kill score and KDA are always drawn in the same small
+font, so a deep text recognizer is more than they need.  This module
+reads them by matching glyphs against a bank of templates:
+
+1. **Ink** — the crop's brightest colour channel (so red and blue digits
+   are as bright as white ones) is upscaled and top-hat filtered, which
+   keeps thin bright strokes and drops large bright areas such as icons.
+2. **Segmentation** — connected components of the thresholded ink.  The
+   text line is the band of similar-height components with the most ink;
+   components touching the crop's sides (cut-off neighbours) are dropped,
+   pairs of dots become ``:``, and components too wide for one glyph
+   (touching digits) are split at their thinnest columns.
+3. **Classification** — every glyph is scaled to :data:`GLYPH_SIZE`,
+   normalised, and correlated against all templates at once with a
+   single matrix product.
+
+The default bank (``glyphs.npz`` next to this module) is harvested from
+the labelled fixture frames by ``tests/build_glyphs.py``;
+:meth:`GlyphBank.from_samples` builds one from any labelled crops.
+
+Exposed as the ``"glyph"`` OCR engine (see
+:data:`wr_analyzer.ocr.OCR_ENGINES`).
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from wr_analyzer.regions import PixelBox
+
+# Template height and width, in pixels.
+GLYPH_SIZE = (12, 12)
+
+# Default template bank, rebuilt by tests/build_glyphs.py.
+DEFAULT_BANK_PATH = Path(__file__).resolve().parent / "glyphs.npz"
+
+# Segmentation works on the crop upscaled by this factor.
+_UPSCALE = 3
+
+# Top-hat kernel: wider than a stroke, narrower than an icon.
+_TOPHAT_KERNEL = cv2.getStructuringElement(cv2.MORPH_RECT, (5 * _UPSCALE,) * 2)
+
+# Ink above this fraction of the crop's near-maximum ink is foreground.
+_INK_THRESHOLD = 0.45
+
+# Components shorter than this (upscaled px) can't anchor a text line.
+_MIN_LINE_HEIGHT = 4 * _UPSCALE
+
+# A glyph narrower than this many line heights is never split.
+_MAX_GLYPH_ASPECT = 0.95
+
+# Width of one glyph, in line heights, used to guess how many touch.
+_GLYPH_ASPECT = 0.62
+
+# Correlation gain a non-default split of touching glyphs must show.
+_SPLIT_MARGIN = 0.05
+
+# A horizontal gap wider than this many line heights becomes a space.
+_SPACE_GAP = 0.45
+
+# Glyphs correlating worse than this with every template read as "?".
+_MIN_SCORE = 0.5
+
+
+class GlyphBank:
+    """Labelled glyph templates.
+
+    Parameters
+    ----------
+    templates : np.ndarray
+        ``(n, h, w)`` template images, :data:`GLYPH_SIZE` each.
+    labels : sequence of str
+        The character each template shows.
+    """
+
+    def __init__(self, templates: np.ndarray, labels) -> None:
+        if len(templates) != len(labels):
+            raise ValueError("templates and labels differ in length")
+        self.templates = np.asarray(templates, dtype=np.uint8)
+        self.labels = np.asarray(list(labels), dtype="<U1")
+        self._vectors = _normalise(self.templates.reshape(len(self.templates), -1))
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    @classmethod
+    def load(cls, path: str | Path = DEFAULT_BANK_PATH) -> GlyphBank:
+        """Load a bank saved by :meth:`save`."""
+        with np.load(path) as data:
+            return cls(data["templates"], data["labels"])
+
+    def save(self, path: str | Path) -> None:
+        """Write the bank to *path* (``.npz``)."""
+        np.savez_compressed(path, templates=self.templates, labels=self.labels)
+
+    @classmethod
+    def from_samples(
+        cls, samples: Iterable[tuple[np.ndarray, str]]
+    ) -> tuple[GlyphBank, int]:
+        """Harvest templates from labelled crops.
+
+        *samples* yields ``(crop, text)`` pairs, e.g. a timer crop and
+        ``"17:35"``.  Each crop is segmented as :func:`read_glyphs` would;
+        if the glyphs line up with the text's characters (spaces ignored,
+        and ``:`` / ``/`` optional since they are faint) every glyph
+        becomes a template for its character.
+
+        Returns the bank and the number of samples that were skipped
+        because their segmentation did not match the label.
+        """
+        templates: list[np.ndarray] = []
+        labels: list[str] = []
+        skipped = 0
+        for crop, text in samples:
+            ink = _ink(crop)
+            glyphs = segment_glyphs(crop, ink=ink)
+            chars = _align(text.replace(" ", ""), glyphs)
+            if chars is None:
+                skipped += 1
+                continue
+            for (box, found), char in zip(glyphs, chars):
+                if found is None:
+                    templates.append(_glyph_image(ink, box))
+                    labels.append(char)
+
+        # The fixtures never show a 6; the font's 6 is a 9 turned upside down.
+        for have, missing in (("9", "6"), ("6", "9")):
+            if missing not in labels:
+                flipped = [
+                    t[::-1, ::-1] for t, c in zip(templates, labels) if c == have
+                ]
+                templates += flipped
+                labels += [missing] * len(flipped)
+        return cls(np.array(templates).reshape(-1, *GLYPH_SIZE), labels), skipped
+
+    def classify(
+        self, images: np.ndarray, allowlist: str | None = None
+    ) -> tuple[list[str], np.ndarray]:
+        """Return the best label and its correlation for each glyph image.
+
+        *images* is ``(m, h, w)`` at :data:`GLYPH_SIZE`.  Only templates
+        whose label is in *allowlist* (if given) are considered.
+        """
+        vectors = self._vectors
+        labels = self.labels
+        if allowlist is not None:
+            keep = np.isin(labels, list(allowlist))
+            vectors, labels = vectors[keep], labels[keep]
+        if len(images) == 0 or len(labels) == 0:
+            return ["?"] * len(images), np.zeros(len(images), dtype=np.float32)
+
+        scores = _normalise(images.reshape(len(images), -1)) @ vectors.T
+        best = scores.argmax(axis=1)
+        return list(labels[best]), scores[np.arange(len(images)), best]
+
+
+def _align(chars: str, glyphs: list[tuple[PixelBox, str | None]]) -> str | None:
+    """Match a label to its glyphs, allowing faint separators to be missed.
+
+    Colons found from their dots must line up with colons in the label.
+    """
+    for drop in ("", "/", ":", ":/"):
+        trimmed = "".join(c for c in chars if c not in drop)
+        if len(trimmed) == len(glyphs) and all(
+            (found == ":") == (char == ":")
+            for (_, found), char in zip(glyphs, trimmed)
+            if found is not None
+        ):
+            return trimmed
+    return None
+
+
+_default_bank: GlyphBank | None = None
+
+
+def _get_default_bank() -> GlyphBank:
+    global _default_bank
+    if _default_bank is None:
+        _default_bank = GlyphBank.load(DEFAULT_BANK_PATH)
+    return _default_bank
+
+
+def _normalise(vectors: np.ndarray) -> np.ndarray:
+    """Zero-mean, unit-norm rows, so a dot product is a correlation."""
+    vectors = vectors.astype(np.float32)
+    vectors -= vectors.mean(axis=1, keepdims=True)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-6)
+
+
+def _ink(image: np.ndarray) -> np.ndarray:
+    """Return the upscaled, top-hat filtered brightness of a BGR/gray crop."""
+    value = image.max(axis=2) if image.ndim == 3 else image
+    value = cv2.resize(
+        value, None, fx=_UPSCALE, fy=_UPSCALE, interpolation=cv2.INTER_CUBIC
+    )
+    return cv2.morphologyEx(value, cv2.MORPH_TOPHAT, _TOPHAT_KERNEL)
+
+
+def _glyph_image(ink: np.ndarray, box: PixelBox) -> np.ndarray:
+    """Scale the ink in *box* to the line's glyph height, centred in a template."""
+    th, tw = GLYPH_SIZE
+    patch = ink[box.y : box.y + box.h, box.x : box.x + box.w]
+    w = max(1, min(tw, round(box.w * th / box.h)))
+    patch = cv2.resize(patch, (w, th), interpolation=cv2.INTER_AREA)
+    out = np.zeros(GLYPH_SIZE, dtype=np.uint8)
+    x = (tw - w) // 2
+    out[:, x : x + w] = patch
+    return out
+
+
+def _find_line(stats: np.ndarray) -> tuple[int, int, float] | None:
+    """Return ``(top, bottom, height)`` of the text line among components."""
+    best = None
+    for x, y, w, h, area in stats:
+        if h < _MIN_LINE_HEIGHT:
+            continue
+        centre = y + h / 2
+        members = [
+            s
+            for s in stats
+            if abs(s[3] - h) <= 0.3 * h and abs(s[1] + s[3] / 2 - centre) <= 0.3 * h
+        ]
+        score = sum(int(s[4]) for s in members)
+        if best is None or score > best[0]:
+            best = (score, members)
+    if best is None:
+        return None
+    members = best[1]
+    top = min(int(s[1]) for s in members)
+    bottom = max(int(s[1] + s[3]) for s in members)
+    # The digits are the line's tallest glyphs; letters and slashes are shorter.
+    return top, bottom, float(max(s[3] for s in members))
+
+
+def _split(ink: np.ndarray, box: PixelBox, parts: int) -> list[PixelBox]:
+    """Cut *box* into *parts* glyphs at the thinnest columns near even spacing."""
+    profile = ink[box.y : box.y + box.h, box.x : box.x + box.w].sum(axis=0)
+    cuts = [0]
+    for i in range(1, parts):
+        guess = box.w * i // parts
+        lo = max(cuts[-1] + 1, guess - box.w // (3 * parts))
+        hi = min(box.w - 1, guess + box.w // (3 * parts) + 1)
+        cuts.append(lo + int(profile[lo:hi].argmin()) if hi > lo else guess)
+    cuts.append(box.w)
+    return [
+        PixelBox(box.x + a, box.y, b - a, box.h)
+        for a, b in zip(cuts, cuts[1:])
+        if b > a
+    ]
+
+
+def segment_glyphs(
+    image: np.ndarray,
+    *,
+    ink: np.ndarray | None = None,
+    bank: GlyphBank | None = None,
+    allowlist: str | None = None,
+) -> list[tuple[PixelBox, str | None]]:
+    """Find the glyphs of *image*'s text line, left to right.
+
+    Returns ``(box, char)`` pairs, with boxes in the upscaled ink image.
+    *char* is ``":"`` for a colon found from its dots and ``None`` for
+    glyphs still to be classified.  Touching glyphs are split into the
+    number of parts that *bank* (if given) classifies best.
+    """
+    if ink is None:
+        ink = _ink(image)
+    cutoff = _INK_THRESHOLD * float(np.percentile(ink, 99.5))
+    mask = (ink > max(cutoff, 1.0)).astype(np.uint8)
+    _, _, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=4)
+    width = ink.shape[1]
+    stats = [
+        s
+        for s in stats[1:]
+        if s[4] >= 2 * _UPSCALE * _UPSCALE and s[0] > 0 and s[0] + s[2] < width
+    ]
+    line = _find_line(stats)
+    if line is None:
+        return []
+    top, bottom, height = line
+
+    glyphs: list[tuple[PixelBox, str | None]] = []
+    dots: list[PixelBox] = []
+    for x, y, w, h, _area in sorted(stats, key=lambda s: s[0]):
+        box = PixelBox(int(x), int(y), int(w), int(h))
+        if y + h / 2 < top or y + h / 2 > bottom:
+            continue
+        if h < 0.45 * height:
+            if w < 0.45 * height:
+                dots.append(box)
+            continue
+        if h < 0.6 * height:
+            continue
+        if w <= _MAX_GLYPH_ASPECT * height:
+            glyphs.append((box, None))
+            continue
+        guess = max(2, round(w / (_GLYPH_ASPECT * height)))
+        options = [_split(ink, box, n) for n in (guess - 1, guess, guess + 1) if n > 1]
+        parts = options[1 if len(options) > 2 else 0]
+        if bank is not None:
+            # Another cut only wins if it fits the templates clearly better.
+            best = _mean_score(ink, parts, bank, allowlist) + _SPLIT_MARGIN
+            for option in options:
+                score = _mean_score(ink, option, bank, allowlist)
+                if score > best:
+                    parts, best = option, score
+        glyphs.extend((part, None) for part in parts)
+
+    # Two dots stacked in one column read as a colon.
+    for i, a in enumerate(dots):
+        for b in dots[i + 1 :]:
+            if abs(a.x - b.x) <= a.w and a.y != b.y:
+                colon = PixelBox(
+                    min(a.x, b.x), min(a.y, b.y), a.w, abs(a.y - b.y) + a.h
+                )
+                glyphs.append((colon, ":"))
+                break
+    glyphs.sort(key=lambda g: g[0].x)
+    return glyphs
+
+
+def _mean_score(
+    ink: np.ndarray, boxes: list[PixelBox], bank: GlyphBank, allowlist: str | None
+) -> float:
+    images = np.stack([_glyph_image(ink, b) for b in boxes])
+    return float(bank.classify(images, allowlist)[1].mean())
+
+
+def read_glyphs(
+    image: np.ndarray, allowlist: str | None = None, *, bank: GlyphBank | None = None
+) -> str:
+    """Read the HUD text in a BGR or grayscale crop by template matching.
+
+    Glyphs separated by a wide gap are joined with a space, and a glyph
+    that matches no template well reads as ``"?"``, so the detectors'
+    regexes reject it.  *bank* defaults to the bundled templates.
+    """
+    return read_glyph_result(image, allowlist, bank=bank)[0]
+
+
+def read_glyph_result(
+    image: np.ndarray, allowlist: str | None = None, *, bank: GlyphBank | None = None
+) -> tuple[str, float, PixelBox | None]:
+    """Read a crop as :func:`read_glyphs` does; also score and locate the text.
+
+    Returns ``(text, confidence, box)``: the confidence is the worst
+    template correlation of the classified glyphs (clipped to 0-1, 0 if
+    there are none) and the box surrounds all glyphs, in *image*'s
+    pixels (``None`` if nothing was found).
+    """
+    if bank is None:
+        bank = _get_default_bank()
+    ink = _ink(image)
+    glyphs = segment_glyphs(image, ink=ink, bank=bank, allowlist=allowlist)
+    if not glyphs:
+        return "", 0.0, None
+
+    unread = [box for box, char in glyphs if char is None]
+    chars: list[str] = []
+    confidence = 0.0
+    if unread:
+        images = np.stack([_glyph_image(ink, box) for box in unread])
+        labels, scores = bank.classify(images, allowlist)
+        chars = [c if s >= _MIN_SCORE else "?" for c, s in zip(labels, scores)]
+        confidence = float(np.clip(scores.min(), 0.0, 1.0))
+    read = iter(chars)
+
+    height = np.median([box.h for box, char in glyphs if char is None] or [1])
+    text = []
+    prev_end = None
+    for box, char in glyphs:
+        if prev_end is not None and box.x - prev_end > _SPACE_GAP * height:
+            text.append(" ")
+        text.append(char if char is not None else next(read))
+        prev_end = box.x + box.w
+
+    # Glyph boxes are in the upscaled ink image.
+    x0 = min(box.x for box, _ in glyphs) // _UPSCALE
+    y0 = min(box.y for box, _ in glyphs) // _UPSCALE
+    x1 = -(-max(box.x + box.w for box, _ in glyphs) // _UPSCALE)
+    y1 = -(-max(box.y + box.h for box, _ in glyphs) // _UPSCALE)
+    return "".join(text), confidence, PixelBox(x0, y0, x1 - x0, y1 - y0)
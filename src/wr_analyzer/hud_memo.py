@@ -0,0 +1,112 @@
+"""Carry HUD readings forward while their crop looks unchanged.
+
+The kill score and KDA change a few dozen times per game, yet every
+in-game frame would OCR them.  A :class:`HudMemo` remembers, per
+region, the last successful reading together with an "ink" signature of
+the crop it came from; while later crops still match that signature the
+reading is carried forward without OCR.  A maximum reuse age forces a
+periodic re-read regardless.
+
+The HUD is translucent, so the raw pixels change with the game world
+behind it.  The signature keeps only thin bright strokes (a top-hat of
+the brightest channel, as :mod:`wr_analyzer.glyphs` does) in the text
+line, and :func:`change_score` compares it column block by column
+block, so that one changed digit isn't averaged away by the rest of the
+line.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import cv2
+import numpy as np
+
+from wr_analyzer.regions import Region
+
+if TYPE_CHECKING:
+    from wr_analyzer.ocr_plan import OcrPlan
+
+# change_score() above which a crop counts as changed.  Over every pair
+# of fixture frames, crops showing the same value score at most 0.177
+# (kills) and 0.145 (KDA); different values at least 0.225 and 0.235.
+# 0.2 sits midway in the narrower, kills gap.  Sweeping the signature
+# (_BLOCKS 4-12, _INK_FLOOR 20-60, _TEXT_BAND 0.6-0.8, top-hat 3-7 px),
+# or making the score shift-tolerant or binarized, did not widen that
+# gap beyond ~1.3x, so the margin is guarded by the tests instead.  A
+# change missed carries a stale value until max_age_sec forces a read;
+# a false change only costs the OCR.
+CHANGE_THRESHOLD = 0.2
+
+# Top fraction of a crop holding the text line.  Below it are the edge
+# of the overlay (kills) and the ping / FPS readout (KDA), which changes
+# all the time.
+_TEXT_BAND = 0.7
+
+# Top-hat size and the faint-texture floor subtracted from the ink.
+_TOPHAT_KERNEL = cv2.getStructuringElement(cv2.MORPH_RECT, (5, 5))
+_INK_FLOOR = 30
+
+# Column blocks compared separately, about one per glyph.
+_BLOCKS = 6
+
+
+def ink_signature(crop: np.ndarray) -> np.ndarray:
+    """Return the text-line ink of a BGR *crop* as a float32 array."""
+    band = crop[: max(1, round(crop.shape[0] * _TEXT_BAND))]
+    ink = cv2.morphologyEx(band.max(axis=2), cv2.MORPH_TOPHAT, _TOPHAT_KERNEL)
+    return np.clip(ink.astype(np.float32) - _INK_FLOOR, 0, None)
+
+
+def change_score(a: np.ndarray, b: np.ndarray) -> float:
+    """Return how much two ink signatures differ (0 = identical).
+
+    The largest per-block absolute difference, relative to the mean
+    total ink of the two.
+    """
+    if a.shape != b.shape:
+        return float("inf")
+    column_diff = np.abs(a - b).sum(axis=0)
+    worst = max(block.sum() for block in np.array_split(column_diff, _BLOCKS))
+    return float(worst / max((a.sum() + b.sum()) / 2, 1.0))
+
+
+class HudMemo:
+    """Last successful reading and crop signature of each HUD region.
+
+    Parameters
+    ----------
+    max_age_sec : float
+        Longest stretch of video a reading is carried before the region
+        is read again, changed or not.
+    threshold : float
+        :func:`change_score` above which a crop counts as changed.
+    """
+
+    def __init__(
+        self, max_age_sec: float = 60.0, *, threshold: float = CHANGE_THRESHOLD
+    ) -> None:
+        if max_age_sec <= 0:
+            raise ValueError(f"max_age_sec must be > 0, got {max_age_sec}")
+        self.max_age_sec = max_age_sec
+        self.threshold = threshold
+        self._readings: dict[Region, tuple[float, np.ndarray, object]] = {}
+
+    def carry(self, region: Region, plan: OcrPlan, video_sec: float):
+        """Return the reading to carry to this frame, or ``None`` to OCR."""
+        entry = self._readings.get(region)
+        if entry is None:
+            return None
+        read_sec, signature, value = entry
+        if not 0 <= video_sec - read_sec <= self.max_age_sec:
+            return None
+        score = change_score(plan.ink(region), signature)
+        return value if score <= self.threshold else None
+
+    def store(self, region: Region, plan: OcrPlan, video_sec: float, value) -> None:
+        """Remember a successful reading of *region* from this frame."""
+        self._readings[region] = (video_sec, plan.ink(region), value)
+
+    def interrupt(self) -> None:
+        """Forget everything, e.g. on leaving play."""
+        self._readings.clear()
@@ -0,0 +1,134 @@
+"""Append-only journal of analysed frames, for resuming a run.
+
+:func:`wr_analyzer.analyze.analyze_video` only returns at the end, so a
+crash or preemption hours into a long VOD would lose everything.  With a
+journal, every frame is appended to a JSON Lines file as soon as it is
+analysed: a header line with the run's settings, then one record per
+frame, tagged with the stage that produced it (the uniform pass or
+refinement).  A resumed run reads the records back and continues after
+them instead of analysing those frames again.
+
+A run killed mid-write may leave a torn last line; it is dropped (and
+that frame analysed again).  Lines are flushed to the OS as they are
+written, which survives the process being killed; they are synced to
+disk every few seconds, which bounds what a machine crash can lose.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+
+JOURNAL_VERSION = 1
+
+# Longest time between fsyncs of the journal.
+_SYNC_SEC = 5.0
+
+
+def journal_path(video_path: Path | str) -> Path:
+    """Return the default journal path of a video (a sidecar file)."""
+    video_path = Path(video_path)
+    return video_path.with_name(video_path.name + ".journal.jsonl")
+
+
+class Journal:
+    """An open journal of one analysis run.
+
+    Parameters
+    ----------
+    path : Path | str
+        Journal file.
+    settings : dict
+        JSON-able settings the frames depend on (video, interval, ...).
+        A journal written with other settings can't be resumed.
+    resume : bool
+        Keep the records of an existing journal at *path* (available on
+        :attr:`replayed`) and append after them.  Otherwise, or if there
+        is none, the journal starts empty.
+
+    Attributes
+    ----------
+    replayed : dict[str, list[dict]]
+        Frame records of the earlier run, by stage, in the order they
+        were written.
+
+    Raises
+    ------
+    ValueError
+        If resuming a journal written with different settings, or one
+        that is corrupt before its last line.
+    """
+
+    def __init__(
+        self, path: Path | str, settings: dict, *, resume: bool = False
+    ) -> None:
+        self.path = Path(path)
+        self.settings = settings
+        self.replayed: dict[str, list[dict]] = {}
+        if resume and self.path.exists():
+            self._load()
+            self._file = open(self.path, "a", encoding="utf-8")
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "w", encoding="utf-8")
+            self._write({"journal": JOURNAL_VERSION, "settings": settings})
+            self._sync()
+        self._synced = time.monotonic()
+
+    def __enter__(self) -> Journal:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def _load(self) -> None:
+        data = self.path.read_bytes()
+        complete = data.rfind(b"\n") + 1
+        if complete < len(data):
+            # Torn last line: drop it so appended records start cleanly.
+            with open(self.path, "r+b") as f:
+                f.truncate(complete)
+        lines = data[:complete].decode("utf-8").splitlines()
+        try:
+            header = json.loads(lines[0]) if lines else {}
+            records = [json.loads(line) for line in lines[1:]]
+        except json.JSONDecodeError as err:
+            raise ValueError(f"Corrupt journal {self.path}: {err}") from None
+        if header.get("journal") != JOURNAL_VERSION:
+            raise ValueError(f"{self.path} is not a version {JOURNAL_VERSION} journal")
+        written = header["settings"]
+        if written != self.settings:
+            changed = sorted(
+                key
+                for key in written.keys() | self.settings.keys()
+                if written.get(key) != self.settings.get(key)
+            )
+            raise ValueError(
+                f"{self.path} was written with different settings "
+                f"({', '.join(changed)}); start a new run instead of resuming"
+            )
+        for record in records:
+            self.replayed.setdefault(record.pop("stage"), []).append(record)
+
+    def _write(self, record: dict) -> None:
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+
+    def _sync(self) -> None:
+        os.fsync(self._file.fileno())
+        self._synced = time.monotonic()
+
+    def append(self, stage: str, record: dict) -> None:
+        """Append a JSON-able frame *record* produced by *stage*."""
+        self._write({"stage": stage, **record})
+        if time.monotonic() - self._synced >= _SYNC_SEC:
+            self._sync()
+
+    def close(self) -> None:
+        """Sync and close the journal."""
+        if self._file.closed:
+            return
+        self._sync()
+        self._file.close()
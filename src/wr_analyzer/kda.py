@@ -7,8 +7,13 @@ from dataclasses import dataclass
 
 import numpy as np
 
-from wr_analyzer.ocr import ocr_easyocr, preprocess_clahe
-from wr_analyzer.regions import KILLS, PLAYER_KDA, SCOREBOARD
+from wr_analyzer.ocr_plan import KDA_CROPS, KILLS_CROPS, OcrPlan, read_confident
+
+# Versions of read_team_kills() / read_player_kda()'s output.  Bump
+# one whenever a change may alter its result for the same frame, so
+# cached results are recomputed (see wr_analyzer.frame_cache).
+TEAM_KILLS_VERSION = 3
+PLAYER_KDA_VERSION = 3
 
 # "# VS #" — V may OCR as V/v, S may OCR as 5/8/s/Y.
 # Limited to 2-digit numbers: no real game reaches 100 kills per team.
@@ -46,62 +51,77 @@ def _valid_kills(m: re.Match) -> TeamKills | None:
     return TeamKills(blue=blue, red=red)
 
 
-def _ocr_kills_text(crop: np.ndarray, scale: int = 4) -> str:
-    """CLAHE-preprocess a crop and OCR it with EasyOCR, returning joined text."""
-    enhanced = preprocess_clahe(crop, scale=scale)
-    parts = ocr_easyocr(enhanced)
-    return " ".join(parts)
+def _parse_kills(text: str) -> TeamKills | None:
+    m = _KILLS_RE.search(text)
+    return None if m is None else _valid_kills(m)
+
+
+def _parse_kda(text: str) -> PlayerKDA | None:
+    m = _KDA_RE.search(text)
+    if m is None:
+        return None
+    return PlayerKDA(
+        kills=int(m.group(1)),
+        deaths=int(m.group(2)),
+        assists=int(m.group(3)),
+    )
+
+
+def read_team_kills(
+    frame: np.ndarray, *, engine: str = "recognize", plan: OcrPlan | None = None
+) -> tuple[TeamKills | None, float | None]:
+    """Read team kill scores (``# VS #``) from a frame, with the OCR's confidence.
+
+    Tries the focused kills region, then the broader scoreboard unless
+    the former parsed confidently (see
+    :func:`~wr_analyzer.ocr_plan.read_confident`).  *engine* selects the
+    OCR engine; pass the frame's *plan* to share one batched OCR pass
+    with the other HUD detectors.
+
+    Returns ``(kills, confidence)``, or ``(None, None)`` if the pattern
+    is not detected.
+    """
+    if plan is None:
+        plan = OcrPlan(frame, KILLS_CROPS, engine=engine)
+    return read_confident(plan, KILLS_CROPS, _parse_kills)
 
 
-def detect_team_kills(frame: np.ndarray) -> TeamKills | None:
+def detect_team_kills(
+    frame: np.ndarray, *, engine: str = "recognize", plan: OcrPlan | None = None
+) -> TeamKills | None:
     """Extract team kill scores (``# VS #``) from a frame.
 
-    Returns ``None`` if the pattern is not detected.
+    :func:`read_team_kills` without the confidence.  Returns ``None`` if
+    the pattern is not detected.
     """
-    # Try focused kills region with CLAHE + EasyOCR.
-    crop = KILLS.crop(frame)
-    text = _ocr_kills_text(crop, scale=4)
-    m = _KILLS_RE.search(text)
-    if m:
-        result = _valid_kills(m)
-        if result is not None:
-            return result
-
-    # Fallback: broader scoreboard region.
-    crop = SCOREBOARD.crop(frame)
-    text = _ocr_kills_text(crop, scale=3)
-    m = _KILLS_RE.search(text)
-    if m:
-        return _valid_kills(m)
+    return read_team_kills(frame, engine=engine, plan=plan)[0]
+
 
-    return None
+def read_player_kda(
+    frame: np.ndarray, *, engine: str = "recognize", plan: OcrPlan | None = None
+) -> tuple[PlayerKDA | None, float | None]:
+    """Read player KDA (``K/D/A``) from a frame, with the OCR's confidence.
 
+    Tries the focused KDA region, then the broader scoreboard unless the
+    former parsed confidently (see
+    :func:`~wr_analyzer.ocr_plan.read_confident`).  *engine* selects the
+    OCR engine; pass the frame's *plan* to share one batched OCR pass
+    with the other HUD detectors.
+
+    Returns ``(kda, confidence)``, or ``(None, None)`` if the pattern is
+    not detected.
+    """
+    if plan is None:
+        plan = OcrPlan(frame, KDA_CROPS, engine=engine)
+    return read_confident(plan, KDA_CROPS, _parse_kda)
 
-def detect_player_kda(frame: np.ndarray) -> PlayerKDA | None:
+
+def detect_player_kda(
+    frame: np.ndarray, *, engine: str = "recognize", plan: OcrPlan | None = None
+) -> PlayerKDA | None:
     """Extract player KDA (``K/D/A``) from a frame.
 
-    Returns ``None`` if the pattern is not detected.
+    :func:`read_player_kda` without the confidence.  Returns ``None`` if
+    the pattern is not detected.
     """
-    # Try focused KDA region.
-    crop = PLAYER_KDA.crop(frame)
-    text = _ocr_kills_text(crop, scale=4)
-    m = _KDA_RE.search(text)
-    if m:
-        return PlayerKDA(
-            kills=int(m.group(1)),
-            deaths=int(m.group(2)),
-            assists=int(m.group(3)),
-        )
-
-    # Fallback: broader scoreboard region.
-    crop = SCOREBOARD.crop(frame)
-    text = _ocr_kills_text(crop, scale=3)
-    m = _KDA_RE.search(text)
-    if m:
-        return PlayerKDA(
-            kills=int(m.group(1)),
-            deaths=int(m.group(2)),
-            assists=int(m.group(3)),
-        )
-
-    return None
+    return read_player_kda(frame, engine=engine, plan=plan)[0]
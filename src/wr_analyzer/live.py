@@ -0,0 +1,435 @@
+"""Live analysis of a recording that is still growing, or of a stream.
+
+:func:`~wr_analyzer.analyze.analyze_video` probes the video's duration
+up front and stops there, so it can't follow a tournament stream while
+it is being recorded.  Here the input has no duration:
+
+* :func:`open_live` runs ``ffmpeg`` on a growing file (read with
+  ffmpeg's ``-follow``, until no new data has arrived for
+  *idle_timeout_sec*) or on stdin (``"-"``: a raw H.264 or MPEG-TS
+  stream, or anything else ffmpeg can read from a pipe).  It thins the
+  video to *decode_fps* frames a second and pipes them out as BMP
+  images, which carry their own size, so nothing needs probing.
+* A :class:`LiveSource` reader thread keeps only the newest decoded
+  frame.  :meth:`LiveSource.frames` samples it every *interval_sec* of
+  wall-clock time; when analysing a frame overruns one or more ticks,
+  those samples are dropped rather than queued, so latency stays
+  bounded however slow the OCR is.
+* :func:`analyze_live` runs the usual per-frame analysis and online
+  game segmentation (see :mod:`wr_analyzer.segmentation`) on the samples
+  and yields every frame and game event with its latency: the wall-clock
+  time from the frame leaving the decoder to the event being emitted.
+  :func:`event_record` turns them into the JSON Lines that the CLI's
+  ``--live`` prints.
+
+A growing recording must be in a container that can be read before it
+is finished (MPEG-TS, Matroska, FLV, fragmented MP4); a plain MP4 only
+gets its index at the end.
+"""
+
+from __future__ import annotations
+
+import math
+import shutil
+import subprocess
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import BinaryIO
+
+import cv2
+import numpy as np
+
+from wr_analyzer.analyze import FrameData, _frame_record, _iter_range
+from wr_analyzer.ocr import _get_easyocr_reader
+from wr_analyzer.ocr_plan import OcrStats, confidence_threshold
+from wr_analyzer.segmentation import (
+    GameEnded,
+    GameEvent,
+    GameResult,
+    GameSegmenter,
+    GameStarted,
+    KillFilter,
+)
+
+# Frames per second ffmpeg decodes out of a live input; the newest of
+# them is what a sample takes.
+DEFAULT_DECODE_FPS = 4.0
+
+# BMP file header: "BM", then the file size as a little-endian uint32.
+_BMP_HEADER_BYTES = 14
+
+
+def _read_exact(stream: BinaryIO, n: int) -> bytes:
+    """Read *n* bytes, or fewer if *stream* ends first."""
+    chunks = []
+    while n > 0:
+        chunk = stream.read(n)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        n -= len(chunk)
+    return b"".join(chunks)
+
+
+def read_bmp(stream: BinaryIO) -> np.ndarray | None:
+    """Read the next BMP image of an ``image2pipe`` stream as a BGR frame.
+
+    Returns ``None`` at the end of the stream, including one that ends
+    mid-image (the producer was stopped).
+
+    Raises
+    ------
+    ValueError
+        If the stream holds something other than BMP images.
+    """
+    header = _read_exact(stream, _BMP_HEADER_BYTES)
+    if len(header) < _BMP_HEADER_BYTES:
+        return None
+    if header[:2] != b"BM":
+        raise ValueError("Not a BMP image stream")
+    size = int.from_bytes(header[2:6], "little")
+    body = _read_exact(stream, size - _BMP_HEADER_BYTES)
+    if len(body) < size - _BMP_HEADER_BYTES:
+        return None
+    frame = cv2.imdecode(np.frombuffer(header + body, np.uint8), cv2.IMREAD_COLOR)
+    if frame is None:
+        raise ValueError("Undecodable BMP image")
+    return frame
+
+
+class LiveSource:
+    """Sample the newest frame of a live BMP stream at wall-clock cadence.
+
+    A reader thread decodes every frame of *stream* as it arrives and
+    keeps only the newest, so the decoder is never blocked by a slow
+    consumer.  Frame *i* is stamped ``i / fps`` seconds into the stream.
+
+    Use :func:`open_live` to get one from a file or stdin.  Closing it
+    stops *process*, the ffmpeg feeding *stream*.
+
+    Parameters
+    ----------
+    stream : BinaryIO
+        Concatenated BMP images (``ffmpeg -f image2pipe -c:v bmp``).
+    fps : float
+        Constant frame rate of *stream*.
+    process : subprocess.Popen | None
+        Producer process of *stream*, owned by the source.
+
+    Attributes
+    ----------
+    pts : float | None
+        Stream timestamp of the frame last yielded by :meth:`frames`.
+    dropped : int
+        Samples skipped because analysis overran their tick.
+    arrivals : dict[float, float]
+        ``time.monotonic()`` at which each yielded frame was read off the
+        stream, by timestamp; consumers pop their entries.
+    """
+
+    def __init__(
+        self,
+        stream: BinaryIO,
+        fps: float,
+        *,
+        process: subprocess.Popen | None = None,
+    ) -> None:
+        self.fps = fps
+        self.pts: float | None = None
+        self.dropped = 0
+        self.arrivals: dict[float, float] = {}
+        self._stream = stream
+        self._process = process
+        self._cond = threading.Condition()
+        self._latest: tuple[float, np.ndarray, float] | None = None
+        self._ended = False
+        self._error: Exception | None = None
+        self._reader = threading.Thread(target=self._read, daemon=True)
+        self._reader.start()
+
+    def __enter__(self) -> LiveSource:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop the producer process and the reader thread."""
+        if self._process is not None:
+            self._process.kill()
+            self._process.wait()
+        self._reader.join(timeout=5.0)
+        self._stream.close()
+
+    def _read(self) -> None:
+        index = 0
+        try:
+            while (frame := read_bmp(self._stream)) is not None:
+                arrival = time.monotonic()
+                with self._cond:
+                    self._latest = (index / self.fps, frame, arrival)
+                    self._cond.notify_all()
+                index += 1
+        except (OSError, ValueError) as err:
+            self._error = err
+        finally:
+            with self._cond:
+                self._ended = True
+                self._cond.notify_all()
+
+    def _newer(self, after: float | None) -> tuple[float, np.ndarray, float] | None:
+        """Wait for a frame later than *after*; ``None`` once none will come."""
+
+        def ready() -> bool:
+            latest = self._latest
+            return latest is not None and (after is None or latest[0] > after)
+
+        with self._cond:
+            self._cond.wait_for(lambda: ready() or self._ended)
+            if ready():
+                return self._latest
+        if self._error is not None:
+            raise RuntimeError(f"Live stream failed: {self._error}")
+        return None
+
+    def frames(
+        self,
+        interval_sec: float = 1.0,
+        start_sec: float = 0.0,
+        end_sec: float | None = None,
+    ) -> Iterator[tuple[float, np.ndarray]]:
+        """Yield ``(timestamp_sec, frame)`` every *interval_sec* of wall time.
+
+        Each sample is the newest frame at its tick.  Ticks that pass
+        while the caller is still busy with the previous frame are
+        counted in :attr:`dropped`, and the next sample is taken right
+        away.  Frames before *start_sec* are skipped; sampling stops at
+        the first frame at or past *end_sec*, or when the stream ends
+        (after yielding its last frame, if it wasn't yet).
+        """
+        tick: float | None = None
+        last: float | None = None
+        while True:
+            if tick is not None:
+                wait = tick - time.monotonic()
+                if wait > 0:
+                    time.sleep(wait)
+                else:
+                    missed = int(-wait // interval_sec)
+                    self.dropped += missed
+                    tick += missed * interval_sec
+            latest = self._newer(last)
+            if latest is None:
+                return
+            ts, frame, arrival = latest
+            last = ts
+            if ts < start_sec:
+                continue
+            if end_sec is not None and ts >= end_sec:
+                return
+            now = time.monotonic()
+            if tick is None or now - tick >= interval_sec:
+                # First sample, or the input stalled: restart the ticks.
+                tick = now
+            tick += interval_sec
+            self.pts = ts
+            self.arrivals[ts] = arrival
+            yield ts, frame
+
+
+def open_live(
+    source: str | Path,
+    *,
+    input_format: str | None = None,
+    decode_fps: float = DEFAULT_DECODE_FPS,
+    idle_timeout_sec: float = 30.0,
+) -> LiveSource:
+    """Start decoding a growing file, or stdin if *source* is ``"-"``.
+
+    *input_format* forces ffmpeg's input format (e.g. ``"h264"`` for a
+    raw stream, ``"mpegts"``) instead of probing it.  A growing file is
+    considered finished once no new data has arrived for
+    *idle_timeout_sec*; stdin once it is closed.
+
+    Raises
+    ------
+    FileNotFoundError
+        If *source* is a path that does not exist.
+    RuntimeError
+        If ``ffmpeg`` is not installed.
+    """
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        raise RuntimeError("ffmpeg not found on PATH")
+    if decode_fps <= 0:
+        raise ValueError(f"decode_fps must be > 0, got {decode_fps}")
+
+    if str(source) == "-":
+        # stdin carries the video, so it can't also be ffmpeg's console.
+        input_args = ["-i", "pipe:0"]
+        stdin = None
+    else:
+        path = Path(source)
+        if not path.exists():
+            raise FileNotFoundError(path)
+        input_args = [
+            "-nostdin",
+            "-follow", "1",
+            "-rw_timeout", str(int(idle_timeout_sec * 1_000_000)),
+            "-i", f"file:{path}",
+        ]  # fmt: skip
+        stdin = subprocess.DEVNULL
+    if input_format is not None:
+        input_args = ["-f", input_format, *input_args]
+    command = [
+        ffmpeg,
+        "-loglevel", "error",
+        *input_args,
+        # Stamp frames from the stream's start, then resample to a
+        # constant rate so frame i is at i / decode_fps.
+        "-vf", f"setpts=PTS-STARTPTS,fps={decode_fps}",
+        "-f", "image2pipe",
+        "-c:v", "bmp",
+        "-pix_fmt", "bgr24",
+        "pipe:1",
+    ]  # fmt: skip
+    # ffmpeg's errors go straight to our stderr: piping them unread
+    # could stall it once the pipe fills.
+    process = subprocess.Popen(command, stdin=stdin, stdout=subprocess.PIPE)
+    return LiveSource(process.stdout, decode_fps, process=process)
+
+
+class LiveStream:
+    """Frames and game events of a live analysis, with their latency.
+
+    Iterating yields ``(item, latency_sec)`` pairs, *item* being a
+    :class:`~wr_analyzer.analyze.FrameData` or a game event as from
+    :func:`~wr_analyzer.analyze.analyze_video_iter`.  Returned by
+    :func:`analyze_live`; can be iterated once.
+
+    Attributes
+    ----------
+    frames : int
+        Frames analysed so far.
+    ocr_stats : OcrStats
+        OCR requests vs. engine calls so far.
+    latency_max_sec : float
+        Highest frame latency so far.
+    """
+
+    def __init__(self, source: LiveSource) -> None:
+        self.source = source
+        self.frames = 0
+        self.ocr_stats = OcrStats()
+        self.latency_max_sec = 0.0
+        self._latency_total = 0.0
+        self._items: Iterator[tuple[FrameData | GameEvent, float]] = iter(())
+
+    def __iter__(self) -> Iterator[tuple[FrameData | GameEvent, float]]:
+        return self._items
+
+    @property
+    def dropped(self) -> int:
+        """Samples dropped because analysis fell behind."""
+        return self.source.dropped
+
+    @property
+    def latency_mean_sec(self) -> float:
+        """Mean frame latency so far."""
+        return self._latency_total / self.frames if self.frames else 0.0
+
+    def _add_latency(self, latency_sec: float) -> None:
+        self.frames += 1
+        self._latency_total += latency_sec
+        self.latency_max_sec = max(self.latency_max_sec, latency_sec)
+
+
+def analyze_live(
+    source: LiveSource,
+    interval_sec: float = 5.0,
+    *,
+    start_sec: float = 0.0,
+    end_sec: float | None = None,
+    ocr_engine: str = "recognize",
+    clock_verify_sec: float | None = None,
+    hud_reuse_sec: float | None = None,
+) -> LiveStream:
+    """Analyse a live *source* as it plays, streaming the results.
+
+    Samples the newest frame every *interval_sec* of wall-clock time
+    (dropping samples while the analysis is behind, see
+    :meth:`LiveSource.frames`) and yields it with the game events it
+    settles, each paired with its latency.  Frames are OCR'd one at a
+    time, as soon as they are sampled.  *ocr_engine*, *clock_verify_sec*
+    and *hud_reuse_sec* are as for
+    :func:`~wr_analyzer.analyze.analyze_video_iter`, except that a
+    conflicting clock reading is emitted as such right away rather than
+    held back until the next reading settles it: a conflict the model
+    later accepts (the clock jumped) keeps its ``"conflict"`` status.
+
+    Timestamps are seconds since the start of the live input; frames
+    before *start_sec* are skipped and the analysis stops at *end_sec*,
+    if given, or when the input ends.
+    """
+    if interval_sec <= 0:
+        raise ValueError(f"interval_sec must be > 0, got {interval_sec}")
+    if clock_verify_sec is not None and clock_verify_sec <= 0:
+        raise ValueError(f"clock_verify_sec must be > 0, got {clock_verify_sec}")
+    if hud_reuse_sec is not None and hud_reuse_sec <= 0:
+        raise ValueError(f"hud_reuse_sec must be > 0, got {hud_reuse_sec}")
+    stream = LiveStream(source)
+
+    def run() -> Iterator[tuple[FrameData | GameEvent, float]]:
+        # Load the model before the first sample, not during it.
+        _get_easyocr_reader()
+        keep = KillFilter(confidence_threshold(ocr_engine))
+        segmenter = GameSegmenter(min_gap_sec=max(30.0, interval_sec * 5))
+        arrival = time.monotonic()
+        for fd, _ in _iter_range(
+            source,
+            interval_sec,
+            start_sec,
+            end_sec if end_sec is not None else math.inf,
+            ocr_engine=ocr_engine,
+            ocr_batch_frames=1,
+            ocr_max_wait_sec=None,
+            pipeline=False,
+            clock_verify_sec=clock_verify_sec,
+            hud_reuse_sec=hud_reuse_sec,
+            ocr_stats=stream.ocr_stats,
+            hold_conflicts=False,
+        ):
+            arrival = source.arrivals.pop(fd.timestamp_sec)
+            fd = keep(fd)
+            latency = time.monotonic() - arrival
+            stream._add_latency(latency)
+            yield fd, latency
+            for event in segmenter.push(fd):
+                yield event, time.monotonic() - arrival
+        for event in segmenter.finish():
+            yield event, time.monotonic() - arrival
+
+    stream._items = run()
+    return stream
+
+
+def event_record(item: FrameData | GameEvent, latency_sec: float) -> dict:
+    """Return a JSON-able record of a live frame or game event."""
+    if isinstance(item, FrameData):
+        record = {"event": "frame", **_frame_record(item)}
+    elif isinstance(item, GameStarted):
+        record = {
+            "event": "game_started",
+            "game": item.game,
+            "start_sec": item.start_sec,
+        }
+    elif isinstance(item, GameEnded):
+        record = {"event": "game_ended", "game": item.game, **item.segment.summary()}
+    elif isinstance(item, GameResult):
+        record = {"event": "game_result", "game": item.game, "result": item.result}
+    else:
+        raise TypeError(f"Not a live item: {item!r}")
+    record["latency_sec"] = round(latency_sec, 3)
+    return record
@@ -1,19 +1,107 @@
-"""OCR wrappers (EasyOCR) with preprocessing for game UI text."""
+"""OCR wrappers (EasyOCR) with preprocessing for game UI text.
+
+Three engines are available through :func:`ocr_text`:
+
+* ``"recognize"`` — runs only EasyOCR's CRNN recognition stage on the
+  whole crop.  The HUD fields (timer, kill score, KDA) are already tight
+  boxes, so CRAFT text detection is skipped entirely.  A per-field
+  character allowlist constrains the greedy decoder.
+* ``"readtext"`` — full EasyOCR ``readtext`` (CRAFT detection +
+  recognition).  Slower, but copes with crops that contain more than one
+  line or lots of non-text clutter.
+* ``"glyph"`` — template matching against the fixed HUD font
+  (:mod:`wr_analyzer.glyphs`), no neural network at all.  It reads the
+  raw crop, not the CLAHE-enhanced one.
+
+Each engine reports an :class:`OcrResult`: the text, how sure the
+engine was of it and where it was found (:func:`ocr_result`);
+:func:`ocr_text` keeps only the text.  The confidences are the
+engines' own (the recognizer's decoding probability, the glyph
+matcher's template correlation) and are not calibrated against each
+other.
+
+:func:`ocr_recognize_results` runs the recognizer over many crops in a
+single batched forward pass; :mod:`wr_analyzer.ocr_plan` uses it to read
+every HUD field of a frame at once.
+"""
 
 from __future__ import annotations
 
+import math
+import threading
+from collections.abc import Iterable
+from dataclasses import dataclass
+
 import cv2
 import easyocr
 import numpy as np
+from easyocr.config import imgH as _MODEL_HEIGHT
+from easyocr.recognition import get_text
+from easyocr.utils import compute_ratio_and_resize
+
+from wr_analyzer.glyphs import read_glyph_result
+from wr_analyzer.preprocess import preprocess
+from wr_analyzer.regions import PixelBox
+
+# Engines accepted by ocr_text() and the detectors built on it.
+OCR_ENGINES = ("recognize", "readtext", "glyph")
+
+# Character allowlists for the fixed-format HUD fields.
+TIMER_CHARS = "0123456789:"
+KILLS_CHARS = "0123456789VS"
+KDA_CHARS = "0123456789/"
+# Union of the above, for batches that mix several fields.
+HUD_CHARS = "".join(sorted(set(TIMER_CHARS + KILLS_CHARS + KDA_CHARS)))
 
 # Lazy-initialised EasyOCR reader (downloads models on first use).
 _easyocr_reader: easyocr.Reader | None = None
 
+# Serializes the reader's creation and inference: the models aren't safe
+# to call from several threads at once (see wr_analyzer.pipeline).
+_reader_lock = threading.RLock()
+
+
+@dataclass(frozen=True)
+class OcrResult:
+    """Text read from an image, the engine's confidence in it and its box.
+
+    *confidence* runs from 0 (nothing read) to 1.  *bbox* is the box
+    around the text, in the pixel coordinates of the image that was
+    read, or ``None`` if nothing was read.
+    """
+
+    text: str
+    confidence: float = 0.0
+    bbox: PixelBox | None = None
+
+
+def join_results(results: Iterable[OcrResult]) -> OcrResult:
+    """Join several results (e.g. the lines of a crop) into one.
+
+    The non-empty texts are joined with spaces in order; the confidence
+    is the least confident part's and the box surrounds all parts.
+    """
+    parts = [r for r in results if r.text]
+    if not parts:
+        return OcrResult("")
+    boxes = [r.bbox for r in parts if r.bbox is not None]
+    bbox = None
+    if boxes:
+        x0 = min(b.x for b in boxes)
+        y0 = min(b.y for b in boxes)
+        x1 = max(b.x + b.w for b in boxes)
+        y1 = max(b.y + b.h for b in boxes)
+        bbox = PixelBox(x0, y0, x1 - x0, y1 - y0)
+    return OcrResult(
+        " ".join(r.text for r in parts), min(r.confidence for r in parts), bbox
+    )
+
 
 def _get_easyocr_reader() -> easyocr.Reader:
     global _easyocr_reader
-    if _easyocr_reader is None:
-        _easyocr_reader = easyocr.Reader(["en"], gpu=True, verbose=False)
+    with _reader_lock:
+        if _easyocr_reader is None:
+            _easyocr_reader = easyocr.Reader(["en"], gpu=True, verbose=False)
     return _easyocr_reader
 
 
@@ -25,16 +113,28 @@ def preprocess_clahe(image: np.ndarray, scale: int = 4) -> np.ndarray:
     blue-tinted *and* red-tinted HUD text visible — unlike grayscale
     conversion, which dims red text on dark backgrounds.
 
+    The ``"clahe"`` variant of :func:`wr_analyzer.preprocess.preprocess`.
     Returns a BGR image (not binary) suitable for EasyOCR.
     """
-    clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(2, 2))
-    b, g, r = cv2.split(image)
-    enhanced = cv2.merge([clahe.apply(b), clahe.apply(g), clahe.apply(r)])
-    if scale > 1:
-        enhanced = cv2.resize(
-            enhanced, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC
-        )
-    return enhanced
+    return preprocess(image, scale, "clahe")
+
+
+def ocr_readtext(image: np.ndarray) -> list[OcrResult]:
+    """Run EasyOCR's full ``readtext`` on a BGR image.
+
+    Returns one :class:`OcrResult` per detected text box, in reading
+    order.
+    """
+    reader = _get_easyocr_reader()
+    with _reader_lock:
+        found = reader.readtext(image, detail=1)
+    results = []
+    for points, text, confidence in found:
+        xs = [int(p[0]) for p in points]
+        ys = [int(p[1]) for p in points]
+        box = PixelBox(min(xs), min(ys), max(xs) - min(xs), max(ys) - min(ys))
+        results.append(OcrResult(text, float(confidence), box))
+    return results
 
 
 def ocr_easyocr(image: np.ndarray) -> list[str]:
@@ -42,5 +142,125 @@ def ocr_easyocr(image: np.ndarray) -> list[str]:
 
     Returns a list of detected text strings.
     """
+    return [r.text for r in ocr_readtext(image)]
+
+
+def ocr_recognize(image: np.ndarray, allowlist: str | None = None) -> list[str]:
+    """Run EasyOCR's recognizer alone on a tightly cropped BGR or gray image.
+
+    The whole image is treated as a single text box, so no CRAFT
+    detection pass is made.  *allowlist* restricts the characters the
+    greedy decoder may emit.
+
+    Returns a list of recognised text strings (at most one).
+    """
+    text = ocr_recognize_batch([image], allowlist=allowlist)[0]
+    return [text] if text else []
+
+
+def ocr_recognize_batch(
+    images: list[np.ndarray], allowlist: str | None = None
+) -> list[str]:
+    """Recognise a list of single-line crops in one batch; return the texts.
+
+    See :func:`ocr_recognize_results`.
+    """
+    return [r.text for r in ocr_recognize_results(images, allowlist=allowlist)]
+
+
+def ocr_recognize_results(
+    images: list[np.ndarray],
+    allowlist: str | None = None,
+    *,
+    allowlists: list[str | None] | None = None,
+) -> list[OcrResult]:
+    """Recognise a list of single-line BGR or gray crops in one batch.
+
+    Each image is treated as one text box, as in :func:`ocr_recognize`.
+    *allowlists* gives each image its own allowlist (``None``: no
+    restriction), instead of *allowlist* for all of them.
+    ``Reader.recognize`` can't be used for this: on CPU it loops over its
+    boxes one at a time whatever ``batch_size`` is, so this calls
+    EasyOCR's ``get_text`` directly.
+
+    The recognizer pads every image in a pass to the pass's widest one,
+    and CRNN cost grows with width, so images are grouped by padded
+    width (a multiple of the model height) and allowlist, and each group
+    runs as one forward pass.  The HUD crops of a frame fall into two or
+    three such groups.
+
+    Returns one :class:`OcrResult` per input image, in order; its box
+    is the whole image, as the recognizer doesn't locate the text.  An
+    image where nothing was read gets an empty result.
+    """
+    if not images:
+        return []
     reader = _get_easyocr_reader()
-    return reader.readtext(image, detail=0)
+    if allowlists is None:
+        allowlists = [allowlist] * len(images)
+
+    # (padded width in units of the model height, allowlist)
+    # -> [(input index, item)].
+    groups: dict[tuple[int, str | None], list[tuple[int, tuple]]] = {}
+    for i, (image, allowed) in enumerate(zip(images, allowlists)):
+        gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        h, w = gray.shape
+        resized, ratio = compute_ratio_and_resize(gray, w, h, _MODEL_HEIGHT)
+        box = [[0, 0], [w, 0], [w, h], [0, h]]
+        key = (max(1, math.ceil(ratio)), allowed)
+        groups.setdefault(key, []).append((i, (box, resized)))
+
+    results = [OcrResult("")] * len(images)
+    for (units, allowed), members in groups.items():
+        if allowed is not None:
+            ignore_char = "".join(set(reader.character) - set(allowed))
+        else:
+            ignore_char = "".join(set(reader.character) - set(reader.lang_char))
+        with _reader_lock:
+            read = get_text(
+                reader.character,
+                _MODEL_HEIGHT,
+                units * _MODEL_HEIGHT,
+                reader.recognizer,
+                reader.converter,
+                [item for _i, item in members],
+                ignore_char,
+                "greedy",
+                batch_size=len(members),
+                workers=0,
+                device=reader.device,
+            )
+        # get_text keeps input order.
+        for (i, (box, _resized)), (_box, text, confidence) in zip(members, read):
+            if text:
+                w, h = box[2]
+                results[i] = OcrResult(text, float(confidence), PixelBox(0, 0, w, h))
+    return results
+
+
+def ocr_result(
+    image: np.ndarray, *, engine: str = "recognize", allowlist: str | None = None
+) -> OcrResult:
+    """OCR *image* with the named engine; return its lines joined.
+
+    *allowlist* applies to the ``"recognize"`` and ``"glyph"`` engines.
+    Several lines (``"readtext"``) are joined by :func:`join_results`.
+    """
+    if engine == "recognize":
+        return ocr_recognize_results([image], allowlist=allowlist)[0]
+    if engine == "readtext":
+        return join_results(ocr_readtext(image))
+    if engine == "glyph":
+        text, confidence, bbox = read_glyph_result(image, allowlist)
+        return OcrResult(text, confidence, bbox)
+    raise ValueError(f"Unknown OCR engine: {engine!r}")
+
+
+def ocr_text(
+    image: np.ndarray, *, engine: str = "recognize", allowlist: str | None = None
+) -> str:
+    """OCR *image* with the named engine and return the joined text.
+
+    *allowlist* applies to the ``"recognize"`` and ``"glyph"`` engines.
+    """
+    return ocr_result(image, engine=engine, allowlist=allowlist).text
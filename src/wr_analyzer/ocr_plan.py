@@ -0,0 +1,543 @@
+"""Per-frame analysis context: shared crops, images and batched OCR.
+
+The timer, kill-score and KDA detectors each OCR a few CLAHE-enhanced
+crops (the timer alone tries three scales before its scoreboard
+fallback).  Run one after another, that is one recognizer call per
+crop, each paying the model's fixed per-call overhead.
+
+An :class:`OcrPlan` is built once per frame and knows every ``(region,
+scale)`` crop the detectors may ask for, grouped into tiers
+(:data:`HUD_TIERS`): the primary crop of each field, then the fallbacks
+(the other CLAHE scales of the timer and the scoreboard).  The first
+time any crop of a tier is requested, the whole tier is preprocessed and
+recognised together with :func:`wr_analyzer.ocr.ocr_recognize_results`;
+the detectors then just look up their text and parse it as before.  A
+frame whose primary crops all parse confidently costs one batched call;
+the fallback tier is only recognised when some field needs it.  A crop
+outside the tiers is OCR'd on its own when asked for.
+
+Regions that span two text rows (the scoreboard) can't be read by the
+single-line recognizer, so the plan splits them into row strips and
+joins the row texts top to bottom, as ``readtext`` would.
+
+With the ``"readtext"`` engine nothing is batched: each crop goes
+through full detection + recognition when first requested.  The
+``"glyph"`` engine template-matches the raw crop instead, once per
+region: the CLAHE scale doesn't apply to it.
+
+The plan is also the frame's analysis context.  Every detector that
+analyses the frame (phase, timer, kills, KDA, result) takes it as
+``plan=`` and reads its region crops, grayscale views, CLAHE images and
+OCR text from it, all memoized, so no frame OCRs the same
+``(region, scale)`` pair twice -- e.g. the timer read during phase
+detection is reused by the extractors, and the scoreboard fallback is
+read once for the timer, kills and KDA.  :class:`OcrStats` counts the
+OCR calls this saves.
+
+Each crop's reading is kept as an :class:`~wr_analyzer.ocr.OcrResult`
+(:meth:`OcrPlan.result`), with its box in frame coordinates.  The
+detectors try their crops with :func:`read_confident`: the first parse
+whose confidence reaches its engine's :func:`confidence_threshold` is
+accepted, and only a failed or doubtful one escalates to the next crop.
+
+Given a :class:`~wr_analyzer.profiling.Profile`, the plan times its
+preprocessing, recognizer calls and parsing, and counts the OCR reads
+of each region.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, replace
+from typing import TypeVar
+
+import cv2
+import numpy as np
+
+from wr_analyzer.hud_memo import ink_signature
+from wr_analyzer.ocr import (
+    HUD_CHARS,
+    KDA_CHARS,
+    KILLS_CHARS,
+    OCR_ENGINES,
+    TIMER_CHARS,
+    OcrResult,
+    join_results,
+    ocr_recognize_results,
+    ocr_result,
+)
+from wr_analyzer.preprocess import DEFAULT_VARIANT, preprocess, resolve_variant
+from wr_analyzer.profiling import Profile, span
+from wr_analyzer.regions import (
+    GAME_TIMER,
+    KILLS,
+    PLAYER_KDA,
+    SCOREBOARD,
+    SCOREBOARD_BOTTOM_ROW,
+    SCOREBOARD_TOP_ROW,
+    PixelBox,
+    Region,
+)
+
+T = TypeVar("T")
+
+# OCR confidence (0-1), per engine, at which a parsed reading is
+# accepted without trying the detector's remaining crops.  Readings
+# below it also count as doubtful to wr_analyzer.segmentation.  Engine
+# confidences aren't on one scale, so each needs its own calibration.
+# The glyph engine's is set from the fixtures: misread crops score
+# 0.6-0.8, clean ones ~1.0.  EasyOCR's engines can't be calibrated
+# without their models, so they have none (see confidence_threshold).
+CONFIDENCE_THRESHOLDS: dict[str, float] = {"glyph": 0.85}
+
+# Crops read by each detector, in the order it tries them.
+TIMER_CROPS: tuple[tuple[Region, int], ...] = (
+    (GAME_TIMER, 5),
+    (GAME_TIMER, 4),
+    (GAME_TIMER, 3),
+    (SCOREBOARD, 3),
+)
+KILLS_CROPS: tuple[tuple[Region, int], ...] = ((KILLS, 4), (SCOREBOARD, 3))
+KDA_CROPS: tuple[tuple[Region, int], ...] = ((PLAYER_KDA, 4), (SCOREBOARD, 3))
+
+# Batches for one frame: every field's first choice, then all fallbacks.
+HUD_TIERS: tuple[tuple[tuple[Region, int], ...], ...] = (
+    ((GAME_TIMER, 5), (KILLS, 4), (PLAYER_KDA, 4)),
+    ((GAME_TIMER, 4), (GAME_TIMER, 3), (SCOREBOARD, 3)),
+)
+_FALLBACK_CROPS = frozenset(crop for tier in HUD_TIERS[1:] for crop in tier)
+
+# Multi-row regions and the single-line strips they are read as.
+_ROWS: dict[Region, tuple[Region, ...]] = {
+    SCOREBOARD: (SCOREBOARD_TOP_ROW, SCOREBOARD_BOTTOM_ROW),
+}
+_ROW_OF = {row: region for region, rows in _ROWS.items() for row in rows}
+
+# Preprocessing variant (see wr_analyzer.preprocess.VARIANTS) of each
+# region's crops; the rows of a multi-row region use the region's, other
+# regions DEFAULT_VARIANT.  A change alters what the detectors read, so
+# bump their *_VERSION with it (see wr_analyzer.frame_cache).
+PREPROCESS_VARIANTS: dict[Region, str] = {
+    GAME_TIMER: "clahe",
+    KILLS: "clahe",
+    PLAYER_KDA: "clahe",
+    SCOREBOARD: "clahe",
+}
+
+# Recognizer allowlist per region; the scoreboard mixes all fields.
+_ALLOWLISTS: dict[Region, str] = {
+    GAME_TIMER: TIMER_CHARS,
+    KILLS: KILLS_CHARS,
+    PLAYER_KDA: KDA_CHARS,
+    SCOREBOARD: HUD_CHARS,
+}
+
+
+@dataclass
+class OcrStats:
+    """OCR request / call counts, per frame or summed over a run.
+
+    *requests* counts the OCR texts the detectors asked for; without a
+    shared context each would have been its own OCR call.  *calls*
+    counts the OCR engine invocations actually made (a batch is one).
+    """
+
+    requests: int = 0
+    calls: int = 0
+
+    @property
+    def saved(self) -> int:
+        """OCR calls avoided by memoization and batching."""
+        return self.requests - self.calls
+
+    def add(self, other: OcrStats) -> None:
+        self.requests += other.requests
+        self.calls += other.calls
+
+
+class OcrPlan:
+    """Lazily batched OCR and memoized crops of one frame.
+
+    Parameters
+    ----------
+    frame : np.ndarray
+        The BGR frame the crops are taken from.
+    crops : iterable of (Region, int), optional
+        Restrict the plan to these ``(region, scale)`` crops (e.g.
+        :data:`TIMER_CROPS` for a timer-only caller).  Defaults to
+        every crop in :data:`HUD_TIERS`.
+    engine : str
+        OCR engine (see :data:`wr_analyzer.ocr.OCR_ENGINES`).
+    batched : bool
+        If ``False``, recognise each crop with its own recognizer call
+        when first requested (the pre-batching behaviour; useful for
+        benchmarking).
+    variant : str, optional
+        Preprocess every crop with this variant instead of the one
+        :data:`PREPROCESS_VARIANTS` configures (for benchmarking).
+    upscale : int, optional
+        Enlarge every crop by this factor instead of its own scale (for
+        benchmarking).  Crops are still keyed by their own scale.
+    fallback : bool
+        If ``False``, never read the fallback crops of :data:`HUD_TIERS`:
+        each field gets only its primary crop, and the fallbacks read as
+        empty text (for benchmarking).
+    profile : Profile, optional
+        Record the plan's preprocessing, OCR and parsing times and OCR
+        reads per region into it (see :mod:`wr_analyzer.profiling`).
+
+    Attributes
+    ----------
+    stats : OcrStats
+        OCR requests made to this plan and engine calls it ran.
+    """
+
+    def __init__(
+        self,
+        frame: np.ndarray,
+        crops=None,
+        *,
+        engine: str = "recognize",
+        batched: bool = True,
+        variant: str | None = None,
+        upscale: int | None = None,
+        fallback: bool = True,
+        profile: Profile | None = None,
+    ) -> None:
+        if engine not in OCR_ENGINES:
+            raise ValueError(f"Unknown OCR engine: {engine!r}")
+        if variant is not None:
+            resolve_variant(variant)
+        self.frame = frame
+        self.engine = engine
+        self.batched = batched
+        self.variant = variant
+        self.upscale = upscale
+        self.fallback = fallback
+        self.profile = profile
+        self.stats = OcrStats()
+        wanted = None if crops is None else set(crops)
+        tiers = [
+            [c for c in tier if wanted is None or c in wanted]
+            for tier in (HUD_TIERS if fallback else HUD_TIERS[:1])
+        ]
+        self._tiers = [tier for tier in tiers if tier]
+        self._results: dict[tuple[Region, int], OcrResult] = {}
+        self._crops: dict[Region, np.ndarray] = {}
+        self._grays: dict[Region | None, np.ndarray] = {}
+        self._enhanced: dict[tuple[Region, int], np.ndarray] = {}
+        self._inks: dict[Region, np.ndarray] = {}
+        self._glyph_results: dict[Region, OcrResult] = {}
+
+    @property
+    def calls(self) -> int:
+        """Number of OCR engine invocations made so far."""
+        return self.stats.calls
+
+    def crop(self, region: Region) -> np.ndarray:
+        """Return *region* cropped from the frame (a view, memoized)."""
+        crop = self._crops.get(region)
+        if crop is None:
+            crop = self._crops[region] = region.crop(self.frame)
+        return crop
+
+    def gray(self, region: Region | None = None) -> np.ndarray:
+        """Return the grayscale of *region*, or of the whole frame if ``None``."""
+        gray = self._grays.get(region)
+        if gray is None:
+            image = self.frame if region is None else self.crop(region)
+            gray = self._grays[region] = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        return gray
+
+    def ink(self, region: Region) -> np.ndarray:
+        """Return the HUD memo's ink signature of *region* (memoized).
+
+        See :func:`wr_analyzer.hud_memo.ink_signature`.
+        """
+        ink = self._inks.get(region)
+        if ink is None:
+            ink = self._inks[region] = ink_signature(self.crop(region))
+        return ink
+
+    def enhanced(self, region: Region, scale: int) -> np.ndarray:
+        """Return the CLAHE-enhanced crop of *region* at *scale* (memoized)."""
+        key = (region, scale)
+        image = self._enhanced.get(key)
+        if image is None:
+            with span(self.profile, "preprocess", _label(region)):
+                image = self._enhanced[key] = preprocess(
+                    self.crop(region), self.upscale or scale, self._variant(region)
+                )
+        return image
+
+    def _variant(self, region: Region) -> str:
+        if self.variant is not None:
+            return self.variant
+        region = _ROW_OF.get(region, region)
+        return PREPROCESS_VARIANTS.get(region, DEFAULT_VARIANT)
+
+    def preprocess(self) -> None:
+        """Enhance the crops of the next unread tier ahead of recognition.
+
+        Lets a pipeline stage do the CLAHE / resize work on another
+        thread; the recognizer then finds the images memoized.  A no-op
+        for the ``"glyph"`` engine, which reads the raw crops.
+        """
+        if self.engine == "glyph":
+            return
+        for region, scale in self._next_tier():
+            for part in _ROWS.get(region, (region,)):
+                self.enhanced(part, scale)
+
+    def skip(self, crops) -> None:
+        """Leave *crops* out of the batches (e.g. a timer that is predicted).
+
+        They can still be read with :meth:`text`, each on its own.
+        """
+        unwanted = set(crops)
+        self._tiers = [[c for c in tier if c not in unwanted] for tier in self._tiers]
+
+    def text(self, region: Region, scale: int, *, engine: str | None = None) -> str:
+        """Return the OCR text of *region* enhanced at *scale*.
+
+        *engine* overrides the plan's engine for regions that always need
+        one (e.g. ``"readtext"`` for the large result banner).  It only
+        matters on the first read: readings are memoized by
+        ``(region, scale)``.
+        """
+        return self.result(region, scale, engine=engine).text
+
+    def result(
+        self, region: Region, scale: int, *, engine: str | None = None
+    ) -> OcrResult:
+        """Return the OCR reading of *region* enhanced at *scale*.
+
+        As :meth:`text`, with the engine's confidence and the text's box
+        in frame coordinates.  The rows of a multi-row region are joined
+        by :func:`~wr_analyzer.ocr.join_results`.
+        """
+        key = (region, scale)
+        if not self.fallback and key in _FALLBACK_CROPS:
+            return OcrResult("")
+        self.stats.requests += 1
+        if key not in self._results:
+            engine = engine or self.engine
+            batch = [key]
+            if engine == "recognize" and self.batched:
+                for tier in self._tiers:
+                    if key in tier:
+                        batch = [c for c in tier if c not in self._results]
+                        break
+            self._run(batch, engine)
+        return self._results[key]
+
+    def _run(self, keys: list[tuple[Region, int]], engine: str) -> None:
+        if engine == "readtext":
+            for region, scale in keys:
+                image = self.enhanced(region, scale)
+                with span(self.profile, "recognize", _label(region)):
+                    result = ocr_result(image, engine="readtext")
+                self._results[(region, scale)] = self._place(region, result, image)
+                self._count([region])
+            return
+        if engine == "glyph":
+            for region, scale in keys:
+                self._results[(region, scale)] = self._glyphs(region)
+            return
+
+        images, owners, allowlists = self._prepare(keys)
+        with span(self.profile, "recognize"):
+            results = ocr_recognize_results(images, allowlists=allowlists)
+        self._count(region for region, _ in keys)
+        self._store(keys, owners, images, results)
+
+    def _count(self, regions: Iterable[Region]) -> None:
+        """Count one OCR engine call, reading *regions*."""
+        self.stats.calls += 1
+        if self.profile is not None:
+            self.profile.count_ocr(_label(region) for region in regions)
+
+    def _glyphs(self, region: Region) -> OcrResult:
+        """Template-match *region*'s raw crop, row by row (memoized)."""
+        result = self._glyph_results.get(region)
+        if result is None:
+            allowlist = _ALLOWLISTS.get(region)
+            with span(self.profile, "recognize", _label(region)):
+                rows = [
+                    self._place(
+                        part,
+                        ocr_result(
+                            self.crop(part), engine="glyph", allowlist=allowlist
+                        ),
+                    )
+                    for part in _ROWS.get(region, (region,))
+                ]
+            result = self._glyph_results[region] = join_results(rows)
+            self._count([region])
+        return result
+
+    def _place(
+        self, region: Region, result: OcrResult, image: np.ndarray | None = None
+    ) -> OcrResult:
+        """Move *result*'s box from *image* of *region* to frame coordinates.
+
+        *image* is the enhanced crop that was read (``None``: the raw
+        crop), whose scale is undone.
+        """
+        if result.bbox is None:
+            return result
+        h, w = self.frame.shape[:2]
+        origin = region.to_pixels(w, h)
+        crop_h, crop_w = self.crop(region).shape[:2]
+        fx = fy = 1.0
+        if image is not None:
+            fx, fy = crop_w / image.shape[1], crop_h / image.shape[0]
+        x, y, bw, bh = result.bbox
+        box = PixelBox(
+            origin.x + int(x * fx),
+            origin.y + int(y * fy),
+            max(1, round(bw * fx)),
+            max(1, round(bh * fy)),
+        )
+        return replace(result, bbox=box)
+
+    def _next_tier(self) -> list[tuple[Region, int]]:
+        """Return the unread crops of the first tier not yet recognised.
+
+        A tier :meth:`skip` emptied ends the search: its fallbacks are
+        only read if a detector asks for them.
+        """
+        for tier in self._tiers:
+            keys = [c for c in tier if c not in self._results]
+            if keys or not tier:
+                return keys
+        return []
+
+    def _prepare(
+        self, keys: list[tuple[Region, int]]
+    ) -> tuple[
+        list[np.ndarray], list[tuple[tuple[Region, int], Region]], list[str | None]
+    ]:
+        """Preprocess *keys* into recognizer inputs, their owners and allowlists.
+
+        Each owner is the ``(key, part)`` an image belongs to: *part* is
+        the key's region or, for a multi-row region, one of its rows.
+        Each image keeps its own region's allowlist, so one field's
+        characters can't be decoded in another's crop.
+        """
+        images: list[np.ndarray] = []
+        owners: list[tuple[tuple[Region, int], Region]] = []
+        allowlists: list[str | None] = []
+        for region, scale in keys:
+            for part in _ROWS.get(region, (region,)):
+                images.append(self.enhanced(part, scale))
+                owners.append(((region, scale), part))
+                allowlists.append(_ALLOWLISTS.get(region))
+        return images, owners, allowlists
+
+    def _store(
+        self,
+        keys: list[tuple[Region, int]],
+        owners: list[tuple[tuple[Region, int], Region]],
+        images: list[np.ndarray],
+        results: list[OcrResult],
+    ) -> None:
+        """Join the recognised rows of each key and memoize them."""
+        parts: dict[tuple[Region, int], list[OcrResult]] = {key: [] for key in keys}
+        for (key, part), image, result in zip(owners, images, results):
+            parts[key].append(self._place(part, result, image))
+        for key in keys:
+            self._results[key] = join_results(parts[key])
+
+
+def confidence_threshold(engine: str) -> float:
+    """Return the confidence at which *engine*'s readings are trusted.
+
+    An engine without a calibrated threshold in
+    :data:`CONFIDENCE_THRESHOLDS` gets 0: its first parsed reading is
+    taken and none counts as doubtful.
+    """
+    return CONFIDENCE_THRESHOLDS.get(engine, 0.0)
+
+
+def read_confident(
+    plan: OcrPlan,
+    crops: Iterable[tuple[Region, int]],
+    parse: Callable[[str], T | None],
+    *,
+    engine: str | None = None,
+) -> tuple[T | None, float | None]:
+    """Read *crops* in order until one parses with confidence; return it.
+
+    Each crop's text is passed to *parse*, which returns ``None`` if it
+    doesn't hold a valid value.  The first value read with a confidence
+    of at least the engine's :func:`confidence_threshold` is returned at
+    once; otherwise, once every crop is tried, the most confident value
+    found (the earliest on a tie).  *engine* (default: the plan's) is
+    passed to :meth:`OcrPlan.result`.
+
+    Returns ``(value, confidence)``, or ``(None, None)`` if no crop
+    parsed.
+    """
+    threshold = confidence_threshold(engine or plan.engine)
+    best: T | None = None
+    best_confidence: float | None = None
+    for region, scale in crops:
+        result = plan.result(region, scale, engine=engine)
+        with span(plan.profile, "parse", _label(region)):
+            value = parse(result.text)
+        if value is None:
+            continue
+        if result.confidence >= threshold:
+            return value, result.confidence
+        if best_confidence is None or result.confidence > best_confidence:
+            best, best_confidence = value, result.confidence
+    return best, best_confidence
+
+
+def recognize_plans(plans: list[OcrPlan]) -> bool:
+    """Recognise the next tier of several frames' plans in one batch.
+
+    Used to batch OCR across frames: each plan's first unread tier
+    (normally the primary crops) is preprocessed, all of them go through
+    a single :func:`~wr_analyzer.ocr.ocr_recognize_results` call, and the
+    readings are stored back in their plans so the detectors find them
+    already read.  Plans using the ``"readtext"`` engine, or created
+    with ``batched=False``, are left untouched.
+
+    Returns ``True`` if a recognizer call was made.  It is not counted
+    in any plan's :attr:`~OcrPlan.stats`, but timed and counted in the
+    plans' profiles, if any.
+    """
+    jobs = []
+    images: list[np.ndarray] = []
+    allowlists: list[str | None] = []
+    for plan in plans:
+        if plan.engine != "recognize" or not plan.batched:
+            continue
+        keys = plan._next_tier()
+        if not keys:
+            continue
+        plan_images, owners, plan_allowlists = plan._prepare(keys)
+        jobs.append((plan, keys, owners, len(images), len(images) + len(plan_images)))
+        images.extend(plan_images)
+        allowlists.extend(plan_allowlists)
+    if not images:
+        return False
+
+    # The plans of one run share a profile.
+    profile = next((job[0].profile for job in jobs if job[0].profile), None)
+    with span(profile, "recognize"):
+        results = ocr_recognize_results(images, allowlists=allowlists)
+    for plan, keys, owners, start, end in jobs:
+        if plan.profile is not None:
+            plan.profile.count_ocr(_label(region) for region, _ in keys)
+        plan._store(keys, owners, images[start:end], results[start:end])
+    return True
+
+
+def _label(region: Region) -> str:
+    """Return *region*'s name for profiles, or its geometry if unnamed."""
+    return region.name or (
+        f"{region.anchor.value}:{region.x},{region.y},{region.w}x{region.h}"
+    )
@@ -0,0 +1,123 @@
+"""Cross-frame micro-batching of HUD OCR.
+
+A single frame's :class:`~wr_analyzer.ocr_plan.OcrPlan` batch holds a
+handful of crops, too few to keep torch's intra-op thread pool busy.
+:class:`OcrScheduler` buffers the sampled frames of a run and, once
+*batch_frames* frames are waiting or the oldest has waited *max_wait_sec*,
+recognises the primary crops of all of them in one recognizer call
+(:func:`~wr_analyzer.ocr_plan.recognize_plans`).  Each buffered frame is
+then handed to the caller's *handler* with its pre-read plan, in
+submission (i.e. timestamp) order; fallback crops, when a frame needs
+them, are still read per frame.
+
+The scheduler is synchronous: the deadline is checked whenever a frame
+is submitted, so the extra latency a frame sees is bounded by
+*max_wait_sec* plus the time to decode the next sampled frame.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from typing import Any
+
+import numpy as np
+
+from wr_analyzer.ocr_plan import OcrPlan, recognize_plans
+
+
+class OcrScheduler:
+    """Buffer frames and batch their OCR across frames.
+
+    Parameters
+    ----------
+    handler : callable
+        Called as ``handler(frame, timestamp_sec, pts_sec, plan=plan)`` for
+        every frame once its batch has been recognised; its return
+        values are what :meth:`submit` and :meth:`flush` deliver.
+    batch_frames : int
+        Number of frames to buffer before running a batch.  ``1``
+        processes every frame immediately (no cross-frame batching).
+    max_wait_sec : float | None
+        Run the batch early once the oldest buffered frame has waited
+        this long; ``None`` waits for a full batch.
+    engine : str
+        OCR engine for the frames' plans.
+    prefetch : callable, optional
+        ``prefetch(plan) -> bool`` says whether a frame's primary crops
+        belong in the shared batch; frames it rejects (e.g. loading
+        screens that pixel checks already settled) are OCR'd only on
+        demand.  Defaults to batching every frame.
+
+    Attributes
+    ----------
+    batches : int
+        Number of cross-frame recognizer batches run so far.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[..., Any],
+        *,
+        batch_frames: int = 8,
+        max_wait_sec: float | None = 2.0,
+        engine: str = "recognize",
+        prefetch: Callable[[OcrPlan], bool] | None = None,
+    ) -> None:
+        if batch_frames < 1:
+            raise ValueError(f"batch_frames must be >= 1, got {batch_frames}")
+        self.handler = handler
+        self.batch_frames = batch_frames
+        self.max_wait_sec = max_wait_sec
+        self.engine = engine
+        self.prefetch = prefetch
+        self.batches = 0
+        self._pending: list[tuple[np.ndarray, float, float | None, OcrPlan]] = []
+        self._oldest = 0.0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def submit(
+        self,
+        frame: np.ndarray,
+        timestamp_sec: float,
+        pts_sec: float | None = None,
+        *,
+        plan: OcrPlan | None = None,
+    ) -> list:
+        """Queue one frame; return the results of any batch this completes.
+
+        The frame is copied, since decoders may reuse their buffers,
+        unless the caller passes the frame's *plan* (e.g. one prepared by
+        an earlier pipeline stage), whose frame is used as is.
+        """
+        if plan is None:
+            frame = frame.copy()
+            plan = OcrPlan(frame, engine=self.engine)
+        else:
+            frame = plan.frame
+        if not self._pending:
+            self._oldest = time.monotonic()
+        self._pending.append((frame, timestamp_sec, pts_sec, plan))
+
+        if len(self._pending) >= self.batch_frames or (
+            self.max_wait_sec is not None
+            and time.monotonic() - self._oldest >= self.max_wait_sec
+        ):
+            return self.flush()
+        return []
+
+    def flush(self) -> list:
+        """Run the buffered frames now and return their results in order."""
+        pending, self._pending = self._pending, []
+        if not pending:
+            return []
+        plans = [plan for *_, plan in pending]
+        if self.prefetch is not None:
+            plans = [plan for plan in plans if self.prefetch(plan)]
+        if recognize_plans(plans):
+            self.batches += 1
+        return [
+            self.handler(frame, ts, pts, plan=plan) for frame, ts, pts, plan in pending
+        ]
@@ -0,0 +1,130 @@
+"""Threaded stage pipeline with bounded queues.
+
+Run one after another, the steps of a frame's analysis never overlap:
+torch sits idle while the next frame decodes, and the decoder idles
+during inference.  :func:`pipelined` runs an iterable (the decoder) and
+a chain of stages (e.g. CLAHE preprocessing) on threads of their own,
+connected by bounded queues, and yields the last stage's output to the
+caller -- which runs the OCR stage on its own thread.  OpenCV and torch
+release the GIL in their kernels, so decode, preprocessing and inference
+of neighbouring frames overlap.
+
+Every queue holds at most *maxsize* items, so a slow consumer blocks
+the producers (backpressure) and at most about ``(stages + 1) *
+(maxsize + 1)`` items are in flight whatever the video's length.  Each
+stage is a single thread fed by a FIFO queue, so items come out in the
+order the iterable produced them.
+
+An exception in any stage is re-raised in the caller; closing the
+generator early (or an exception in the caller) stops and joins the
+threads.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any
+
+# Items buffered between two stages.
+DEFAULT_QUEUE_SIZE = 4
+
+# How often a blocked producer checks whether the pipeline was closed.
+_POLL_SEC = 0.1
+
+_DONE = object()
+
+
+class _Failure:
+    """Carries a stage's exception downstream to the caller."""
+
+    def __init__(self, exc: BaseException) -> None:
+        self.exc = exc
+
+
+def pipelined(
+    items: Iterable[Any],
+    *stages: Callable[[Any], Any],
+    maxsize: int = DEFAULT_QUEUE_SIZE,
+) -> Iterator[Any]:
+    """Yield ``stages[-1](...stages[0](item))`` for each of *items*, in order.
+
+    *items* is iterated on a thread of its own, and each stage runs on
+    its own thread; the queues between them hold at most *maxsize*
+    items.  With no stages, only the iteration moves to a thread.
+    """
+    if maxsize < 1:
+        raise ValueError(f"maxsize must be >= 1, got {maxsize}")
+    stop = threading.Event()
+    queues = [queue.Queue(maxsize) for _ in range(len(stages) + 1)]
+
+    def put(q: queue.Queue, item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=_POLL_SEC)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def get(q: queue.Queue) -> Any:
+        while not stop.is_set():
+            try:
+                return q.get(timeout=_POLL_SEC)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def produce() -> None:
+        iterator = iter(items)
+        try:
+            for item in iterator:
+                if not put(queues[0], item):
+                    return
+        except BaseException as exc:
+            put(queues[0], _Failure(exc))
+            return
+        finally:
+            # Release the decoder on this thread, not at garbage collection.
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+        put(queues[0], _DONE)
+
+    def run(stage: Callable[[Any], Any], inbox: queue.Queue, outbox: queue.Queue):
+        while True:
+            item = get(inbox)
+            if item is not _DONE and not isinstance(item, _Failure):
+                try:
+                    item = stage(item)
+                except BaseException as exc:
+                    item = _Failure(exc)
+            if not put(outbox, item) or item is _DONE or isinstance(item, _Failure):
+                return
+
+    threads = [threading.Thread(target=produce, name="pipeline-source", daemon=True)]
+    for i, stage in enumerate(stages):
+        threads.append(
+            threading.Thread(
+                target=run,
+                args=(stage, queues[i], queues[i + 1]),
+                name=f"pipeline-stage-{i}",
+                daemon=True,
+            )
+        )
+    for thread in threads:
+        thread.start()
+
+    try:
+        while True:
+            item = queues[-1].get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item.exc
+            yield item
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
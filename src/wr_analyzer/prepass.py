@@ -0,0 +1,290 @@
+"""Low-resolution pre-pass that decides where to run the full analysis.
+
+Most of a long VOD is lobby, champion select or streamer chatter, yet a
+uniform pass decodes every sampled frame at full resolution and OCRs
+those the pixel checks can't settle.  The pre-pass first decodes the
+whole range as tiny grayscale thumbnails
+(:data:`~wr_analyzer.game_state.THUMB_WIDTH` wide) at about *fps* a
+second -- only keyframes where they are that dense, since a keyframe
+decodes on its own -- and classifies them in chunks with the vectorized
+:func:`~wr_analyzer.game_state.thumbnail_phases`.
+
+Runs of thumbnails showing the in-game HUD become candidate
+:class:`Span` s: an ``"in_game"`` span from just before the first to
+just after the last of the run (runs closer than *merge_gap_sec* are
+joined, so a few thumbnails without a visible HUD don't split a game),
+followed by a ``"post_game"`` window in which the result screens are
+looked for.  :func:`wr_analyzer.analyze.analyze_video` (``prepass=True``)
+then decodes and OCRs only the sampled timestamps inside the spans.
+
+The pre-pass is tuned to over-include: a false candidate only costs the
+OCR the uniform pass would have spent anyway, a missed game is lost.
+"""
+
+from __future__ import annotations
+
+import math
+import shutil
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+import cv2
+import numpy as np
+
+from wr_analyzer.game_state import THUMB_WIDTH, thumbnail_phases
+from wr_analyzer.video import DecodeFilter, FfmpegSource, VideoSource
+from wr_analyzer.video_index import VideoIndex
+
+# Thumbnails per second of video.
+DEFAULT_FPS = 1.0
+
+# Only keyframes are decoded if they are at most this many thumbnail
+# spacings apart (median); otherwise thumbnails are sampled uniformly.
+_KEYFRAME_GAP_MAX = 2.0
+
+# Thumbnails classified per vectorized batch.
+_CHUNK = 256
+
+
+@dataclass(frozen=True)
+class Span:
+    """A stretch of video ``[start_sec, end_sec)`` worth a full analysis.
+
+    *phase* is ``"in_game"`` for a candidate game, ``"post_game"`` for the
+    window after one where its result screens are expected.
+    """
+
+    start_sec: float
+    end_sec: float
+    phase: str
+
+    def __contains__(self, timestamp_sec: float) -> bool:
+        return self.start_sec <= timestamp_sec < self.end_sec
+
+
+@dataclass
+class PrepassStats:
+    """What the pre-pass cost and how much of the full analysis it saved.
+
+    *video_sec* is the length of the analysed range and *covered_sec* how
+    much of it the spans cover.  *frames* is the number of sampling
+    timestamps inside the spans, *uniform* the number a run without the
+    pre-pass would sample, and *analysis_sec* the wall time of the full
+    analysis (refinement included).
+    """
+
+    thumbnails: int = 0
+    keyframes_only: bool = False
+    seconds: float = 0.0
+    video_sec: float = 0.0
+    covered_sec: float = 0.0
+    frames: int = 0
+    uniform: int = 0
+    analysis_sec: float = 0.0
+
+    @property
+    def skipped_fraction(self) -> float:
+        """Fraction of the range left out of the full analysis."""
+        if self.video_sec <= 0:
+            return 0.0
+        return 1.0 - self.covered_sec / self.video_sec
+
+    @property
+    def speedup(self) -> float | None:
+        """Estimated speedup of pre-pass + analysis over a uniform run.
+
+        A uniform run is estimated at *uniform* frames of the mean cost
+        of the analysed ones.  The skipped frames are mostly ones the
+        pixel checks settle without OCR, so this is an upper bound;
+        ``benchmarks/bench_prepass.py`` measures the real one.
+        """
+        if self.frames == 0:
+            return None
+        full_sec = self.uniform * self.analysis_sec / self.frames
+        return full_sec / (self.seconds + self.analysis_sec)
+
+
+def thumbnail_times(
+    index: VideoIndex, start_sec: float, stop: float, fps: float = DEFAULT_FPS
+) -> tuple[np.ndarray, bool]:
+    """Return the pre-pass timestamps and whether they are all keyframes.
+
+    Where the keyframes are dense enough, the keyframe nearest to each
+    ``1 / fps`` tick is used (each at most once); otherwise the ticks
+    themselves.  Either way they end within the indexed video.
+    """
+    spacing = 1.0 / fps
+    stop = min(stop, index.duration)
+    ticks = np.arange(start_sec, stop, spacing)
+    keys = index.pts[index.keyframes]
+    keys = keys[(keys >= start_sec) & (keys < stop)]
+    if len(keys) < 2 or np.median(np.diff(keys)) > _KEYFRAME_GAP_MAX * spacing:
+        return ticks, False
+    i = np.clip(np.searchsorted(keys, ticks), 1, len(keys) - 1)
+    nearest = np.where(ticks - keys[i - 1] <= keys[i] - ticks, i - 1, i)
+    return keys[np.unique(nearest)], True
+
+
+def scan(
+    path: Path | str,
+    times: np.ndarray,
+    *,
+    index: VideoIndex,
+    keyframes_only: bool = False,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Decode a thumbnail at each of *times* and classify them.
+
+    Returns ``(times, phases)``, cut short if the decoder fails before
+    the end.  Thumbnails are classified a chunk at a time, so memory
+    stays flat however long the video is.
+
+    With ``ffmpeg`` installed, the thumbnails are scaled and converted
+    to gray inside ffmpeg (see :class:`~wr_analyzer.video.DecodeFilter`)
+    and streamed -- *keyframes_only* *times* (see
+    :func:`thumbnail_times`) by decoding nothing but the keyframes.
+    Otherwise each is read as a full frame through the index and
+    reduced with OpenCV.
+    """
+    phases: list[np.ndarray] = []
+    buf: np.ndarray | None = None
+    n = done = 0
+    for _, thumb in _thumbnails(path, times, index, keyframes_only):
+        if buf is None:
+            buf = np.empty((_CHUNK, *thumb.shape), dtype=np.uint8)
+        buf[n] = thumb
+        n += 1
+        done += 1
+        if n == _CHUNK:
+            phases.append(thumbnail_phases(buf))
+            n = 0
+    if n:
+        phases.append(thumbnail_phases(buf[:n]))
+    phases_out = np.concatenate(phases) if phases else np.empty(0, dtype=object)
+    return np.asarray(times[:done], dtype=np.float64), phases_out
+
+
+def _thumbnails(
+    path: Path | str, times: np.ndarray, index: VideoIndex, keyframes_only: bool
+) -> Iterator[tuple[float, np.ndarray]]:
+    """Yield ``(timestamp, thumbnail)`` for *times*, in order (see :func:`scan`)."""
+    if len(times) == 0:
+        return
+    if shutil.which("ffmpeg") is not None:
+        decode_filter = DecodeFilter(scale=(THUMB_WIDTH, -1), pix_fmt="gray")
+        with FfmpegSource(path, decode_filter=decode_filter) as source:
+            if not keyframes_only:
+                yield from source.frames_at(times)
+                return
+            # Every keyframe of the range is decoded (they are what
+            # ffmpeg skips to); those between the ticks are dropped.
+            keys = index.pts[index.keyframes]
+            keys = keys[(keys >= times[0]) & (keys <= times[-1])]
+            wanted = np.isin(keys, times)
+            for keep, (ts, thumb) in zip(wanted, source.keyframes(keys)):
+                if keep:
+                    yield ts, thumb
+        return
+
+    with VideoSource(path, index=index) as source:
+        size = (
+            THUMB_WIDTH,
+            max(1, round(source.info.height * THUMB_WIDTH / source.info.width)),
+        )
+        thumb = np.empty((size[1], size[0]), dtype=np.uint8)
+        for ts in times:
+            try:
+                frame = source.read(float(ts))
+            except RuntimeError:
+                return
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            cv2.resize(gray, size, dst=thumb, interpolation=cv2.INTER_AREA)
+            yield ts, thumb
+
+
+def candidate_spans(
+    times: np.ndarray,
+    phases: np.ndarray,
+    start_sec: float,
+    stop: float,
+    *,
+    lead_sec: float = 0.0,
+    tail_sec: float = 60.0,
+    merge_gap_sec: float = 180.0,
+) -> list[Span]:
+    """Turn classified thumbnails into the spans to analyse, in order.
+
+    In-game thumbnails less than *merge_gap_sec* apart form one run.  A
+    run's game starts after the thumbnail before its first one and ends
+    before the one after its last, so its ``"in_game"`` span reaches
+    from the former (minus *lead_sec*, so the analysis samples a frame
+    before the game) to the latter.  A ``"post_game"`` span of
+    *tail_sec* follows, up to the next game's span.  All spans are
+    clipped to ``[start_sec, stop)``.
+    """
+    in_game = np.flatnonzero(phases == "in_game")
+    if len(in_game) == 0:
+        return []
+    breaks = np.flatnonzero(np.diff(times[in_game]) > merge_gap_sec)
+    firsts = in_game[np.concatenate([[0], breaks + 1])]
+    lasts = in_game[np.concatenate([breaks, [len(in_game) - 1]])]
+
+    games = []
+    for first, last in zip(firsts, lasts):
+        begin = times[first - 1] if first > 0 else start_sec
+        end = times[last + 1] if last + 1 < len(times) else stop
+        games.append((max(begin - lead_sec, start_sec), min(end, stop)))
+
+    spans = []
+    for i, (begin, end) in enumerate(games):
+        if spans and begin < spans[-1].end_sec:
+            # Overlaps the previous game's window: continue from it.
+            begin = spans[-1].end_sec
+        spans.append(Span(begin, end, "in_game"))
+        tail_end = min(end + tail_sec, stop)
+        if i + 1 < len(games):
+            tail_end = min(tail_end, games[i + 1][0])
+        if tail_end > end:
+            spans.append(Span(end, tail_end, "post_game"))
+    return [s for s in spans if s.end_sec > s.start_sec]
+
+
+def find_spans(
+    path: Path | str,
+    start_sec: float,
+    stop: float,
+    *,
+    index: VideoIndex,
+    fps: float = DEFAULT_FPS,
+    lead_sec: float = 0.0,
+    tail_sec: float = 60.0,
+    merge_gap_sec: float = 180.0,
+) -> tuple[list[Span], PrepassStats]:
+    """Run the pre-pass over ``[start_sec, stop)`` of the video at *path*.
+
+    Returns the spans to analyse (see :func:`candidate_spans`) and the
+    pre-pass part of their :class:`PrepassStats`.
+    """
+    if fps <= 0:
+        raise ValueError(f"fps must be > 0, got {fps}")
+    t0 = time.monotonic()
+    times, keyframes_only = thumbnail_times(index, start_sec, stop, fps)
+    times, phases = scan(path, times, index=index, keyframes_only=keyframes_only)
+    spans = candidate_spans(
+        times,
+        phases,
+        start_sec,
+        stop,
+        lead_sec=lead_sec,
+        tail_sec=tail_sec,
+        merge_gap_sec=merge_gap_sec,
+    )
+    stats = PrepassStats(
+        thumbnails=len(times),
+        keyframes_only=keyframes_only,
+        seconds=time.monotonic() - t0,
+        video_sec=max(0.0, stop - start_sec),
+        covered_sec=math.fsum(s.end_sec - s.start_sec for s in spans),
+    )
+    return spans, stats
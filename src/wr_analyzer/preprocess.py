@@ -0,0 +1,141 @@
+"""Crop preprocessing for OCR: CLAHE enhancement and resizing.
+
+Every HUD crop the recognizer reads is contrast-enhanced with CLAHE
+(Contrast-Limited Adaptive Histogram Equalisation) and enlarged first.
+The original recipe equalises each colour channel on its own and
+upscales by the crop's scale (3-5x) with cubic interpolation; it is
+most of the per-frame cost outside the recognizer itself.
+
+A :class:`Variant` describes one recipe:
+
+* *channels* -- ``"bgr"`` equalises the three channels separately;
+  ``"max"`` equalises once, on the per-pixel maximum of the channels: a
+  gray image in which both blue- and red-tinted text stay bright (a
+  luma conversion would dim the red).
+* *resize* -- ``"scale"`` enlarges by the crop's scale; ``"model"``
+  resizes straight to the recognizer's input height, which the
+  recognizer would otherwise resize the upscaled crop to again.
+* *interpolation* -- the OpenCV interpolation of the resize.
+
+:data:`VARIANTS` names the presets and :data:`DEFAULT_VARIANT` is the
+original recipe; :data:`wr_analyzer.ocr_plan.PREPROCESS_VARIANTS`
+chooses one per HUD region.  ``benchmarks/bench_preprocess.py``
+compares their latency and accuracy on the fixture frames.
+
+CLAHE objects and the intermediate planes are reused, per thread (the
+pipeline preprocesses on a thread of its own) and per crop size, so a
+crop allocates only its output image -- which the caller may keep, so it
+is never a shared buffer.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+
+import cv2
+import numpy as np
+from easyocr.config import imgH as _MODEL_HEIGHT
+
+# CLAHE parameters of every variant.
+_CLIP_LIMIT = 3.0
+_TILE_GRID = (2, 2)
+
+
+@dataclass(frozen=True)
+class Variant:
+    """One preprocessing recipe; see the module docstring."""
+
+    channels: str = "bgr"
+    resize: str = "scale"
+    interpolation: int = cv2.INTER_CUBIC
+
+    def __post_init__(self) -> None:
+        if self.channels not in ("bgr", "max"):
+            raise ValueError(f"Unknown channels: {self.channels!r}")
+        if self.resize not in ("scale", "model"):
+            raise ValueError(f"Unknown resize: {self.resize!r}")
+
+
+# Named variants, the original recipe first.
+VARIANTS: dict[str, Variant] = {
+    "clahe": Variant(),
+    "clahe_linear": Variant(interpolation=cv2.INTER_LINEAR),
+    "clahe_area": Variant(interpolation=cv2.INTER_AREA),
+    "max_clahe": Variant(channels="max"),
+    "max_clahe_model": Variant(
+        channels="max", resize="model", interpolation=cv2.INTER_LINEAR
+    ),
+}
+
+DEFAULT_VARIANT = "clahe"
+
+_local = threading.local()
+
+
+def _clahe() -> cv2.CLAHE:
+    """Return this thread's CLAHE object (they keep per-call state)."""
+    clahe = getattr(_local, "clahe", None)
+    if clahe is None:
+        clahe = _local.clahe = cv2.createCLAHE(
+            clipLimit=_CLIP_LIMIT, tileGridSize=_TILE_GRID
+        )
+    return clahe
+
+
+def _buffers(key: tuple) -> list[np.ndarray]:
+    """Return this thread's intermediate planes for *key* (kind, h, w)."""
+    buffers = getattr(_local, "buffers", None)
+    if buffers is None:
+        buffers = _local.buffers = {}
+    planes = buffers.get(key)
+    if planes is None:
+        kind, h, w = key
+        count = 6 if kind == "bgr" else 2
+        planes = buffers[key] = [np.empty((h, w), np.uint8) for _ in range(count)]
+        if kind == "bgr":
+            planes.append(np.empty((h, w, 3), np.uint8))
+    return planes
+
+
+def resolve_variant(variant: str | Variant) -> Variant:
+    """Return the :class:`Variant` named *variant* (or *variant* itself)."""
+    if isinstance(variant, Variant):
+        return variant
+    try:
+        return VARIANTS[variant]
+    except KeyError:
+        raise ValueError(f"Unknown preprocessing variant: {variant!r}") from None
+
+
+def preprocess(
+    image: np.ndarray, scale: int, variant: str | Variant = DEFAULT_VARIANT
+) -> np.ndarray:
+    """Enhance a BGR crop with *variant* for the OCR.
+
+    *scale* is the crop's upscale factor, used by ``resize="scale"``
+    variants.  Returns a new BGR image for ``channels="bgr"``, a gray
+    one for ``"max"``.
+    """
+    v = resolve_variant(variant)
+    clahe = _clahe()
+    h, w = image.shape[:2]
+    if v.channels == "bgr":
+        *planes, merged = _buffers(("bgr", h, w))
+        for i in range(3):
+            cv2.extractChannel(image, i, planes[i])
+            clahe.apply(planes[i], planes[i + 3])
+        enhanced = cv2.merge(planes[3:], merged)
+    else:
+        brightest, enhanced = _buffers(("max", h, w))
+        np.maximum(image[..., 0], image[..., 1], out=brightest)
+        np.maximum(brightest, image[..., 2], out=brightest)
+        clahe.apply(brightest, enhanced)
+
+    if v.resize == "model":
+        size = (max(1, int(_MODEL_HEIGHT * w / h)), _MODEL_HEIGHT)
+    elif scale > 1:
+        size = (w * scale, h * scale)
+    else:
+        return enhanced.copy()
+    return cv2.resize(enhanced, size, interpolation=v.interpolation)
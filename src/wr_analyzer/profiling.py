@@ -0,0 +1,233 @@
+"""Per-stage timing of an analysis run, and Chrome trace export.
+
+A :class:`Profile` collects how long each stage of the per-frame work
+takes and how often each HUD region goes through the recognizer.  The
+stages are:
+
+* ``"decode"`` -- seeking and decoding one sampled frame;
+* ``"frame"`` -- everything :func:`~wr_analyzer.analyze.analyze_frame`
+  does for it once decoded;
+* ``"phase"`` -- game phase detection (pixel checks, and the timer OCR
+  of the cascade when they can't settle it);
+* ``"preprocess"`` -- CLAHE enhancement and resizing of one crop;
+* ``"recognize"`` -- one OCR engine call (a batch is one);
+* ``"parse"`` -- turning one crop's text into a detector value;
+* ``"prepass"`` -- the thumbnail pre-pass, once per run.
+
+Stages nest -- ``"frame"`` contains the phase, OCR and parsing of its
+frame, ``"phase"`` the OCR it triggers -- so their times add up to more
+than the wall time.  :meth:`Profile.stages` reports each stage's count,
+total and p50 / p95 / p99 latency; :attr:`Profile.ocr_calls` counts the
+OCR engine reads per region (a batched call counts each region in it).
+
+With ``trace=True`` every span is also kept as a Chrome trace event;
+:meth:`Profile.write_trace` writes them as a JSON file for
+``chrome://tracing`` or https://ui.perfetto.dev, one track per thread
+(the pipeline's decode and preprocess threads get their own) and per
+worker process.
+
+Instrumented code takes an optional profile and wraps its stages in
+:func:`span`, which costs next to nothing without one.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TypeVar
+
+import numpy as np
+
+T = TypeVar("T")
+
+# Returned by span() when there is no profile to record into.
+_NULL_SPAN = nullcontext()
+
+
+@dataclass(frozen=True)
+class StageStats:
+    """Latency of one stage: how often it ran, in total and percentiles."""
+
+    count: int
+    total_sec: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+
+class _Span:
+    """Times one stage from ``__enter__`` to ``__exit__`` into a profile."""
+
+    __slots__ = ("profile", "stage", "region", "start")
+
+    def __init__(self, profile: Profile, stage: str, region: str | None) -> None:
+        self.profile = profile
+        self.stage = stage
+        self.region = region
+
+    def __enter__(self) -> _Span:
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.profile.record(
+            self.stage, self.start, time.perf_counter(), region=self.region
+        )
+
+
+class Profile:
+    """Stage timings and per-region OCR call counts of a run.
+
+    Parameters
+    ----------
+    trace : bool
+        Also keep every span as a Chrome trace event (see
+        :meth:`write_trace`).  Costs memory in proportion to the frames
+        analysed.
+
+    Attributes
+    ----------
+    ocr_calls : Counter[str]
+        OCR engine reads per region name.
+    events : list[dict]
+        The trace events recorded so far (empty without *trace*).
+
+    Safe to record into from several threads.  A profile pickles
+    without its lock, so a worker process can record into a
+    :meth:`fork` and send it back to be :meth:`add` ed.
+    """
+
+    def __init__(self, trace: bool = False) -> None:
+        self.trace = trace
+        self.ocr_calls: Counter[str] = Counter()
+        self.events: list[dict] = []
+        self._durations: dict[str, list[float]] = {}
+        self._threads: dict[tuple[int, int], str] = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def span(self, stage: str, region: str | None = None) -> _Span:
+        """Return a context manager timing one run of *stage*.
+
+        *region* names the HUD region the stage works on; it is only
+        kept in the trace event.
+        """
+        return _Span(self, stage, region)
+
+    def record(
+        self, stage: str, start: float, end: float, *, region: str | None = None
+    ) -> None:
+        """Record a run of *stage* between two :func:`time.perf_counter` values."""
+        with self._lock:
+            self._durations.setdefault(stage, []).append(end - start)
+            if not self.trace:
+                return
+            thread = threading.current_thread()
+            pid, tid = os.getpid(), thread.ident or 0
+            self._threads.setdefault((pid, tid), thread.name)
+            event = {
+                "name": stage,
+                "cat": "wr_analyzer",
+                "ph": "X",
+                "ts": start * 1e6,
+                "dur": (end - start) * 1e6,
+                "pid": pid,
+                "tid": tid,
+            }
+            if region is not None:
+                event["args"] = {"region": region}
+            self.events.append(event)
+
+    def count_ocr(self, regions: Iterable[str]) -> None:
+        """Count one OCR engine read of each of *regions*."""
+        with self._lock:
+            self.ocr_calls.update(regions)
+
+    def fork(self) -> Profile:
+        """Return an empty profile with the same settings, to :meth:`add` later."""
+        return Profile(trace=self.trace)
+
+    def add(self, other: Profile) -> None:
+        """Merge the timings, counts and events of *other* into this profile."""
+        with self._lock:
+            for stage, durations in other._durations.items():
+                self._durations.setdefault(stage, []).extend(durations)
+            self.ocr_calls.update(other.ocr_calls)
+            self.events.extend(other.events)
+            for key, name in other._threads.items():
+                self._threads.setdefault(key, name)
+
+    def stages(self) -> dict[str, StageStats]:
+        """Return the latency statistics of every stage recorded."""
+        stats = {}
+        for stage, durations in self._durations.items():
+            ms = np.asarray(durations) * 1e3
+            p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+            stats[stage] = StageStats(
+                count=len(durations),
+                total_sec=float(ms.sum() / 1e3),
+                p50_ms=float(p50),
+                p95_ms=float(p95),
+                p99_ms=float(p99),
+            )
+        return stats
+
+    def summary(self) -> dict:
+        """Return the stage statistics and OCR call counts as a JSON-able dict."""
+        return {
+            "stages": {stage: asdict(s) for stage, s in self.stages().items()},
+            "ocr_calls": dict(self.ocr_calls.most_common()),
+        }
+
+    def write_trace(self, path: str | Path) -> None:
+        """Write the trace events to *path* in the Chrome trace-event format."""
+        names = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": tid,
+                "args": {"name": name},
+            }
+            for (pid, tid), name in self._threads.items()
+        ]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": names + self.events, "displayTimeUnit": "ms"}, f)
+
+
+def span(profile: Profile | None, stage: str, region: str | None = None):
+    """Return :meth:`Profile.span`, or a no-op context without a *profile*."""
+    if profile is None:
+        return _NULL_SPAN
+    return _Span(profile, stage, region)
+
+
+def timed(profile: Profile | None, stage: str, iterable: Iterable[T]) -> Iterator[T]:
+    """Iterate *iterable*, timing each step (e.g. a decoder's) as *stage*."""
+    if profile is None:
+        yield from iterable
+        return
+    items = iter(iterable)
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(items)
+        except StopIteration:
+            return
+        profile.record(stage, start, time.perf_counter())
+        yield item
@@ -10,7 +10,7 @@ Pixel offsets are scaled proportionally with frame width at runtime.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from typing import NamedTuple
 
@@ -52,6 +52,8 @@ class Region:
       from frame centre (positive = rightward), *y* = top/bottom margin.
 
     *w* and *h* are the region's width and height in reference pixels.
+    *name* labels the region in profiles (see :mod:`wr_analyzer.profiling`);
+    it takes no part in comparisons.
     """
 
     anchor: Anchor
@@ -59,6 +61,7 @@ class Region:
     y: int
     w: int
     h: int
+    name: str = field(default="", compare=False)
 
     def to_pixels(self, frame_w: int, frame_h: int) -> PixelBox:
         """Convert to absolute pixel coordinates for a given frame size.
@@ -128,32 +131,43 @@ class Region:
 
 # Broad scoreboard area — captures kills "# VS #", timer, and KDA.
 # Anchored top-right; right margin = 112, top margin = 0.
-SCOREBOARD = Region(anchor=Anchor.TOP_RIGHT, x=112, y=0, w=145, h=47)
+SCOREBOARD = Region(anchor=Anchor.TOP_RIGHT, x=112, y=0, w=145, h=47, name="scoreboard")
+
+# The scoreboard's two text rows, for single-line recognition.  The top
+# row holds the kill score and KDA, the second row the clock and ping.
+SCOREBOARD_TOP_ROW = Region(
+    anchor=Anchor.TOP_RIGHT, x=112, y=0, w=145, h=16, name="scoreboard_top_row"
+)
+SCOREBOARD_BOTTOM_ROW = Region(
+    anchor=Anchor.TOP_RIGHT, x=112, y=14, w=145, h=14, name="scoreboard_bottom_row"
+)
 
 # Game clock ("12:34") — top-right, second row below kill scores.
 # Right margin = 180, top margin = 15.
-GAME_TIMER = Region(anchor=Anchor.TOP_RIGHT, x=180, y=15, w=68, h=23)
+GAME_TIMER = Region(anchor=Anchor.TOP_RIGHT, x=180, y=15, w=68, h=23, name="game_timer")
 
 # Team kill scores ("# VS #") — top-right, first row.
 # Right margin = 146, top margin = 0.
 # Height limited to 14px to avoid overlapping the GAME_TIMER region below.
-KILLS = Region(anchor=Anchor.TOP_RIGHT, x=146, y=0, w=111, h=14)
+KILLS = Region(anchor=Anchor.TOP_RIGHT, x=146, y=0, w=111, h=14, name="kills")
 
 # Player KDA ("K/D/A") — top-right, right of kill scores.
 # Right margin = 104, top margin = 0.
-PLAYER_KDA = Region(anchor=Anchor.TOP_RIGHT, x=104, y=0, w=59, h=23)
+PLAYER_KDA = Region(anchor=Anchor.TOP_RIGHT, x=104, y=0, w=59, h=23, name="player_kda")
 
 # Minimap — top-left corner (default placement).
-MINIMAP = Region(anchor=Anchor.TOP_LEFT, x=0, y=0, w=187, h=177)
+MINIMAP = Region(anchor=Anchor.TOP_LEFT, x=0, y=0, w=187, h=177, name="minimap")
 
 # Player champion portrait + level — bottom-left.
-PLAYER_PORTRAIT = Region(anchor=Anchor.BOTTOM_LEFT, x=0, y=1, w=102, h=118)
+PLAYER_PORTRAIT = Region(
+    anchor=Anchor.BOTTOM_LEFT, x=0, y=1, w=102, h=118, name="player_portrait"
+)
 
 # Ability buttons — bottom-right cluster.
-ABILITIES = Region(anchor=Anchor.BOTTOM_RIGHT, x=1, y=1, w=298, h=177)
+ABILITIES = Region(anchor=Anchor.BOTTOM_RIGHT, x=1, y=1, w=298, h=177, name="abilities")
 
 # Gold display — bottom centre.
-GOLD = Region(anchor=Anchor.BOTTOM_CENTER, x=0, y=1, w=170, h=39)
+GOLD = Region(anchor=Anchor.BOTTOM_CENTER, x=0, y=1, w=170, h=39, name="gold")
 
 # Event / kill feed — left side, below minimap.
-EVENT_FEED = Region(anchor=Anchor.TOP_LEFT, x=0, y=39, w=213, h=118)
+EVENT_FEED = Region(anchor=Anchor.TOP_LEFT, x=0, y=39, w=213, h=118, name="event_feed")
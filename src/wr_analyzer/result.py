@@ -10,17 +10,26 @@ import re
 
 import numpy as np
 
-from wr_analyzer.ocr import ocr_easyocr, preprocess_clahe
+from wr_analyzer.ocr_plan import OcrPlan, read_confident
 from wr_analyzer.regions import Anchor, Region
 
+# Version of read_result()'s output.  Bump it whenever a change may
+# alter the result for the same frame, so cached results are recomputed
+# (see wr_analyzer.frame_cache).
+RESULT_VERSION = 3
+
 # Two regions to check — the VICTORY/DEFEAT text appears in different
 # positions on the animated banner vs. the post-game scoreboard.
 #
 # Banner region: the large centred banner shown right after game end.
 # Centred horizontally, 19px from top at 854×394 reference.
-_RESULT_BANNER = Region(anchor=Anchor.TOP_CENTER, x=0, y=19, w=427, h=137)
+_RESULT_BANNER = Region(
+    anchor=Anchor.TOP_CENTER, x=0, y=19, w=427, h=137, name="result_banner"
+)
 # Scoreboard header: smaller text at the very top of the stats screen.
-_RESULT_SCOREBOARD = Region(anchor=Anchor.TOP_CENTER, x=0, y=0, w=341, h=47)
+_RESULT_SCOREBOARD = Region(
+    anchor=Anchor.TOP_CENTER, x=0, y=0, w=341, h=47, name="result_scoreboard"
+)
 
 # Patterns tolerant of common OCR misreads.
 # "VICTORY" often appears as "Victory", "VICTARY", "VICTQRY", etc.
@@ -38,29 +47,41 @@ def _match_text(text: str) -> str | None:
     return None
 
 
-def detect_result(frame: np.ndarray) -> str | None:
-    """Detect win/loss from a post-game frame.
+def read_result(
+    frame: np.ndarray, *, plan: OcrPlan | None = None
+) -> tuple[str | None, float | None]:
+    """Detect win/loss from a post-game frame, with the OCR's confidence.
 
     Tries the large centred banner region first (animated victory/defeat
     splash), then falls back to the scoreboard header region (post-game
-    stats screen).
+    stats screen) unless the banner was read confidently (see
+    :func:`~wr_analyzer.ocr_plan.read_confident`).
 
     Parameters
     ----------
     frame : np.ndarray
         A BGR frame (OpenCV format).
+    plan : OcrPlan | None
+        The frame's analysis context, to reuse readings made by earlier
+        detectors on the same frame.
 
     Returns
     -------
-    str | None
-        ``"victory"``, ``"defeat"``, or ``None`` if no result is detected.
+    tuple[str | None, float | None]
+        ``"victory"`` or ``"defeat"`` and the OCR confidence, or
+        ``(None, None)`` if no result is detected.
     """
-    for region in (_RESULT_BANNER, _RESULT_SCOREBOARD):
-        crop = region.crop(frame)
-        enhanced = preprocess_clahe(crop, scale=4)
-        parts = ocr_easyocr(enhanced)
-        text = " ".join(parts)
-        result = _match_text(text)
-        if result is not None:
-            return result
-    return None
+    if plan is None:
+        plan = OcrPlan(frame, ())
+    # Large multi-word banners need full text detection.
+    crops = ((_RESULT_BANNER, 4), (_RESULT_SCOREBOARD, 4))
+    return read_confident(plan, crops, _match_text, engine="readtext")
+
+
+def detect_result(frame: np.ndarray, *, plan: OcrPlan | None = None) -> str | None:
+    """Detect win/loss from a post-game frame.
+
+    :func:`read_result` without the confidence: ``"victory"``,
+    ``"defeat"``, or ``None`` if no result is detected.
+    """
+    return read_result(frame, plan=plan)[0]
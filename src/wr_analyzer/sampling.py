@@ -0,0 +1,92 @@
+"""Coarse-to-fine sampling around game boundaries.
+
+A uniform pass has to choose between a small interval, which OCRs the
+whole VOD densely, and a large one, which places every game start and
+end only to within one interval.  Adaptive sampling does a sparse
+uniform pass first, then repeatedly samples the midpoint between
+neighbouring frames whose phases disagree about being in play
+(loading → in_game, in_game → post_game, in-game gaps), until every
+such pair is at most *resolution_sec* apart.  Dense OCR is only spent
+around the transitions; the stretches in between keep the sparse
+spacing.
+
+The functions here only decide *where* to sample;
+:func:`wr_analyzer.analyze.analyze_video` (``refine_sec=``) reads the
+frames.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from wr_analyzer.analyze import FrameData
+
+
+@dataclass
+class SamplingStats:
+    """Frames analysed by an adaptive run, and what uniform would cost.
+
+    *uniform* is the number of frames a uniform pass at the refinement
+    resolution would analyse over the same range, i.e. one that places
+    the boundaries just as precisely.
+    """
+
+    sparse: int = 0
+    refined: int = 0
+    rounds: int = 0
+    uniform: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.sparse + self.refined
+
+
+def uniform_frame_count(start_sec: float, stop: float, interval_sec: float) -> int:
+    """Return how many frames uniform sampling of ``[start_sec, stop)`` reads."""
+    return max(0, math.ceil((stop - start_sec) / interval_sec))
+
+
+def sample_times(start_sec: float, stop: float, interval_sec: float) -> list[float]:
+    """Return the timestamps uniform sampling of ``[start_sec, stop)`` reads.
+
+    They are accumulated exactly as
+    :meth:`~wr_analyzer.video.VideoSource.frames` does, so they compare
+    equal to the timestamps of a sequential pass.
+    """
+    times = []
+    ts = start_sec
+    while ts < stop:
+        times.append(ts)
+        ts += interval_sec
+    return times
+
+
+def is_transition(a: FrameData, b: FrameData) -> bool:
+    """Return ``True`` if a game boundary lies between frames *a* and *b*.
+
+    That is, exactly one of them is in play.  Changes between the
+    phases outside play (e.g. post_game → loading) don't move any game
+    boundary and are left alone.
+    """
+    return (a.phase == "in_game") != (b.phase == "in_game")
+
+
+def refinement_times(frames: Sequence[FrameData], resolution_sec: float) -> list[float]:
+    """Return the midpoints to sample next, in timestamp order.
+
+    *frames* must be sorted by timestamp.  One midpoint is returned for
+    every neighbouring pair that :func:`is_transition` and is more than
+    *resolution_sec* apart; an empty list means the boundaries are
+    pinned down.
+    """
+    if resolution_sec <= 0:
+        raise ValueError(f"resolution_sec must be > 0, got {resolution_sec}")
+    return [
+        (a.timestamp_sec + b.timestamp_sec) / 2
+        for a, b in zip(frames, frames[1:])
+        if b.timestamp_sec - a.timestamp_sec > resolution_sec and is_transition(a, b)
+    ]
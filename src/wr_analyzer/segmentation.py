@@ -0,0 +1,267 @@
+"""Online game segmentation of a stream of analysed frames.
+
+Both steps that turn frames into games work one frame at a time, in
+timestamp order, so a long VOD (or a live stream) never needs its frames
+held in memory:
+
+* :class:`KillFilter` clears team-kill readings that break monotonicity
+  (kill totals only go up) or are implausibly large, trusting a
+  confident OCR reading over a doubtful one.
+* :class:`GameSegmenter` groups in-game frames into
+  :class:`GameSegment` s, split where consecutive in-game frames are
+  more than *min_gap_sec* apart, and attaches the post-game frames that
+  follow within that gap.  It reports each game with events:
+  :class:`GameStarted` once the segment has lasted *min_duration_sec*
+  (shorter ones are discarded as false positives), then
+  :class:`GameEnded` and :class:`GameResult` once no later frame can
+  extend it, i.e. a frame more than *min_gap_sec* past its end arrives
+  or the stream ends.
+
+Fed a whole run, they give exactly the batch results.
+
+Readings are weighed by their OCR confidence (the ``*_confidence``
+fields of :class:`~wr_analyzer.analyze.FrameData`): one below the
+:func:`~wr_analyzer.ocr_plan.confidence_threshold` of the engine that
+read it is doubtful, and one without a confidence (e.g. from an older
+journal) counts as confident, so such frames are treated as before.
+Engines without a calibrated threshold never produce doubtful readings.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING
+
+from wr_analyzer.kda import MAX_TEAM_KILLS, PlayerKDA, TeamKills
+from wr_analyzer.ocr_plan import confidence_threshold
+
+if TYPE_CHECKING:
+    from wr_analyzer.analyze import FrameData
+
+
+def _weight(confidence: float | None) -> float:
+    """Return a reading's confidence, taking an unknown one as certain."""
+    return 1.0 if confidence is None else confidence
+
+
+@dataclass
+class GameSegment:
+    """A contiguous stretch of in-game frames plus trailing post-game data."""
+
+    start_sec: float
+    end_sec: float
+    frames: list[FrameData] = field(default_factory=list)
+    post_game_frames: list[FrameData] = field(default_factory=list)
+
+    @property
+    def result(self) -> str | None:
+        """Return ``"victory"`` or ``"defeat"`` from the post-game frames.
+
+        The first confident reading wins; failing one, the most
+        confident (the earliest on a tie).  The result banners are
+        always read with the ``"readtext"`` engine, so that engine's
+        threshold applies.
+        """
+        threshold = confidence_threshold("readtext")
+        best, best_weight = None, -1.0
+        for f in self.post_game_frames:
+            if f.result is None:
+                continue
+            weight = _weight(f.result_confidence)
+            if weight >= threshold:
+                return f.result
+            if weight > best_weight:
+                best, best_weight = f.result, weight
+        return best
+
+    @property
+    def first_game_time(self) -> str | None:
+        for f in self.frames:
+            if f.game_time is not None and f.clock_status != "conflict":
+                return f.game_time
+        return None
+
+    @property
+    def last_game_time(self) -> str | None:
+        for f in reversed(self.frames):
+            if f.game_time is not None and f.clock_status != "conflict":
+                return f.game_time
+        return None
+
+    @property
+    def final_team_kills(self) -> TeamKills | None:
+        for f in reversed(self.frames):
+            if f.team_kills is not None:
+                return f.team_kills
+        return None
+
+    @property
+    def final_player_kda(self) -> PlayerKDA | None:
+        for f in reversed(self.frames):
+            if f.player_kda is not None:
+                return f.player_kda
+        return None
+
+    def summary(self) -> dict:
+        """Return a JSON-able summary of the game."""
+        entry: dict = {
+            "video_start_sec": self.start_sec,
+            "video_end_sec": self.end_sec,
+            "result": self.result,
+            "first_game_time": self.first_game_time,
+            "last_game_time": self.last_game_time,
+        }
+        tk = self.final_team_kills
+        if tk:
+            entry["final_kills"] = {"blue": tk.blue, "red": tk.red}
+        kda = self.final_player_kda
+        if kda:
+            entry["final_kda"] = {
+                "kills": kda.kills,
+                "deaths": kda.deaths,
+                "assists": kda.assists,
+            }
+        return entry
+
+
+@dataclass(frozen=True)
+class GameStarted:
+    """Game number *game* (from 1) has lasted long enough to be reported."""
+
+    game: int
+    start_sec: float
+
+
+@dataclass(frozen=True)
+class GameEnded:
+    """Game number *game* is over; *segment* holds all its frames."""
+
+    game: int
+    segment: GameSegment
+
+
+@dataclass(frozen=True)
+class GameResult:
+    """The post-game screens of game number *game* showed *result*."""
+
+    game: int
+    result: str
+
+
+GameEvent = GameStarted | GameEnded | GameResult
+
+
+class KillFilter:
+    """Clear team-kill readings that violate monotonicity.
+
+    Kill totals can only increase during a game.  A reading where either
+    team's count decreases compared to the previous valid reading is an
+    OCR error and is replaced with ``None`` (the frame is kept, its kill
+    data is cleared), as is one above
+    :data:`~wr_analyzer.kda.MAX_TEAM_KILLS`.
+
+    The error is taken to be the earlier reading's instead if that one
+    was doubtful and the decreasing one is confident: the latter is
+    kept and later readings are checked against it, so one misread
+    total too high doesn't clear every reading after it.
+
+    Parameters
+    ----------
+    confidence_threshold : float
+        Confidence below which a reading is doubtful: the
+        :func:`~wr_analyzer.ocr_plan.confidence_threshold` of the OCR
+        engine the kills were read with.  The default, 0, never
+        overrides a reading.
+    """
+
+    def __init__(self, confidence_threshold: float = 0.0) -> None:
+        self.confidence_threshold = confidence_threshold
+        self._last_blue = -1
+        self._last_red = -1
+        self._last_doubtful = False
+
+    def __call__(self, frame: FrameData) -> FrameData:
+        """Return *frame*, with its kills cleared if they are implausible."""
+        if frame.team_kills is None:
+            return frame
+        b, r = frame.team_kills.blue, frame.team_kills.red
+        if b > MAX_TEAM_KILLS or r > MAX_TEAM_KILLS:
+            return replace(frame, team_kills=None, team_kills_confidence=None)
+        doubtful = _weight(frame.team_kills_confidence) < self.confidence_threshold
+        if (b >= self._last_blue and r >= self._last_red) or (
+            self._last_doubtful and not doubtful
+        ):
+            self._last_blue, self._last_red = b, r
+            self._last_doubtful = doubtful
+            return frame
+        return replace(frame, team_kills=None, team_kills_confidence=None)
+
+
+class GameSegmenter:
+    """Group a timestamp-ordered stream of frames into games.
+
+    Parameters
+    ----------
+    min_gap_sec : float
+        A gap between consecutive in-game frames above this starts a new
+        game; post-game frames up to this long after a game's last
+        in-game frame are attached to it.
+    min_duration_sec : float
+        Shorter segments are discarded (likely false positives).
+    """
+
+    def __init__(
+        self, min_gap_sec: float = 30.0, min_duration_sec: float = 60.0
+    ) -> None:
+        self.min_gap_sec = min_gap_sec
+        self.min_duration_sec = min_duration_sec
+        self.games = 0
+        self._current: GameSegment | None = None
+        self._started = False
+        self._post_game: list[FrameData] = []
+
+    def push(self, frame: FrameData) -> list[GameEvent]:
+        """Add the next frame; return the events it settles."""
+        events: list[GameEvent] = []
+        current = self._current
+        if (
+            current is not None
+            and frame.timestamp_sec > current.end_sec + self.min_gap_sec
+        ):
+            events.extend(self.finish())
+        ts = frame.timestamp_sec
+        if frame.phase == "in_game":
+            if self._current is None:
+                self._current = GameSegment(start_sec=ts, end_sec=ts)
+                self._started = False
+            current = self._current
+            current.end_sec = ts
+            current.frames.append(frame)
+            # Post-game frames before the segment's end don't follow it.
+            self._post_game.clear()
+            if (
+                not self._started
+                and current.end_sec - current.start_sec >= self.min_duration_sec
+            ):
+                self._started = True
+                self.games += 1
+                events.append(GameStarted(self.games, current.start_sec))
+        elif (
+            frame.phase == "post_game"
+            and self._current is not None
+            and ts > self._current.end_sec
+        ):
+            self._post_game.append(frame)
+        return events
+
+    def finish(self) -> list[GameEvent]:
+        """Close the current segment (the stream ended); return its events."""
+        segment, self._current = self._current, None
+        post_game, self._post_game = self._post_game, []
+        if segment is None or not self._started:
+            return []
+        segment.post_game_frames = post_game
+        events: list[GameEvent] = [GameEnded(self.games, segment)]
+        if segment.result is not None:
+            events.append(GameResult(self.games, segment.result))
+        return events
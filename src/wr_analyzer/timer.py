@@ -6,8 +6,12 @@ import re
 
 import numpy as np
 
-from wr_analyzer.ocr import ocr_easyocr, preprocess_clahe
-from wr_analyzer.regions import GAME_TIMER, SCOREBOARD
+from wr_analyzer.ocr_plan import TIMER_CROPS, OcrPlan, read_confident
+
+# Version of read_game_time()'s output.  Bump it whenever a change may
+# alter the result for the same frame, so cached results are recomputed
+# (see wr_analyzer.frame_cache).
+GAME_TIME_VERSION = 3
 
 # Matches "MM:SS" or "M:SS" patterns.  The colon may OCR as period,
 # semicolon, asterisk, or a letter/digit (e.g. "17e35", "07835").
@@ -33,31 +37,46 @@ def parse_game_time(text: str) -> int | None:
     return minutes * 60 + seconds
 
 
-def detect_game_time(frame: np.ndarray) -> str | None:
-    """Extract the game clock from a video frame.
+def format_game_time(seconds: int) -> str:
+    """Format total seconds as the ``"M:SS"`` string detectors return."""
+    return f"{seconds // 60}:{seconds % 60:02d}"
 
-    Tries the dedicated timer region first; falls back to the broader
-    scoreboard region and regex extraction.
 
-    Returns the time as ``"MM:SS"`` or ``None`` if not detected.
-    """
-    # Try the focused timer region with CLAHE + EasyOCR at multiple scales.
-    crop = GAME_TIMER.crop(frame)
-    for scale in (5, 4, 3):
-        enhanced = preprocess_clahe(crop, scale=scale)
-        parts = ocr_easyocr(enhanced)
-        text = " ".join(parts)
-        secs = parse_game_time(text)
-        if secs is not None:
-            return f"{secs // 60}:{secs % 60:02d}"
-
-    # Fallback: broader scoreboard region.
-    crop = SCOREBOARD.crop(frame)
-    enhanced = preprocess_clahe(crop, scale=3)
-    parts = ocr_easyocr(enhanced)
-    text = " ".join(parts)
+def _parse_clock(text: str) -> str | None:
     secs = parse_game_time(text)
-    if secs is not None:
-        return f"{secs // 60}:{secs % 60:02d}"
+    return None if secs is None else format_game_time(secs)
+
 
-    return None
+def read_game_time(
+    frame: np.ndarray, *, engine: str = "recognize", plan: OcrPlan | None = None
+) -> tuple[str | None, float | None]:
+    """Read the game clock from a video frame, with the OCR's confidence.
+
+    Tries the dedicated timer region first at several CLAHE scales;
+    falls back to the broader scoreboard region and regex extraction.
+    A confident parse ends the search; a doubtful one only gives way to
+    a more confident later crop (see
+    :func:`~wr_analyzer.ocr_plan.read_confident`).  *engine* selects the
+    OCR engine (see :data:`wr_analyzer.ocr.OCR_ENGINES`).  Pass the
+    frame's *plan* to share one batched OCR pass with the other HUD
+    detectors; *engine* is then taken from the plan.
+
+    Returns ``(time, confidence)`` with the time as ``"MM:SS"``, or
+    ``(None, None)`` if not detected.
+    """
+    if plan is None:
+        plan = OcrPlan(frame, TIMER_CROPS, engine=engine)
+
+    # Focused timer region at each scale, then the scoreboard fallback.
+    return read_confident(plan, TIMER_CROPS, _parse_clock)
+
+
+def detect_game_time(
+    frame: np.ndarray, *, engine: str = "recognize", plan: OcrPlan | None = None
+) -> str | None:
+    """Extract the game clock from a video frame.
+
+    :func:`read_game_time` without the confidence.  Returns the time as
+    ``"MM:SS"`` or ``None`` if not detected.
+    """
+    return read_game_time(frame, engine=engine, plan=plan)[0]
@@ -1,17 +1,34 @@
 """Video loading and frame sampling.
 
-Uses OpenCV (cv2.VideoCapture) for decoding.
+Two decoder backends share the same interface (``info``, ``read``,
+``frames``, context manager):
+
+* :class:`VideoSource` — OpenCV (``cv2.VideoCapture``), the default.
+* :class:`FfmpegSource` — an ``ffmpeg -f rawvideo`` pipe read into
+  preallocated NumPy buffers, with optional decode-time crop / scale /
+  pixel-format conversion (:class:`DecodeFilter`).
+
+Use :func:`open_video` to pick one by name.
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import math
+import shutil
+import subprocess
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Iterator
+from typing import Iterable, Iterator, Sequence
 
 import cv2
 import numpy as np
 
+from wr_analyzer.regions import PixelBox, Region
+from wr_analyzer.video_index import VideoIndex
+
+# Names accepted by open_video() / analyze_video(decoder=...).
+DECODERS = ("opencv", "ffmpeg")
+
 
 @dataclass(frozen=True)
 class VideoInfo:
@@ -23,8 +40,45 @@ class VideoInfo:
     duration: float  # seconds
 
 
-def probe(path: Path | str) -> VideoInfo:
-    """Read video metadata via OpenCV.
+class VideoSource:
+    """A decoder session that stays open across many frame reads.
+
+    Opening a ``cv2.VideoCapture`` re-parses the container, which is
+    expensive on multi-hour VODs.  A ``VideoSource`` opens the file once
+    and serves every read from the same handle.
+
+    Short forward hops are bridged by ``grab()``-ing the intervening
+    frames (decode without colour conversion); anything further away, or
+    backwards, falls back to a real seek.
+
+    With a :class:`~wr_analyzer.video_index.VideoIndex` the choice is
+    exact: if the current position already lies in the target's GOP it
+    decodes forward, otherwise it jumps to the target's keyframe and
+    decodes forward from there, checking each frame's true PTS.  The
+    index also supplies the duration, which is then correct for
+    variable-frame-rate recordings.
+
+    After every read, :attr:`pts` holds the presentation timestamp of the
+    frame actually returned (which may differ slightly from the one
+    requested).
+
+    Use as a context manager::
+
+        with VideoSource(path) as source:
+            frame = source.read(600.0)
+
+    Parameters
+    ----------
+    path : Path | str
+        Video file path.
+    max_skip_sec : float
+        Largest forward gap (in seconds of video) that is decoded through
+        rather than seeked over.  A seek lands on the previous keyframe and
+        decodes forward anyway, so this should be around one GOP.  Unused
+        when *index* is given.
+    index : VideoIndex | None
+        Keyframe / PTS index of the file (see
+        :func:`wr_analyzer.video_index.ensure_index`).
 
     Raises
     ------
@@ -33,60 +87,469 @@ def probe(path: Path | str) -> VideoInfo:
     RuntimeError
         If cv2 fails to open the file.
     """
-    path = Path(path)
-    if not path.exists():
-        raise FileNotFoundError(path)
 
-    cap = cv2.VideoCapture(str(path))
-    if not cap.isOpened():
-        raise RuntimeError(f"Failed to open video: {path}")
+    def __init__(
+        self,
+        path: Path | str,
+        *,
+        max_skip_sec: float = 2.0,
+        index: VideoIndex | None = None,
+    ) -> None:
+        self.path = Path(path)
+        if not self.path.exists():
+            raise FileNotFoundError(self.path)
 
-    fps = cap.get(cv2.CAP_PROP_FPS)
-    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-    frame_count = cap.get(cv2.CAP_PROP_FRAME_COUNT)
+        self._cap = cv2.VideoCapture(str(self.path))
+        if not self._cap.isOpened():
+            raise RuntimeError(f"Failed to open video: {self.path}")
 
-    cap.release()
+        fps = self._cap.get(cv2.CAP_PROP_FPS)
+        frame_count = self._cap.get(cv2.CAP_PROP_FRAME_COUNT)
+        self.info = VideoInfo(
+            width=int(self._cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            height=int(self._cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            fps=fps,
+            duration=frame_count / fps if fps > 0 else 0.0,
+        )
+        self.index = index
+        if index is not None:
+            self.info = replace(self.info, duration=index.duration)
+        self._max_skip = int(max_skip_sec * fps) if fps > 0 else 0
+        # Index of the frame the next read()/grab() will return.
+        self._next_index = 0
+        self.pts: float | None = None
 
-    duration = frame_count / fps if fps > 0 else 0.0
+    def __enter__(self) -> VideoSource:
+        return self
 
-    return VideoInfo(
-        width=width,
-        height=height,
-        fps=fps,
-        duration=duration,
-    )
+    def __exit__(self, *exc: object) -> None:
+        self.close()
 
+    def close(self) -> None:
+        """Release the underlying capture handle."""
+        self._cap.release()
 
-def extract_frame(path: Path | str, timestamp_sec: float) -> np.ndarray:
-    """Extract a single frame at *timestamp_sec* seconds into the video.
+    def _frame_index(self, timestamp_sec: float) -> int:
+        # Same rounding as OpenCV's own CAP_PROP_POS_MSEC seek, so a
+        # grab-forward and a real seek land on the same frame.
+        return int(timestamp_sec * self.info.fps + 0.5)
+
+    def read(self, timestamp_sec: float) -> np.ndarray:
+        """Return the BGR frame at *timestamp_sec* seconds into the video.
+
+        Raises
+        ------
+        RuntimeError
+            If the frame cannot be decoded (e.g. past the end of the file).
+        """
+        if self.index is not None:
+            return self._read_indexed(timestamp_sec)
+
+        target = self._frame_index(timestamp_sec)
+        gap = target - self._next_index
+
+        if 0 <= gap <= self._max_skip:
+            for _ in range(gap):
+                if not self._cap.grab():
+                    break
+        else:
+            self._cap.set(cv2.CAP_PROP_POS_MSEC, timestamp_sec * 1000.0)
+
+        ret, frame = self._cap.read()
+        self._next_index = int(self._cap.get(cv2.CAP_PROP_POS_FRAMES))
+        self.pts = self._cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+
+        if not ret or frame is None:
+            raise RuntimeError(f"Failed to extract frame at timestamp={timestamp_sec}s")
+
+        return frame
+
+    def _grab_indexed(self, timestamp_sec: float) -> int:
+        """Grab the next frame; return its index and record its true PTS."""
+        if not self._cap.grab():
+            raise RuntimeError(f"Failed to extract frame at timestamp={timestamp_sec}s")
+        self.pts = self._cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+        current = self.index.frame_at(self.pts)
+        self._next_index = current + 1
+        return current
+
+    def _seek_indexed(self, keyframe: int, target: int, timestamp_sec: float) -> int:
+        """Seek to *keyframe* and grab it; return the landed frame index."""
+        while True:
+            self._cap.set(cv2.CAP_PROP_POS_MSEC, self.index.pts[keyframe] * 1000.0)
+            current = self._grab_indexed(timestamp_sec)
+            if current <= target or keyframe == 0:
+                return current
+            # OpenCV counts frames at the nominal rate after a seek, which
+            # overshoots across variable-frame-rate gaps.  Aim one GOP
+            # earlier and decode forward from there instead.
+            keyframe = self.index.keyframe_before(keyframe - 1)
+
+    def _read_indexed(self, timestamp_sec: float) -> np.ndarray:
+        target = self.index.frame_at(timestamp_sec)
+        keyframe = self.index.keyframe_before(target)
+
+        if keyframe <= self._next_index <= target:
+            current = self._grab_indexed(timestamp_sec)
+        else:
+            current = self._seek_indexed(keyframe, target, timestamp_sec)
 
-    Returns an OpenCV BGR image (numpy array).
+        # Decode forward by the known number of frames; only the target
+        # itself is colour-converted.
+        while current < target:
+            current = self._grab_indexed(timestamp_sec)
+
+        ret, frame = self._cap.retrieve()
+        if not ret or frame is None:
+            raise RuntimeError(f"Failed to extract frame at timestamp={timestamp_sec}s")
+        return frame
+
+    def frames(
+        self,
+        interval_sec: float = 1.0,
+        start_sec: float = 0.0,
+        end_sec: float | None = None,
+    ) -> Iterator[tuple[float, np.ndarray]]:
+        """Yield ``(timestamp_sec, frame)`` tuples at *interval_sec* intervals.
+
+        Stops early if the decoder runs out of frames before *end_sec*.
+        """
+        end = end_sec if end_sec is not None else self.info.duration
+
+        ts = start_sec
+        while ts < end:
+            try:
+                frame = self.read(ts)
+            except RuntimeError:
+                break
+            yield ts, frame
+            ts += interval_sec
+
+
+@dataclass(frozen=True)
+class DecodeFilter:
+    """Decode-time image reduction for :class:`FfmpegSource`.
+
+    Applied inside ffmpeg, so the pipe only ever carries the reduced
+    frames.  Steps run in order: crop, scale, pixel-format conversion.
+
+    *crop* is either a :class:`~wr_analyzer.regions.Region` (resolved
+    against the source resolution) or an absolute
+    :class:`~wr_analyzer.regions.PixelBox`.  *scale* is the output
+    ``(width, height)``; a height of ``-1`` keeps the aspect ratio.  It
+    averages over the source pixels, like ``cv2.INTER_AREA``.
+    *pix_fmt* is ``"bgr24"`` (3-channel, OpenCV layout) or ``"gray"``.
+    """
+
+    crop: Region | PixelBox | None = None
+    scale: tuple[int, int] | None = None
+    pix_fmt: str = "bgr24"
+
+    def __post_init__(self) -> None:
+        if self.pix_fmt not in _PIX_FMT_CHANNELS:
+            raise ValueError(f"Unsupported pix_fmt: {self.pix_fmt!r}")
+
+    def resolve(self, width: int, height: int) -> tuple[list[str], tuple[int, ...]]:
+        """Return ``(filters, frame_shape)`` for a *width* × *height* source."""
+        filters: list[str] = []
+        w, h = width, height
+
+        if self.crop is not None:
+            box = self.crop
+            if isinstance(box, Region):
+                box = box.to_pixels(width, height)
+            filters.append(f"crop={box.w}:{box.h}:{box.x}:{box.y}")
+            w, h = box.w, box.h
+
+        if self.scale is not None:
+            sw, sh = self.scale
+            if sh == -1:
+                sh = max(1, round(sw * h / w))
+            filters.append(f"scale={sw}:{sh}:flags=area")
+            w, h = sw, sh
+
+        channels = _PIX_FMT_CHANNELS[self.pix_fmt]
+        shape = (h, w) if channels == 1 else (h, w, channels)
+        return filters, shape
+
+
+_PIX_FMT_CHANNELS = {"bgr24": 3, "gray": 1}
+
+
+class FfmpegSource:
+    """Decode frames through an ``ffmpeg`` rawvideo pipe.
+
+    Sampling is done inside ffmpeg with a ``select`` filter, so a whole
+    :meth:`frames` run is a single process streaming only the sampled
+    (and optionally cropped / scaled / gray) frames.  Each frame is read
+    straight into one of *buffers* preallocated arrays that are reused
+    round-robin: a yielded frame is only valid until *buffers* further
+    frames have been read, so copy it if you need to keep it.
+
+    Frames land on the same indices as :class:`VideoSource` for
+    constant-frame-rate input.
+
+    Parameters
+    ----------
+    path : Path | str
+        Video file path.
+    decode_filter : DecodeFilter | None
+        Optional crop / scale / pixel format applied during decode.
+    buffers : int
+        Number of preallocated output frames.
 
     Raises
     ------
     FileNotFoundError
         If *path* does not exist.
     RuntimeError
-        If cv2 fails to decode the frame.
+        If ``ffmpeg`` is not installed or cv2 fails to read the metadata.
     """
-    path = Path(path)
-    if not path.exists():
-        raise FileNotFoundError(path)
 
-    cap = cv2.VideoCapture(str(path))
-    if not cap.isOpened():
-        raise RuntimeError(f"Failed to open video: {path}")
+    def __init__(
+        self,
+        path: Path | str,
+        *,
+        decode_filter: DecodeFilter | None = None,
+        buffers: int = 2,
+    ) -> None:
+        self.path = Path(path)
+        self._ffmpeg = shutil.which("ffmpeg")
+        if self._ffmpeg is None:
+            raise RuntimeError("ffmpeg not found on PATH")
+
+        self.info = probe(self.path)
+        self.decode_filter = decode_filter or DecodeFilter()
+        self._filters, self.frame_shape = self.decode_filter.resolve(
+            self.info.width, self.info.height
+        )
+        self._buffers = [
+            np.empty(self.frame_shape, dtype=np.uint8) for _ in range(max(1, buffers))
+        ]
+        self._proc: subprocess.Popen | None = None
+        self.pts: float | None = None
+
+    def __enter__(self) -> FfmpegSource:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop any running ffmpeg process."""
+        if self._proc is not None:
+            self._proc.kill()
+            self._proc.wait()
+            self._proc.stdout.close()
+            self._proc.stderr.close()
+            self._proc = None
 
-    # Seek to the requested timestamp (in milliseconds)
-    cap.set(cv2.CAP_PROP_POS_MSEC, timestamp_sec * 1000.0)
-    ret, frame = cap.read()
-    cap.release()
+    def _command(
+        self, start_sec: float, select: str, *, keyframes_only: bool = False
+    ) -> list[str]:
+        # -copyts keeps t absolute so *select* does not depend on where
+        # the input seek landed.
+        half = 0.5 / self.info.fps if self.info.fps > 0 else 0.0
+        skip = ["-skip_frame", "nokey"] if keyframes_only else []
+        return [
+            self._ffmpeg,
+            "-nostdin",
+            "-loglevel", "error",
+            *skip,
+            "-ss", str(max(0.0, start_sec - half)),
+            "-copyts",
+            "-i", str(self.path),
+            "-vf", ",".join([select, *self._filters]),
+            "-vsync", "passthrough",
+            "-f", "rawvideo",
+            "-pix_fmt", self.decode_filter.pix_fmt,
+            "pipe:1",
+        ]  # fmt: skip
 
-    if not ret or frame is None:
+    def _read_into(self, buf: np.ndarray) -> bool:
+        view = memoryview(buf).cast("B")
+        got = 0
+        while got < len(view):
+            n = self._proc.stdout.readinto(view[got:])
+            if not n:
+                return False
+            got += n
+        return True
+
+    def read(self, timestamp_sec: float) -> np.ndarray:
+        """Return the (filtered) frame at *timestamp_sec* seconds.
+
+        Spawns one ffmpeg process per call — use :meth:`frames` for
+        sequential sampling.  The returned array is a fresh copy.
+
+        Raises
+        ------
+        RuntimeError
+            If the frame cannot be decoded (e.g. past the end of the file).
+        """
+        frames = self.frames(1.0, timestamp_sec, timestamp_sec + 0.5)
+        try:
+            for _, frame in frames:
+                return frame.copy()
+        finally:
+            frames.close()
         raise RuntimeError(f"Failed to extract frame at timestamp={timestamp_sec}s")
 
-    return frame
+    def frames(
+        self,
+        interval_sec: float = 1.0,
+        start_sec: float = 0.0,
+        end_sec: float | None = None,
+    ) -> Iterator[tuple[float, np.ndarray]]:
+        """Yield ``(timestamp_sec, frame)`` tuples at *interval_sec* intervals.
+
+        Stops early if ffmpeg runs out of frames before *end_sec*.
+        """
+        end = end_sec if end_sec is not None else self.info.duration
+        if start_sec >= end:
+            return
+
+        # Select the frame nearest to each start + k*interval, matching
+        # VideoSource's rounding.
+        half = 0.5 / self.info.fps if self.info.fps > 0 else 0.0
+        select = (
+            f"select=lt(ceil((t-{half}-{start_sec})/{interval_sec})\\,"
+            f"ceil((t+{half}-{start_sec})/{interval_sec}))*lt(t\\,{end})"
+        )
+
+        def stamps() -> Iterator[tuple[float, float]]:
+            ts = start_sec
+            while ts < end:
+                # rawvideo carries no timestamps; this is the frame the
+                # select filter picks, assuming a constant frame rate.
+                yield ts, int(ts * self.info.fps + 0.5) / self.info.fps
+                ts += interval_sec
+
+        yield from self._stream(self._command(start_sec, select), stamps())
+
+    def frames_at(self, times: Sequence[float]) -> Iterator[tuple[float, np.ndarray]]:
+        """Yield ``(timestamp_sec, frame)`` at each of the sorted *times*.
+
+        Runs of three or more evenly spaced *times* (such as a uniform
+        grid cut into spans) are each decoded by one :meth:`frames`
+        process; any other timestamp costs a process of its own, like
+        :meth:`read`.  Stops at the first timestamp ffmpeg can't deliver.
+        """
+        i = 0
+        while i < len(times):
+            j = i + 1
+            step = times[j] - times[i] if j < len(times) else 0.0
+            while j < len(times) and math.isclose(
+                times[j] - times[j - 1], step, abs_tol=1e-6
+            ):
+                j += 1
+            if j - i < 3 or step <= 0:
+                j, step = i + 1, 1.0
+            run = times[i:j]
+            got = 0
+            for ts, (_, frame) in zip(
+                run, self.frames(step, run[0], run[-1] + step / 2)
+            ):
+                got += 1
+                yield ts, frame
+            if got < len(run):
+                return
+            i = j
+
+    def keyframes(self, key_pts: Sequence[float]) -> Iterator[tuple[float, np.ndarray]]:
+        """Yield ``(pts, frame)`` for the keyframes at *key_pts*.
+
+        *key_pts* must hold every keyframe of its range, ascending, e.g.
+        from a :class:`~wr_analyzer.video_index.VideoIndex`: ffmpeg skips
+        all other frames without decoding them, and the rawvideo pipe
+        carries no timestamps, so the frames are matched to *key_pts* in
+        order.  Both read the container's keyframe flags.
+        """
+        if len(key_pts) == 0:
+            return
+        half = 0.5 / self.info.fps if self.info.fps > 0 else 0.0
+        first, last = key_pts[0] - half, key_pts[-1] + half
+        select = f"select=gte(t\\,{first})*lt(t\\,{last})"
+        command = self._command(key_pts[0], select, keyframes_only=True)
+        yield from self._stream(command, ((pts, pts) for pts in key_pts))
+
+    def _stream(
+        self, command: list[str], stamps: Iterable[tuple[float, float]]
+    ) -> Iterator[tuple[float, np.ndarray]]:
+        # Run *command* and yield its frames as (timestamp, buffer),
+        # labelled by the (timestamp, pts) pairs of *stamps*.
+        self.close()
+        self._proc = subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=self._buffers[0].nbytes,
+        )
+        try:
+            for i, (ts, pts) in enumerate(stamps):
+                buf = self._buffers[i % len(self._buffers)]
+                if not self._read_into(buf):
+                    break
+                self.pts = pts
+                yield ts, buf
+        finally:
+            self.close()
+
+
+def open_video(
+    path: Path | str,
+    decoder: str = "opencv",
+    *,
+    index: VideoIndex | None = None,
+    decode_filter: DecodeFilter | None = None,
+) -> VideoSource | FfmpegSource:
+    """Open *path* with the named decoder backend (see :data:`DECODERS`).
+
+    *index* is used by the OpenCV backend for seeking; the ffmpeg backend
+    streams and ignores it.  *decode_filter* is applied by the ffmpeg
+    backend inside ffmpeg; the OpenCV backend can't apply one.
+    """
+    if decoder == "opencv":
+        if decode_filter is not None:
+            raise ValueError("decode_filter requires the ffmpeg decoder")
+        return VideoSource(path, index=index)
+    if decoder == "ffmpeg":
+        return FfmpegSource(path, decode_filter=decode_filter)
+    raise ValueError(f"Unknown decoder: {decoder!r}")
+
+
+def probe(path: Path | str) -> VideoInfo:
+    """Read video metadata via OpenCV.
+
+    To read frames as well, open a :class:`VideoSource` and use its
+    ``info`` attribute instead, so the file is only opened once.
+
+    Raises
+    ------
+    FileNotFoundError
+        If *path* does not exist.
+    RuntimeError
+        If cv2 fails to open the file.
+    """
+    with VideoSource(path) as source:
+        return source.info
+
+
+def extract_frame(path: Path | str, timestamp_sec: float) -> np.ndarray:
+    """Extract a single frame at *timestamp_sec* seconds into the video.
+
+    Returns an OpenCV BGR image (numpy array).  This opens and closes
+    the file on every call; use :class:`VideoSource` for repeated reads.
+
+    Raises
+    ------
+    FileNotFoundError
+        If *path* does not exist.
+    RuntimeError
+        If cv2 fails to decode the frame.
+    """
+    with VideoSource(path) as source:
+        return source.read(timestamp_sec)
 
 
 def sample_frames(
@@ -108,27 +571,5 @@ def sample_frames(
     end_sec : float | None
         Where to stop (defaults to video duration).
     """
-    path = Path(path)
-    if not path.exists():
-        raise FileNotFoundError(path)
-
-    cap = cv2.VideoCapture(str(path))
-    if not cap.isOpened():
-        raise RuntimeError(f"Failed to open video: {path}")
-
-    try:
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        frame_count = cap.get(cv2.CAP_PROP_FRAME_COUNT)
-        duration = frame_count / fps if fps > 0 else 0.0
-        end = end_sec if end_sec is not None else duration
-
-        ts = start_sec
-        while ts < end:
-            cap.set(cv2.CAP_PROP_POS_MSEC, ts * 1000.0)
-            ret, frame = cap.read()
-            if not ret or frame is None:
-                break
-            yield ts, frame
-            ts += interval_sec
-    finally:
-        cap.release()
+    with VideoSource(path) as source:
+        yield from source.frames(interval_sec, start_sec, end_sec)
@@ -0,0 +1,167 @@
+"""Persistent keyframe / presentation-timestamp index for a video file.
+
+``CAP_PROP_POS_MSEC`` seeking assumes a constant frame rate and lets the
+demuxer pick the landing point, which is slow and imprecise on long
+H.264 files and wrong for variable-frame-rate phone recordings.  The
+index records the true presentation timestamp (PTS) of every frame and
+which frames are keyframes, so a reader can jump to the keyframe at or
+before a target and decode forward a known number of frames.
+
+Building the index only demuxes packets (OpenCV raw mode, no decoding),
+so it takes seconds even for multi-hour VODs.  It is cached as a
+``{video}.index.npz`` sidecar next to the video and rebuilt whenever the
+video's size or modification time changes.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class VideoIndex:
+    """Frame timing for one video.
+
+    *pts* holds every frame's presentation time in seconds, sorted, on
+    the same timeline as OpenCV's ``CAP_PROP_POS_MSEC`` (the first frame
+    is normally at 0).  *keyframes* holds the indices (into *pts*)
+    of the keyframes, ascending.
+    """
+
+    pts: np.ndarray
+    keyframes: np.ndarray
+
+    @property
+    def frame_count(self) -> int:
+        return len(self.pts)
+
+    @property
+    def duration(self) -> float:
+        """Presentation span including the last frame's display time."""
+        if len(self.pts) < 2:
+            return 0.0
+        return float(self.pts[-1] + np.median(np.diff(self.pts)))
+
+    def frame_at(self, timestamp_sec: float) -> int:
+        """Return the index of the frame nearest to *timestamp_sec*.
+
+        Ties go to the later frame, matching OpenCV's own seek rounding.
+        """
+        i = int(np.searchsorted(self.pts, timestamp_sec))
+        if i == 0:
+            return 0
+        if i >= len(self.pts):
+            return len(self.pts) - 1
+        if timestamp_sec - self.pts[i - 1] < self.pts[i] - timestamp_sec:
+            return i - 1
+        return i
+
+    def keyframe_before(self, frame: int) -> int:
+        """Return the index of the last keyframe at or before *frame*."""
+        k = int(np.searchsorted(self.keyframes, frame, side="right")) - 1
+        return int(self.keyframes[max(k, 0)])
+
+
+def index_path(video_path: Path | str) -> Path:
+    """Return the sidecar path used to cache the index of *video_path*."""
+    video_path = Path(video_path)
+    return video_path.with_name(video_path.name + ".index.npz")
+
+
+def build_index(video_path: Path | str) -> VideoIndex:
+    """Demux every packet of *video_path* and build its index.
+
+    Raises
+    ------
+    FileNotFoundError
+        If *video_path* does not exist.
+    RuntimeError
+        If the file cannot be opened or contains no video packets.
+    """
+    video_path = Path(video_path)
+    if not video_path.exists():
+        raise FileNotFoundError(video_path)
+
+    # CAP_PROP_FORMAT=-1 puts the FFmpeg backend in raw mode: grab()
+    # returns demuxed packets without decoding them.
+    cap = cv2.VideoCapture(str(video_path), cv2.CAP_FFMPEG, [cv2.CAP_PROP_FORMAT, -1])
+    if not cap.isOpened():
+        raise RuntimeError(f"Failed to open video: {video_path}")
+
+    pts: list[float] = []
+    is_key: list[bool] = []
+    try:
+        while cap.grab():
+            pts.append(cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0)
+            is_key.append(bool(cap.get(cv2.CAP_PROP_LRF_HAS_KEY_FRAME)))
+    finally:
+        cap.release()
+
+    if not pts:
+        raise RuntimeError(f"No video packets in {video_path}")
+
+    # Packets arrive in decode order; B-frames make that differ from
+    # presentation order, so sort and locate the keyframes afterwards.
+    decode_pts = np.asarray(pts, dtype=np.float64)
+    sorted_pts = np.sort(decode_pts)
+    key_pts = decode_pts[np.asarray(is_key, dtype=bool)]
+    keyframes = np.unique(np.searchsorted(sorted_pts, key_pts))
+    if len(keyframes) == 0 or keyframes[0] != 0:
+        # Treat the first frame as a seek point even if the demuxer did
+        # not flag it, so keyframe_before() always has an answer.
+        keyframes = np.concatenate([[0], keyframes])
+
+    return VideoIndex(pts=sorted_pts, keyframes=keyframes.astype(np.int64))
+
+
+def _stamp(video_path: Path) -> np.ndarray:
+    st = video_path.stat()
+    return np.array([st.st_size, st.st_mtime_ns], dtype=np.int64)
+
+
+def load_index(video_path: Path | str) -> VideoIndex | None:
+    """Return the cached index of *video_path*, or ``None`` if stale/missing."""
+    video_path = Path(video_path)
+    path = index_path(video_path)
+    if not path.exists() or not video_path.exists():
+        return None
+    try:
+        with np.load(path) as data:
+            if not np.array_equal(data["stamp"], _stamp(video_path)):
+                return None
+            return VideoIndex(pts=data["pts"], keyframes=data["keyframes"])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def ensure_index(video_path: Path | str) -> VideoIndex:
+    """Load the cached index of *video_path*, building and saving it if needed.
+
+    Failure to write the sidecar (e.g. a read-only directory) is logged
+    and otherwise ignored; the freshly built index is still returned.
+    """
+    video_path = Path(video_path)
+    index = load_index(video_path)
+    if index is not None:
+        return index
+
+    index = build_index(video_path)
+    path = index_path(video_path)
+    try:
+        # Write via a temp name so a concurrent reader never sees a
+        # half-written file.
+        tmp = path.with_name(path.name + ".tmp.npz")
+        np.savez(
+            tmp, pts=index.pts, keyframes=index.keyframes, stamp=_stamp(video_path)
+        )
+        tmp.replace(path)
+    except OSError as e:
+        logger.warning("Could not cache video index at %s: %s", path, e)
+    return index
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+"""Rebuild the glyph templates of the ``"glyph"`` OCR engine.
+
+Usage:
+    uv run python tests/build_glyphs.py [OUT]
+
+Crops the timer, kill-score and KDA regions of every labelled fixture
+frame (HUD_GROUND_TRUTH in support.py, i.e. the ground-truth table in
+plan.md) plus the scoreboard's top row, segments each crop into glyphs and stores every glyph as a
+template for its character.  Crops whose segmentation doesn't line up
+with their label are skipped and reported.
+
+The default output is src/wr_analyzer/glyphs.npz, the bank the engine
+loads.  Re-run this after adding fixtures or changing the segmentation.
+"""
+
+from __future__ import annotations
+
+import sys
+from collections import Counter
+from collections.abc import Iterable
+from pathlib import Path
+
+from support import HUD_GROUND_TRUTH, load_frame
+
+from wr_analyzer.glyphs import DEFAULT_BANK_PATH, GlyphBank
+from wr_analyzer.regions import GAME_TIMER, KILLS, PLAYER_KDA, SCOREBOARD_TOP_ROW
+
+HUD_REGIONS = (GAME_TIMER, KILLS, PLAYER_KDA)
+
+
+def labelled_crops(names: Iterable[str] | None = None):
+    """Yield ``(crop, text)`` for every HUD field of the labelled frames.
+
+    *names* restricts it to some of the frames (default: all of them).
+
+    The scoreboard's top row (kill score, then KDA) is included too: its
+    glyphs sometimes segment cleanly where the focused crop's don't.
+    """
+    for name in HUD_GROUND_TRUTH if names is None else names:
+        texts = HUD_GROUND_TRUTH[name]
+        frame = load_frame(name)
+        for region, text in zip(HUD_REGIONS, texts):
+            yield region.crop(frame), text
+        _, kills, kda = texts
+        yield SCOREBOARD_TOP_ROW.crop(frame), f"{kills} {kda}"
+
+
+def main() -> None:
+    out = Path(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BANK_PATH
+    bank, skipped = GlyphBank.from_samples(labelled_crops())
+    bank.save(out)
+    counts = Counter(bank.labels)
+    print(
+        f"  {len(bank)} templates: "
+        + " ".join(f"{c}x{n}" for c, n in sorted(counts.items()))
+    )
+    print(f"  skipped {skipped} crops whose glyphs didn't match their label")
+    print(f"\nWrote {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,55 @@
 """Shared test fixtures."""
 
+import os
+from functools import cache
 from pathlib import Path
 
 import pytest
 
+import wr_analyzer.analyze
+import wr_analyzer.live
+import wr_analyzer.ocr
+from support import write_synthetic_video
 from wr_analyzer.analyze import AnalysisResult, analyze_video
 
 REPO_ROOT = Path(__file__).resolve().parent.parent
 VIDEOS_DIR = REPO_ROOT / "videos"
 SAMPLE_VIDEO = VIDEOS_DIR / "JjoDryfoCGs.mp4"
 
+# The EasyOCR reader as loaded before any test can replace it.
+_load_reader = wr_analyzer.ocr._get_easyocr_reader
+
+
+@cache
+def _ocr_unavailable() -> str | None:
+    """Return why the EasyOCR models can't be loaded, or ``None``."""
+    try:
+        _load_reader()
+    except Exception as exc:  # no models offline
+        return f"EasyOCR models not available: {exc}"
+    return None
+
+
+@pytest.fixture(autouse=True)
+def _skip_without_ocr(monkeypatch):
+    """Skip a test once it needs the EasyOCR reader and that can't load.
+
+    Opt-in with ``WR_ANALYZER_SKIP_OCR=1`` (e.g. offline), so a reader
+    that fails to load otherwise still fails the suite.  Tests that mock
+    the OCR never ask for the reader and still run.
+    """
+    if os.environ.get("WR_ANALYZER_SKIP_OCR") != "1":
+        return
+    reason = _ocr_unavailable()
+    if reason is None:
+        return
+
+    def unavailable():
+        pytest.skip(reason)
+
+    for module in (wr_analyzer.ocr, wr_analyzer.analyze, wr_analyzer.live):
+        monkeypatch.setattr(module, "_get_easyocr_reader", unavailable)
+
 
 @pytest.fixture
 def sample_video_path() -> Path:
@@ -30,3 +70,15 @@ def sample_analysis_result() -> AnalysisResult:
     return analyze_video(
         SAMPLE_VIDEO, interval_sec=30.0, start_sec=600.0, end_sec=720.0
     )
+
+
+@pytest.fixture(scope="session")
+def synthetic_video(tmp_path_factory) -> Path:
+    """A short generated video whose frames encode their own index.
+
+    Available without Git LFS, so decoder tests always run.  Use
+    :func:`support.frame_index` to recover the index of a decoded frame.
+    """
+    path = tmp_path_factory.mktemp("video") / "synthetic.mp4"
+    write_synthetic_video(path)
+    return path
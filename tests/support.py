@@ -13,6 +13,21 @@ FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures" / "frames"
 # All available in-game frame names, for tests that iterate over several.
 IN_GAME_FRAMES = [name for name, _ in FRAME_DEFS if name.startswith("in_game_")]
 
+# HUD text of the in-game frames as shown on screen: (timer, kills, KDA).
+# Mirrors the ground-truth table in plan.md; in_game_01 has no HUD yet.
+HUD_GROUND_TRUTH: dict[str, tuple[str, str, str]] = {
+    "in_game_02": ("02:35", "1 VS 1", "1/0/0"),
+    "in_game_03": ("03:05", "2 VS 2", "1/0/1"),
+    "in_game_04": ("03:35", "2 VS 2", "1/0/1"),
+    "in_game_05": ("04:05", "2 VS 2", "1/0/1"),
+    "in_game_06": ("04:15", "2 VS 4", "1/0/1"),
+    "in_game_07": ("07:35", "3 VS 5", "1/0/2"),
+    "in_game_08": ("12:35", "7 VS 14", "1/0/5"),
+    "in_game_09": ("17:35", "15 VS 20", "2/0/12"),
+    "in_game_10": ("22:35", "25 VS 29", "3/2/18"),
+    "in_game_11": ("25:55", "31 VS 32", "4/2/21"),
+}
+
 
 @cache
 def load_frame(name: str) -> np.ndarray:
@@ -31,3 +46,37 @@ def load_frame(name: str) -> np.ndarray:
         raise FileNotFoundError(f"Missing test frame fixture: {path}")
     frame.flags.writeable = False
     return frame
+
+
+# Synthetic video: 30 fps, 30 s, every frame stamps its index as a row of
+# black/white 16px blocks (one bit per block) along the top edge.
+SYNTHETIC_FPS = 30.0
+SYNTHETIC_FRAMES = 900
+SYNTHETIC_SIZE = (320, 148)
+_INDEX_BITS = 12
+_BLOCK = 16
+
+
+def write_synthetic_video(path: Path) -> None:
+    """Write the synthetic test video to *path* (mp4v codec)."""
+    w, h = SYNTHETIC_SIZE
+    writer = cv2.VideoWriter(
+        str(path), cv2.VideoWriter_fourcc(*"mp4v"), SYNTHETIC_FPS, (w, h)
+    )
+    for i in range(SYNTHETIC_FRAMES):
+        frame = np.zeros((h, w, 3), dtype=np.uint8)
+        for bit in range(_INDEX_BITS):
+            if (i >> bit) & 1:
+                frame[:_BLOCK, bit * _BLOCK : (bit + 1) * _BLOCK] = 255
+        writer.write(frame)
+    writer.release()
+
+
+def frame_index(frame: np.ndarray) -> int:
+    """Decode the index stamped into a synthetic video frame."""
+    mid = _BLOCK // 2
+    return sum(
+        1 << bit
+        for bit in range(_INDEX_BITS)
+        if frame[mid, bit * _BLOCK + mid].mean() > 128
+    )
@@ -1,14 +1,25 @@
 """Tests for wr_analyzer.analyze."""
 
-from support import load_frame
+import json
+
+import pytest
+from support import SYNTHETIC_FPS, frame_index, load_frame
 from wr_analyzer.analyze import (
     AnalysisResult,
     FrameData,
+    _frame_from_record,
+    _frame_record,
+    _sample,
     _segment_games,
     _sanitize_kills,
+    _shard_ranges,
     analyze_frame,
+    analyze_video,
+    analyze_video_iter,
 )
-from wr_analyzer.kda import TeamKills
+from wr_analyzer.kda import PlayerKDA, TeamKills
+from wr_analyzer.segmentation import GameEnded
+from wr_analyzer.video import open_video
 
 
 class TestSegmentGames:
@@ -59,6 +70,24 @@ class TestSegmentGames:
         assert len(segments[0].post_game_frames) == 0
         assert segments[0].result is None
 
+    def test_conflicting_clock_readings_ignored(self):
+        times = [("4:00", "read"), ("7:35", "conflict"), ("8:10", "predicted")]
+        frames = [
+            FrameData(timestamp_sec=t, phase="in_game", game_time=gt, clock_status=st)
+            for t, (gt, st) in zip((0, 30, 60), times)
+        ]
+        frames.append(
+            FrameData(
+                timestamp_sec=90,
+                phase="in_game",
+                game_time="3:00",
+                clock_status="conflict",
+            )
+        )
+        (segment,) = _segment_games(frames, min_duration_sec=60)
+        assert segment.first_game_time == "4:00"
+        assert segment.last_game_time == "8:10"
+
 
 class TestSanitizeKills:
     """Test monotonicity filtering of team kill readings."""
@@ -109,6 +138,23 @@ class TestSanitizeKills:
         kills = [f.team_kills for f in result]
         assert TeamKills(5, 111) not in kills
 
+    def test_cleared_frame_keeps_other_fields(self):
+        """Clearing a kill reading must not drop the rest of the frame."""
+        frames = [
+            self._make_frame(10, 3, 3),
+            FrameData(
+                timestamp_sec=20,
+                phase="in_game",
+                game_time="4:15",
+                team_kills=TeamKills(blue=1, red=1),
+                pts_sec=20.01,
+            ),
+        ]
+        result = _sanitize_kills(frames)
+        assert result[1].team_kills is None
+        assert result[1].game_time == "4:15"
+        assert result[1].pts_sec == 20.01
+
     def test_none_kills_preserved(self):
         """Frames without kill readings should pass through."""
         frames = [
@@ -120,6 +166,84 @@ class TestSanitizeKills:
         assert result[0].team_kills is None
 
 
+def _sample_times(start: float, stop: float, interval: float) -> list[float]:
+    times, ts = [], start
+    while ts < stop:
+        times.append(ts)
+        ts += interval
+    return times
+
+
+class TestFrameRecord:
+    def test_roundtrips_through_json(self):
+        fd = FrameData(
+            timestamp_sec=0.1 + 0.2,
+            phase="in_game",
+            game_time="7:35",
+            team_kills=TeamKills(blue=4, red=6),
+            player_kda=PlayerKDA(kills=1, deaths=2, assists=3),
+            pts_sec=0.3,
+            phase_confidence=0.8,
+            phase_stage="hud_pixels",
+            clock_status="read",
+            carried=("player_kda",),
+            game_time_confidence=0.97,
+            team_kills_confidence=0.5,
+            player_kda_confidence=1.0,
+        )
+        record = json.loads(json.dumps(_frame_record(fd)))
+        assert _frame_from_record(record) == fd
+
+    def test_record_without_confidences(self):
+        """Journals written before the OCR confidences still load."""
+        fd = FrameData(timestamp_sec=5.0, phase="in_game", game_time="0:05")
+        record = _frame_record(fd)
+        for name in list(record):
+            if name.endswith("_confidence") and name != "phase_confidence":
+                del record[name]
+        assert _frame_from_record(record) == fd
+
+    def test_empty_fields(self):
+        fd = FrameData(timestamp_sec=5.0, phase="loading")
+        assert _frame_from_record(json.loads(json.dumps(_frame_record(fd)))) == fd
+
+
+class TestShardRanges:
+    @pytest.mark.parametrize("shards", [1, 2, 3, 7])
+    def test_shards_reproduce_sequential_timestamps(self, shards):
+        # 0.1 accumulates rounding error, so boundaries must be exact.
+        ranges = _shard_ranges(0.0, 10.0, 0.1, shards)
+        assert len(ranges) == shards
+        assert ranges[0][0] == 0.0 and ranges[-1][1] == 10.0
+        joined = [ts for a, b in ranges for ts in _sample_times(a, b, 0.1)]
+        assert joined == _sample_times(0.0, 10.0, 0.1)
+
+    def test_more_shards_than_samples(self):
+        assert _shard_ranges(0.0, 25.0, 10.0, 8) == [
+            (0.0, 10.0),
+            (10.0, 20.0),
+            (20.0, 25.0),
+        ]
+
+    def test_empty_range(self):
+        assert _shard_ranges(5.0, 5.0, 1.0, 4) == []
+
+
+class TestSample:
+    def test_reads_given_times(self, synthetic_video):
+        with open_video(synthetic_video) as source:
+            got = [
+                (ts, frame_index(frame))
+                for ts, frame in _sample(source, 1.0, 0.0, 30.0, [1.5, 7.0, 12.25])
+            ]
+        assert got == [(ts, round(ts * SYNTHETIC_FPS)) for ts in (1.5, 7.0, 12.25)]
+
+    def test_stops_past_end(self, synthetic_video):
+        with open_video(synthetic_video) as source:
+            got = [ts for ts, _ in _sample(source, 1.0, 0.0, 60.0, [10.0, 45.0, 50.0])]
+        assert got == [10.0]
+
+
 class TestAnalyzeFrame:
     def test_returns_frame_data(self):
         fd = analyze_frame(load_frame("in_game_06"), 700.0)
@@ -147,3 +271,98 @@ class TestAnalyzeVideo:
         assert "games_detected" in summary
         assert "games" in summary
         assert isinstance(summary["games"], list)
+
+    def test_workers_match_sequential(self, synthetic_video):
+        progress = []
+        sequential = analyze_video(synthetic_video, interval_sec=3.0)
+        parallel = analyze_video(
+            synthetic_video,
+            interval_sec=3.0,
+            workers=3,
+            on_progress=lambda i, total, _: progress.append((i, total)),
+        )
+        assert parallel.frame_data == sequential.frame_data
+        assert parallel.games == sequential.games
+        assert parallel.ocr_stats == sequential.ocr_stats
+        n = len(sequential.frame_data)
+        assert [i for i, _ in progress] == list(range(1, n + 1))
+
+    def test_pipeline_matches_sequential(self, synthetic_video):
+        sequential = analyze_video(synthetic_video, interval_sec=3.0)
+        pipelined = analyze_video(synthetic_video, interval_sec=3.0, pipeline=True)
+        assert pipelined.frame_data == sequential.frame_data
+        assert pipelined.ocr_stats == sequential.ocr_stats
+
+    def test_refine_reports_sampling(self, synthetic_video):
+        uniform = analyze_video(synthetic_video, interval_sec=3.0)
+        assert uniform.sampling is None
+        refined = analyze_video(synthetic_video, interval_sec=3.0, refine_sec=1.0)
+        sampling = refined.sampling
+        assert sampling.sparse == len(uniform.frame_data)
+        assert len(refined.frame_data) == sampling.total
+        assert sampling.uniform == 30
+
+    def test_results_cache_reused(self, synthetic_video, tmp_path):
+        cache = tmp_path / "results.sqlite"
+        uncached = analyze_video(synthetic_video, interval_sec=3.0)
+        first = analyze_video(synthetic_video, interval_sec=3.0, results_cache=cache)
+        second = analyze_video(synthetic_video, interval_sec=3.0, results_cache=cache)
+        assert first.frame_data == uncached.frame_data
+        assert second.frame_data == uncached.frame_data
+        assert second.ocr_stats.requests < first.ocr_stats.requests
+
+    @pytest.mark.parametrize("options", [{}, {"clock_verify_sec": 5.0}])
+    def test_resume_matches_uninterrupted(self, synthetic_video, tmp_path, options):
+        journal = tmp_path / "run.jsonl"
+        full = analyze_video(synthetic_video, interval_sec=1.0, **options)
+
+        def interrupt(done, total, elapsed):
+            if done == 12:
+                raise KeyboardInterrupt
+
+        with pytest.raises(KeyboardInterrupt):
+            analyze_video(
+                synthetic_video,
+                interval_sec=1.0,
+                on_progress=interrupt,
+                journal=journal,
+                **options,
+            )
+        resumed = analyze_video(
+            synthetic_video, interval_sec=1.0, journal=journal, resume=True, **options
+        )
+        assert resumed.frame_data == full.frame_data
+        assert resumed.games == full.games
+
+    def test_stream_matches_batch(self, synthetic_video):
+        batch = analyze_video(synthetic_video, interval_sec=3.0)
+        stream = analyze_video_iter(synthetic_video, interval_sec=3.0)
+        items = list(stream)
+        assert [i for i in items if isinstance(i, FrameData)] == batch.frame_data
+        assert [i.segment for i in items if isinstance(i, GameEnded)] == batch.games
+        assert stream.ocr_stats == batch.ocr_stats
+        assert stream.duration_sec == batch.duration_sec
+
+    def test_stream_validates_eagerly(self, synthetic_video):
+        with pytest.raises(ValueError):
+            analyze_video_iter(synthetic_video, workers=0)
+
+    def test_resume_requires_journal(self, synthetic_video):
+        with pytest.raises(ValueError):
+            analyze_video(synthetic_video, resume=True)
+
+    def test_invalid_workers(self, synthetic_video):
+        with pytest.raises(ValueError):
+            analyze_video(synthetic_video, workers=0)
+
+    def test_invalid_refine(self, synthetic_video):
+        with pytest.raises(ValueError):
+            analyze_video(synthetic_video, refine_sec=0.0)
+
+    def test_decode_width_requires_ffmpeg(self, synthetic_video):
+        with pytest.raises(ValueError):
+            analyze_video(synthetic_video, decode_width=640)
+
+    def test_refine_requires_opencv(self, synthetic_video):
+        with pytest.raises(ValueError):
+            analyze_video(synthetic_video, decoder="ffmpeg", refine_sec=1.0)
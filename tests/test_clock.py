@@ -0,0 +1,89 @@
+"""Tests for wr_analyzer.clock."""
+
+import pytest
+from support import FRAME_DEFS, HUD_GROUND_TRUTH
+
+from wr_analyzer.clock import GameClock
+from wr_analyzer.timer import parse_game_time
+
+
+def _read(clock: GameClock, video_sec: float, game_sec: int) -> str:
+    assert clock.needs_reading(video_sec)
+    return clock.observe(video_sec, game_sec)
+
+
+class TestGameClock:
+    def test_rejects_non_positive_verify(self):
+        with pytest.raises(ValueError):
+            GameClock(0.0)
+
+    def test_predicts_after_agreeing_readings(self):
+        clock = GameClock(60.0)
+        assert _read(clock, 600.0, 155) == "read"
+        assert clock.predict(610.0) is None
+        assert _read(clock, 630.0, 185) == "read"
+        assert clock.offset == -445.0
+        assert not clock.needs_reading(645.0)
+        assert clock.skip(645.0) == 200
+
+    def test_verifies_periodically(self):
+        clock = GameClock(60.0)
+        _read(clock, 600.0, 155)
+        _read(clock, 630.0, 185)
+        assert not clock.needs_reading(689.0)
+        assert clock.needs_reading(690.0)
+
+    def test_misread_is_flagged_and_ignored(self):
+        # A 7:35 misread as 5:35.
+        clock = GameClock(60.0)
+        _read(clock, 600.0, 155)
+        _read(clock, 630.0, 185)
+        assert _read(clock, 900.0, 5 * 60 + 35) == "conflict"
+        assert clock.predict(900.0) == 7 * 60 + 35
+        # The next reading agrees with the model, not with the misread.
+        assert _read(clock, 915.0, 7 * 60 + 50) == "read"
+        assert clock.revised == []
+        assert not clock.needs_reading(930.0)
+
+    def test_confirmed_jump_starts_new_piece(self):
+        # A 40 s pause: the game clock falls behind video time.
+        clock = GameClock(60.0)
+        _read(clock, 600.0, 155)
+        _read(clock, 630.0, 185)
+        assert _read(clock, 700.0, 215) == "conflict"
+        assert clock.pending == 700.0
+        assert _read(clock, 710.0, 225) == "read"
+        assert clock.pending is None
+        assert clock.revised == [700.0]
+        assert clock.predict(720.0) == 235
+
+    def test_non_game_frame_forces_reading(self):
+        clock = GameClock(60.0)
+        _read(clock, 600.0, 155)
+        _read(clock, 630.0, 185)
+        clock.interrupt()
+        assert clock.needs_reading(640.0)
+        _read(clock, 640.0, 195)
+        assert not clock.needs_reading(650.0)
+
+    def test_going_back_in_time_forces_reading(self):
+        clock = GameClock(60.0)
+        _read(clock, 600.0, 155)
+        _read(clock, 630.0, 185)
+        assert clock.needs_reading(615.0)
+
+    def test_median_resists_single_drift(self):
+        clock = GameClock(60.0, tolerance_sec=2.0)
+        for video_sec, game_sec in [(0, 100), (10, 110), (20, 122), (30, 130)]:
+            clock.observe(video_sec, game_sec)
+        assert clock.offset == 100.0
+
+
+def test_ground_truth_fits_one_piece():
+    """The labelled fixtures' timers agree with one offset from the video time."""
+    clock = GameClock(1.0)
+    timestamps = dict(FRAME_DEFS)
+    for name, (timer, _, _) in sorted(HUD_GROUND_TRUTH.items()):
+        assert _read(clock, timestamps[name], parse_game_time(timer)) == "read"
+    assert clock.offset == -445.0
+    assert clock.revised == []
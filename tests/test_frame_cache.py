@@ -0,0 +1,125 @@
+"""Tests for wr_analyzer.frame_cache."""
+
+import multiprocessing
+import pickle
+import shutil
+
+from wr_analyzer import frame_cache
+from wr_analyzer.frame_cache import FrameCache, video_fingerprint
+from wr_analyzer.game_state import PhaseDecision
+from wr_analyzer.kda import PlayerKDA, TeamKills
+
+VALUES = {
+    "phase": PhaseDecision("in_game", 0.8, "hud_pixels"),
+    "game_time": ("7:35", 0.97),
+    "team_kills": (TeamKills(blue=4, red=6), 0.5),
+    "player_kda": (PlayerKDA(kills=1, deaths=2, assists=3), 1.0),
+    "result": (None, None),
+}
+
+
+def _fill(cache: FrameCache, pts_sec: float, values=VALUES) -> None:
+    entry = cache.frame(pts_sec)
+    for name, value in values.items():
+        entry.get_or_compute(name, lambda value=value: value)
+
+
+def _not_computed():
+    raise AssertionError("cached value recomputed")
+
+
+def _write_frames(path, video, first, count):
+    """Process target: store *count* frames' results."""
+    with FrameCache(path, video) as cache:
+        for i in range(first, first + count):
+            _fill(cache, i / 10)
+
+
+class TestVideoFingerprint:
+    def test_same_content_same_key(self, synthetic_video, tmp_path):
+        copy = tmp_path / "renamed.mp4"
+        shutil.copy(synthetic_video, copy)
+        assert video_fingerprint(copy) == video_fingerprint(synthetic_video)
+
+    def test_changed_content_changes_key(self, synthetic_video, tmp_path):
+        copy = tmp_path / "changed.mp4"
+        data = bytearray(synthetic_video.read_bytes())
+        data[-1] ^= 0xFF
+        copy.write_bytes(bytes(data))
+        assert video_fingerprint(copy) != video_fingerprint(synthetic_video)
+
+
+class TestFrameCache:
+    def test_roundtrip_across_connections(self, tmp_path):
+        path = tmp_path / "results.sqlite"
+        with FrameCache(path, "v") as cache:
+            _fill(cache, 12.345)
+        with FrameCache(path, "v") as cache:
+            entry = cache.frame(12.345)
+            for name, value in VALUES.items():
+                assert entry.get_or_compute(name, _not_computed) == value
+
+    def test_keys_separate_video_pts_and_engine(self, tmp_path):
+        path = tmp_path / "results.sqlite"
+        with FrameCache(path, "v") as cache:
+            _fill(cache, 1.0)
+        with FrameCache(path, "v") as cache:
+            assert not cache.frame(1.1).has("phase")
+        with FrameCache(path, "w") as cache:
+            assert not cache.frame(1.0).has("phase")
+        with FrameCache(path, "v", engine="glyph") as cache:
+            assert not cache.frame(1.0).has("phase")
+
+    def test_version_bump_invalidates_only_that_detector(self, tmp_path, monkeypatch):
+        path = tmp_path / "results.sqlite"
+        with FrameCache(path, "v") as cache:
+            _fill(cache, 1.0)
+        version, encode, decode = frame_cache.DETECTORS["team_kills"]
+        monkeypatch.setitem(
+            frame_cache.DETECTORS, "team_kills", (version + 1, encode, decode)
+        )
+        with FrameCache(path, "v") as cache:
+            entry = cache.frame(1.0)
+            assert not entry.has("team_kills")
+            assert all(entry.has(name) for name in VALUES if name != "team_kills")
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        path = tmp_path / "results.sqlite"
+        with FrameCache(path, "v") as cache:
+            for i in range(2000):
+                _fill(cache, i)
+            size = cache.size_bytes()
+        with FrameCache(path, "v", max_bytes=size // 2) as cache:
+            cache.frame(0)  # touch the oldest frame
+            cache.flush()
+            assert cache.size_bytes() <= size // 2
+            assert cache.frame(0).has("phase")
+            assert not cache.frame(1).has("phase")
+            assert cache.frame(1999).has("phase")
+
+    def test_pickles_without_connection(self, tmp_path):
+        cache = FrameCache(tmp_path / "results.sqlite", "v")
+        _fill(cache, 1.0)
+        clone = pickle.loads(pickle.dumps(cache))
+        cache.close()
+        assert clone.frame(1.0).has("phase")
+        clone.close()
+
+    def test_concurrent_writers(self, tmp_path):
+        path = tmp_path / "results.sqlite"
+        ctx = multiprocessing.get_context("spawn")
+        procs = [
+            ctx.Process(target=_write_frames, args=(path, "v", i * 200, 200))
+            for i in range(4)
+        ]
+        for p in procs:
+            p.start()
+        # Read while they write.
+        with FrameCache(path, "v") as reader:
+            for i in range(800):
+                reader.frame(i / 10)
+        for p in procs:
+            p.join(timeout=60)
+            assert p.exitcode == 0
+        with FrameCache(path, "v") as cache:
+            assert all(cache.frame(i / 10).has("player_kda") for i in range(800))
@@ -1,9 +1,22 @@
 """Tests for wr_analyzer.game_state."""
 
+import cv2
 import numpy as np
 
-from support import IN_GAME_FRAMES, load_frame
-from wr_analyzer.game_state import detect_game_phase
+from support import FRAME_DEFS, IN_GAME_FRAMES, load_frame
+from wr_analyzer.game_state import (
+    PHASE_STAGES,
+    THUMB_WIDTH,
+    batch_classify_pixels,
+    batch_phase_features,
+    classify_game_phase,
+    classify_pixels,
+    detect_game_phase,
+    phase_features,
+    thumbnail_phases,
+)
+from wr_analyzer.ocr_plan import OcrPlan
+from wr_analyzer.regions import KILLS
 
 
 class TestDetectGamePhase:
@@ -50,3 +63,103 @@ class TestDetectGamePhase:
         assert (
             detect_game_phase(load_frame("postgame_victory_scoreboard")) == "post_game"
         )
+
+
+class TestClassifyGamePhase:
+    # Pixel-stage decisions need no OCR model.
+
+    def test_black_frame_decided_by_pixels(self):
+        black = np.zeros((394, 854, 3), dtype=np.uint8)
+        decision = classify_game_phase(black)
+        assert decision.phase == "loading"
+        assert decision.stage == "pixels"
+        assert decision.confidence == 1.0
+
+    def test_champ_select_decided_by_pixels(self):
+        decision = classify_game_phase(load_frame("champ_select"))
+        assert decision.phase == "loading"
+        assert decision.stage == "pixels"
+
+    def test_strong_hud_skips_ocr(self):
+        frame = load_frame("in_game_09")
+        plan = OcrPlan(frame)
+        decision = classify_game_phase(frame, plan=plan)
+        assert decision.phase == "in_game"
+        assert decision.stage == "pixels"
+        assert plan.stats.calls == 0
+
+    def test_confidence_in_range(self):
+        for name in ["champ_select", *IN_GAME_FRAMES[1:]]:
+            decision = classify_game_phase(load_frame(name))
+            assert 0.0 <= decision.confidence <= 1.0
+            assert decision.stage in PHASE_STAGES
+
+
+class TestBatchPhaseFeatures:
+    def test_matches_per_frame(self):
+        frames = [load_frame(name) for name, _ in FRAME_DEFS]
+        features = batch_phase_features(np.stack(frames))
+        assert len(features) == len(frames)
+        for record, frame in zip(features, frames):
+            single = phase_features(OcrPlan(frame))
+            assert record["brightness"] == single.brightness
+            assert record["scoreboard_mean"] == single.scoreboard_mean
+            assert record["hud_max"] == single.hud_max
+            assert record["hud_fraction"] == single.hud_fraction
+
+    def test_iterable_and_grayscale_inputs(self):
+        rng = np.random.default_rng(0)
+        stack = rng.integers(0, 256, (150, 36, 80, 3), dtype=np.uint8)
+        features = batch_phase_features(stack)
+        # More frames than one chunk, from a generator.
+        np.testing.assert_array_equal(
+            batch_phase_features(frame for frame in stack), features
+        )
+        gray = np.stack([cv2.cvtColor(f, cv2.COLOR_BGR2GRAY) for f in stack])
+        np.testing.assert_array_equal(batch_phase_features(gray), features)
+
+    def test_empty(self):
+        assert len(batch_phase_features([])) == 0
+        assert len(batch_phase_features(np.empty((0, 36, 80, 3), np.uint8))) == 0
+
+
+class TestBatchClassifyPixels:
+    def test_matches_per_frame(self):
+        frames = [load_frame(name) for name, _ in FRAME_DEFS]
+        phases, confidences = batch_classify_pixels(
+            batch_phase_features(np.stack(frames))
+        )
+        for phase, confidence, frame in zip(phases, confidences, frames):
+            decision = classify_pixels(OcrPlan(frame))
+            if decision is None:
+                assert (phase, confidence) == ("unknown", 0.0)
+            else:
+                assert (phase, confidence) == (decision.phase, decision.confidence)
+        assert set(phases) == {"loading", "in_game", "unknown"}
+
+
+def _thumbnails(*names: str) -> np.ndarray:
+    thumbs = []
+    for name in names:
+        gray = cv2.cvtColor(load_frame(name), cv2.COLOR_BGR2GRAY)
+        h, w = gray.shape
+        size = (THUMB_WIDTH, round(h * THUMB_WIDTH / w))
+        thumbs.append(cv2.resize(gray, size, interpolation=cv2.INTER_AREA))
+    return np.stack(thumbs)
+
+
+class TestThumbnailPhases:
+    def test_fixtures(self):
+        phases = thumbnail_phases(_thumbnails("champ_select", *IN_GAME_FRAMES))
+        assert phases[0] == "loading"
+        assert list(phases[1:]) == ["in_game"] * len(IN_GAME_FRAMES)
+
+    def test_bright_frame_is_post_game(self):
+        thumb = np.full((1, 148, THUMB_WIDTH), 200, dtype=np.uint8)
+        k = KILLS.to_pixels(THUMB_WIDTH, 148)
+        thumb[:, k.y : k.y + k.h, k.x : k.x + k.w] = 40  # no kill score
+        assert list(thumbnail_phases(thumb)) == ["post_game"]
+
+    def test_empty_stack(self):
+        empty = np.empty((0, 148, THUMB_WIDTH), dtype=np.uint8)
+        assert thumbnail_phases(empty).shape == (0,)
@@ -0,0 +1,123 @@
+"""Tests for wr_analyzer.glyphs."""
+
+import cv2
+import numpy as np
+import pytest
+from support import HUD_GROUND_TRUTH, load_frame
+
+from wr_analyzer.glyphs import (
+    GLYPH_SIZE,
+    GlyphBank,
+    read_glyph_result,
+    read_glyphs,
+    segment_glyphs,
+)
+from wr_analyzer.kda import PlayerKDA, TeamKills, detect_player_kda, detect_team_kills
+from wr_analyzer.ocr_plan import TIMER_CROPS, OcrPlan
+from wr_analyzer.regions import GAME_TIMER
+from wr_analyzer.timer import detect_game_time
+
+
+def _text_image(text: str) -> np.ndarray:
+    """Render small light text on a dark background, like the HUD."""
+    img = np.full((30, 120, 3), 30, dtype=np.uint8)
+    cv2.putText(
+        img,
+        text,
+        (8, 22),
+        cv2.FONT_HERSHEY_SIMPLEX,
+        0.6,
+        (235, 235, 235),
+        1,
+        cv2.LINE_AA,
+    )
+    return img
+
+
+SYNTHETIC = ["12:35", "07:48", "90:16"]
+
+
+class TestSegmentGlyphs:
+    def test_digits_and_colon(self):
+        glyphs = segment_glyphs(_text_image("12:35"))
+        assert [char for _, char in glyphs] == [None, None, ":", None, None]
+        xs = [box.x for box, _ in glyphs]
+        assert xs == sorted(xs)
+
+    def test_blank_image(self):
+        assert segment_glyphs(np.zeros((30, 120, 3), dtype=np.uint8)) == []
+
+
+class TestGlyphBank:
+    def test_from_samples(self):
+        bank, skipped = GlyphBank.from_samples((_text_image(t), t) for t in SYNTHETIC)
+        assert skipped == 0
+        assert set(bank.labels) == set("0123456789")
+        assert bank.templates.shape[1:] == GLYPH_SIZE
+
+    def test_save_load_roundtrip(self, tmp_path):
+        bank, _ = GlyphBank.from_samples((_text_image(t), t) for t in SYNTHETIC)
+        bank.save(tmp_path / "bank.npz")
+        loaded = GlyphBank.load(tmp_path / "bank.npz")
+        assert list(loaded.labels) == list(bank.labels)
+        np.testing.assert_array_equal(loaded.templates, bank.templates)
+
+    def test_mismatched_labels(self):
+        with pytest.raises(ValueError):
+            GlyphBank(np.zeros((2, *GLYPH_SIZE), dtype=np.uint8), "1")
+
+    def test_classify_respects_allowlist(self):
+        bank, _ = GlyphBank.from_samples((_text_image(t), t) for t in SYNTHETIC)
+        labels, scores = bank.classify(bank.templates, allowlist="01")
+        assert set(labels) <= {"0", "1"}
+        assert len(scores) == len(bank)
+
+
+class TestReadGlyphs:
+    def test_reads_unseen_combination(self):
+        bank, _ = GlyphBank.from_samples((_text_image(t), t) for t in SYNTHETIC)
+        assert read_glyphs(_text_image("53:20"), bank=bank) == "53:20"
+
+    @pytest.mark.parametrize("name", ["in_game_07", "in_game_09"])
+    def test_default_bank_reads_timer(self, name):
+        timer, _, _ = HUD_GROUND_TRUTH[name]
+        crop = GAME_TIMER.crop(load_frame(name))
+        assert read_glyphs(crop, "0123456789:") == timer
+
+    def test_result_scores_and_locates_text(self):
+        crop = GAME_TIMER.crop(load_frame("in_game_09"))
+        text, confidence, box = read_glyph_result(crop, "0123456789:")
+        assert text == "17:35"
+        assert confidence > 0.9
+        assert box.x >= 0 and box.y >= 0
+        assert box.x + box.w <= crop.shape[1] and box.y + box.h <= crop.shape[0]
+
+    def test_blank_crop_has_no_confidence(self):
+        assert read_glyph_result(np.zeros((20, 60, 3), dtype=np.uint8)) == (
+            "",
+            0.0,
+            None,
+        )
+
+
+class TestGlyphEngine:
+    # The bundled templates were harvested from these frames, so this
+    # checks the engine end to end rather than how well it generalises
+    # (see benchmarks/bench_glyphs.py for leave-one-frame-out accuracy).
+
+    @pytest.mark.parametrize(
+        "name, expected",
+        [("in_game_03", "3:05"), ("in_game_07", "7:35"), ("in_game_09", "17:35")],
+    )
+    def test_timer_ground_truth(self, name, expected):
+        assert detect_game_time(load_frame(name), engine="glyph") == expected
+
+    def test_kills_and_kda_ground_truth(self):
+        frame = load_frame("in_game_09")
+        assert detect_team_kills(frame, engine="glyph") == TeamKills(15, 20)
+        assert detect_player_kda(frame, engine="glyph") == PlayerKDA(2, 0, 12)
+
+    def test_region_read_once_across_scales(self):
+        plan = OcrPlan(load_frame("in_game_09"), TIMER_CROPS, engine="glyph")
+        assert plan.text(GAME_TIMER, 5) == plan.text(GAME_TIMER, 4)
+        assert plan.calls == 1
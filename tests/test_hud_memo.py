@@ -0,0 +1,102 @@
+"""Tests for wr_analyzer.hud_memo."""
+
+import numpy as np
+import pytest
+from support import HUD_GROUND_TRUTH, load_frame
+
+from wr_analyzer.hud_memo import HudMemo, change_score, ink_signature
+from wr_analyzer.kda import TeamKills
+from wr_analyzer.ocr_plan import OcrPlan
+from wr_analyzer.regions import KILLS, PLAYER_KDA
+
+_FRAMES = sorted(HUD_GROUND_TRUTH)
+
+
+def _pairs(field: int, same: bool):
+    return [
+        (a, b)
+        for i, a in enumerate(_FRAMES)
+        for b in _FRAMES[i + 1 :]
+        if (HUD_GROUND_TRUTH[a][field] == HUD_GROUND_TRUTH[b][field]) == same
+    ]
+
+
+def _plan(name: str) -> OcrPlan:
+    return OcrPlan(load_frame(name))
+
+
+class TestChangeScore:
+    def test_identical_is_zero(self):
+        ink = ink_signature(load_frame("in_game_09")[:20, -160:])
+        assert change_score(ink, ink) == 0.0
+
+    def test_shape_mismatch_is_changed(self):
+        assert change_score(np.zeros((4, 8)), np.zeros((4, 9))) == float("inf")
+
+    @pytest.mark.parametrize("region, field", [(KILLS, 1), (PLAYER_KDA, 2)])
+    def test_fixtures_separate_at_default_threshold(self, region, field):
+        """Same on-screen value reuses; a different one always re-reads."""
+        memo = HudMemo()
+        ink = {name: ink_signature(_plan(name).crop(region)) for name in _FRAMES}
+        for a, b in _pairs(field, same=False):
+            assert change_score(ink[a], ink[b]) > memo.threshold, (a, b)
+        assert any(
+            change_score(ink[a], ink[b]) <= memo.threshold
+            for a, b in _pairs(field, same=True)
+        )
+
+    @pytest.mark.parametrize("region, field", [(KILLS, 1), (PLAYER_KDA, 2)])
+    def test_fixtures_keep_a_margin(self, region, field):
+        """Both sides stay at least 10% clear of the default threshold."""
+        threshold = HudMemo().threshold
+        ink = {name: _plan(name).ink(region) for name in _FRAMES}
+        for a, b in _pairs(field, same=True):
+            assert change_score(ink[a], ink[b]) <= 0.9 * threshold, (a, b)
+        for a, b in _pairs(field, same=False):
+            assert change_score(ink[a], ink[b]) >= 1.1 * threshold, (a, b)
+
+
+class TestHudMemo:
+    def test_rejects_non_positive_age(self):
+        with pytest.raises(ValueError):
+            HudMemo(0.0)
+
+    def test_nothing_to_carry_before_a_read(self):
+        assert HudMemo().carry(KILLS, _plan("in_game_03"), 630.0) is None
+
+    def test_carries_while_unchanged(self):
+        # in_game_04 and _05 both show 2 VS 2.
+        memo = HudMemo(60.0)
+        memo.store(KILLS, _plan("in_game_04"), 660.0, TeamKills(2, 2))
+        assert memo.carry(KILLS, _plan("in_game_05"), 690.0) == TeamKills(2, 2)
+
+    def test_rereads_on_change(self):
+        # in_game_06 shows 2 VS 4.
+        memo = HudMemo(60.0)
+        memo.store(KILLS, _plan("in_game_05"), 690.0, TeamKills(2, 2))
+        assert memo.carry(KILLS, _plan("in_game_06"), 700.0) is None
+
+    def test_max_age_forces_refresh(self):
+        memo = HudMemo(20.0)
+        memo.store(KILLS, _plan("in_game_04"), 660.0, TeamKills(2, 2))
+        assert memo.carry(KILLS, _plan("in_game_05"), 690.0) is None
+
+    def test_signature_computed_once_per_plan(self, monkeypatch):
+        memo = HudMemo(60.0)
+        memo.store(KILLS, _plan("in_game_04"), 660.0, TeamKills(2, 2))
+        plan = _plan("in_game_05")
+        calls = []
+        monkeypatch.setattr(
+            "wr_analyzer.ocr_plan.ink_signature",
+            lambda crop: calls.append(crop) or ink_signature(crop),
+        )
+        for _ in range(3):
+            assert memo.carry(KILLS, plan, 690.0) == TeamKills(2, 2)
+        assert len(calls) == 1
+
+    def test_interrupt_forgets(self):
+        memo = HudMemo(60.0)
+        plan = _plan("in_game_04")
+        memo.store(KILLS, plan, 660.0, TeamKills(2, 2))
+        memo.interrupt()
+        assert memo.carry(KILLS, plan, 660.0) is None
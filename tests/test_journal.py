@@ -0,0 +1,75 @@
+"""Tests for wr_analyzer.journal."""
+
+import json
+
+import pytest
+
+from wr_analyzer.journal import Journal, journal_path
+
+SETTINGS = {"video": "abc", "interval_sec": 10.0}
+
+
+def test_journal_path_is_sidecar(tmp_path):
+    assert journal_path(tmp_path / "vod.mp4") == tmp_path / "vod.mp4.journal.jsonl"
+
+
+class TestJournal:
+    def test_resume_replays_records_by_stage(self, tmp_path):
+        path = tmp_path / "run.jsonl"
+        with Journal(path, SETTINGS) as journal:
+            journal.append("sample", {"timestamp_sec": 0.0})
+            journal.append("sample", {"timestamp_sec": 10.0})
+            journal.append("refine", {"timestamp_sec": 5.0})
+        with Journal(path, SETTINGS, resume=True) as journal:
+            assert journal.replayed == {
+                "sample": [{"timestamp_sec": 0.0}, {"timestamp_sec": 10.0}],
+                "refine": [{"timestamp_sec": 5.0}],
+            }
+            journal.append("sample", {"timestamp_sec": 20.0})
+        with Journal(path, SETTINGS, resume=True) as journal:
+            assert len(journal.replayed["sample"]) == 3
+
+    def test_without_resume_starts_over(self, tmp_path):
+        path = tmp_path / "run.jsonl"
+        with Journal(path, SETTINGS) as journal:
+            journal.append("sample", {"timestamp_sec": 0.0})
+        with Journal(path, SETTINGS):
+            pass
+        with Journal(path, SETTINGS, resume=True) as journal:
+            assert journal.replayed == {}
+
+    def test_resume_without_journal_starts_empty(self, tmp_path):
+        with Journal(tmp_path / "new.jsonl", SETTINGS, resume=True) as journal:
+            assert journal.replayed == {}
+
+    def test_torn_last_line_dropped(self, tmp_path):
+        path = tmp_path / "run.jsonl"
+        with Journal(path, SETTINGS) as journal:
+            journal.append("sample", {"timestamp_sec": 0.0})
+        with open(path, "a") as f:
+            f.write('{"stage": "sample", "timesta')
+        with Journal(path, SETTINGS, resume=True) as journal:
+            assert journal.replayed == {"sample": [{"timestamp_sec": 0.0}]}
+            journal.append("sample", {"timestamp_sec": 10.0})
+        lines = path.read_text().splitlines()
+        assert [json.loads(line).get("timestamp_sec") for line in lines] == [
+            None,
+            0.0,
+            10.0,
+        ]
+
+    def test_different_settings_rejected(self, tmp_path):
+        path = tmp_path / "run.jsonl"
+        with Journal(path, SETTINGS):
+            pass
+        with pytest.raises(ValueError, match="interval_sec"):
+            Journal(path, {**SETTINGS, "interval_sec": 5.0}, resume=True)
+
+    def test_corrupt_journal_rejected(self, tmp_path):
+        path = tmp_path / "run.jsonl"
+        with Journal(path, SETTINGS):
+            pass
+        with open(path, "a") as f:
+            f.write("not json\n")
+        with pytest.raises(ValueError, match="Corrupt"):
+            Journal(path, SETTINGS, resume=True)
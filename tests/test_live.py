@@ -0,0 +1,194 @@
+"""Tests for wr_analyzer.live."""
+
+import io
+import json
+import os
+import shutil
+import subprocess
+import threading
+import time
+
+import cv2
+import numpy as np
+import pytest
+
+from support import SYNTHETIC_FPS, frame_index
+from wr_analyzer.__main__ import main
+from wr_analyzer.analyze import FrameData
+from wr_analyzer.kda import TeamKills
+from wr_analyzer.live import (
+    LiveSource,
+    analyze_live,
+    event_record,
+    open_live,
+    read_bmp,
+)
+from wr_analyzer.segmentation import (
+    GameEnded,
+    GameResult,
+    GameSegment,
+    GameStarted,
+)
+from wr_analyzer.video import VideoSource
+
+needs_ffmpeg = pytest.mark.skipif(
+    shutil.which("ffmpeg") is None, reason="ffmpeg not installed"
+)
+
+
+def _bmp(frame: np.ndarray) -> bytes:
+    ok, data = cv2.imencode(".bmp", frame)
+    assert ok
+    return data.tobytes()
+
+
+def _feed(video, fps: float, count: int) -> LiveSource:
+    """Return a source fed *count* synthetic frames at *fps*, in real time."""
+    read_fd, write_fd = os.pipe()
+    with VideoSource(video) as source:
+        frames = [
+            _bmp(source.read(i / fps)) for i in range(count)
+        ]  # decode up front, so the pace holds
+
+    def write():
+        with open(write_fd, "wb") as pipe:
+            for data in frames:
+                pipe.write(data)
+                pipe.flush()
+                time.sleep(1 / fps)
+
+    threading.Thread(target=write, daemon=True).start()
+    return LiveSource(open(read_fd, "rb"), fps)
+
+
+class TestReadBmp:
+    def test_reads_frames_in_order(self):
+        frames = [np.full((5, 7, 3), i, dtype=np.uint8) for i in range(3)]
+        stream = io.BytesIO(b"".join(_bmp(f) for f in frames))
+        for frame in frames:
+            np.testing.assert_array_equal(read_bmp(stream), frame)
+        assert read_bmp(stream) is None
+
+    def test_truncated_image_ends_stream(self):
+        data = _bmp(np.zeros((5, 7, 3), dtype=np.uint8))
+        assert read_bmp(io.BytesIO(data[:-3])) is None
+
+    def test_rejects_other_data(self):
+        with pytest.raises(ValueError, match="BMP"):
+            read_bmp(io.BytesIO(b"\x00" * 64))
+
+
+class TestLiveSource:
+    def test_samples_at_wall_clock_cadence(self, synthetic_video):
+        with _feed(synthetic_video, 10.0, 20) as source:
+            samples = [(ts, frame_index(f)) for ts, f in source.frames(0.3)]
+        times = [ts for ts, _ in samples]
+        assert times == sorted(times)
+        assert all(b - a >= 0.1 for a, b in zip(times, times[1:]))
+        assert times[-1] == pytest.approx(1.9)  # the last frame isn't lost
+        # Stamps match the stream: frame i of a 10 fps feed is at i / 10.
+        for ts, index in samples:
+            assert index == round(ts * SYNTHETIC_FPS)
+        assert source.dropped == 0
+
+    def test_drops_samples_when_behind(self, synthetic_video):
+        with _feed(synthetic_video, 10.0, 20) as source:
+            times = []
+            for ts, _ in source.frames(0.2):
+                times.append(ts)
+                time.sleep(0.5)  # analysis slower than the interval
+        assert source.dropped >= 2
+        # Never a backlog: each sample is the newest frame at the time.
+        assert len(times) <= 6
+        assert times[-1] == pytest.approx(1.9)
+
+    def test_start_and_end(self, synthetic_video):
+        with _feed(synthetic_video, 10.0, 20) as source:
+            times = [ts for ts, _ in source.frames(0.1, start_sec=0.5, end_sec=1.2)]
+        assert times[0] >= 0.5
+        assert times[-1] < 1.2
+
+
+class TestEventRecord:
+    def test_frame(self):
+        fd = FrameData(12.5, "in_game", "3:05", TeamKills(2, 4))
+        record = event_record(fd, 0.1234)
+        assert record["event"] == "frame"
+        assert record["team_kills"] == {"blue": 2, "red": 4}
+        assert record["latency_sec"] == 0.123
+        json.dumps(record)
+
+    def test_game_events(self):
+        segment = GameSegment(
+            start_sec=10.0,
+            end_sec=200.0,
+            frames=[FrameData(10.0, "in_game", "0:05", TeamKills(1, 0))],
+            post_game_frames=[FrameData(210.0, "post_game", result="victory")],
+        )
+        started = event_record(GameStarted(1, 10.0), 0.0)
+        ended = event_record(GameEnded(1, segment), 0.0)
+        result = event_record(GameResult(1, "victory"), 0.0)
+        assert started == {
+            "event": "game_started",
+            "game": 1,
+            "start_sec": 10.0,
+            "latency_sec": 0.0,
+        }
+        assert ended["event"] == "game_ended"
+        assert ended["final_kills"] == {"blue": 1, "red": 0}
+        assert ended["result"] == "victory"
+        assert result["result"] == "victory"
+
+
+class TestAnalyzeLive:
+    def test_streams_frames_with_latency(self, synthetic_video):
+        with _feed(synthetic_video, 10.0, 30) as source:
+            stream = analyze_live(source, 0.5)
+            items = list(stream)
+        frames = [item for item, _ in items if isinstance(item, FrameData)]
+        assert frames
+        assert all(latency >= 0 for _, latency in items)
+        assert stream.frames == len(frames)
+        assert stream.latency_max_sec >= stream.latency_mean_sec >= 0
+        for item, latency in items:
+            json.dumps(event_record(item, latency))
+
+    def test_invalid_interval(self, synthetic_video):
+        with _feed(synthetic_video, 10.0, 1) as source:
+            with pytest.raises(ValueError, match="interval_sec"):
+                analyze_live(source, 0.0)
+
+
+@needs_ffmpeg
+class TestOpenLive:
+    def test_follows_growing_recording(self, synthetic_video, tmp_path):
+        recording = tmp_path / "live.ts"
+        # Re-mux the synthetic video at playback speed, like a recorder.
+        writer = subprocess.Popen(
+            ["ffmpeg", "-loglevel", "error", "-re", "-i", str(synthetic_video),
+             "-c", "copy", "-flush_packets", "1", "-f", "mpegts", str(recording)],
+            stdin=subprocess.DEVNULL,
+        )  # fmt: skip
+        try:
+            deadline = time.monotonic() + 10.0
+            while not recording.exists() or recording.stat().st_size == 0:
+                assert time.monotonic() < deadline, "recorder wrote nothing"
+                time.sleep(0.05)
+            with open_live(recording, idle_timeout_sec=2.0) as source:
+                samples = [(ts, frame_index(f)) for ts, f in source.frames(1.0)]
+        finally:
+            writer.wait()
+        assert len(samples) >= 20
+        for ts, index in samples:
+            assert abs(index - ts * SYNTHETIC_FPS) <= 1
+
+    def test_missing_file(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            open_live(tmp_path / "missing.ts")
+
+
+class TestLiveCli:
+    def test_rejects_ignored_flags(self, tmp_path, capsys):
+        with pytest.raises(SystemExit):
+            main(["-", "--live", "--journal", str(tmp_path / "run.jsonl")])
+        assert "--journal can't be used with --live" in capsys.readouterr().err
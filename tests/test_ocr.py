@@ -2,11 +2,22 @@
 
 import cv2
 import numpy as np
+import pytest
 
 from wr_analyzer.ocr import (
+    KILLS_CHARS,
+    TIMER_CHARS,
+    OcrResult,
+    join_results,
     ocr_easyocr,
+    ocr_recognize,
+    ocr_recognize_batch,
+    ocr_recognize_results,
+    ocr_result,
+    ocr_text,
     preprocess_clahe,
 )
+from wr_analyzer.regions import PixelBox
 
 
 def _make_text_image(text: str, width: int = 200, height: int = 60) -> np.ndarray:
@@ -58,3 +69,84 @@ class TestOcrEasyocr:
         img = np.zeros((50, 100, 3), dtype=np.uint8)
         result = ocr_easyocr(img)
         assert isinstance(result, list)
+
+
+class TestOcrRecognize:
+    def test_reads_white_text(self):
+        img = _make_text_image("25 VS 29")
+        texts = ocr_recognize(img, allowlist=KILLS_CHARS)
+        joined = " ".join(texts)
+        assert "25" in joined or "29" in joined
+
+    def test_allowlist_restricts_output(self):
+        img = _make_text_image("12:34")
+        joined = " ".join(ocr_recognize(img, allowlist=TIMER_CHARS))
+        assert set(joined) <= set(TIMER_CHARS + " ")
+
+    def test_accepts_grayscale(self):
+        img = cv2.cvtColor(_make_text_image("7"), cv2.COLOR_BGR2GRAY)
+        assert isinstance(ocr_recognize(img), list)
+
+
+class TestOcrRecognizeBatch:
+    def test_empty(self):
+        assert ocr_recognize_batch([]) == []
+
+    def test_one_string_per_image_in_order(self):
+        images = [
+            _make_text_image("12"),
+            _make_text_image("7", width=60),
+            np.zeros((40, 40, 3), dtype=np.uint8),
+            _make_text_image("34", width=400),
+        ]
+        texts = ocr_recognize_batch(images, allowlist=TIMER_CHARS)
+        assert len(texts) == len(images)
+        assert all(isinstance(t, str) for t in texts)
+        assert "1" in texts[0] or "2" in texts[0]
+        assert "3" in texts[3] or "4" in texts[3]
+
+    def test_matches_single_image(self):
+        img = _make_text_image("25 VS 29")
+        assert ocr_recognize_batch([img], allowlist=KILLS_CHARS) == [
+            " ".join(ocr_recognize(img, allowlist=KILLS_CHARS))
+        ]
+
+    def test_results_carry_confidence_and_box(self):
+        images = [_make_text_image("12"), np.zeros((40, 40, 3), dtype=np.uint8)]
+        read, blank = ocr_recognize_results(images, allowlist=TIMER_CHARS)
+        assert 0 < read.confidence <= 1
+        assert read.bbox == PixelBox(0, 0, 200, 60)
+        if not blank.text:
+            assert blank == OcrResult("")
+
+
+class TestJoinResults:
+    def test_joins_text_with_least_confidence_and_union_box(self):
+        joined = join_results(
+            [
+                OcrResult("15 VS 20", 0.9, PixelBox(10, 0, 50, 12)),
+                OcrResult(""),
+                OcrResult("2/0/12", 0.6, PixelBox(0, 14, 40, 12)),
+            ]
+        )
+        assert joined == OcrResult("15 VS 20 2/0/12", 0.6, PixelBox(0, 0, 60, 26))
+
+    def test_nothing_read(self):
+        assert join_results([OcrResult(""), OcrResult("")]) == OcrResult("")
+        assert join_results([]) == OcrResult("")
+
+
+class TestOcrText:
+    def test_engines_return_str(self):
+        img = _make_text_image("25 VS 29")
+        for engine in ("recognize", "readtext"):
+            assert isinstance(ocr_text(img, engine=engine), str)
+
+    def test_unknown_engine(self):
+        with pytest.raises(ValueError):
+            ocr_text(np.zeros((10, 10, 3), dtype=np.uint8), engine="tesseract")
+
+    def test_result_is_the_text(self):
+        img = _make_text_image("25 VS 29")
+        for engine in ("recognize", "readtext", "glyph"):
+            assert ocr_result(img, engine=engine).text == ocr_text(img, engine=engine)
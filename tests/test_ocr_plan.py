@@ -0,0 +1,230 @@
+"""Tests for wr_analyzer.ocr_plan."""
+
+import pytest
+from support import load_frame
+
+from wr_analyzer.game_state import detect_game_phase
+from wr_analyzer.kda import TeamKills, detect_player_kda, detect_team_kills
+from wr_analyzer import ocr_plan
+from wr_analyzer.ocr import KDA_CHARS, KILLS_CHARS, TIMER_CHARS, OcrResult
+from wr_analyzer.ocr_plan import (
+    CONFIDENCE_THRESHOLDS,
+    HUD_TIERS,
+    TIMER_CROPS,
+    OcrPlan,
+    OcrStats,
+    read_confident,
+)
+from wr_analyzer.regions import GAME_TIMER, KILLS, PLAYER_KDA, SCOREBOARD
+from wr_analyzer.timer import detect_game_time
+
+
+def test_tiers_cover_detector_crops():
+    """Every crop a detector may read is planned exactly once."""
+    planned = [crop for tier in HUD_TIERS for crop in tier]
+    assert len(planned) == len(set(planned))
+    assert set(TIMER_CROPS) <= set(planned)
+
+
+class TestOcrStats:
+    def test_saved(self):
+        stats = OcrStats(requests=7, calls=2)
+        assert stats.saved == 5
+
+    def test_add(self):
+        total = OcrStats()
+        total.add(OcrStats(requests=3, calls=1))
+        total.add(OcrStats(requests=4, calls=2))
+        assert total == OcrStats(requests=7, calls=3)
+
+
+class _ScriptedPlan:
+    """Stands in for an OcrPlan, returning fixed readings per crop."""
+
+    def __init__(self, readings: dict) -> None:
+        self.readings = readings
+        self.read: list = []
+        self.profile = None
+        self.engine = "glyph"
+
+    def result(self, region, scale, *, engine=None) -> OcrResult:
+        self.read.append((region, scale))
+        return self.readings.get((region, scale), OcrResult(""))
+
+
+class TestReadConfident:
+    def test_stops_at_first_confident_parse(self):
+        plan = _ScriptedPlan({TIMER_CROPS[0]: OcrResult("17:35", 0.99)})
+        assert read_confident(plan, TIMER_CROPS, lambda t: t or None) == ("17:35", 0.99)
+        assert plan.read == [TIMER_CROPS[0]]
+
+    def test_doubtful_parse_escalates(self):
+        doubtful = CONFIDENCE_THRESHOLDS["glyph"] / 2
+        plan = _ScriptedPlan(
+            {
+                TIMER_CROPS[0]: OcrResult("17:36", doubtful),
+                TIMER_CROPS[2]: OcrResult("17:35", 0.99),
+            }
+        )
+        assert read_confident(plan, TIMER_CROPS, lambda t: t or None) == ("17:35", 0.99)
+        assert plan.read == list(TIMER_CROPS[:3])
+
+    def test_most_confident_when_none_is_confident(self):
+        plan = _ScriptedPlan(
+            {
+                TIMER_CROPS[0]: OcrResult("a", 0.3),
+                TIMER_CROPS[1]: OcrResult("b", 0.5),
+                TIMER_CROPS[2]: OcrResult("c", 0.5),
+            }
+        )
+        assert read_confident(plan, TIMER_CROPS, lambda t: t or None) == ("b", 0.5)
+        assert plan.read == list(TIMER_CROPS)
+
+    def test_nothing_parsed(self):
+        plan = _ScriptedPlan({TIMER_CROPS[0]: OcrResult("??", 0.99)})
+        assert read_confident(plan, TIMER_CROPS, lambda t: None) == (None, None)
+
+    def test_uncalibrated_engine_takes_first_parse(self):
+        plan = _ScriptedPlan(
+            {
+                TIMER_CROPS[0]: OcrResult("17:36", 0.2),
+                TIMER_CROPS[1]: OcrResult("17:35", 0.99),
+            }
+        )
+        plan.engine = "recognize"
+        assert read_confident(plan, TIMER_CROPS, lambda t: t or None) == ("17:36", 0.2)
+        assert plan.read == [TIMER_CROPS[0]]
+
+
+class TestFrameContext:
+    """Memoized crops and images; none of these need the OCR model."""
+
+    def test_crop_is_memoized(self):
+        plan = OcrPlan(load_frame("in_game_09"))
+        crop = plan.crop(KILLS)
+        assert plan.crop(KILLS) is crop
+        assert crop.shape == KILLS.crop(load_frame("in_game_09")).shape
+
+    def test_gray_of_region_and_frame(self):
+        frame = load_frame("in_game_09")
+        plan = OcrPlan(frame)
+        assert plan.gray().shape == frame.shape[:2]
+        assert plan.gray(SCOREBOARD).ndim == 2
+        assert plan.gray(SCOREBOARD) is plan.gray(SCOREBOARD)
+
+    def test_enhanced_is_memoized_per_scale(self):
+        plan = OcrPlan(load_frame("in_game_09"))
+        assert plan.enhanced(GAME_TIMER, 5) is plan.enhanced(GAME_TIMER, 5)
+        assert plan.enhanced(GAME_TIMER, 4).shape != plan.enhanced(GAME_TIMER, 5).shape
+
+    def test_preprocess_enhances_next_tier(self):
+        plan = OcrPlan(load_frame("in_game_09"))
+        plan.preprocess()
+        assert set(plan._enhanced) == set(HUD_TIERS[0])
+        assert plan.calls == 0
+
+    def test_skipped_crops_leave_the_batch(self):
+        plan = OcrPlan(load_frame("in_game_09"))
+        plan.skip(TIMER_CROPS[:-1])
+        plan.preprocess()
+        assert set(plan._enhanced) == {(KILLS, 4), (PLAYER_KDA, 4)}
+
+    def test_glyph_result_box_in_frame_coordinates(self):
+        frame = load_frame("in_game_09")
+        plan = OcrPlan(frame, engine="glyph")
+        result = plan.result(GAME_TIMER, 5)
+        assert result.text == plan.text(GAME_TIMER, 5) == "17:35"
+        assert result.confidence >= CONFIDENCE_THRESHOLDS["glyph"]
+        region = GAME_TIMER.to_pixels(frame.shape[1], frame.shape[0])
+        box = result.bbox
+        assert region.x <= box.x and box.x + box.w <= region.x + region.w
+        assert region.y <= box.y and box.y + box.h <= region.y + region.h
+
+    def test_fully_skipped_tier_prefetches_nothing(self):
+        plan = OcrPlan(load_frame("in_game_09"))
+        plan.skip(HUD_TIERS[0])
+        plan.preprocess()
+        assert plan._enhanced == {}
+
+
+class TestOcrPlan:
+    def test_unknown_engine(self):
+        with pytest.raises(ValueError):
+            OcrPlan(load_frame("in_game_09"), engine="tesseract")
+
+    def test_one_call_per_tier(self):
+        plan = OcrPlan(load_frame("in_game_09"))
+        plan.text(GAME_TIMER, 5)
+        assert plan.calls == 1
+        # The rest of the primary tier came with the first request.
+        plan.text(KILLS, 4)
+        plan.text(PLAYER_KDA, 4)
+        assert plan.calls == 1
+        plan.text(SCOREBOARD, 3)
+        plan.text(GAME_TIMER, 3)
+        assert plan.calls == 2
+
+    def test_batch_keeps_each_fields_allowlist(self, monkeypatch):
+        calls = []
+
+        def recognize(images, allowlist=None, *, allowlists=None):
+            calls.append(allowlists)
+            return [OcrResult("")] * len(images)
+
+        monkeypatch.setattr(ocr_plan, "ocr_recognize_results", recognize)
+        plans = [OcrPlan(load_frame("in_game_09")) for _ in range(2)]
+        plans[0].text(GAME_TIMER, 5)
+        assert calls == [[TIMER_CHARS, KILLS_CHARS, KDA_CHARS]]
+        assert ocr_plan.recognize_plans(plans[1:])
+        assert calls[1] == calls[0]
+
+    def test_texts_are_memoized(self):
+        plan = OcrPlan(load_frame("in_game_09"))
+        first = plan.text(KILLS, 4)
+        assert plan.text(KILLS, 4) == first
+        assert plan.calls == 1
+
+    def test_unplanned_crop_runs_alone(self):
+        plan = OcrPlan(load_frame("in_game_09"), TIMER_CROPS)
+        plan.text(KILLS, 4)
+        plan.text(GAME_TIMER, 5)
+        assert plan.calls == 2
+
+    def test_unbatched_calls_per_crop(self):
+        plan = OcrPlan(load_frame("in_game_09"), batched=False)
+        plan.text(GAME_TIMER, 5)
+        plan.text(KILLS, 4)
+        assert plan.calls == 2
+
+    def test_phase_then_extractors_read_timer_once(self):
+        # in_game_01's HUD is too dim for the pixel stage, so the phase
+        # check reads the timer.
+        frame = load_frame("in_game_01")
+        plan = OcrPlan(frame)
+        detect_game_phase(frame, plan=plan)
+        calls = plan.stats.calls
+        detect_game_time(frame, plan=plan)
+        assert plan.stats.calls == calls
+        assert plan.stats.saved > 0
+
+    def test_shared_plan_ground_truth(self):
+        """Detectors reading from one shared plan match their solo results."""
+        frame = load_frame("in_game_09")
+        plan = OcrPlan(frame)
+        assert detect_game_time(frame, plan=plan) == "17:35"
+        assert detect_team_kills(frame, plan=plan) == TeamKills(blue=15, red=20)
+        assert detect_player_kda(frame, plan=plan) == detect_player_kda(frame)
+        assert plan.calls <= len(HUD_TIERS)
+
+    def test_without_fallback_reads_primary_tier_only(self):
+        plan = OcrPlan(load_frame("in_game_09"), engine="glyph", fallback=False)
+        assert plan.text(SCOREBOARD, 3) == ""
+        assert plan.text(GAME_TIMER, 3) == ""
+        assert plan.calls == 0
+        assert detect_game_time(load_frame("in_game_09"), plan=plan) == "17:35"
+
+    def test_upscale_overrides_crop_scale(self):
+        plan = OcrPlan(load_frame("in_game_09"), upscale=2)
+        crop = plan.crop(KILLS)
+        image = plan.enhanced(KILLS, 4)
+        assert image.shape[:2] == (crop.shape[0] * 2, crop.shape[1] * 2)
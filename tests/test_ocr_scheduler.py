@@ -0,0 +1,97 @@
+"""Tests for wr_analyzer.ocr_scheduler."""
+
+import time
+
+import numpy as np
+import pytest
+from support import IN_GAME_FRAMES, load_frame
+
+from wr_analyzer.ocr_plan import OcrPlan
+from wr_analyzer.ocr_scheduler import OcrScheduler
+from wr_analyzer.regions import GAME_TIMER, KILLS
+
+
+def _record(frame, ts, pts, plan):
+    return ts, pts, frame, plan
+
+
+def _frame(value: int = 0) -> np.ndarray:
+    return np.full((20, 40, 3), value, dtype=np.uint8)
+
+
+class TestOcrScheduler:
+    # The readtext engine has nothing to batch, so these tests exercise
+    # the buffering without loading the OCR model.
+
+    def test_rejects_empty_batch(self):
+        with pytest.raises(ValueError):
+            OcrScheduler(_record, batch_frames=0)
+
+    def test_delivers_full_batches_in_order(self):
+        scheduler = OcrScheduler(_record, batch_frames=3, engine="readtext")
+        assert scheduler.submit(_frame(), 0.0) == []
+        assert scheduler.submit(_frame(), 1.0) == []
+        out = scheduler.submit(_frame(), 2.0, 2.1)
+        assert [ts for ts, *_ in out] == [0.0, 1.0, 2.0]
+        assert out[2][1] == 2.1
+        assert len(scheduler) == 0
+        # Nothing to batch with readtext.
+        assert scheduler.batches == 0
+
+    def test_flush_returns_partial_batch(self):
+        scheduler = OcrScheduler(_record, batch_frames=4, engine="readtext")
+        scheduler.submit(_frame(), 0.0)
+        scheduler.submit(_frame(), 1.0)
+        assert [ts for ts, *_ in scheduler.flush()] == [0.0, 1.0]
+        assert scheduler.flush() == []
+
+    def test_batch_of_one_is_immediate(self):
+        scheduler = OcrScheduler(_record, batch_frames=1, engine="readtext")
+        assert len(scheduler.submit(_frame(), 5.0)) == 1
+
+    def test_deadline_flushes_early(self):
+        scheduler = OcrScheduler(
+            _record, batch_frames=100, max_wait_sec=0.05, engine="readtext"
+        )
+        assert scheduler.submit(_frame(), 0.0) == []
+        time.sleep(0.06)
+        assert len(scheduler.submit(_frame(), 1.0)) == 2
+
+    def test_frames_are_copied(self):
+        """Decoders reuse their buffers; queued frames must not change."""
+        scheduler = OcrScheduler(_record, batch_frames=2, engine="readtext")
+        buf = _frame(1)
+        scheduler.submit(buf, 0.0)
+        buf[:] = 2
+        out = scheduler.submit(buf, 1.0)
+        assert out[0][2].max() == 1
+        assert out[1][2].max() == 2
+        assert out[0][3].frame is out[0][2]
+
+    def test_prepared_plan_is_used_as_is(self):
+        scheduler = OcrScheduler(_record, batch_frames=1, engine="readtext")
+        plan = OcrPlan(_frame(3), engine="readtext")
+        [(_ts, _pts, frame, got)] = scheduler.submit(None, 0.0, plan=plan)
+        assert got is plan
+        assert frame is plan.frame
+
+    def test_prefetch_can_skip_frames(self):
+        """Frames the prefetch check rejects are left out of the batch."""
+        scheduler = OcrScheduler(_record, batch_frames=2, prefetch=lambda plan: False)
+        scheduler.submit(_frame(), 0.0)
+        out = scheduler.submit(_frame(), 1.0)
+        assert len(out) == 2
+        assert scheduler.batches == 0
+
+    def test_primary_crops_read_across_frames(self):
+        """One batch reads every frame's primary crops before the handler runs."""
+        scheduler = OcrScheduler(_record, batch_frames=3)
+        out = []
+        for i, name in enumerate(IN_GAME_FRAMES[:3]):
+            out += scheduler.submit(load_frame(name), float(i))
+        assert scheduler.batches == 1
+        for *_, plan in out:
+            assert isinstance(plan, OcrPlan)
+            plan.text(GAME_TIMER, 5)
+            plan.text(KILLS, 4)
+            assert plan.calls == 0
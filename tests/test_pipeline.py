@@ -0,0 +1,78 @@
+"""Tests for wr_analyzer.pipeline."""
+
+import threading
+import time
+
+import pytest
+
+from wr_analyzer.pipeline import pipelined
+
+
+class TestPipelined:
+    def test_stages_applied_in_order(self):
+        out = list(pipelined(range(50), lambda x: x * 2, lambda x: x + 1))
+        assert out == [x * 2 + 1 for x in range(50)]
+
+    def test_no_stages(self):
+        assert list(pipelined(iter("abc"))) == ["a", "b", "c"]
+
+    def test_stages_run_off_the_caller_thread(self):
+        caller = threading.get_ident()
+        threads = set(pipelined(range(3), lambda _: threading.get_ident()))
+        assert caller not in threads
+
+    def test_rejects_empty_queue(self):
+        with pytest.raises(ValueError):
+            list(pipelined(range(3), maxsize=0))
+
+    def test_stage_error_reaches_caller(self):
+        def stage(x):
+            if x == 3:
+                raise RuntimeError("boom")
+            return x
+
+        out = []
+        with pytest.raises(RuntimeError, match="boom"):
+            for x in pipelined(range(10), stage):
+                out.append(x)
+        assert out == [0, 1, 2]
+
+    def test_source_error_reaches_caller(self):
+        def source():
+            yield 1
+            raise OSError("decode failed")
+
+        with pytest.raises(OSError, match="decode failed"):
+            list(pipelined(source(), lambda x: x))
+
+    def test_backpressure_bounds_read_ahead(self):
+        produced = []
+
+        def source():
+            for i in range(100):
+                produced.append(i)
+                yield i
+
+        it = pipelined(source(), lambda x: x, maxsize=2)
+        assert next(it) == 0
+        time.sleep(0.2)
+        # Two queues of 2, one item held by each thread, one delivered.
+        assert len(produced) <= 2 * (2 + 1) + 1
+        it.close()
+
+    def test_close_stops_source(self):
+        closed = threading.Event()
+
+        def source():
+            try:
+                i = 0
+                while True:
+                    yield i
+                    i += 1
+            finally:
+                closed.set()
+
+        it = pipelined(source(), lambda x: x, maxsize=1)
+        assert next(it) == 0
+        it.close()
+        assert closed.is_set()
@@ -0,0 +1,135 @@
+"""Tests for wr_analyzer.prepass."""
+
+import numpy as np
+import pytest
+
+from wr_analyzer.analyze import analyze_video
+from wr_analyzer.prepass import (
+    PrepassStats,
+    Span,
+    candidate_spans,
+    find_spans,
+    scan,
+    thumbnail_times,
+)
+from wr_analyzer.video_index import VideoIndex, build_index
+
+
+def _phases(*runs: tuple[str, int]) -> tuple[np.ndarray, np.ndarray]:
+    """Return one thumbnail a second: *runs* of ``(phase, count)``."""
+    phases = np.array([p for p, n in runs for _ in range(n)], dtype=object)
+    return np.arange(len(phases), dtype=np.float64), phases
+
+
+class TestCandidateSpans:
+    def test_one_game(self):
+        times, phases = _phases(("loading", 10), ("in_game", 20), ("unknown", 70))
+        spans = candidate_spans(times, phases, 0.0, 100.0, lead_sec=2.0, tail_sec=30)
+        assert spans == [Span(7.0, 30.0, "in_game"), Span(30.0, 60.0, "post_game")]
+
+    def test_short_gaps_merged(self):
+        times, phases = _phases(
+            ("loading", 10), ("in_game", 20), ("unknown", 5), ("in_game", 20)
+        )
+        spans = candidate_spans(times, phases, 0.0, 55.0, merge_gap_sec=10)
+        # The game runs to the end of the range: no room for a post-game span.
+        assert spans == [Span(9.0, 55.0, "in_game")]
+
+    def test_tail_stops_at_next_game(self):
+        times, phases = _phases(
+            ("in_game", 10), ("loading", 30), ("in_game", 10), ("loading", 10)
+        )
+        spans = candidate_spans(times, phases, 0.0, 60.0, tail_sec=60, merge_gap_sec=10)
+        assert spans == [
+            Span(0.0, 10.0, "in_game"),
+            Span(10.0, 39.0, "post_game"),
+            Span(39.0, 50.0, "in_game"),
+            Span(50.0, 60.0, "post_game"),
+        ]
+
+    def test_no_game(self):
+        times, phases = _phases(("loading", 10), ("post_game", 10))
+        assert candidate_spans(times, phases, 0.0, 20.0) == []
+
+    def test_contains(self):
+        span = Span(5.0, 10.0, "in_game")
+        assert 5.0 in span and 9.9 in span
+        assert 10.0 not in span and 4.9 not in span
+
+
+class TestThumbnailTimes:
+    def _index(self, keyframe_every: int) -> VideoIndex:
+        pts = np.arange(600) / 10.0  # 60 s at 10 fps
+        return VideoIndex(pts, np.arange(0, 600, keyframe_every))
+
+    def test_dense_keyframes(self):
+        times, keyframes_only = thumbnail_times(self._index(5), 0.0, 60.0, fps=1.0)
+        assert keyframes_only
+        assert len(times) == 60
+        assert np.all(np.diff(times) > 0)
+        assert np.allclose(times, np.arange(60.0))
+
+    def test_keyframe_used_once(self):
+        # Keyframes 1.5 s apart: ticks share a nearest keyframe.
+        times, keyframes_only = thumbnail_times(self._index(15), 0.0, 60.0, fps=1.0)
+        assert keyframes_only
+        assert len(np.unique(times)) == len(times) == 40
+
+    def test_ends_within_video(self):
+        times, _ = thumbnail_times(self._index(5), 50.0, 90.0, fps=1.0)
+        assert times[-1] < 60.0
+
+    def test_sparse_keyframes(self):
+        times, keyframes_only = thumbnail_times(self._index(100), 0.0, 60.0, fps=1.0)
+        assert not keyframes_only
+        assert np.allclose(times, np.arange(60.0))
+
+
+class TestScan:
+    def test_synthetic_video(self, synthetic_video):
+        # Black frames with a white index block: no HUD anywhere.
+        index = build_index(synthetic_video)
+        times, phases = scan(synthetic_video, np.arange(0.0, 30.0, 2.0), index=index)
+        assert len(times) == len(phases) == 15
+        assert set(phases) == {"loading"}
+
+    def test_keyframes_only(self, synthetic_video):
+        index = build_index(synthetic_video)
+        keys = index.pts[index.keyframes]
+        times, phases = scan(synthetic_video, keys, index=index, keyframes_only=True)
+        assert np.array_equal(times, keys)
+        assert set(phases) == {"loading"}
+
+
+class TestFindSpans:
+    def test_no_games(self, synthetic_video):
+        index = build_index(synthetic_video)
+        spans, stats = find_spans(synthetic_video, 0.0, 30.0, index=index)
+        assert spans == []
+        assert stats.thumbnails == 30
+        assert stats.skipped_fraction == 1.0
+
+    def test_invalid_fps(self, synthetic_video):
+        index = build_index(synthetic_video)
+        with pytest.raises(ValueError, match="fps"):
+            find_spans(synthetic_video, 0.0, 30.0, index=index, fps=0.0)
+
+    def test_analysis_skips_everything(self, synthetic_video):
+        result = analyze_video(synthetic_video, interval_sec=3.0, prepass=True)
+        assert result.frame_data == []
+        assert result.prepass.frames == 0
+        assert result.prepass.uniform == 10
+        assert result.prepass.speedup is None
+
+
+class TestPrepassStats:
+    def test_speedup(self):
+        stats = PrepassStats(seconds=1.0, frames=10, uniform=100, analysis_sec=4.0)
+        # A uniform run: 100 frames at 0.4 s.
+        assert stats.speedup == pytest.approx(40.0 / 5.0)
+
+    def test_skipped_fraction(self):
+        assert PrepassStats(video_sec=100.0, covered_sec=25.0).skipped_fraction == (
+            0.75
+        )
+        assert PrepassStats().skipped_fraction == 0.0
@@ -0,0 +1,110 @@
+"""Tests for wr_analyzer.preprocess."""
+
+import threading
+
+import cv2
+import numpy as np
+import pytest
+from easyocr.config import imgH
+
+from support import IN_GAME_FRAMES, load_frame
+from wr_analyzer.ocr_plan import OcrPlan
+from wr_analyzer.preprocess import (
+    VARIANTS,
+    Variant,
+    _clahe,
+    preprocess,
+    resolve_variant,
+)
+from wr_analyzer.regions import GAME_TIMER, KILLS, PLAYER_KDA
+
+
+def _original(image: np.ndarray, scale: int) -> np.ndarray:
+    """The recipe preprocess_clahe() used before the variants."""
+    clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(2, 2))
+    b, g, r = cv2.split(image)
+    enhanced = cv2.merge([clahe.apply(b), clahe.apply(g), clahe.apply(r)])
+    if scale > 1:
+        enhanced = cv2.resize(
+            enhanced, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC
+        )
+    return enhanced
+
+
+def _crops():
+    return [
+        region.crop(load_frame(name))
+        for name in IN_GAME_FRAMES
+        for region in (GAME_TIMER, KILLS, PLAYER_KDA)
+    ]
+
+
+class TestPreprocess:
+    @pytest.mark.parametrize("scale", [1, 3, 5])
+    def test_default_matches_original(self, scale):
+        for crop in _crops():
+            np.testing.assert_array_equal(
+                preprocess(crop, scale), _original(crop, scale)
+            )
+
+    def test_results_are_not_shared_buffers(self):
+        a, b = _crops()[:2]  # two timer crops of the same size
+        first = preprocess(a, 1)
+        kept = first.copy()
+        second = preprocess(b, 1)
+        assert not np.shares_memory(first, second)
+        np.testing.assert_array_equal(first, kept)
+
+    def test_max_variant_keeps_red_and_blue_text(self):
+        img = np.zeros((30, 100, 3), dtype=np.uint8)
+        img[10:20, 10:30, 2] = 120  # red text
+        img[10:20, 60:80, 0] = 120  # blue text
+        result = preprocess(img, 1, "max_clahe")
+        assert result.ndim == 2
+        assert result[10:20, 10:30].mean() >= 120
+        assert result[10:20, 60:80].mean() >= 120
+
+    def test_model_resize_height(self):
+        crop = _crops()[0]
+        result = preprocess(crop, 5, "max_clahe_model")
+        assert result.shape == (imgH, int(imgH * crop.shape[1] / crop.shape[0]))
+
+    def test_custom_variant(self):
+        crop = _crops()[0]
+        result = preprocess(crop, 2, Variant(interpolation=cv2.INTER_NEAREST))
+        assert result.shape == (crop.shape[0] * 2, crop.shape[1] * 2, 3)
+
+    def test_unknown_variant(self):
+        with pytest.raises(ValueError, match="variant"):
+            resolve_variant("sharpen")
+        with pytest.raises(ValueError, match="channels"):
+            Variant(channels="hsv")
+
+    def test_clahe_per_thread(self):
+        assert _clahe() is _clahe()
+        other = []
+        thread = threading.Thread(target=lambda: other.append(_clahe()))
+        thread.start()
+        thread.join()
+        assert other[0] is not _clahe()
+
+    def test_all_variants_run(self):
+        crop = _crops()[0]
+        for name in VARIANTS:
+            assert preprocess(crop, 4, name).dtype == np.uint8
+
+
+class TestPlanVariant:
+    def test_override(self):
+        plan = OcrPlan(load_frame("in_game_09"), variant="max_clahe")
+        assert plan.enhanced(KILLS, 4).ndim == 2
+
+    def test_default_is_configured_variant(self):
+        frame = load_frame("in_game_09")
+        np.testing.assert_array_equal(
+            OcrPlan(frame).enhanced(KILLS, 4), _original(KILLS.crop(frame), 4)
+        )
+
+    def test_unknown_variant(self):
+        with pytest.raises(ValueError, match="variant"):
+            OcrPlan(load_frame("in_game_09"), variant="sharpen")
@@ -0,0 +1,122 @@
+"""Tests for wr_analyzer.profiling."""
+
+import json
+import pickle
+import threading
+
+import pytest
+from support import load_frame
+
+from wr_analyzer.analyze import analyze_frame
+from wr_analyzer.ocr_plan import OcrPlan
+from wr_analyzer.profiling import Profile, span, timed
+from wr_analyzer.regions import GAME_TIMER, Anchor, Region
+from wr_analyzer.timer import read_game_time
+
+
+class TestProfile:
+    def test_stage_statistics(self):
+        profile = Profile()
+        for ms in range(1, 101):
+            profile.record("recognize", 0.0, ms / 1e3)
+        stats = profile.stages()["recognize"]
+        assert stats.count == 100
+        assert stats.total_sec == pytest.approx(5.05)
+        assert stats.p50_ms == pytest.approx(50.5)
+        assert stats.p95_ms == pytest.approx(95.05)
+        assert stats.p99_ms == pytest.approx(99.01)
+
+    def test_span_records(self):
+        profile = Profile()
+        with profile.span("parse"):
+            pass
+        with span(profile, "parse", "kills"):
+            pass
+        assert profile.stages()["parse"].count == 2
+        assert profile.events == []
+
+    def test_span_without_profile(self):
+        with span(None, "decode"):
+            pass
+
+    def test_timed(self):
+        profile = Profile()
+        assert list(timed(profile, "decode", range(3))) == [0, 1, 2]
+        assert profile.stages()["decode"].count == 3
+        assert list(timed(None, "decode", range(3))) == [0, 1, 2]
+
+    def test_add_merges_worker_profiles(self):
+        profile = Profile(trace=True)
+        profile.record("decode", 0.0, 0.001)
+        shard = pickle.loads(pickle.dumps(profile.fork()))
+        shard.record("decode", 0.0, 0.003)
+        shard.count_ocr(["game_timer", "kills"])
+        profile.add(pickle.loads(pickle.dumps(shard)))
+        assert profile.stages()["decode"].count == 2
+        assert profile.ocr_calls == {"game_timer": 1, "kills": 1}
+        assert len(profile.events) == 2
+
+    def test_threads_record_concurrently(self):
+        profile = Profile(trace=True)
+
+        def work():
+            for _ in range(1000):
+                profile.record("preprocess", 0.0, 0.001)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert profile.stages()["preprocess"].count == 4000
+        assert len(profile.events) == 4000
+
+    def test_summary_is_json(self):
+        profile = Profile()
+        profile.record("frame", 0.0, 0.002)
+        profile.count_ocr(["kills", "kills", "game_timer"])
+        summary = json.loads(json.dumps(profile.summary()))
+        assert summary["stages"]["frame"]["count"] == 1
+        assert summary["ocr_calls"] == {"kills": 2, "game_timer": 1}
+
+    def test_write_trace(self, tmp_path):
+        profile = Profile(trace=True)
+        profile.record("recognize", 1.0, 1.25, region="kills")
+        path = tmp_path / "trace.json"
+        profile.write_trace(path)
+        events = json.loads(path.read_text())["traceEvents"]
+        meta = [e for e in events if e["ph"] == "M"]
+        (event,) = [e for e in events if e["ph"] == "X"]
+        assert meta[0]["args"]["name"] == threading.current_thread().name
+        assert event["name"] == "recognize"
+        assert event["ts"] == pytest.approx(1e6)
+        assert event["dur"] == pytest.approx(2.5e5)
+        assert event["args"] == {"region": "kills"}
+
+
+def test_region_name_not_compared():
+    named = Region(anchor=Anchor.TOP_LEFT, x=0, y=0, w=10, h=10, name="a")
+    unnamed = Region(anchor=Anchor.TOP_LEFT, x=0, y=0, w=10, h=10)
+    assert named == unnamed
+    assert hash(named) == hash(unnamed)
+
+
+class TestInstrumentation:
+    def test_plan_counts_ocr_per_region(self):
+        profile = Profile()
+        frame = load_frame("in_game_09")
+        plan = OcrPlan(frame, engine="glyph", profile=profile)
+        game_time, _ = read_game_time(frame, plan=plan)
+        assert game_time is not None
+        stages = profile.stages()
+        assert stages["recognize"].count == plan.calls
+        assert stages["parse"].count >= 1
+        assert profile.ocr_calls[GAME_TIMER.name] == 1
+
+    def test_analyze_frame_times_phase(self):
+        profile = Profile()
+        frame = load_frame("in_game_09")
+        plan = OcrPlan(frame, engine="glyph", profile=profile)
+        analyze_frame(frame, 0.0, plan=plan)
+        assert {"phase", "recognize", "parse"} <= set(profile.stages())
+        assert sum(profile.ocr_calls.values()) == plan.calls
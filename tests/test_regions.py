@@ -9,6 +9,8 @@ from wr_analyzer.regions import (
     MINIMAP,
     PLAYER_KDA,
     SCOREBOARD,
+    SCOREBOARD_BOTTOM_ROW,
+    SCOREBOARD_TOP_ROW,
     Anchor,
     PixelBox,
     REF_HEIGHT,
@@ -123,6 +125,18 @@ def test_scoreboard_encompasses_kills_and_timer():
     assert sb.y + sb.h >= timer.y + timer.h
 
 
+def test_scoreboard_rows_split_scoreboard():
+    """The row strips lie inside the scoreboard, top row first."""
+    w, h = 854, 394
+    sb = SCOREBOARD.to_pixels(w, h)
+    top = SCOREBOARD_TOP_ROW.to_pixels(w, h)
+    bottom = SCOREBOARD_BOTTOM_ROW.to_pixels(w, h)
+    for row in (top, bottom):
+        assert (row.x, row.w) == (sb.x, sb.w)
+        assert sb.y <= row.y and row.y + row.h <= sb.y + sb.h
+    assert top.y < bottom.y < top.y + top.h
+
+
 def test_minimap_is_top_left():
     box = MINIMAP.to_pixels(854, 394)
     assert box.x == 0
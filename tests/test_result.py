@@ -3,6 +3,7 @@
 import numpy as np
 
 from support import load_frame
+from wr_analyzer.ocr_plan import OcrPlan
 from wr_analyzer.result import detect_result
 
 
@@ -28,3 +29,12 @@ class TestDetectResult:
         """A black frame should not trigger result detection."""
         black = np.zeros((394, 854, 3), dtype=np.uint8)
         assert detect_result(black) is None
+
+    def test_shared_plan_reads_once(self):
+        """A second detect_result on the same plan reuses the first OCR."""
+        frame = load_frame("postgame_victory_scoreboard")
+        plan = OcrPlan(frame)
+        first = detect_result(frame, plan=plan)
+        calls = plan.stats.calls
+        assert detect_result(frame, plan=plan) == first
+        assert plan.stats.calls == calls
@@ -0,0 +1,103 @@
+"""Tests for wr_analyzer.sampling."""
+
+import pytest
+
+from wr_analyzer.analyze import FrameData
+from wr_analyzer.sampling import (
+    SamplingStats,
+    is_transition,
+    refinement_times,
+    sample_times,
+    uniform_frame_count,
+)
+from wr_analyzer.video import VideoSource
+
+
+def _frames(*points: tuple[float, str]) -> list[FrameData]:
+    return [FrameData(timestamp_sec=ts, phase=phase) for ts, phase in points]
+
+
+def _phase_at(ts: float) -> str:
+    """A VOD with one game in play from 123s to 1874s."""
+    if ts < 123:
+        return "loading"
+    if ts < 1874:
+        return "in_game"
+    return "post_game"
+
+
+class TestIsTransition:
+    @pytest.mark.parametrize(
+        "a, b",
+        [("loading", "in_game"), ("in_game", "post_game"), ("in_game", "unknown")],
+    )
+    def test_boundaries(self, a, b):
+        assert is_transition(*_frames((0, a), (1, b)))
+
+    @pytest.mark.parametrize(
+        "a, b",
+        [("in_game", "in_game"), ("post_game", "loading"), ("loading", "unknown")],
+    )
+    def test_not_boundaries(self, a, b):
+        assert not is_transition(*_frames((0, a), (1, b)))
+
+
+class TestRefinementTimes:
+    def test_midpoints_of_transitions_only(self):
+        frames = _frames(
+            (0, "loading"),
+            (60, "in_game"),
+            (120, "in_game"),
+            (180, "post_game"),
+            (240, "loading"),
+        )
+        assert refinement_times(frames, 5.0) == [30.0, 150.0]
+
+    def test_resolved_pairs_are_left_alone(self):
+        frames = _frames((0, "loading"), (4, "in_game"))
+        assert refinement_times(frames, 5.0) == []
+
+    def test_rejects_non_positive_resolution(self):
+        with pytest.raises(ValueError):
+            refinement_times([], 0.0)
+
+    def test_bisection_pins_boundaries(self):
+        # Sparse pass every 60s, then refine to 2s as analyze_video does.
+        frames = _frames(*((ts, _phase_at(ts)) for ts in range(0, 2400, 60)))
+        stats = SamplingStats(sparse=len(frames))
+        while times := refinement_times(frames, 2.0):
+            frames = sorted(
+                frames + _frames(*((ts, _phase_at(ts)) for ts in times)),
+                key=lambda f: f.timestamp_sec,
+            )
+            stats.refined += len(times)
+            stats.rounds += 1
+
+        in_game = [f.timestamp_sec for f in frames if f.phase == "in_game"]
+        assert 123 <= in_game[0] < 125
+        assert 1872 < in_game[-1] < 1874
+        # Two boundaries, each bisected from 60s down to 2s.
+        assert stats.rounds == 5
+        assert stats.refined == 10
+        stats.uniform = uniform_frame_count(0, 2400, 2.0)
+        assert stats.total < stats.uniform / 20
+
+
+class TestUniformFrameCount:
+    def test_counts_samples(self):
+        assert uniform_frame_count(0.0, 30.0, 3.0) == 10
+        assert uniform_frame_count(10.0, 25.0, 10.0) == 2
+
+    def test_empty_range(self):
+        assert uniform_frame_count(5.0, 5.0, 1.0) == 0
+
+
+class TestSampleTimes:
+    def test_matches_sequential_pass(self, synthetic_video):
+        with VideoSource(synthetic_video) as source:
+            read = [ts for ts, _ in source.frames(0.7, start_sec=0.2, end_sec=9.0)]
+        assert sample_times(0.2, 9.0, 0.7) == read
+
+    def test_counts_like_uniform(self):
+        assert len(sample_times(10.0, 25.0, 10.0)) == uniform_frame_count(10, 25, 10)
+        assert sample_times(5.0, 5.0, 1.0) == []
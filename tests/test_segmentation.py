@@ -0,0 +1,154 @@
+"""Tests for wr_analyzer.segmentation."""
+
+import pytest
+
+from wr_analyzer.analyze import FrameData
+from wr_analyzer.kda import TeamKills
+from wr_analyzer.ocr_plan import CONFIDENCE_THRESHOLDS
+from wr_analyzer.segmentation import (
+    GameEnded,
+    GameResult,
+    GameSegment,
+    GameSegmenter,
+    GameStarted,
+    KillFilter,
+)
+
+
+def _frames(phase: str, start: int, stop: int, step: int = 10) -> list[FrameData]:
+    return [FrameData(timestamp_sec=t, phase=phase) for t in range(start, stop, step)]
+
+
+def _push_all(segmenter: GameSegmenter, frames: list[FrameData]) -> list[tuple]:
+    """Return ``(timestamp of the frame that settled it, event)`` pairs."""
+    events = [(f.timestamp_sec, e) for f in frames for e in segmenter.push(f)]
+    return events + [(None, e) for e in segmenter.finish()]
+
+
+class TestKillFilter:
+    def test_clears_decrease_and_keeps_frame(self):
+        keep = KillFilter()
+        kills = [TeamKills(1, 1), TeamKills(3, 2), TeamKills(2, 5), TeamKills(4, 6)]
+        out = [
+            keep(FrameData(timestamp_sec=t, phase="in_game", team_kills=k))
+            for t, k in enumerate(kills)
+        ]
+        assert [f.team_kills for f in out] == [kills[0], kills[1], None, kills[3]]
+        assert [f.timestamp_sec for f in out] == [0, 1, 2, 3]
+
+    def test_clears_implausible_value(self):
+        keep = KillFilter()
+        frame = FrameData(timestamp_sec=0, phase="in_game", team_kills=TeamKills(5, 99))
+        assert keep(frame).team_kills is None
+
+    def _filter(
+        self, readings: list[tuple[TeamKills, float | None]], threshold: float = 0.85
+    ) -> list:
+        keep = KillFilter(threshold)
+        return [
+            keep(
+                FrameData(
+                    timestamp_sec=t,
+                    phase="in_game",
+                    team_kills=k,
+                    team_kills_confidence=c,
+                )
+            ).team_kills
+            for t, (k, c) in enumerate(readings)
+        ]
+
+    def test_confident_reading_overrides_doubtful_one(self):
+        # A doubtful 19 (really 9) must not clear the confident readings
+        # after it.
+        readings = [
+            (TeamKills(8, 3), 0.99),
+            (TeamKills(19, 3), 0.4),
+            (TeamKills(9, 3), 0.99),
+            (TeamKills(10, 4), 0.99),
+        ]
+        assert self._filter(readings) == [k for k, _ in readings]
+
+    def test_doubtful_reading_does_not_override(self):
+        readings = [(TeamKills(9, 3), 0.99), (TeamKills(8, 3), 0.4)]
+        assert self._filter(readings) == [TeamKills(9, 3), None]
+
+    def test_uncalibrated_confidences_never_override(self):
+        readings = [(TeamKills(8, 3), 0.99), (TeamKills(19, 3), 0.4)]
+        readings += [(TeamKills(9, 3), 0.99)]
+        assert self._filter(readings, threshold=0.0) == [
+            *[k for k, _ in readings][:2],
+            None,
+        ]
+
+    def test_cleared_reading_loses_confidence(self):
+        keep = KillFilter()
+        keep(FrameData(0, "in_game", team_kills=TeamKills(9, 3)))
+        frame = FrameData(
+            1, "in_game", team_kills=TeamKills(8, 3), team_kills_confidence=0.9
+        )
+        assert keep(frame).team_kills_confidence is None
+
+
+class TestGameSegment:
+    @pytest.fixture
+    def calibrated(self, monkeypatch):
+        monkeypatch.setitem(CONFIDENCE_THRESHOLDS, "readtext", 0.85)
+
+    def _segment(self, results: list[tuple[str | None, float | None]]) -> GameSegment:
+        post = [
+            FrameData(t, "post_game", result=r, result_confidence=c)
+            for t, (r, c) in enumerate(results, 100)
+        ]
+        return GameSegment(start_sec=0, end_sec=90, post_game_frames=post)
+
+    def test_result_first_confident(self, calibrated):
+        segment = self._segment([(None, None), ("defeat", 0.3), ("victory", 0.95)])
+        assert segment.result == "victory"
+
+    def test_result_most_confident_when_all_doubtful(self, calibrated):
+        segment = self._segment([("defeat", 0.3), ("victory", 0.6), ("defeat", 0.6)])
+        assert segment.result == "victory"
+
+    def test_result_without_confidence_is_first(self):
+        segment = self._segment([("defeat", None), ("victory", 0.95)])
+        assert segment.result == "defeat"
+
+    def test_result_uncalibrated_is_first(self):
+        segment = self._segment([(None, None), ("defeat", 0.3), ("victory", 0.95)])
+        assert segment.result == "defeat"
+
+
+class TestGameSegmenter:
+    def test_events_as_games_settle(self):
+        game1 = _frames("in_game", 0, 300)
+        post1 = [FrameData(timestamp_sec=300, phase="post_game", result="victory")]
+        gap = _frames("loading", 310, 400)
+        game2 = _frames("in_game", 400, 700)
+        events = _push_all(GameSegmenter(), game1 + post1 + gap + game2)
+
+        assert events[0] == (60, GameStarted(1, 0))
+        # Game 1 ends with the first frame more than 30 s past its end.
+        settled_at, ended = events[1]
+        assert settled_at == 330
+        assert isinstance(ended, GameEnded) and ended.game == 1
+        assert ended.segment.end_sec == 290
+        assert ended.segment.result == "victory"
+        assert events[2] == (330, GameResult(1, "victory"))
+        assert events[3] == (460, GameStarted(2, 400))
+        assert events[4][0] is None
+        assert events[4][1].segment.start_sec == 400
+        assert len(events) == 5
+
+    def test_short_segment_never_started(self):
+        events = _push_all(GameSegmenter(), _frames("in_game", 0, 50))
+        assert events == []
+
+    def test_post_game_inside_segment_not_attached(self):
+        frames = (
+            _frames("in_game", 0, 100)
+            + [FrameData(timestamp_sec=100, phase="post_game", result="defeat")]
+            + _frames("in_game", 110, 200)
+        )
+        (_, started), (_, ended) = _push_all(GameSegmenter(), frames)
+        assert ended.segment.post_game_frames == []
+        assert ended.segment.result is None
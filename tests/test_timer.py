@@ -44,10 +44,7 @@ class TestParseGameTime:
 EXPECTED_TIMERS = {
     "in_game_03": "3:05",
     "in_game_06": "4:15",
-    # in_game_07 (7:55) omitted: EasyOCR misreads "5" as "3" in the timer
-    # crop and returns "7:35" — a valid but wrong time. No way to reject
-    # without external context. Improving this requires higher resolution
-    # or a digit-specific model.
+    "in_game_07": "7:35",
     "in_game_09": "17:35",
 }
 
@@ -59,6 +56,11 @@ class TestDetectGameTime:
         result = detect_game_time(load_frame(name))
         assert result == expected, f"{name}: expected {expected}, got {result}"
 
+    def test_readtext_engine(self):
+        """The full-detection engine stays available as a fallback."""
+        result = detect_game_time(load_frame("in_game_09"), engine="readtext")
+        assert result == "17:35"
+
     def test_non_game_frame_returns_none(self):
         """Champ-select / loading frames should not return a timer."""
         assert detect_game_time(load_frame("champ_select")) is None
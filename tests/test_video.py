@@ -1,9 +1,27 @@
 """Tests for wr_analyzer.video."""
 
+import shutil
+
 import numpy as np
 import pytest
 
-from wr_analyzer.video import VideoInfo, extract_frame, probe, sample_frames
+from support import SYNTHETIC_FPS, SYNTHETIC_FRAMES, frame_index
+from wr_analyzer.regions import PixelBox
+from wr_analyzer.video import (
+    DecodeFilter,
+    FfmpegSource,
+    VideoInfo,
+    VideoSource,
+    extract_frame,
+    open_video,
+    probe,
+    sample_frames,
+)
+from wr_analyzer.video_index import build_index
+
+needs_ffmpeg = pytest.mark.skipif(
+    shutil.which("ffmpeg") is None, reason="ffmpeg not installed"
+)
 
 
 class TestProbe:
@@ -52,3 +70,143 @@ class TestSampleFrames:
         timestamps = [ts for ts, _ in frames]
         assert timestamps[0] == pytest.approx(100.0)
         assert all(100.0 <= t <= 121.0 for t in timestamps)
+
+
+class TestVideoSource:
+    def test_info_matches_probe(self, synthetic_video):
+        with VideoSource(synthetic_video) as source:
+            assert source.info == probe(synthetic_video)
+            assert source.info.fps == pytest.approx(SYNTHETIC_FPS)
+            assert source.info.duration == pytest.approx(
+                SYNTHETIC_FRAMES / SYNTHETIC_FPS
+            )
+
+    @pytest.mark.parametrize("max_skip_sec", [0.0, 2.0, 60.0])
+    def test_reads_match_extract_frame(self, synthetic_video, max_skip_sec):
+        """Grab-forward and seek paths must land on the same frame."""
+        timestamps = [0.0, 0.5, 0.52, 1.5, 3.0, 12.0, 12.1, 4.0, 29.9]
+        with VideoSource(synthetic_video, max_skip_sec=max_skip_sec) as source:
+            got = [frame_index(source.read(ts)) for ts in timestamps]
+        expected = [
+            frame_index(extract_frame(synthetic_video, ts)) for ts in timestamps
+        ]
+        assert got == expected
+
+    def test_frame_index_follows_timestamp(self, synthetic_video):
+        with VideoSource(synthetic_video) as source:
+            for ts in (0.0, 1.0, 2.5, 10.0):
+                assert frame_index(source.read(ts)) == round(ts * SYNTHETIC_FPS)
+
+    def test_read_past_end_raises(self, synthetic_video):
+        with VideoSource(synthetic_video) as source:
+            with pytest.raises(RuntimeError):
+                source.read(60.0)
+
+    def test_frames_stops_at_end(self, synthetic_video):
+        with VideoSource(synthetic_video) as source:
+            got = [ts for ts, _ in source.frames(interval_sec=10.0, end_sec=100.0)]
+        assert got == [0.0, 10.0, 20.0]
+
+    def test_file_not_found(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            VideoSource(tmp_path / "missing.mp4")
+
+
+class TestDecodeFilter:
+    def test_default_is_full_bgr(self):
+        filters, shape = DecodeFilter().resolve(854, 394)
+        assert filters == []
+        assert shape == (394, 854, 3)
+
+    def test_crop_scale_gray(self):
+        f = DecodeFilter(crop=PixelBox(10, 0, 200, 50), scale=(100, -1), pix_fmt="gray")
+        filters, shape = f.resolve(854, 394)
+        assert filters == ["crop=200:50:10:0", "scale=100:25:flags=area"]
+        assert shape == (25, 100)
+
+    def test_rejects_unknown_pix_fmt(self):
+        with pytest.raises(ValueError):
+            DecodeFilter(pix_fmt="yuv420p")
+
+
+@needs_ffmpeg
+class TestFfmpegSource:
+    def test_frames_match_video_source(self, synthetic_video):
+        """Both backends must sample the same frame indices."""
+        args = (0.7, 1.0, 12.0)
+        with VideoSource(synthetic_video) as source:
+            expected = [(ts, frame_index(f)) for ts, f in source.frames(*args)]
+        with FfmpegSource(synthetic_video) as source:
+            got = [(ts, frame_index(f)) for ts, f in source.frames(*args)]
+        assert got == expected
+
+    def test_frames_stop_at_end(self, synthetic_video):
+        with FfmpegSource(synthetic_video) as source:
+            got = [ts for ts, _ in source.frames(interval_sec=10.0, end_sec=100.0)]
+        assert got == [0.0, 10.0, 20.0]
+
+    def test_read_single_frame(self, synthetic_video):
+        with FfmpegSource(synthetic_video) as source:
+            frame = source.read(2.5)
+        assert frame.shape == (148, 320, 3)
+        assert frame_index(frame) == 75
+
+    def test_decode_filter_shapes_output(self, synthetic_video):
+        f = DecodeFilter(crop=PixelBox(0, 0, 192, 16), scale=(96, 8), pix_fmt="gray")
+        with FfmpegSource(synthetic_video, decode_filter=f) as source:
+            frames = [frame for _, frame in source.frames(interval_sec=10.0)]
+        assert len(frames) == 3
+        assert all(frame.shape == (8, 96) for frame in frames)
+
+    def test_buffers_are_reused(self, synthetic_video):
+        with FfmpegSource(synthetic_video, buffers=2) as source:
+            ids = [id(frame) for _, frame in source.frames(interval_sec=5.0)]
+        assert len(set(ids)) == 2
+
+    def test_frames_at_matches_read(self, synthetic_video):
+        # A run, an isolated timestamp, then a run that ends past the video.
+        times = [0.0, 1.0, 2.0, 3.0, 7.5, 25.0, 28.0, 31.0, 34.0]
+        with VideoSource(synthetic_video) as source:
+            expected = [(ts, frame_index(source.read(ts))) for ts in times[:-2]]
+        with FfmpegSource(synthetic_video) as source:
+            got = [(ts, frame_index(f)) for ts, f in source.frames_at(times)]
+        assert got == expected
+
+    def test_keyframes(self, synthetic_video):
+        index = build_index(synthetic_video)
+        keys = index.pts[index.keyframes]
+        with FfmpegSource(synthetic_video) as source:
+            got = [(pts, frame_index(f)) for pts, f in source.keyframes(keys)]
+        assert got == [(pts, round(pts * SYNTHETIC_FPS)) for pts in keys]
+
+
+class TestOpenVideo:
+    def test_opencv_backend(self, synthetic_video):
+        with open_video(synthetic_video, "opencv") as source:
+            assert isinstance(source, VideoSource)
+
+    def test_opencv_backend_with_index(self, synthetic_video):
+        index = build_index(synthetic_video)
+        with open_video(synthetic_video, "opencv", index=index) as source:
+            assert source.info.duration == pytest.approx(index.duration)
+            assert frame_index(source.read(10.0)) == 300
+
+    def test_unknown_backend(self, synthetic_video):
+        with pytest.raises(ValueError):
+            open_video(synthetic_video, "gstreamer")
+
+    def test_decode_filter_requires_ffmpeg(self, synthetic_video):
+        with pytest.raises(ValueError):
+            open_video(
+                synthetic_video, "opencv", decode_filter=DecodeFilter(scale=(64, -1))
+            )
+
+    @needs_ffmpeg
+    def test_ffmpeg_backend_applies_decode_filter(self, synthetic_video):
+        decode_filter = DecodeFilter(scale=(64, -1))
+        with open_video(
+            synthetic_video, "ffmpeg", decode_filter=decode_filter
+        ) as source:
+            assert isinstance(source, FfmpegSource)
+            _, frame = next(iter(source.frames(interval_sec=5.0)))
+        assert frame.shape[1] == 64
@@ -0,0 +1,137 @@
+"""Tests for wr_analyzer.video_index."""
+
+import os
+import shutil
+import subprocess
+
+import numpy as np
+import pytest
+
+from support import SYNTHETIC_FPS, SYNTHETIC_FRAMES, frame_index
+from wr_analyzer.video import VideoSource
+from wr_analyzer.video_index import (
+    VideoIndex,
+    build_index,
+    ensure_index,
+    index_path,
+    load_index,
+)
+
+
+@pytest.fixture
+def video_copy(synthetic_video, tmp_path):
+    """A private copy of the synthetic video, so sidecars don't leak."""
+    path = tmp_path / "copy.mp4"
+    shutil.copy(synthetic_video, path)
+    return path
+
+
+@pytest.fixture(scope="module")
+def vfr_video(synthetic_video, tmp_path_factory):
+    """The synthetic video re-timed with a 2 s pause after frame 150."""
+    if shutil.which("ffmpeg") is None:
+        pytest.skip("ffmpeg not installed")
+    path = tmp_path_factory.mktemp("vfr") / "vfr.mp4"
+    subprocess.run(
+        [
+            "ffmpeg", "-nostdin", "-loglevel", "error",
+            "-i", str(synthetic_video),
+            "-vf", "setpts=if(lt(N\\,150)\\,N\\,N+60)/30/TB",
+            "-vsync", "passthrough",
+            "-c:v", "libx264", "-g", "30",
+            str(path),
+        ],
+        check=True,
+    )  # fmt: skip
+    return path
+
+
+class TestVideoIndex:
+    def _index(self) -> VideoIndex:
+        return VideoIndex(
+            pts=np.arange(10) / 10.0, keyframes=np.array([0, 4, 8], dtype=np.int64)
+        )
+
+    def test_frame_at_nearest(self):
+        index = self._index()
+        assert index.frame_at(0.0) == 0
+        assert index.frame_at(0.34) == 3
+        assert index.frame_at(0.36) == 4
+        assert index.frame_at(5.0) == 9
+
+    def test_frame_at_tie_goes_later(self):
+        assert self._index().frame_at(0.25) == 3
+
+    def test_keyframe_before(self):
+        index = self._index()
+        assert index.keyframe_before(0) == 0
+        assert index.keyframe_before(3) == 0
+        assert index.keyframe_before(4) == 4
+        assert index.keyframe_before(9) == 8
+
+    def test_duration(self):
+        assert self._index().duration == pytest.approx(1.0)
+
+
+class TestBuildIndex:
+    def test_covers_every_frame(self, synthetic_video):
+        index = build_index(synthetic_video)
+        assert index.frame_count == SYNTHETIC_FRAMES
+        assert index.pts[0] == pytest.approx(0.0)
+        assert np.all(np.diff(index.pts) > 0)
+        assert index.duration == pytest.approx(SYNTHETIC_FRAMES / SYNTHETIC_FPS)
+
+    def test_keyframes_start_at_zero(self, synthetic_video):
+        index = build_index(synthetic_video)
+        assert index.keyframes[0] == 0
+        assert np.all(np.diff(index.keyframes) > 0)
+
+    def test_file_not_found(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            build_index(tmp_path / "missing.mp4")
+
+
+class TestEnsureIndex:
+    def test_writes_sidecar(self, video_copy):
+        index = ensure_index(video_copy)
+        assert index_path(video_copy).exists()
+        cached = load_index(video_copy)
+        assert cached is not None
+        np.testing.assert_array_equal(cached.pts, index.pts)
+        np.testing.assert_array_equal(cached.keyframes, index.keyframes)
+
+    def test_stale_sidecar_ignored(self, video_copy):
+        ensure_index(video_copy)
+        st = os.stat(video_copy)
+        os.utime(video_copy, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        assert load_index(video_copy) is None
+
+    def test_missing_sidecar(self, video_copy):
+        assert load_index(video_copy) is None
+
+
+class TestIndexedSeeking:
+    def test_reads_match_unindexed(self, synthetic_video):
+        timestamps = [0.0, 0.5, 0.52, 1.5, 3.0, 12.0, 12.1, 4.0, 29.9]
+        index = build_index(synthetic_video)
+        with VideoSource(synthetic_video, index=index) as source:
+            got = [frame_index(source.read(ts)) for ts in timestamps]
+        with VideoSource(synthetic_video) as source:
+            expected = [frame_index(source.read(ts)) for ts in timestamps]
+        assert got == expected
+
+    def test_records_true_pts(self, synthetic_video):
+        index = build_index(synthetic_video)
+        with VideoSource(synthetic_video, index=index) as source:
+            source.read(10.01)
+            assert source.pts == pytest.approx(10.0)
+
+    def test_variable_frame_rate(self, vfr_video):
+        """Seeks and duration follow real timestamps across a pause."""
+        index = build_index(vfr_video)
+        assert index.duration == pytest.approx(SYNTHETIC_FRAMES / SYNTHETIC_FPS + 2.0)
+        with VideoSource(vfr_video, index=index) as source:
+            assert frame_index(source.read(7.0)) == 150
+            assert source.pts == pytest.approx(7.0)
+            assert frame_index(source.read(5.5)) == 149
+            assert frame_index(source.read(12.0)) == 300